@@ -0,0 +1,112 @@
+"""
+Connections opened to the database per 1,000 requests of the stateless API.
+
+`--requests` reads of an order by its ID (a `GenericReader.get` each, as a
+request of the stateless API makes) are run against a pooled engine kept
+open throughout, and against one disposed of after every session, as the
+sessions used to: the connections each opens, per 1,000 requests, and the
+mean time per request are printed.
+
+The engine runs on the database of the application settings (`DB_URI`),
+whose tables are dropped and created anew for every run: point it at a
+scratch database.
+
+Usage:
+    python -m benchmarks.db_connects [--requests 1000]
+"""
+
+import argparse
+import asyncio
+from asyncio import current_task
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from decimal import Decimal
+from time import perf_counter
+from typing import AsyncIterator, Callable
+from uuid import uuid4
+
+from loguru import logger
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.order_book.order.model import Order
+
+
+async def run(requests: int, dispose: bool) -> tuple[int, float]:
+    """Return the connections opened for `requests` reads, and the time taken."""
+    # Imported here, as connecting needs the database settings
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+    from ctenex.core.db.async_session import (
+        AsyncDatabaseConnection,
+        DatabaseManager,
+        create_custom_engine,
+        get_async_session,
+    )
+    from ctenex.domain.order_book.model import OrderBook
+    from ctenex.settings.application import get_app_settings
+
+    connection = AsyncDatabaseConnection(
+        engine=create_custom_engine(str(get_app_settings().db.uri))
+    )
+    await DatabaseManager.drop_db(engine=connection.get_engine())
+    await DatabaseManager.setup_db(engine=connection.get_engine())
+
+    @asynccontextmanager
+    async def session_stream(
+        _: AsyncDatabaseConnection = connection,
+        current_scope: Callable = current_task,
+    ) -> AsyncIterator[async_scoped_session[AsyncSession]]:
+        async with get_async_session(connection, current_scope) as session:
+            yield session
+        if dispose:
+            await connection.close_engine()
+
+    order_book = OrderBook(db=session_stream)
+    try:
+        order_id = await order_book.add_order(
+            Order(
+                id=uuid4(),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=uuid4(),
+                side=OrderSide.BUY,
+                type=OrderType.LIMIT,
+                price=Decimal("100.00"),
+                quantity=Decimal("1.00"),
+                remaining_quantity=Decimal("1.00"),
+                placed_at=datetime.now(UTC),
+            )
+        )
+
+        connects = connection.get_pool_stats().connects
+        start = perf_counter()
+        for _ in range(requests):
+            await order_book.get_order(order_id)
+        elapsed = perf_counter() - start
+        connects = connection.get_pool_stats().connects - connects
+    finally:
+        await DatabaseManager.drop_db(engine=connection.get_engine())
+        await connection.close_engine()
+
+    return connects, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1_000)
+    args = parser.parse_args()
+
+    # Keep the engine's logging out of the output
+    logger.remove()
+
+    print(f"{'engine':>9} {'connects/1k':>12} {'ms/request':>11}")
+    for label, dispose in (("disposed", True), ("pooled", False)):
+        connects, elapsed = asyncio.run(run(args.requests, dispose))
+        print(
+            f"{label:>9} {connects / args.requests * 1_000:>12,.1f} "
+            f"{elapsed / args.requests * 1e3:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Round trips and commits to the database per order of the database matching engine.
+
+For each sweep size in `--sweeps`, that many asks are rested at increasing
+prices, then a single buy order crossing all of them is added: the statements
+the engine sends to the database for that order are counted (a bulk statement
+counting once, however many rows it writes), as are the transactions it
+commits. Matching is set-based, so the statements stay the same whatever the
+number of orders swept, and all the effects of the order are committed at once.
+
+The engine runs on the database of the application settings (`DB_URI`),
+whose tables are dropped and created anew for every sweep: point it at a
+scratch database.
+
+Usage:
+    python -m benchmarks.db_round_trips [--sweeps 1 10 50]
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from loguru import logger
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.order_book.order.model import Order
+
+
+def limit_order(side: OrderSide, price: Decimal, quantity: Decimal) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=uuid4(),
+        side=side,
+        type=OrderType.LIMIT,
+        price=price,
+        quantity=quantity,
+        placed_at=datetime.now(UTC),
+    )
+
+
+async def sweep(size: int) -> tuple[int, int, int]:
+    """
+    Return the statements sent and commits for an order sweeping `size` asks,
+    and its trades.
+    """
+    # Imported here, as connecting needs the database settings
+    from sqlalchemy import event, func, select
+
+    from ctenex.core.db.async_session import (
+        DatabaseManager,
+        create_custom_engine,
+        db_connection,
+        get_async_session,
+    )
+    from ctenex.domain.entities import Trade
+    from ctenex.domain.matching_engine.model import MatchingEngine
+    from ctenex.settings.application import get_app_settings
+
+    db_engine = create_custom_engine(str(get_app_settings().db.uri))
+    await DatabaseManager.drop_db(engine=db_engine)
+    await DatabaseManager.setup_db(engine=db_engine)
+
+    statements = 0
+    commits = 0
+
+    def count(*_) -> None:
+        nonlocal statements
+        statements += 1
+
+    def count_commit(*_) -> None:
+        nonlocal commits
+        commits += 1
+
+    engine = MatchingEngine()
+    sync_engine = db_connection.get_engine().sync_engine
+    try:
+        for index in range(size):
+            await engine.add_order(
+                limit_order(OrderSide.SELL, Decimal(100 + index), Decimal(1))
+            )
+
+        event.listen(sync_engine, "before_cursor_execute", count)
+        event.listen(sync_engine, "commit", count_commit)
+        order = limit_order(OrderSide.BUY, Decimal(100 + size), Decimal(size))
+        await engine.add_order(order)
+        event.remove(sync_engine, "before_cursor_execute", count)
+        event.remove(sync_engine, "commit", count_commit)
+
+        async with get_async_session() as session:
+            trades = (
+                await session.execute(select(func.count()).select_from(Trade))
+            ).scalar_one()
+    finally:
+        await DatabaseManager.drop_db(engine=db_engine)
+        await db_engine.dispose()
+        # Its connections are bound to this sweep's event loop
+        await db_connection.close_engine()
+
+    return statements, commits, trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sweeps", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    # Keep the engine's logging out of the output
+    logger.remove()
+
+    print(f"{'swept':>6} {'trades':>7} {'statements':>11} {'commits':>8}")
+    for size in args.sweeps:
+        statements, commits, trades = asyncio.run(sweep(size))
+        print(f"{size:>6} {trades:>7} {statements:>11} {commits:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Throughput and latency of the in-memory and database matching engines.
+
+Each scenario is a seeded flow of commands on a single contract:
+
+- passive: non-crossing limit orders building up both sides of the book
+- aggressive: resting orders swept by large crossing limit orders
+- cancel-heavy: resting orders, most of them cancelled soon after
+- market: resting orders taken by market orders
+- fok-heavy: resting orders and as many large fill-or-kill orders, most of
+  them cancelled for lack of liquidity at their limit price
+
+Every scenario is run on a fresh engine, timing each command, and reported as
+commands (orders added or cancelled) per second, trades per second and the
+p50/p99/p99.9 latency of a command, along with the engine's own per-stage
+latencies. The results are written as JSON with `--output`, and compared with
+those of an earlier run with `--baseline`.
+
+The database engine runs on the database of the application settings
+(`DB_URI`), whose tables are dropped and created anew for every scenario:
+point it at a scratch database. Being orders of magnitude slower, it runs
+`--db-orders` commands per scenario.
+
+Usage:
+    python -m benchmarks.engines [--orders 20000] [--db-orders 300]
+                                 [--engines in_memory db]
+                                 [--scenarios passive aggressive ...]
+                                 [--seed 42] [--output results.json]
+                                 [--baseline previous.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter, perf_counter_ns
+from typing import Callable
+from uuid import UUID
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType, TimeInForce
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+# Prices are drawn in ticks of 0.01 around a mid of 100.00: bids rest at or
+# below 99.99 and asks at or above 100.00, unless they are meant to cross
+MID = 10_000
+SPREAD = 100
+
+Command = tuple[str, Order | UUID]
+
+
+def limit_order(rng: random.Random, side: OrderSide, price: int, quantity: int):
+    return Order(
+        id=UUID(int=rng.getrandbits(128)),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=UUID(int=rng.getrandbits(128)),
+        side=side,
+        type=OrderType.LIMIT,
+        price=Decimal(price).scaleb(-2),
+        quantity=Decimal(quantity).scaleb(-2),
+        placed_at=datetime(2025, 3, 1, tzinfo=UTC),
+    )
+
+
+def passive_order(rng: random.Random) -> Order:
+    side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+    price = (
+        rng.randint(MID - SPREAD, MID - 1)
+        if side == OrderSide.BUY
+        else rng.randint(MID, MID + SPREAD)
+    )
+    return limit_order(rng, side, price, rng.randint(1, 2_000))
+
+
+def passive(size: int, rng: random.Random) -> list[Command]:
+    return [("add", passive_order(rng)) for _ in range(size)]
+
+
+def aggressive(size: int, rng: random.Random) -> list[Command]:
+    """One in five orders sweeps up to a tenth of the opposite side's levels."""
+    commands: list[Command] = []
+    for _ in range(size):
+        if rng.random() < 0.8:
+            commands.append(("add", passive_order(rng)))
+            continue
+
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        levels = rng.randint(1, SPREAD // 10)
+        price = MID + levels if side == OrderSide.BUY else MID - 1 - levels
+        commands.append(
+            ("add", limit_order(rng, side, price, rng.randint(5_000, 20_000)))
+        )
+    return commands
+
+
+def cancel_heavy(size: int, rng: random.Random) -> list[Command]:
+    """Three in five commands cancel a random resting order."""
+    commands: list[Command] = []
+    resting: list[UUID] = []
+    for _ in range(size):
+        if resting and rng.random() < 0.6:
+            # Swap the order cancelled with the last one, to pop it cheaply
+            index = rng.randrange(len(resting))
+            resting[index], resting[-1] = resting[-1], resting[index]
+            commands.append(("cancel", resting.pop()))
+            continue
+
+        order = passive_order(rng)
+        resting.append(order.id)
+        commands.append(("add", order))
+    return commands
+
+
+def market(size: int, rng: random.Random) -> list[Command]:
+    """One in four orders is a market order."""
+    commands: list[Command] = []
+    for _ in range(size):
+        if rng.random() < 0.75:
+            commands.append(("add", passive_order(rng)))
+            continue
+
+        commands.append(
+            (
+                "add",
+                Order(
+                    id=UUID(int=rng.getrandbits(128)),
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=UUID(int=rng.getrandbits(128)),
+                    side=rng.choice([OrderSide.BUY, OrderSide.SELL]),
+                    type=OrderType.MARKET,
+                    quantity=Decimal(rng.randint(1, 5_000)).scaleb(-2),
+                    placed_at=datetime(2025, 3, 1, tzinfo=UTC),
+                ),
+            )
+        )
+    return commands
+
+
+def fok_heavy(size: int, rng: random.Random) -> list[Command]:
+    """Every other order is a fill-or-kill order crossing up to 20 levels."""
+    commands: list[Command] = []
+    for _ in range(size):
+        if rng.random() < 0.5:
+            commands.append(("add", passive_order(rng)))
+            continue
+
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        levels = rng.randint(1, SPREAD // 5)
+        price = MID + levels if side == OrderSide.BUY else MID - 1 - levels
+        order = limit_order(rng, side, price, rng.randint(1_000, 50_000))
+        order.time_in_force = TimeInForce.FOK
+        commands.append(("add", order))
+    return commands
+
+
+SCENARIOS: dict[str, Callable[[int, random.Random], list[Command]]] = {
+    "passive": passive,
+    "aggressive": aggressive,
+    "cancel-heavy": cancel_heavy,
+    "market": market,
+    "fok-heavy": fok_heavy,
+}
+
+
+def percentiles(latencies: list[int]) -> dict[str, float]:
+    """p50, p99, p99.9 and max of latencies in nanoseconds, in microseconds."""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"p50": 0.0, "p99": 0.0, "p999": 0.0, "max": 0.0}
+
+    def at(percentile: float) -> float:
+        index = min(len(latencies) - 1, round(len(latencies) * percentile / 100))
+        return latencies[index] / 1_000
+
+    return {"p50": at(50), "p99": at(99), "p999": at(99.9), "max": at(100)}
+
+
+def result(
+    engine: str,
+    scenario: str,
+    commands: list[Command],
+    trades: int,
+    elapsed: float,
+    latencies: list[int],
+    stages: dict,
+) -> dict:
+    return {
+        "engine": engine,
+        "scenario": scenario,
+        "commands": len(commands),
+        "orders": sum(1 for action, _ in commands if action == "add"),
+        "cancels": sum(1 for action, _ in commands if action == "cancel"),
+        "trades": trades,
+        "elapsed": elapsed,
+        "commands_per_second": len(commands) / elapsed,
+        "trades_per_second": trades / elapsed,
+        "latency_us": percentiles(latencies),
+        "stages_us": stages,
+    }
+
+
+def stage_latencies(engine) -> dict:
+    return {
+        stage: latency.model_dump()
+        for contract in engine.get_latency().contracts
+        for stage, latency in contract.stages.items()
+    }
+
+
+def run_in_memory(scenario: str, commands: list[Command]) -> dict:
+    engine = MatchingEngine()
+    engine.start(contracts=[CONTRACT])
+
+    latencies = []
+    start = perf_counter()
+    for action, argument in commands:
+        command_start = perf_counter_ns()
+        if action == "add":
+            engine.add_order(argument)  # type: ignore[arg-type]
+        else:
+            engine.cancel_order(ContractCode.UK_BL_MAR_25, argument)  # type: ignore[arg-type]
+        latencies.append(perf_counter_ns() - command_start)
+    elapsed = perf_counter() - start
+
+    trades = len(engine.get_trades(ContractCode.UK_BL_MAR_25))
+    stages = stage_latencies(engine)
+    engine.stop()
+    return result("in_memory", scenario, commands, trades, elapsed, latencies, stages)
+
+
+async def run_db(scenario: str, commands: list[Command]) -> dict:
+    # Imported here, as connecting needs the database settings
+    from sqlalchemy import func, select
+
+    from ctenex.core.db.async_session import (
+        DatabaseManager,
+        create_custom_engine,
+        db_connection,
+        get_async_session,
+    )
+    from ctenex.domain.entities import Trade
+    from ctenex.domain.matching_engine.model import MatchingEngine as DbMatchingEngine
+    from ctenex.settings.application import get_app_settings
+
+    db_engine = create_custom_engine(str(get_app_settings().db.uri))
+    await DatabaseManager.drop_db(engine=db_engine)
+    await DatabaseManager.setup_db(engine=db_engine)
+
+    engine = DbMatchingEngine()
+    latencies = []
+    try:
+        start = perf_counter()
+        for action, argument in commands:
+            command_start = perf_counter_ns()
+            if action == "add":
+                await engine.add_order(argument)  # type: ignore[arg-type]
+            else:
+                await engine.order_book.cancel_order(argument)  # type: ignore[arg-type]
+            latencies.append(perf_counter_ns() - command_start)
+        elapsed = perf_counter() - start
+
+        async with get_async_session() as session:
+            trades = (
+                await session.execute(select(func.count()).select_from(Trade))
+            ).scalar_one()
+    finally:
+        await DatabaseManager.drop_db(engine=db_engine)
+        await db_engine.dispose()
+        # Its connections are bound to this run's event loop
+        await db_connection.close_engine()
+
+    stages = stage_latencies(engine)
+    return result("db", scenario, commands, trades, elapsed, latencies, stages)
+
+
+def metadata(args: argparse.Namespace) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "orders": args.orders,
+        "db_orders": args.db_orders,
+    }
+
+
+def report(results: list[dict], baseline: list[dict] | None) -> None:
+    previous = {(entry["engine"], entry["scenario"]): entry for entry in baseline or []}
+
+    print(
+        f"{'engine':>10} {'scenario':>13} {'commands/s':>12} {'trades/s':>12} "
+        f"{'p50 µs':>9} {'p99 µs':>9} {'p99.9 µs':>9}"
+    )
+    for entry in results:
+        latency = entry["latency_us"]
+        line = (
+            f"{entry['engine']:>10} {entry['scenario']:>13} "
+            f"{entry['commands_per_second']:>12,.0f} "
+            f"{entry['trades_per_second']:>12,.0f} "
+            f"{latency['p50']:>9,.1f} {latency['p99']:>9,.1f} "
+            f"{latency['p999']:>9,.1f}"
+        )
+        before = previous.get((entry["engine"], entry["scenario"]))
+        if before is not None:
+            change = entry["commands_per_second"] / before["commands_per_second"] - 1
+            line += f"  ({change:+.1%} commands/s vs baseline)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--db-orders", type=int, default=300)
+    parser.add_argument(
+        "--engines", nargs="+", choices=["in_memory", "db"], default=["in_memory"]
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    args = parser.parse_args()
+
+    # Keep the engines' logging out of the measurements
+    logger.remove()
+
+    results = []
+    for engine in args.engines:
+        for scenario in args.scenarios:
+            size = args.orders if engine == "in_memory" else args.db_orders
+            commands = SCENARIOS[scenario](size, random.Random(args.seed))
+            if engine == "in_memory":
+                results.append(run_in_memory(scenario, commands))
+            else:
+                results.append(asyncio.run(run_db(scenario, commands)))
+
+    baseline = (
+        json.loads(args.baseline.read_text())["results"]
+        if args.baseline is not None
+        else None
+    )
+    report(results, baseline)
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps({"metadata": metadata(args), "results": results}, indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cost of expiring day orders at the end of the session in the in-memory engine.
+
+`--orders` day orders are rested (bids and asks that do not cross), then
+removed from their book: in one expiry sweep at the session close, and, for
+comparison, by cancelling them one by one.
+
+Usage:
+    python -m benchmarks.expiry [--orders 100000] [--seed 42]
+"""
+
+import argparse
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType, TimeInForce
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+PLACED_AT = datetime(2025, 3, 3, 9, tzinfo=UTC)
+SESSION_CLOSE = datetime(2025, 3, 4, tzinfo=UTC)
+
+
+def make_orders(size: int, seed: int) -> list[Order]:
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(size):
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        # Bids below 100.00, asks from 100.00 on: nothing matches
+        ticks = (
+            rng.randint(9_500, 9_999)
+            if side == OrderSide.BUY
+            else rng.randint(10_000, 10_500)
+        )
+        orders.append(
+            Order(
+                id=UUID(int=rng.getrandbits(128)),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=UUID(int=rng.getrandbits(128)),
+                side=side,
+                type=OrderType.LIMIT,
+                time_in_force=TimeInForce.DAY,
+                price=Decimal(ticks).scaleb(-2),
+                quantity=Decimal(rng.randint(1, 2_000)).scaleb(-2),
+                placed_at=PLACED_AT,
+            )
+        )
+    return orders
+
+
+def rest(orders: list[Order]) -> MatchingEngine:
+    engine = MatchingEngine()
+    engine.start(contracts=[CONTRACT])
+    for order in orders:
+        engine.add_order(order)
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    # The models of the orders are not kept (as by an API caller): both ways
+    # build the models of the orders they remove
+    order_ids = [order.id for order in make_orders(args.orders, args.seed)]
+
+    engine = rest(make_orders(args.orders, args.seed))
+    start = perf_counter()
+    expired = engine.expire_orders(SESSION_CLOSE)
+    sweep = perf_counter() - start
+    assert len(expired) == args.orders
+    assert engine.get_orders(ContractCode.UK_BL_MAR_25) == []
+
+    engine = rest(make_orders(args.orders, args.seed))
+    start = perf_counter()
+    for order_id in order_ids:
+        engine.cancel_order(ContractCode.UK_BL_MAR_25, order_id)
+    cancels = perf_counter() - start
+
+    for label, elapsed in (("expiry sweep", sweep), ("cancels", cancels)):
+        print(
+            f"{label:>12}: {args.orders:,} orders in {elapsed * 1e3:>8,.1f} ms "
+            f"({elapsed / args.orders * 1e6:.2f} us per order)"
+        )
+
+
+if __name__ == "__main__":
+    main()
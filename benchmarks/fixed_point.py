@@ -0,0 +1,91 @@
+"""
+Matching throughput of the in-memory engine on Decimals versus integer ticks.
+
+The same seeded flow of crossing limit orders is replayed on an engine whose
+book matches on Decimals and on one whose book matches on integer ticks and
+lots (the contract's tick size is given).
+
+Usage:
+    python -m benchmarks.fixed_point [--orders 50000] [--seed 42]
+"""
+
+import argparse
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import Commodity, DeliveryPeriod, OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.contract.model import Contract
+from ctenex.domain.order_book.order.model import Order
+
+CONTRACT = Contract(
+    external_id=ContractCode.UK_BL_MAR_25,
+    commodity=Commodity.POWER,
+    delivery_period=DeliveryPeriod.MONTHLY,
+    start_date=datetime(2025, 3, 1),
+    end_date=datetime(2025, 3, 31),
+    location="GB",
+    tick_size=Decimal("0.01"),
+    contract_size=Decimal("1.0"),
+)
+
+
+def make_flow(size: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": UUID(int=rng.getrandbits(128)),
+            "contract_id": ContractCode.UK_BL_MAR_25,
+            "trader_id": UUID(int=rng.getrandbits(128)),
+            "side": rng.choice([OrderSide.BUY, OrderSide.SELL]),
+            "type": OrderType.LIMIT,
+            "price": Decimal(rng.randint(9_950, 10_050)).scaleb(-2),
+            "quantity": Decimal(rng.randint(1, 2_000)).scaleb(-2),
+            "placed_at": datetime(2025, 3, 1, tzinfo=UTC),
+        }
+        for _ in range(size)
+    ]
+
+
+def run(engine: MatchingEngine, flow: list[dict]) -> float:
+    orders = [Order(**payload) for payload in flow]
+
+    start = perf_counter()
+    for order in orders:
+        engine.add_order(order)
+    return perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    flow = make_flow(args.orders, args.seed)
+
+    decimal_engine = MatchingEngine()
+    decimal_engine.start()
+    tick_engine = MatchingEngine()
+    tick_engine.start(contracts=[CONTRACT])
+
+    for name, engine in (("decimal", decimal_engine), ("ticks", tick_engine)):
+        elapsed = run(engine, flow)
+        trades = len(engine.get_trades(ContractCode.UK_BL_MAR_25))
+        print(
+            f"{name:>8}: {args.orders / elapsed:>10,.0f} orders/s "
+            f"({trades:,} trades in {elapsed:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
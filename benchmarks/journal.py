@@ -0,0 +1,129 @@
+"""
+Journaling and replay throughput of the in-memory engine's journal.
+
+Appends `--events` orders to a fresh journal, group-committed every
+`--commit-size` orders, and compares with an fsync per order on a sample. It
+then reads the journal back: scanning its records (framing and checksums
+only), decoding them into orders, and replaying `--replay-events` of them
+into an engine. The same orders are then matched by an engine directly, and
+the time to decode and to replay 10M events is projected: replay re-runs the
+matching, which its cost is bound by, and snapshots bound the events left to
+replay (see `benchmarks.snapshot`).
+
+Usage:
+    python -m benchmarks.journal [--events 1000000] [--commit-size 1000]
+                                 [--replay-events 100000] [--dir /tmp]
+"""
+
+import argparse
+import mmap
+import tempfile
+from itertools import cycle, islice
+from pathlib import Path
+from time import perf_counter
+
+from loguru import logger
+
+from benchmarks.fixed_point import make_flow
+from ctenex.domain.in_memory.journal.codec import frames
+from ctenex.domain.in_memory.journal.model import Journal
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+
+def append(path: Path, orders: list[Order], events: int, commit_size: int) -> float:
+    journal = Journal(path, commit_size=commit_size, commit_interval=float("inf"))
+
+    start = perf_counter()
+    for order in islice(cycle(orders), events):
+        journal.append_add(order)
+    journal.commit()
+    elapsed = perf_counter() - start
+
+    journal.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--commit-size", type=int, default=1_000)
+    parser.add_argument("--replay-events", type=int, default=100_000)
+    parser.add_argument("--dir", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's logging out of the measurements
+    logger.remove()
+
+    orders = [Order(**payload) for payload in make_flow(10_000, args.seed)]
+    replay_orders = [
+        Order(**payload) for payload in make_flow(args.replay_events, args.seed + 1)
+    ]
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        path = Path(directory) / "journal"
+
+        sample = min(args.events, 2_000)
+        elapsed = append(path, orders, sample, commit_size=1)
+        print(f"{'append, fsync per order':>28}: {sample / elapsed:>12,.0f} events/s")
+        path.unlink()
+
+        elapsed = append(path, orders, args.events, args.commit_size)
+        size = path.stat().st_size
+        print(
+            f"{f'append, commit per {args.commit_size}':>28}: "
+            f"{args.events / elapsed:>12,.0f} events/s "
+            f"({size / 2**20:,.0f}MB, {size / args.events:.0f} bytes/event)"
+        )
+
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = perf_counter()
+                count = sum(1 for _ in frames(data, 6, size))
+                elapsed = perf_counter() - start
+        print(f"{'scan':>28}: {count / elapsed:>12,.0f} events/s ({elapsed:.2f}s)")
+
+        journal = Journal(path)
+        start = perf_counter()
+        count = sum(1 for _ in journal.read())
+        elapsed = perf_counter() - start
+        journal.close()
+        decode_rate = count / elapsed
+        print(f"{'decode':>28}: {decode_rate:>12,.0f} events/s ({elapsed:.2f}s)")
+        path.unlink()
+
+        journal = Journal(path, commit_interval=float("inf"))
+        for order in replay_orders:
+            journal.append_add(order)
+        journal.commit()
+        engine = MatchingEngine(journal=journal)
+        engine.start()
+        start = perf_counter()
+        count = engine.replay()
+        elapsed = perf_counter() - start
+        journal.close()
+        replay_rate = count / elapsed
+        print(
+            f"{'replay into the engine':>28}: "
+            f"{replay_rate:>12,.0f} events/s ({elapsed:.2f}s)"
+        )
+
+        engine = MatchingEngine()
+        engine.start()
+        start = perf_counter()
+        engine.add_orders(replay_orders)
+        elapsed = perf_counter() - start
+        print(
+            f"{'matching alone':>28}: "
+            f"{len(replay_orders) / elapsed:>12,.0f} events/s ({elapsed:.2f}s)"
+        )
+
+        print(
+            f"{'10M events':>28}: decode {10_000_000 / decode_rate:,.0f}s, "
+            f"replay {10_000_000 / replay_rate:,.0f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
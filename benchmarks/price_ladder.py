@@ -0,0 +1,88 @@
+"""
+Matching throughput of the `SortedDict` order book versus the price ladder.
+
+The same seeded flow of limit orders is replayed on engines whose book is an
+`OrderBook` or a `LadderOrderBook`, matching on Decimals and on integer ticks.
+The `--spread` option sets how many ticks around 100.00 the prices are drawn
+from: a wide spread builds a deep book with many levels, a narrow one keeps
+the orders crossing. Each configuration is replayed `--repeat` times on a
+fresh engine and the best run is reported.
+
+Usage:
+    python -m benchmarks.price_ladder [--orders 50000] [--spread 50] [--seed 42]
+                                      [--repeat 3]
+"""
+
+import argparse
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT, run
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.order_book.ladder import LadderOrderBook
+from ctenex.domain.in_memory.order_book.model import OrderBook
+
+
+def make_flow(size: int, spread: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": UUID(int=rng.getrandbits(128)),
+            "contract_id": ContractCode.UK_BL_MAR_25,
+            "trader_id": UUID(int=rng.getrandbits(128)),
+            "side": rng.choice([OrderSide.BUY, OrderSide.SELL]),
+            "type": OrderType.LIMIT,
+            "price": Decimal(10_000 + rng.randint(-spread, spread)).scaleb(-2),
+            "quantity": Decimal(rng.randint(1, 2_000)).scaleb(-2),
+            "placed_at": datetime(2025, 3, 1, tzinfo=UTC),
+        }
+        for _ in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--spread", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    flow = make_flow(args.orders, args.spread, args.seed)
+
+    print(f"{'book':>8} {'units':>8} {'orders/s':>12} {'trades':>10} {'levels':>8}")
+    for name, order_book_type in (("sorted", OrderBook), ("ladder", LadderOrderBook)):
+        for units, contracts in (("decimal", []), ("ticks", [CONTRACT])):
+            elapsed = setup = float("inf")
+            for _ in range(args.repeat):
+                engine = MatchingEngine()
+                start = perf_counter()
+                engine.start(
+                    contracts=contracts,
+                    order_book_types={ContractCode.UK_BL_MAR_25: order_book_type},
+                )
+                setup = min(setup, perf_counter() - start)
+                elapsed = min(elapsed, run(engine, flow))
+
+            order_book = engine.order_books[ContractCode.UK_BL_MAR_25]
+            depth = order_book.depth(levels=len(order_book.orders_by_id) or 1)
+            print(
+                f"{name:>8} {units:>8} {args.orders / elapsed:>12,.0f} "
+                f"{len(engine.trade_logs[ContractCode.UK_BL_MAR_25]):>10,} "
+                f"{len(depth.bids) + len(depth.asks):>8,}"
+                f"  (book created in {setup * 1_000:.1f}ms)"
+            )
+
+
+if __name__ == "__main__":
+    main()
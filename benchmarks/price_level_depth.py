@@ -0,0 +1,109 @@
+"""
+Cancel and fill cost of the in-memory order book as the depth of a single
+price level grows.
+
+Every operation is timed on a level holding exactly `depth` resting orders:
+after each cancel or fill a fresh order is queued (untimed) to restore the
+depth. With O(1) price-level queues the cost per operation stays flat.
+
+Usage:
+    python -m benchmarks.price_level_depth [--ops 2000] [--seed 42]
+"""
+
+import argparse
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from time import perf_counter_ns
+from uuid import uuid4
+
+from loguru import logger
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+DEPTHS = (10, 100, 1_000, 10_000, 100_000)
+PRICE = Decimal("100.00")
+CONTRACT = ContractCode.UK_BL_MAR_25
+
+
+def make_order(side: OrderSide, type: OrderType = OrderType.LIMIT) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=CONTRACT,
+        trader_id=uuid4(),
+        side=side,
+        type=type,
+        price=PRICE if type == OrderType.LIMIT else None,
+        quantity=Decimal("1.00"),
+        placed_at=datetime.now(UTC),
+    )
+
+
+def build_level(depth: int) -> tuple[MatchingEngine, list]:
+    engine = MatchingEngine()
+    engine.start()
+    ids = [engine.add_order(make_order(OrderSide.SELL)) for _ in range(depth)]
+    return engine, ids
+
+
+def bench_cancel(depth: int, ops: int, rng: random.Random) -> float:
+    engine, ids = build_level(depth)
+    order_book = engine.order_books[CONTRACT]
+    refills = [make_order(OrderSide.SELL) for _ in range(ops)]
+
+    elapsed = 0
+    for refill in refills:
+        # Cancel a random order anywhere in the queue
+        index = rng.randrange(len(ids))
+        ids[index], ids[-1] = ids[-1], ids[index]
+        order_id = ids.pop()
+
+        start = perf_counter_ns()
+        order_book.cancel_order(order_id)
+        elapsed += perf_counter_ns() - start
+
+        ids.append(engine.add_order(refill))
+
+    return elapsed / ops
+
+
+def bench_fill(depth: int, ops: int) -> float:
+    engine, _ = build_level(depth)
+    aggressors = [make_order(OrderSide.BUY, OrderType.MARKET) for _ in range(ops)]
+    refills = [make_order(OrderSide.SELL) for _ in range(ops)]
+
+    elapsed = 0
+    for aggressor, refill in zip(aggressors, refills):
+        # Fully fill the order at the head of the queue
+        start = perf_counter_ns()
+        engine.add_order(aggressor)
+        elapsed += perf_counter_ns() - start
+
+        engine.add_order(refill)
+
+    return elapsed / ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    rng = random.Random(args.seed)
+
+    print(f"{'depth':>8} {'cancel (us/op)':>16} {'fill (us/op)':>14}")
+    for depth in DEPTHS:
+        cancel = bench_cancel(depth, args.ops, rng)
+        fill = bench_fill(depth, args.ops)
+        print(f"{depth:>8} {cancel / 1_000:>16.2f} {fill / 1_000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
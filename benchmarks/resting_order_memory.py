@@ -0,0 +1,97 @@
+"""
+Bytes per resting order in the in-memory order book.
+
+Compares the pydantic `Order` models the book used to hold with the compact
+`OrderRecord`s it holds now, in both Decimal and tick mode. Memory is measured
+with `tracemalloc`, after the submitted models have been released.
+
+Usage:
+    python -m benchmarks.resting_order_memory [--orders 200000] [--seed 42]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Callable
+from uuid import UUID
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.order_book.order.model import Order
+
+
+def make_orders(size: int, seed: int) -> list[Order]:
+    # Bids below 100.00 and asks above it, so that nothing would cross
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(size):
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        offset = rng.randint(1, 5_000)
+        ticks = 10_000 - offset if side == OrderSide.BUY else 10_000 + offset
+        orders.append(
+            Order(
+                id=UUID(int=rng.getrandbits(128)),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=UUID(int=rng.getrandbits(128)),
+                side=side,
+                type=OrderType.LIMIT,
+                price=Decimal(ticks).scaleb(-2),
+                quantity=Decimal(rng.randint(1, 2_000)).scaleb(-2),
+                placed_at=datetime.now(UTC),
+            )
+        )
+    return orders
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Return the bytes still allocated by what `build` returns."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    kept = build()
+
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del kept
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    def pydantic_models():
+        # What the book used to keep: the models, by ID and in price queues
+        orders = make_orders(args.orders, args.seed)
+        return {order.id: order for order in orders}, orders
+
+    def records(tick_size: Decimal | None):
+        def build():
+            order_book = OrderBook(ContractCode.UK_BL_MAR_25, tick_size=tick_size)
+            for order in make_orders(args.orders, args.seed):
+                order_book.add_order(order)
+            return order_book
+
+        return build
+
+    print(f"{'representation':>24} {'bytes/order':>12}")
+    for name, build in (
+        ("pydantic Order (before)", pydantic_models),
+        ("OrderRecord, Decimal", records(None)),
+        ("OrderRecord, ticks", records(Decimal("0.01"))),
+    ):
+        size = measure(build)
+        print(f"{name:>24} {size / args.orders:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
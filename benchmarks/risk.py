@@ -0,0 +1,111 @@
+"""
+Cost of the pre-trade risk checks of the in-memory engine.
+
+The same seeded flow of `--orders` crossing limit orders, spread over
+`--traders` traders, is added one by one to an engine without risk limits and
+to one with all of them set (wide enough for no order to be rejected, so both
+match the same orders): the difference is the cost of checking each order and
+of keeping the exposures up to date on every fill and cancellation. Runs
+alternate between the two engines, `--rounds` times each, and the fastest run
+of each is kept, to take the noise of the machine out of the comparison (as
+are timing CPU rather than wall-clock time, and running each in a fresh
+process, so that no run inherits the heap left by the one before).
+
+Usage:
+    python -m benchmarks.risk [--orders 50000] [--traders 100] [--rounds 5]
+                              [--seed 42]
+"""
+
+import argparse
+import gc
+import multiprocessing
+from decimal import Decimal
+from time import process_time
+from uuid import UUID
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT, make_flow
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.risk import RiskLimits
+from ctenex.domain.order_book.order.model import Order
+
+LIMITS = RiskLimits(
+    max_order_quantity=Decimal("1000"),
+    max_open_notional=Decimal("1000000000"),
+    max_position=Decimal("1000000000"),
+)
+
+
+def make_orders(size: int, traders: int, seed: int) -> list[Order]:
+    return [
+        Order(**{**payload, "trader_id": UUID(int=index % traders)})
+        for index, payload in enumerate(make_flow(size, seed))
+    ]
+
+
+def run(
+    size: int, traders: int, seed: int, limits: RiskLimits | None
+) -> tuple[float, int, float]:
+    """Add the flow's orders and return the time taken, trades and p50 (us)."""
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    engine = MatchingEngine(risk_limits=limits)
+    engine.start(contracts=[CONTRACT])
+    orders = make_orders(size, traders, seed)
+
+    # As `timeit` does, keep collections (and their timing) out of the runs
+    gc.collect()
+    gc.disable()
+    try:
+        start = process_time()
+        for order in orders:
+            engine.add_order(order)
+        elapsed = process_time() - start
+    finally:
+        gc.enable()
+
+    (contract,) = [
+        contract
+        for contract in engine.get_latency().contracts
+        if contract.contract_id == ContractCode.UK_BL_MAR_25
+    ]
+    return (
+        elapsed,
+        engine.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence,
+        contract.stages["total"].p50,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--traders", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    best: dict[str, tuple[float, int, float]] = {}
+    for _ in range(args.rounds):
+        for label, limits in (("no limits", None), ("risk limits", LIMITS)):
+            with context.Pool(1) as pool:
+                result = pool.apply(run, (args.orders, args.traders, args.seed, limits))
+            if label not in best or result[0] < best[label][0]:
+                best[label] = result
+
+    for label, (elapsed, trades, p50) in best.items():
+        print(
+            f"{label:>12}: {args.orders / elapsed:>10,.0f} orders/s "
+            f"{elapsed / args.orders * 1e6:>6.2f} us/order "
+            f"p50 {p50:>6.2f} us ({trades:,} trades)"
+        )
+
+    overhead = best["risk limits"][0] / best["no limits"][0] - 1
+    print(f"{'overhead':>12}: {overhead:>+10.1%} per order")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Throughput of the stateful app's engine calls with and without the sequencer.
+
+Concurrent async clients each submit their share of a seeded flow of limit
+orders, awaiting every order in turn as a route handler would. Without the
+sequencer the calls run on a worker thread pool, as FastAPI runs plain `def`
+handlers, so the threads share the engine concurrently. With the sequencer
+every call is queued to its single matching thread.
+
+Usage:
+    python -m benchmarks.sequencer [--orders 20000] [--clients 1 8 64] [--seed 42]
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+from typing import Awaitable, Callable
+from uuid import UUID
+
+import anyio.to_thread
+from loguru import logger
+
+from benchmarks.fixed_point import make_flow
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.sequencer import Sequencer
+from ctenex.domain.order_book.order.model import Order
+
+Submit = Callable[[MatchingEngine, Order], Awaitable[UUID]]
+
+
+async def run(submit: Submit, flow: list[dict], clients: int) -> float:
+    engine = MatchingEngine()
+    engine.start()
+    orders = [Order(**payload) for payload in flow]
+
+    async def client(index: int):
+        for order in orders[index::clients]:
+            await submit(engine, order)
+
+    start = perf_counter()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    return perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    flow = make_flow(args.orders, args.seed)
+
+    sequencer = Sequencer()
+    sequencer.start()
+
+    async def thread_pool(engine: MatchingEngine, order: Order) -> UUID:
+        return await anyio.to_thread.run_sync(engine.add_order, order)
+
+    async def sequenced(engine: MatchingEngine, order: Order) -> UUID:
+        return await sequencer.execute(engine.add_order, order)
+
+    print(f"{'clients':>8} {'thread pool':>14} {'sequencer':>14}  (orders/s)")
+    for clients in args.clients:
+        thread_pool_elapsed = await run(thread_pool, flow, clients)
+        sequenced_elapsed = await run(sequenced, flow, clients)
+        print(
+            f"{clients:>8} {args.orders / thread_pool_elapsed:>14,.0f} "
+            f"{args.orders / sequenced_elapsed:>14,.0f}"
+        )
+
+    sequencer.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Throughput of the sharded app's engine calls through the sequencer and the
+dispatcher.
+
+Concurrent async clients each submit their share of the flow of
+`benchmarks.sharding`, awaiting every order in turn as a route handler of the
+sharded app would: through a `Sequencer`, whose single matching thread waits
+on the pipe round trip of every call, then through the `Dispatcher` the app
+now uses, which keeps calls in flight to every shard at once.
+
+Usage:
+    python -m benchmarks.sharded_dispatch [--orders 2000] [--clients 1 8 64]
+                                          [--shards 1 2 4] [--seed 42]
+"""
+
+import argparse
+import asyncio
+import os
+from time import perf_counter
+
+from loguru import logger
+
+from benchmarks.sharding import CODES, CONTRACTS, make_orders
+from ctenex.domain.in_memory.matching_engine.sequencer import Dispatcher, Sequencer
+from ctenex.domain.in_memory.matching_engine.sharding import ShardedMatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+
+async def run(
+    sequencer: Sequencer | Dispatcher,
+    shards: int,
+    orders: list[Order],
+    clients: int,
+) -> float:
+    engine = ShardedMatchingEngine(shards, log_level=None)
+    engine.start(contract_codes=CODES, contracts=CONTRACTS)
+    sequencer.start()
+
+    async def client(index: int):
+        for order in orders[index::clients]:
+            await sequencer.execute(engine.add_orders, [order])
+
+    try:
+        start = perf_counter()
+        await asyncio.gather(*(client(index) for index in range(clients)))
+        return perf_counter() - start
+    finally:
+        sequencer.stop()
+        engine.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=2_000, help="Per contract")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's logging out of the measurements
+    logger.remove()
+
+    count = args.orders * len(CONTRACTS)
+    print(f"{len(CONTRACTS)} contracts, {os.cpu_count()} cores")
+    print(
+        f"{'shards':>7} {'clients':>8} {'sequencer':>12} {'dispatcher':>12}  (orders/s)"
+    )
+    for shards in args.shards:
+        for clients in args.clients:
+            sequenced = await run(
+                Sequencer(), shards, make_orders(args.orders, args.seed), clients
+            )
+            dispatched = await run(
+                Dispatcher(), shards, make_orders(args.orders, args.seed), clients
+            )
+            print(
+                f"{shards:>7} {clients:>8} {count / sequenced:>12,.0f} "
+                f"{count / dispatched:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Aggregate matching throughput of the in-memory engine spread over shards.
+
+The same seeded flow of crossing limit orders is generated for every contract
+and submitted, interleaved across contracts, in batches of `--batch-size`
+orders: to an engine matching in-process, then to sharded engines with 1, 2,
+4 and 8 worker processes (each batch is split per shard and matched by all
+the shards at once). Scaling is bounded by the number of cores available.
+
+Usage:
+    python -m benchmarks.sharding [--orders 20000] [--batch-size 1000]
+                                  [--shards 1 2 4 8] [--seed 42]
+"""
+
+import argparse
+import os
+from itertools import chain
+from time import perf_counter
+from uuid import uuid4
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT, make_flow
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.sharding import ShardedMatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+# Contracts of the benchmark's own, for every shard to have some to match
+CODES = [f"UK-BL-{index:02d}-25" for index in range(10)]
+CONTRACTS = [CONTRACT.model_copy(update={"external_id": code}) for code in CODES]
+
+
+def make_orders(orders: int, seed: int) -> list[Order]:
+    """`orders` orders per contract, interleaved across contracts."""
+    # Order IDs are unique across contracts
+    flows = [
+        [
+            Order(**{**payload, "contract_id": code, "id": uuid4()})
+            for payload in make_flow(orders, seed)
+        ]
+        for code in CODES
+    ]
+    return list(chain.from_iterable(zip(*flows)))
+
+
+def run(
+    engine: MatchingEngine | ShardedMatchingEngine,
+    orders: list[Order],
+    batch_size: int,
+) -> tuple[float, int]:
+    trades = 0
+    start = perf_counter()
+    for offset in range(0, len(orders), batch_size):
+        results = engine.add_orders(orders[offset : offset + batch_size])
+        trades += sum(len(result.trades) for result in results)
+    return perf_counter() - start, trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20_000, help="Per contract")
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's logging out of the measurements
+    logger.remove()
+
+    print(f"{len(CONTRACTS)} contracts, {os.cpu_count()} cores")
+
+    engine = MatchingEngine()
+    engine.start(contract_codes=CODES, contracts=CONTRACTS)
+    elapsed, trades = run(engine, make_orders(args.orders, args.seed), args.batch_size)
+    count = args.orders * len(CONTRACTS)
+    print(
+        f"{'in-process':>12}: {count / elapsed:>10,.0f} orders/s "
+        f"{trades / elapsed:>10,.0f} trades/s"
+    )
+
+    for shards in args.shards:
+        engine = ShardedMatchingEngine(shards, log_level=None)
+        engine.start(contract_codes=CODES, contracts=CONTRACTS)
+        try:
+            elapsed, trades = run(
+                engine, make_orders(args.orders, args.seed), args.batch_size
+            )
+        finally:
+            engine.stop()
+        print(
+            f"{f'{shards} shards':>12}: {count / elapsed:>10,.0f} orders/s "
+            f"{trades / elapsed:>10,.0f} trades/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
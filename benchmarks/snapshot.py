@@ -0,0 +1,136 @@
+"""
+Snapshot and restore times of the in-memory engine's books.
+
+Rests `--orders` non-crossing orders (bids below, asks above the mid, from
+`--traders` traders) in a book matching on ticks, then times taking a
+snapshot: copying the state of the books (the pause of the matching thread),
+then encoding the copy and writing it out (off that thread). Then times
+restoring a fresh engine from it, compared with replaying a journal of the
+same orders (extrapolated from `--replay-orders` of them).
+
+Usage:
+    python -m benchmarks.snapshot [--orders 1000000] [--traders 1000]
+                                  [--replay-orders 50000] [--dir /tmp]
+"""
+
+import argparse
+import random
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OpenOrderStatus, OrderSide, OrderType
+from ctenex.domain.in_memory.journal.model import Journal
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.snapshot.codec import encode as encode_snapshot
+from ctenex.domain.in_memory.snapshot.model import SnapshotStore
+from ctenex.domain.order_book.order.model import Order
+
+
+def make_records(size: int, traders: int, seed: int) -> list[OrderRecord]:
+    rng = random.Random(seed)
+    trader_ids = [UUID(int=rng.getrandbits(128)) for _ in range(traders)]
+    placed_at = datetime(2025, 3, 1, tzinfo=UTC)
+
+    records = []
+    for _ in range(size):
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        quantity = rng.randint(1, 2_000)
+        records.append(
+            OrderRecord(
+                id=UUID(int=rng.getrandbits(128)),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=rng.choice(trader_ids),
+                side=side,
+                type=OrderType.LIMIT,
+                price=(
+                    rng.randint(9_500, 9_999)
+                    if side == OrderSide.BUY
+                    else rng.randint(10_000, 10_500)
+                ),
+                quantity=quantity,
+                remaining=quantity,
+                status=OpenOrderStatus.OPEN,
+                placed_at=placed_at,
+            )
+        )
+
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--traders", type=int, default=1_000)
+    parser.add_argument("--replay-orders", type=int, default=50_000)
+    parser.add_argument("--dir", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's logging out of the measurements
+    logger.remove()
+
+    records = make_records(args.orders, args.traders, args.seed)
+    engine = MatchingEngine()
+    engine.start(contracts=[CONTRACT])
+    engine.order_books[ContractCode.UK_BL_MAR_25].load(records)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        store = SnapshotStore(Path(directory) / "snapshots")
+
+        start = perf_counter()
+        position, books = engine.copy_state()
+        copied = perf_counter() - start
+
+        start = perf_counter()
+        data = encode_snapshot(position, books)
+        encoded = perf_counter() - start
+
+        start = perf_counter()
+        store.write(data)
+        written = perf_counter() - start
+
+        restored = MatchingEngine()
+        restored.start(contracts=[CONTRACT])
+        start = perf_counter()
+        restored.restore(store)
+        restored_in = perf_counter() - start
+        assert len(restored.order_books[ContractCode.UK_BL_MAR_25].orders_by_id) == (
+            args.orders
+        )
+
+        scale = engine.order_books[ContractCode.UK_BL_MAR_25].scale
+        journal = Journal(Path(directory) / "journal", commit_interval=float("inf"))
+        for record in records[: args.replay_orders]:
+            journal.append_add(Order(**record.to_order(scale).model_dump()))
+        journal.commit()
+        replayed = MatchingEngine(journal=journal)
+        replayed.start(contracts=[CONTRACT])
+        start = perf_counter()
+        count = replayed.replay()
+        replay_rate = count / (perf_counter() - start)
+        journal.close()
+
+    print(f"{args.orders:,} resting orders, {len(data) / 2**20:,.0f}MB snapshot")
+    print(f"{'copy (matching paused)':>28}: {copied:>8.2f}s")
+    print(f"{'encode':>28}: {encoded:>8.2f}s")
+    print(f"{'write':>28}: {written:>8.2f}s")
+    print(
+        f"{'restore':>28}: {restored_in:>8.2f}s "
+        f"({args.orders / restored_in:,.0f} orders/s)"
+    )
+    print(
+        f"{'journal replay (estimated)':>28}: {args.orders / replay_rate:>8.2f}s "
+        f"({replay_rate:,.0f} orders/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
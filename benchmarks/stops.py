@@ -0,0 +1,136 @@
+"""
+Cost of stop orders waiting for their trigger in the in-memory engine.
+
+First, the same seeded flow of crossing limit orders is matched with no stop
+orders and with `--stops` stop orders waiting outside of the range the flow
+trades in: every trade looks for the stops it triggers, and this must not
+grow with their number. Then a ladder of `--cascade` one-lot asks, each with
+a buy stop at its price, is swept by a single order: each stop triggered
+buys the next ask, which triggers the next stop, and so on.
+
+Usage:
+    python -m benchmarks.stops [--orders 50000] [--stops 100000]
+                               [--cascade 10000] [--seed 42]
+"""
+
+import argparse
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+
+from benchmarks.fixed_point import CONTRACT, make_flow
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.order.model import Order
+
+# Outside of the 99.50-100.50 range of the flow's prices
+BUY_STOPS = (10_100, 11_000)
+SELL_STOPS = (9_000, 9_900)
+
+
+def make_stops(size: int, seed: int) -> list[Order]:
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(size):
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        low, high = BUY_STOPS if side == OrderSide.BUY else SELL_STOPS
+        orders.append(
+            Order(
+                id=UUID(int=rng.getrandbits(128)),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=UUID(int=rng.getrandbits(128)),
+                side=side,
+                type=OrderType.STOP,
+                stop_price=Decimal(rng.randint(low, high)).scaleb(-2),
+                quantity=Decimal(rng.randint(1, 2_000)).scaleb(-2),
+                placed_at=datetime(2025, 3, 1, tzinfo=UTC),
+            )
+        )
+    return orders
+
+
+def make_order(side: OrderSide, ticks: int, type: OrderType = OrderType.LIMIT) -> Order:
+    """A one-lot limit order, or stop order, at `ticks`."""
+    price = Decimal(ticks).scaleb(-2)
+    return Order(
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=UUID(int=0),
+        side=side,
+        type=type,
+        price=price if type == OrderType.LIMIT else None,
+        stop_price=price if type == OrderType.STOP else None,
+        quantity=Decimal("0.01"),
+        placed_at=datetime(2025, 3, 1, tzinfo=UTC),
+    )
+
+
+def run_flow(stops: list[Order], flow: list[dict]) -> tuple[float, int]:
+    engine = MatchingEngine()
+    engine.start(contracts=[CONTRACT])
+    for stop in stops:
+        engine.add_order(stop)
+    orders = [Order(**payload) for payload in flow]
+
+    start = perf_counter()
+    for order in orders:
+        engine.add_order(order)
+    elapsed = perf_counter() - start
+
+    assert len(engine.get_stop_orders(ContractCode.UK_BL_MAR_25)) == len(stops)
+    return elapsed, engine.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence
+
+
+def run_cascade(size: int) -> tuple[float, int]:
+    engine = MatchingEngine()
+    engine.start(contracts=[CONTRACT])
+    first = 10_051
+    for ticks in range(first, first + size):
+        engine.add_order(make_order(OrderSide.SELL, ticks))
+        engine.add_order(make_order(OrderSide.BUY, ticks, OrderType.STOP))
+    # For the last stop triggered to buy
+    engine.add_order(make_order(OrderSide.SELL, first + size))
+
+    start = perf_counter()
+    engine.add_order(make_order(OrderSide.BUY, first))
+    elapsed = perf_counter() - start
+
+    assert engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+    return elapsed, engine.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--stops", type=int, default=100_000)
+    parser.add_argument("--cascade", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the engine's debug logging out of the measurements
+    logger.remove()
+
+    flow = make_flow(args.orders, args.seed)
+    for label, stops in (
+        ("no stops", []),
+        (f"{args.stops:,} stops", make_stops(args.stops, args.seed)),
+    ):
+        elapsed, trades = run_flow(stops, flow)
+        print(
+            f"{label:>14}: {args.orders / elapsed:>10,.0f} orders/s "
+            f"{trades / elapsed:>10,.0f} trades/s"
+        )
+
+    elapsed, trades = run_cascade(args.cascade)
+    print(
+        f"{'cascade':>14}: {args.cascade:,} stops triggered in {elapsed * 1e3:,.1f} ms "
+        f"({elapsed / args.cascade * 1e6:,.1f} us per stop, {trades:,} trades)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Memory of the in-memory engine's trade log over a long soak.
+
+Appends `--trades` trade records to a `TradeLog` retaining `--retain` of them,
+in batches as the engine does, and samples the resident memory of the process
+and the cost of reading the trades since a recent sequence number as it goes.
+With bounded retention both stay flat however many trades went through.
+
+Usage:
+    python -m benchmarks.trade_log_soak [--trades 10000000] [--retain 100000]
+                                        [--batch 100] [--samples 10]
+"""
+
+import argparse
+import resource
+import sys
+from time import perf_counter, perf_counter_ns
+from uuid import uuid4
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.in_memory.matching_engine.record import TradeRecord
+from ctenex.domain.in_memory.matching_engine.trade_log import TradeLog
+
+
+def resident_memory_mb() -> float:
+    """Return the current resident memory (Linux), else the peak one."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trades", type=int, default=10_000_000)
+    parser.add_argument("--retain", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=10)
+    args = parser.parse_args()
+
+    trade_log = TradeLog(max_trades=args.retain)
+    buy_order_id, sell_order_id = uuid4(), uuid4()
+    sample_every = max(args.trades // args.samples // args.batch, 1) * args.batch
+
+    print(
+        f"{'trades':>12} {'retained':>10} {'RSS (MB)':>10} "
+        f"{'since(-100) µs':>15} {'trades/s':>12}"
+    )
+    start = perf_counter()
+    appended = 0
+    while appended < args.trades:
+        trade_log.append(
+            TradeRecord(
+                contract_id=ContractCode.UK_BL_MAR_25,
+                buy_order_id=buy_order_id,
+                sell_order_id=sell_order_id,
+                price=10_000,
+                quantity=100,
+            )
+            for _ in range(args.batch)
+        )
+        appended += args.batch
+
+        if appended % sample_every == 0:
+            elapsed = perf_counter() - start
+            read_start = perf_counter_ns()
+            trade_log.since(trade_log.last_sequence - 100)
+            read = (perf_counter_ns() - read_start) / 1_000
+            print(
+                f"{appended:>12,} {len(trade_log):>10,} "
+                f"{resident_memory_mb():>10,.1f} {read:>15,.1f} "
+                f"{appended / elapsed:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+
+from ctenex.core.db.async_session import db_connection
+from ctenex.core.db.pool import PoolGetResponse
+from ctenex.domain.latency.schemas import LatencyGetResponse
+from ctenex.domain.matching_engine.model import matching_engine
 
 router = APIRouter(tags=["status"])
 
@@ -7,3 +12,17 @@ router = APIRouter(tags=["status"])
 async def read_system_status():
     # TODO: Check database connection
     return {"status": "OK"}
+
+
+@router.get("/status/latency")
+async def read_latency(request: Request) -> LatencyGetResponse:
+    # The stateful app's engine is only touched from its matching thread
+    sequencer = getattr(request.app.state, "sequencer", None)
+    if sequencer is None:
+        return matching_engine.get_latency()
+    return await sequencer.execute(request.app.state.matching_engine.get_latency)
+
+
+@router.get("/status/pool")
+async def read_pool() -> PoolGetResponse:
+    return db_connection.get_pool_stats()
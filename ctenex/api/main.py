@@ -7,6 +7,7 @@ from ctenex.api.v1.in_memory.controllers.exchange import (
     router as stateful_exchange_router,
 )
 from ctenex.api.v1.in_memory.lifespan import lifespan
+from ctenex.api.v1.lifespan import lifespan as stateless_lifespan
 from ctenex.settings.application import get_app_settings
 
 settings = get_app_settings()
@@ -27,6 +28,7 @@ app.mount(stateful_app_path, stateful_app)
 
 stateless_app_path = "/v1/stateless/"
 stateless_app = create_app(
+    lifespan=stateless_lifespan,
     routers=[status_router, stateless_exchange_router],
 )
 stateless_app_url = f"{base_url}{stateless_app_path[1:]}"
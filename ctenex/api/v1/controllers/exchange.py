@@ -1,10 +1,12 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends
 
+from ctenex.api.exceptions import CtenexException
 from ctenex.core.db.async_session import AsyncSessionStream, db
 from ctenex.core.db.utils import get_entity_values
-from ctenex.domain.entities import OpenOrderStatus
+from ctenex.domain.contracts import ContractCode
 from ctenex.domain.matching_engine.model import matching_engine
 from ctenex.domain.order_book.contract.reader import contracts_reader
 from ctenex.domain.order_book.contract.schemas import ContractGetResponse
@@ -25,11 +27,15 @@ async def place_order(
 ) -> OrderAddResponse:
     order = Order(**body.model_dump())
 
-    order_id = await matching_engine.add_order(order)
+    try:
+        order_id = await matching_engine.add_order(order)
+    except ValueError as e:
+        raise CtenexException(status_code=400, detail=str(e))
     return OrderAddResponse(
         **body.model_dump(),
         id=order_id,
-        status=OpenOrderStatus.OPEN,
+        # e.g. cancelled, for an immediate-or-cancel or fill-or-kill order
+        status=order.status,
     )
 
 
@@ -47,6 +53,15 @@ async def get_orders(
     return [OrderGetResponse(**order.model_dump(exclude_none=True)) for order in orders]
 
 
+@router.delete("/orders")
+async def cancel_orders(
+    trader_id: UUID,
+    contract_id: ContractCode | None = None,
+) -> list[OrderGetResponse]:
+    orders: list[Order] = await matching_engine.cancel_all(trader_id, contract_id)
+    return [OrderGetResponse(**order.model_dump()) for order in orders]
+
+
 @router.get("/supported-contracts")
 async def get_supported_contracts(
     limit: int = 10,
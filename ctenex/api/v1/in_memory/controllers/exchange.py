@@ -1,34 +1,199 @@
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import APIRouter, Body, Request
+from fastapi import APIRouter, Body, Query, Request
 
+from ctenex.api.exceptions import CtenexException
 from ctenex.domain.contracts import ContractCode
-from ctenex.domain.entities import OpenOrderStatus
+from ctenex.domain.exceptions import RiskLimitError
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.depth.schemas import DepthGetResponse
 from ctenex.domain.order_book.order.model import Order
-from ctenex.domain.order_book.order.schemas import OrderAddRequest, OrderAddResponse
+from ctenex.domain.order_book.order.schemas import (
+    OrderAddRequest,
+    OrderAddResponse,
+    OrderAmendRequest,
+    OrderBatchAddRequest,
+    OrderBatchAddResponse,
+    OrderGetResponse,
+)
 
 router = APIRouter(tags=["exchange"])
 
 
+# Handlers run every engine call through the app's sequencer, so that the
+# engine is only ever touched from its matching thread (see `Sequencer`)
+
+
 @router.post("/orders")
-def place_order(
+async def place_order(
     request: Request,
     body: Annotated[OrderAddRequest, Body()],
 ) -> OrderAddResponse:
     order = Order(**body.model_dump())
 
-    order_id = request.app.state.matching_engine.add_order(order)
+    engine: MatchingEngine = request.app.state.matching_engine
+    try:
+        order_id = await request.app.state.sequencer.execute(engine.add_order, order)
+    except ValueError as e:
+        raise CtenexException(status_code=400, detail=str(e))
+    except RiskLimitError as e:
+        raise risk_limit_exception(e)
     return OrderAddResponse(
-        **body.model_dump(),
+        **body.model_dump(exclude={"expires_at"}),
         id=order_id,
-        status=OpenOrderStatus.OPEN,
+        # e.g. cancelled, for an immediate-or-cancel or fill-or-kill order
+        status=order.status,
+        # Set by the engine for a day order
+        expires_at=order.expires_at,
     )
 
 
+@router.post("/orders/batch")
+async def place_orders(
+    request: Request,
+    body: Annotated[OrderBatchAddRequest, Body()],
+) -> list[OrderBatchAddResponse]:
+    orders = [Order(**order.model_dump()) for order in body.orders]
+
+    engine: MatchingEngine = request.app.state.matching_engine
+    return await request.app.state.sequencer.execute(_add_orders, engine, orders)
+
+
 @router.get("/orders")
-def get_order(
+async def get_order(
     request: Request,
     contract_id: ContractCode,
 ) -> list[Order]:
-    orders: list[Order] = request.app.state.matching_engine.get_orders(contract_id)
+    engine: MatchingEngine = request.app.state.matching_engine
+    orders: list[Order] = await request.app.state.sequencer.execute(
+        engine.get_orders, contract_id
+    )
     return orders
+
+
+@router.delete("/orders")
+async def cancel_orders(
+    request: Request,
+    trader_id: UUID,
+    contract_id: ContractCode | None = None,
+) -> list[OrderGetResponse]:
+    engine: MatchingEngine = request.app.state.matching_engine
+    orders: list[Order] = await request.app.state.sequencer.execute(
+        engine.cancel_all, trader_id, contract_id
+    )
+    return [OrderGetResponse(**order.model_dump()) for order in orders]
+
+
+@router.get("/orders/stops")
+async def get_stop_orders(
+    request: Request,
+    contract_id: ContractCode,
+) -> list[Order]:
+    engine: MatchingEngine = request.app.state.matching_engine
+    orders: list[Order] = await request.app.state.sequencer.execute(
+        engine.get_stop_orders, contract_id
+    )
+    return orders
+
+
+@router.patch("/orders/{order_id}")
+async def amend_order(
+    request: Request,
+    order_id: UUID,
+    body: Annotated[OrderAmendRequest, Body()],
+) -> OrderGetResponse:
+    engine: MatchingEngine = request.app.state.matching_engine
+    try:
+        order: Order | None = await request.app.state.sequencer.execute(
+            engine.amend_order, body.contract_id, order_id, body.quantity, body.price
+        )
+    except ValueError as e:
+        raise CtenexException(status_code=400, detail=str(e))
+    except RiskLimitError as e:
+        raise risk_limit_exception(e)
+    if order is None:
+        raise CtenexException(status_code=404, detail=f"Order {order_id} not found")
+
+    return OrderGetResponse(**order.model_dump())
+
+
+@router.get("/orders/depth")
+async def get_depth(
+    request: Request,
+    contract_id: ContractCode,
+    levels: Annotated[int, Query(gt=0)] = 10,
+) -> DepthGetResponse:
+    engine: MatchingEngine = request.app.state.matching_engine
+    return await request.app.state.sequencer.execute(
+        engine.get_depth, contract_id, levels
+    )
+
+
+# Declared after the other `/orders/...` routes, which would otherwise be
+# taken for an order ID
+
+
+@router.get("/orders/{order_id}")
+async def get_order_by_id(
+    request: Request,
+    order_id: UUID,
+) -> OrderGetResponse:
+    engine: MatchingEngine = request.app.state.matching_engine
+    order: Order | None = await request.app.state.sequencer.execute(
+        engine.get_order, order_id
+    )
+    if order is None:
+        raise CtenexException(status_code=404, detail=f"Order {order_id} not found")
+
+    return OrderGetResponse(**order.model_dump())
+
+
+@router.delete("/orders/{order_id}")
+async def cancel_order(
+    request: Request,
+    order_id: UUID,
+) -> OrderGetResponse:
+    engine: MatchingEngine = request.app.state.matching_engine
+    order: Order | None = await request.app.state.sequencer.execute(
+        _cancel_order, engine, order_id
+    )
+    if order is None:
+        raise CtenexException(status_code=404, detail=f"Order {order_id} not found")
+
+    return OrderGetResponse(**order.model_dump())
+
+
+def risk_limit_exception(error: RiskLimitError) -> CtenexException:
+    # The type of limit breached is part of the response, for clients to act on
+    return CtenexException(
+        status_code=422,
+        detail={"code": error.code, "message": str(error)},
+    )
+
+
+def _cancel_order(engine: MatchingEngine, order_id: UUID) -> Order | None:
+    # Looked up and cancelled in one step, for the order not to move meanwhile
+    contract_id = engine.find_contract(order_id)
+    if contract_id is None:
+        return None
+    return engine.cancel_order(contract_id, order_id)
+
+
+def _add_orders(
+    engine: MatchingEngine, orders: list[Order]
+) -> list[OrderBatchAddResponse]:
+    # Built on the matching thread, before later commands update the orders
+    return [
+        OrderBatchAddResponse(
+            **result.order.model_dump(),
+            trades=result.get_trades(),
+            error=result.error,
+            error_code=(
+                result.exception.code
+                if isinstance(result.exception, RiskLimitError)
+                else None
+            ),
+        )
+        for result in engine.add_orders(orders)
+    ]
@@ -1,16 +1,190 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncIterator
 
 from fastapi import FastAPI
+from loguru import logger
 
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.exceptions import SnapshotFormatError
+from ctenex.domain.in_memory.journal.model import Journal
 from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.risk import RiskLimits
+from ctenex.domain.in_memory.matching_engine.sequencer import Dispatcher, Sequencer
+from ctenex.domain.in_memory.matching_engine.sharding import ShardedMatchingEngine
+from ctenex.domain.in_memory.order_book.ladder import LadderOrderBook
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.in_memory.snapshot.codec import encode as encode_snapshot
+from ctenex.domain.in_memory.snapshot.model import SnapshotStore
+from ctenex.domain.latency.model import LatencyRecorder
+from ctenex.settings.application import get_app_settings
+from ctenex.settings.engine import EngineSettings
+
+
+async def take_snapshots(
+    engine: MatchingEngine,
+    sequencer: Sequencer,
+    store: SnapshotStore,
+    interval: float,
+) -> None:
+    """Snapshot the engine every `interval` seconds, until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Copied on the matching thread, between two commands, so that
+            # the snapshot is consistent; encoded and written out off that
+            # thread, while matching continues
+            position, books = await sequencer.execute(engine.copy_state)
+            data = await asyncio.to_thread(encode_snapshot, position, books)
+            await asyncio.to_thread(store.write, data)
+        except Exception:
+            logger.exception("Failed to take a snapshot of the matching engine")
+
+
+async def expire_orders(
+    engine: MatchingEngine | ShardedMatchingEngine,
+    sequencer: Sequencer | Dispatcher,
+    interval: float,
+) -> None:
+    """Expire the orders past their expiry time every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sequencer.execute(engine.expire_orders)
+        except Exception:
+            logger.exception("Failed to expire orders")
+
+
+def get_risk_limits(settings: EngineSettings) -> RiskLimits | None:
+    """Return the risk limits set, if any (see `RiskLimits`)."""
+    limits = RiskLimits(
+        max_order_quantity=settings.risk_max_order_quantity,
+        max_open_notional=settings.risk_max_open_notional,
+        max_position=settings.risk_max_position,
+    )
+    return limits if any(limit is not None for limit in limits) else None
+
+
+def get_order_book_types(settings: EngineSettings) -> dict[str, type[OrderBook]]:
+    """Return the order book implementation selected for each contract."""
+    if settings.ladder_order_books:
+        return {contract_code: LadderOrderBook for contract_code in ContractCode}
+    return {}
+
+
+async def cancel(task: asyncio.Task | None) -> None:
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator:
+    settings = get_app_settings().engine
+    if settings.shards > 0:
+        async with sharded_lifespan(app):
+            yield
+        return
+
     # Instantiate the matching engine
-    app.state.matching_engine = MatchingEngine()
-    app.state.matching_engine.start()
+    journal = (
+        Journal(
+            settings.journal_path,
+            commit_size=settings.journal_commit_size,
+            commit_interval=settings.journal_commit_interval,
+        )
+        if settings.journal_path is not None
+        else None
+    )
+    # Snapshots only make sense on top of a journal to replay from
+    store = (
+        SnapshotStore(settings.snapshot_dir, keep=settings.snapshot_keep)
+        if settings.snapshot_dir is not None and journal is not None
+        else None
+    )
+    engine = app.state.matching_engine = MatchingEngine(
+        max_trades=settings.trade_retention_count,
+        max_trade_age=settings.trade_retention_seconds,
+        journal=journal,
+        latency=LatencyRecorder(enabled=settings.latency_histograms),
+        session_close=settings.session_close,
+        risk_limits=get_risk_limits(settings),
+        max_closed_orders=settings.closed_order_retention_count,
+    )
+    engine.start(
+        order_book_types=get_order_book_types(settings),
+        tick_sizes=settings.tick_sizes,
+    )
+    # Rebuild the books from the latest snapshot, if any, and the commands
+    # journaled after it before the last shutdown
+    position = None
+    if store is not None:
+        try:
+            position = engine.restore(store)
+        except SnapshotFormatError:
+            logger.exception("Ignoring the snapshot, replaying the whole journal")
+    engine.replay(start=position)
+    # Every command reaches the engine through its single matching thread,
+    # which commits the journal once per batch of commands
+    sequencer = app.state.sequencer = Sequencer(
+        on_batch=journal.commit if journal is not None else None,
+        batch_size=settings.journal_commit_size,
+    )
+    sequencer.start()
+    snapshots = (
+        asyncio.create_task(
+            take_snapshots(engine, sequencer, store, settings.snapshot_interval)
+        )
+        if store is not None
+        else None
+    )
+    expiry = asyncio.create_task(
+        expire_orders(engine, sequencer, settings.expiry_interval)
+    )
+    yield
+    # Let the queued commands run, then clean up all order books
+    await cancel(expiry)
+    await cancel(snapshots)
+    sequencer.stop()
+    if store is not None:
+        # The matching thread is stopped: snapshot the final state directly
+        store.write(engine.snapshot())
+    engine.stop()
+    if journal is not None:
+        journal.close()
+
+
+@asynccontextmanager
+async def sharded_lifespan(app: FastAPI) -> AsyncIterator:
+    # Contracts are matched in worker processes, each running its own books
+    settings = get_app_settings().engine
+    if settings.journal_path is not None:
+        raise ValueError("The sharded engine does not support journaling")
+
+    engine = app.state.matching_engine = ShardedMatchingEngine(
+        shards=settings.shards,
+        max_trades=settings.trade_retention_count,
+        max_trade_age=settings.trade_retention_seconds,
+        latency_histograms=settings.latency_histograms,
+        session_close=settings.session_close,
+        risk_limits=get_risk_limits(settings),
+        max_closed_orders=settings.closed_order_retention_count,
+    )
+    await asyncio.to_thread(
+        engine.start,
+        order_book_types=get_order_book_types(settings),
+        tick_sizes=settings.tick_sizes,
+    )
+    # The shards take calls from many threads at once: commands are
+    # dispatched from a pool of threads, each waiting on its own shards only,
+    # rather than all queueing on a single matching thread
+    sequencer = app.state.sequencer = Dispatcher(workers=settings.dispatch_workers)
+    sequencer.start()
+    expiry = asyncio.create_task(
+        expire_orders(engine, sequencer, settings.expiry_interval)
+    )
     yield
-    # Clean up all order books
-    app.state.matching_engine.stop()
+    await cancel(expiry)
+    sequencer.stop()
+    engine.stop()
@@ -0,0 +1,15 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from ctenex.core.db.async_session import db_connection
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator:
+    # The database engine, and the connections of its pool, live as long as
+    # the app: sessions check connections out of the pool and back in
+    app.state.db_connection = db_connection
+    yield
+    await db_connection.close_engine()
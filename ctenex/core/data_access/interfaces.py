@@ -53,6 +53,14 @@ class IWrite(Protocol[Entity]):
         """Create an entity."""
         ...
 
+    async def create_many(
+        self,
+        session: async_scoped_session[AsyncSession],
+        entities: list[Entity],
+    ) -> list[Entity]:
+        """Create several entities at once."""
+        ...
+
     async def update(
         self,
         session: async_scoped_session[AsyncSession],
@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from typing import Type
 
 from loguru import logger
-from sqlalchemy import column, inspect, update
+from sqlalchemy import column, insert, inspect, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
 from ctenex.core.data_access.interfaces import Entity, IWrite
@@ -21,6 +21,28 @@ class GenericWriter(IWrite[Entity]):
         session.add(entity)
         return entity
 
+    async def create_many(
+        self,
+        session: async_scoped_session[AsyncSession],
+        entities: list[Entity],
+    ) -> list[Entity]:
+        logger.info(f"Creating {len(entities)} {self.model.__name__} records")
+
+        # A single multi-row INSERT, rather than one per entity on flush
+        if entities:
+            await session.execute(
+                insert(self.model).values(
+                    [
+                        {
+                            c.key: getattr(entity, c.key)
+                            for c in inspect(entity).mapper.column_attrs
+                        }
+                        for entity in entities
+                    ]
+                )
+            )
+        return entities
+
     async def update(
         self,
         session: async_scoped_session[AsyncSession],
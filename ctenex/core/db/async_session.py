@@ -4,7 +4,7 @@ from asyncio import current_task
 from contextlib import asynccontextmanager
 from typing import AsyncContextManager, AsyncIterator, Callable, Protocol
 
-from sqlalchemy import DDL, Connection, Table, event, text
+from sqlalchemy import DDL, Column, Connection, Table, event, inspect, literal, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -14,8 +14,15 @@ from sqlalchemy.ext.asyncio import (
     close_all_sessions,
     create_async_engine,
 )
+from sqlalchemy.sql.schema import ScalarElementColumnDefault
 
 from ctenex.core.db.base import Base
+from ctenex.core.db.pool import (
+    MonitoredQueuePool,
+    PoolGetResponse,
+    get_pool_stats,
+    monitor_pool,
+)
 from ctenex.settings.application import get_app_settings
 
 db_settings = get_app_settings().db
@@ -23,14 +30,50 @@ env_settings = get_app_settings().environment
 
 
 def create_custom_engine(uri: str) -> AsyncEngine:
-    return create_async_engine(
+    engine = create_async_engine(
         uri,
+        poolclass=MonitoredQueuePool,
         pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=0,
-        pool_recycle=25,
+        pool_size=db_settings.pool_size,
+        max_overflow=db_settings.max_overflow,
+        pool_timeout=db_settings.pool_timeout,
+        pool_recycle=db_settings.pool_recycle,
         echo=env_settings == "dev",
     )
+    monitor_pool(engine)
+    return engine
+
+
+def add_column_ddl(connection: Connection, column: Column) -> list[str]:
+    """
+    The statements adding a column to its existing table. The rows already
+    in it get the column's default, if it has a fixed one (a column that
+    cannot be null needs one), which is only set for them: the tables of the
+    schema have no defaults in the database, the app sets every column.
+    """
+    dialect = connection.dialect
+    table = f"{column.table.schema}.{column.table.name}"
+    add = (
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "
+        f"{column.name} {column.type.compile(dialect=dialect)}"
+    )
+
+    default = column.default
+    if not isinstance(default, ScalarElementColumnDefault):
+        if not column.nullable:
+            raise ValueError(f"Cannot add {column} to existing rows without a default")
+        return [add]
+
+    value = getattr(default.arg, "value", default.arg)  # Enums as stored
+    value = literal(value, column.type).compile(
+        dialect=dialect, compile_kwargs={"literal_binds": True}
+    )
+    if not column.nullable:
+        add += " NOT NULL"
+    return [
+        f"{add} DEFAULT {value}",
+        f"ALTER TABLE {table} ALTER COLUMN {column.name} DROP DEFAULT",
+    ]
 
 
 class DatabaseManager:
@@ -44,6 +87,36 @@ class DatabaseManager:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+    @staticmethod
+    async def migrate_db(engine: AsyncEngine):
+        """
+        Bring an existing database up to date with the schema: create the
+        tables it lacks, add the columns its tables lack and then the
+        indexes, leaving what it has (and its data) untouched. Columns are
+        only ever added: a column changed or dropped from the schema needs a
+        migration of its own.
+        """
+
+        def create_missing(connection: Connection) -> None:
+            Base.metadata.create_all(connection)
+            # Tables created before a column or an index was added to them
+            # lack it (`create_all` skips the tables that exist)
+            inspector = inspect(connection)
+            for table in Base.metadata.sorted_tables:
+                existing = {
+                    column["name"]
+                    for column in inspector.get_columns(table.name, table.schema)
+                }
+                for column in table.columns:
+                    if column.name not in existing:
+                        for statement in add_column_ddl(connection, column):
+                            connection.execute(DDL(statement))
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(create_missing)
+
     @staticmethod
     async def drop_db(engine: AsyncEngine):
         await close_all_sessions()
@@ -71,9 +144,16 @@ class AsyncDatabaseConnection:
         return self._engine
 
     async def close_engine(self) -> None:
+        """
+        Close the connections of the engine's pool: to be called once, when
+        the app shuts down, as the engine is meant to live as long as it.
+        """
         if self._engine:
             await self._engine.dispose()
 
+    def get_pool_stats(self) -> PoolGetResponse:
+        return get_pool_stats(self.get_engine())
+
     def get_session_factory(self) -> async_sessionmaker[AsyncSession]:
         if not self._session_factory:
             self._session_factory = async_sessionmaker(
@@ -146,7 +226,6 @@ async def get_async_session(
     finally:
         if session is not None:
             await session.close()
-            await connection.close_engine()
 
 
 class AsyncSessionStreamProvider:
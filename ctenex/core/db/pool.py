@@ -0,0 +1,95 @@
+from time import perf_counter_ns
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+class PoolGetResponse(BaseModel):
+    """State of a pool of connections, and its activity since it was created."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    connects: int
+    checkouts: int
+    mean_wait_ms: float
+    max_wait_ms: float
+
+
+class PoolMonitor:
+    """Activity of a pool, kept across the pools an engine recreates."""
+
+    __slots__ = ("connects", "checkouts", "wait_ns", "max_wait_ns")
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.wait_ns = 0
+        self.max_wait_ns = 0
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that counts its checkouts and the time each waited for a
+    connection: for a free one, or for one to be opened (and pinged).
+    """
+
+    monitor: PoolMonitor
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.monitor = PoolMonitor()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter_ns()
+        connection = super().connect()
+        wait = perf_counter_ns() - start
+
+        monitor = self.monitor
+        monitor.checkouts += 1
+        monitor.wait_ns += wait
+        if wait > monitor.max_wait_ns:
+            monitor.max_wait_ns = wait
+        return connection
+
+    def recreate(self) -> "MonitoredQueuePool":
+        pool = super().recreate()
+        assert isinstance(pool, MonitoredQueuePool)
+        pool.monitor = self.monitor
+        return pool
+
+
+def monitor_pool(engine: AsyncEngine) -> None:
+    """Count the connections the engine's pool opens to the database."""
+
+    def count_connect(*_) -> None:
+        pool = engine.sync_engine.pool
+        if isinstance(pool, MonitoredQueuePool):
+            pool.monitor.connects += 1
+
+    # Listened to on the engine, for the pools it recreates to keep it
+    event.listen(engine.sync_engine, "connect", count_connect)
+
+
+def get_pool_stats(engine: AsyncEngine) -> PoolGetResponse:
+    """Return the state and activity of the engine's pool of connections."""
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, MonitoredQueuePool)
+    monitor = pool.monitor
+    return PoolGetResponse(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        # Connections open beyond the size of the pool (SQLAlchemy counts the
+        # free slots of the pool as a negative overflow until then)
+        overflow=max(pool.overflow(), 0),
+        connects=monitor.connects,
+        checkouts=monitor.checkouts,
+        mean_wait_ms=(
+            monitor.wait_ns / monitor.checkouts / 1e6 if monitor.checkouts else 0.0
+        ),
+        max_wait_ms=monitor.max_wait_ns / 1e6,
+    )
@@ -6,7 +6,7 @@ from decimal import Decimal
 from enum import Enum
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.schema import ForeignKey
+from sqlalchemy.schema import ForeignKey, Index
 from sqlalchemy.types import DECIMAL, TIMESTAMP, UUID, String
 
 from ctenex.core.db.base import AbstractBase
@@ -34,6 +34,16 @@ class OrderSide(str, Enum):
 class OrderType(str, Enum):
     LIMIT = "limit"
     MARKET = "market"
+    STOP = "stop"  # A market order once triggered
+    STOP_LIMIT = "stop_limit"  # A limit order once triggered
+
+
+class TimeInForce(str, Enum):
+    GTC = "gtc"  # Good till cancelled: the remainder rests in the book
+    IOC = "ioc"  # Immediate or cancel: the remainder is cancelled
+    FOK = "fok"  # Fill or kill: filled in full at once, or cancelled
+    GTD = "gtd"  # Good till date: the remainder rests until its expiry time
+    DAY = "day"  # Day: the remainder rests until the end of the session
 
 
 class OpenOrderStatus(str, Enum):
@@ -44,6 +54,7 @@ class OpenOrderStatus(str, Enum):
 class ProcessedOrderStatus(str, Enum):
     FILLED = "filled"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"
 
 
 OrderStatus = OpenOrderStatus | ProcessedOrderStatus
@@ -67,6 +78,7 @@ class BaseOrder(AbstractBase):
     trader_id: Mapped[uuid.UUID] = mapped_column(
         type_=UUID(as_uuid=True),
         nullable=False,
+        index=True,
     )
     side: Mapped[OrderSide] = mapped_column(
         type_=String,
@@ -85,6 +97,19 @@ class BaseOrder(AbstractBase):
         type_=DECIMAL(precision=5, scale=2),
         nullable=False,
     )
+    stop_price: Mapped[Decimal | None] = mapped_column(
+        type_=DECIMAL(precision=5, scale=2),
+        nullable=True,
+    )
+    time_in_force: Mapped[TimeInForce] = mapped_column(
+        type_=String,
+        nullable=False,
+        default=TimeInForce.GTC,
+    )
+    expires_at: Mapped[datetime | None] = mapped_column(
+        type_=TIMESTAMP(timezone=True),
+        nullable=True,
+    )
     placed_at: Mapped[datetime] = mapped_column(
         type_=TIMESTAMP(timezone=True),
         default=datetime.now(UTC),
@@ -160,6 +185,33 @@ class Order(BaseOrder):
     )
 
 
+# Open orders of each side, in the priority they are matched in (best price
+# first, then first in): the best prices and the orders an incoming order
+# crosses are read off these, whatever the number of orders filled or
+# cancelled since. Queries must spell out the side and statuses as literals,
+# for the planner to match them with the predicates of the indexes
+OPEN_STATUSES = [status.value for status in OpenOrderStatus]
+
+Index(
+    "ix_book_orders_open_asks",
+    Order.contract_id,
+    Order.side,
+    Order.price,
+    Order.created_at,
+    postgresql_where=(Order.side == OrderSide.SELL.value)
+    & Order.status.in_(OPEN_STATUSES),
+)
+Index(
+    "ix_book_orders_open_bids",
+    Order.contract_id,
+    Order.side,
+    Order.price.desc(),
+    Order.created_at,
+    postgresql_where=(Order.side == OrderSide.BUY.value)
+    & Order.status.in_(OPEN_STATUSES),
+)
+
+
 class BaseTrade(AbstractBase):
     __abstract__ = True
 
@@ -2,3 +2,27 @@ class CoreException(Exception): ...
 
 
 class InvalidContractIdError(CoreException): ...
+
+
+class JournalFormatError(CoreException): ...
+
+
+class SnapshotFormatError(CoreException): ...
+
+
+class RiskLimitError(CoreException):
+    """An order rejected by the pre-trade risk checks of the engine."""
+
+    code = "risk_limit"
+
+
+class OrderSizeLimitError(RiskLimitError):
+    code = "order_size_limit"
+
+
+class OpenNotionalLimitError(RiskLimitError):
+    code = "open_notional_limit"
+
+
+class PositionLimitError(RiskLimitError):
+    code = "position_limit"
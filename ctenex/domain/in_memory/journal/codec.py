@@ -0,0 +1,362 @@
+"""
+Binary encoding of the journal of the in-memory engine.
+
+A journal file starts with `FILE_HEADER` (magic and format version), followed
+by records. Each record is a `RECORD_HEADER` (length and CRC32 of the body)
+and a body, whose first byte is the `EventKind`:
+
+- ADD: the order as submitted (IDs, side, type and time in force, price and
+  quantity as an exponent and an integer mantissa, placement time in
+  microseconds), followed by the contract ID
+- ADD_STOP: as ADD, for an order with a stop price, followed by the stop
+  price (as an exponent and an integer mantissa) and the contract ID
+- ADD_EXPIRING: as ADD, for an order with an expiry time, followed by the
+  stop price (flagged as given or not, as an exponent and an integer
+  mantissa), the expiry time in microseconds and the contract ID
+- CANCEL: the ID of the cancelled order, followed by the contract ID
+- AMEND: the ID of the amended order, its new quantity and new price (each
+  flagged as given or not, as an exponent and an integer mantissa), followed
+  by the contract ID
+- EXPIRE: the time, in microseconds, orders were expired at (the orders
+  themselves follow from the commands before it)
+- CANCEL_ALL: the ID of the trader whose orders were all cancelled, followed
+  by the contract ID
+
+All integers are little-endian. Contract IDs are UTF-8, prefixed by their
+length in bytes.
+"""
+
+import struct
+import zlib
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from enum import IntEnum
+from mmap import mmap
+from typing import Iterator, NamedTuple
+from uuid import UUID
+
+from ctenex.domain.entities import OrderSide, OrderType, TimeInForce
+from ctenex.domain.exceptions import JournalFormatError
+from ctenex.domain.order_book.order.model import Order
+
+MAGIC = b"CTXJ"
+VERSION = 1
+
+FILE_HEADER = struct.Struct("<4sH")
+RECORD_HEADER = struct.Struct("<II")
+ADD = struct.Struct("<B16s16sBB?bqbqqB")
+ADD_STOP = struct.Struct("<B16s16sBB?bqbqqbqB")
+ADD_EXPIRING = struct.Struct("<B16s16sBB?bqbqq?bqqB")
+CANCEL = struct.Struct("<B16sB")
+AMEND = struct.Struct("<B16s?bq?bqB")
+EXPIRE = struct.Struct("<Bq")
+CANCEL_ALL = struct.Struct("<B16sB")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+
+SIDES = (OrderSide.BUY, OrderSide.SELL)
+TYPES = (OrderType.LIMIT, OrderType.MARKET, OrderType.STOP, OrderType.STOP_LIMIT)
+TIMES_IN_FORCE = (
+    TimeInForce.GTC,
+    TimeInForce.IOC,
+    TimeInForce.FOK,
+    TimeInForce.GTD,
+    TimeInForce.DAY,
+)
+SIDE_CODES = {side: code for code, side in enumerate(SIDES)}
+TYPE_CODES = {type: code for code, type in enumerate(TYPES)}
+TIME_IN_FORCE_CODES = {
+    time_in_force: code for code, time_in_force in enumerate(TIMES_IN_FORCE)
+}
+
+# The time in force shares the type's byte, in its high bits: records written
+# before orders had one read back as good till cancelled
+TIME_IN_FORCE_SHIFT = 4
+TYPE_MASK = (1 << TIME_IN_FORCE_SHIFT) - 1
+
+
+class EventKind(IntEnum):
+    ADD = 1
+    CANCEL = 2
+    AMEND = 3
+    ADD_STOP = 4
+    ADD_EXPIRING = 5
+    EXPIRE = 6
+    CANCEL_ALL = 7
+
+
+class CancelEvent(NamedTuple):
+    contract_id: str
+    order_id: UUID
+
+
+class AmendEvent(NamedTuple):
+    contract_id: str
+    order_id: UUID
+    quantity: Decimal | None
+    price: Decimal | None
+
+
+class ExpireEvent(NamedTuple):
+    timestamp: datetime
+
+
+class CancelAllEvent(NamedTuple):
+    contract_id: str
+    trader_id: UUID
+
+
+Event = Order | CancelEvent | AmendEvent | ExpireEvent | CancelAllEvent
+
+
+def encode_header() -> bytes:
+    return FILE_HEADER.pack(MAGIC, VERSION)
+
+
+def check_header(data: bytes) -> None:
+    if len(data) < FILE_HEADER.size:
+        raise JournalFormatError("Journal file is too short to have a header")
+
+    magic, version = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise JournalFormatError("Not a journal file")
+    if version != VERSION:
+        raise JournalFormatError(f"Unsupported journal version {version}")
+
+
+def split_decimal(value: Decimal) -> tuple[int, int]:
+    """Return the exponent and integer mantissa of a Decimal, exactly."""
+    exponent = value.as_tuple().exponent
+    assert isinstance(exponent, int)
+    return exponent, int(value.scaleb(-exponent))
+
+
+def join_decimal(exponent: int, mantissa: int) -> Decimal:
+    return Decimal(mantissa).scaleb(exponent)
+
+
+def to_microseconds(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def encode_add(order: Order) -> bytes:
+    price_exponent, price = (
+        split_decimal(order.price) if order.price is not None else (0, 0)
+    )
+    quantity_exponent, quantity = split_decimal(order.quantity)
+    contract_id = order.contract_id.encode()
+    fields = (
+        order.id.bytes,
+        order.trader_id.bytes,
+        SIDE_CODES[order.side],
+        TYPE_CODES[order.type]
+        | TIME_IN_FORCE_CODES[order.time_in_force] << TIME_IN_FORCE_SHIFT,
+        order.price is not None,
+        price_exponent,
+        price,
+        quantity_exponent,
+        quantity,
+        to_microseconds(order.placed_at),
+    )
+
+    if order.expires_at is not None:
+        return _frame(
+            ADD_EXPIRING.pack(
+                EventKind.ADD_EXPIRING,
+                *fields,
+                order.stop_price is not None,
+                *(
+                    split_decimal(order.stop_price)
+                    if order.stop_price is not None
+                    else (0, 0)
+                ),
+                to_microseconds(order.expires_at),
+                len(contract_id),
+            )
+            + contract_id
+        )
+    if order.stop_price is None:
+        return _frame(ADD.pack(EventKind.ADD, *fields, len(contract_id)) + contract_id)
+    return _frame(
+        ADD_STOP.pack(
+            EventKind.ADD_STOP,
+            *fields,
+            *split_decimal(order.stop_price),
+            len(contract_id),
+        )
+        + contract_id
+    )
+
+
+def encode_cancel(contract_id: str, order_id: UUID) -> bytes:
+    contract = contract_id.encode()
+    return _frame(
+        CANCEL.pack(EventKind.CANCEL, order_id.bytes, len(contract)) + contract
+    )
+
+
+def encode_amend(
+    contract_id: str,
+    order_id: UUID,
+    quantity: Decimal | None,
+    price: Decimal | None,
+) -> bytes:
+    quantity_exponent, quantity_mantissa = (
+        split_decimal(quantity) if quantity is not None else (0, 0)
+    )
+    price_exponent, price_mantissa = (
+        split_decimal(price) if price is not None else (0, 0)
+    )
+    contract = contract_id.encode()
+
+    return _frame(
+        AMEND.pack(
+            EventKind.AMEND,
+            order_id.bytes,
+            quantity is not None,
+            quantity_exponent,
+            quantity_mantissa,
+            price is not None,
+            price_exponent,
+            price_mantissa,
+            len(contract),
+        )
+        + contract
+    )
+
+
+def encode_expire(timestamp: datetime) -> bytes:
+    return _frame(EXPIRE.pack(EventKind.EXPIRE, to_microseconds(timestamp)))
+
+
+def encode_cancel_all(contract_id: str, trader_id: UUID) -> bytes:
+    contract = contract_id.encode()
+    return _frame(
+        CANCEL_ALL.pack(EventKind.CANCEL_ALL, trader_id.bytes, len(contract)) + contract
+    )
+
+
+def frames(data: bytes | mmap, offset: int, end: int) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield the body of each record of `data` between `offset` and `end`, with
+    the offset of the record that follows it. Stops at the first incomplete or
+    corrupted record (e.g. torn by a crash).
+    """
+    while offset + RECORD_HEADER.size <= end:
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        if start + length > end:
+            return
+
+        body = data[start : start + length]
+        if zlib.crc32(body) != checksum:
+            return
+
+        offset = start + length
+        yield offset, body
+
+
+def decode(data: bytes | mmap, offset: int, end: int) -> Iterator[tuple[int, Event]]:
+    """Like `frames`, decoding the event of each record."""
+    for offset, body in frames(data, offset, end):
+        yield offset, _decode_body(body)
+
+
+def _frame(body: bytes) -> bytes:
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+ADD_KINDS = (EventKind.ADD, EventKind.ADD_STOP, EventKind.ADD_EXPIRING)
+
+
+def _decode_body(body: bytes) -> Event:
+    if body[0] in ADD_KINDS:
+        stop_price = expires_at = None
+        if body[0] == EventKind.ADD:
+            *fields, contract_length = ADD.unpack_from(body)
+            contract_id = body[ADD.size : ADD.size + contract_length].decode()
+        elif body[0] == EventKind.ADD_STOP:
+            *fields, stop_exponent, stop, contract_length = ADD_STOP.unpack_from(body)
+            contract_id = body[ADD_STOP.size : ADD_STOP.size + contract_length].decode()
+            stop_price = join_decimal(stop_exponent, stop)
+        else:
+            (
+                *fields,
+                has_stop,
+                stop_exponent,
+                stop,
+                expiry,
+                contract_length,
+            ) = ADD_EXPIRING.unpack_from(body)
+            contract_id = body[
+                ADD_EXPIRING.size : ADD_EXPIRING.size + contract_length
+            ].decode()
+            if has_stop:
+                stop_price = join_decimal(stop_exponent, stop)
+            expires_at = EPOCH + expiry * MICROSECOND
+        (
+            _,
+            order_id,
+            trader_id,
+            side,
+            type,
+            has_price,
+            price_exponent,
+            price,
+            quantity_exponent,
+            quantity,
+            placed_at,
+        ) = fields
+
+        return Order(
+            id=UUID(bytes=order_id),
+            contract_id=contract_id,
+            trader_id=UUID(bytes=trader_id),
+            side=SIDES[side],
+            type=TYPES[type & TYPE_MASK],
+            time_in_force=TIMES_IN_FORCE[type >> TIME_IN_FORCE_SHIFT],
+            price=join_decimal(price_exponent, price) if has_price else None,
+            stop_price=stop_price,
+            quantity=join_decimal(quantity_exponent, quantity),
+            placed_at=EPOCH + placed_at * MICROSECOND,
+            expires_at=expires_at,
+        )
+
+    if body[0] == EventKind.CANCEL:
+        _, order_id, contract_length = CANCEL.unpack_from(body)
+        contract_id = body[CANCEL.size : CANCEL.size + contract_length].decode()
+        return CancelEvent(contract_id, UUID(bytes=order_id))
+
+    if body[0] == EventKind.AMEND:
+        (
+            _,
+            order_id,
+            has_quantity,
+            quantity_exponent,
+            quantity,
+            has_price,
+            price_exponent,
+            price,
+            contract_length,
+        ) = AMEND.unpack_from(body)
+        contract_id = body[AMEND.size : AMEND.size + contract_length].decode()
+        return AmendEvent(
+            contract_id,
+            UUID(bytes=order_id),
+            join_decimal(quantity_exponent, quantity) if has_quantity else None,
+            join_decimal(price_exponent, price) if has_price else None,
+        )
+
+    if body[0] == EventKind.EXPIRE:
+        _, timestamp = EXPIRE.unpack_from(body)
+        return ExpireEvent(EPOCH + timestamp * MICROSECOND)
+
+    if body[0] == EventKind.CANCEL_ALL:
+        _, trader_id, contract_length = CANCEL_ALL.unpack_from(body)
+        contract_id = body[CANCEL_ALL.size : CANCEL_ALL.size + contract_length].decode()
+        return CancelAllEvent(contract_id, UUID(bytes=trader_id))
+
+    raise JournalFormatError(f"Unknown journal event kind {body[0]}")
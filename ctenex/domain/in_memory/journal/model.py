@@ -0,0 +1,168 @@
+import mmap
+import os
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from time import monotonic
+from typing import Iterator
+from uuid import UUID
+
+from loguru import logger
+
+from ctenex.domain.in_memory.journal.codec import (
+    FILE_HEADER,
+    Event,
+    check_header,
+    decode,
+    encode_add,
+    encode_amend,
+    encode_cancel,
+    encode_cancel_all,
+    encode_expire,
+    encode_header,
+    frames,
+)
+from ctenex.domain.order_book.order.model import Order
+
+
+class Journal:
+    """
+    Append-only binary journal of the commands accepted by an in-memory engine.
+
+    Commands are encoded (see `ctenex.domain.in_memory.journal.codec`) into an
+    in-memory buffer and group-committed: written and fsynced to the file in
+    one go, either when `commit` is called (e.g. by the `Sequencer` once per
+    batch of commands) or, failing that, as soon as `commit_size` commands or
+    `commit_interval` seconds have piled up. A command is only durable once
+    committed.
+
+    Positions are byte offsets in the file: `position` is the end of the last
+    command appended, which is where a replay resumes from (see `read`).
+    Opening an existing journal drops any torn record left at its end by a
+    crash.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        commit_size: int = 1_000,
+        commit_interval: float = 0.01,
+    ):
+        self.path = Path(path)
+        self.commit_size = commit_size
+        self.commit_interval = commit_interval
+
+        self._file = open(self.path, "a+b")
+        self._file.seek(0)
+        header = self._file.read(FILE_HEADER.size)
+        if header:
+            check_header(header)
+            self.position = self._recover()
+        else:
+            self._file.write(encode_header())
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.position = FILE_HEADER.size
+
+        self.committed_position = self.position
+        self._buffer = bytearray()
+        self._pending = 0
+        self._last_commit = monotonic()
+
+    @property
+    def start(self) -> int:
+        """Position of the first command of the journal."""
+        return FILE_HEADER.size
+
+    def append_add(self, order: Order) -> int:
+        """Journal an order as submitted and return the position after it."""
+        return self._append(encode_add(order))
+
+    def append_cancel(self, contract_id: str, order_id: UUID) -> int:
+        """Journal the cancellation of an order and return the position after it."""
+        return self._append(encode_cancel(contract_id, order_id))
+
+    def append_amend(
+        self,
+        contract_id: str,
+        order_id: UUID,
+        quantity: Decimal | None,
+        price: Decimal | None,
+    ) -> int:
+        """Journal the amendment of an order and return the position after it."""
+        return self._append(encode_amend(contract_id, order_id, quantity, price))
+
+    def append_expire(self, timestamp: datetime) -> int:
+        """Journal an expiry sweep and return the position after it."""
+        return self._append(encode_expire(timestamp))
+
+    def append_cancel_all(self, contract_id: str, trader_id: UUID) -> int:
+        """
+        Journal the cancellation of all the orders of a trader for a contract
+        and return the position after it.
+        """
+        return self._append(encode_cancel_all(contract_id, trader_id))
+
+    def commit(self) -> None:
+        """Write and fsync the commands appended since the last commit."""
+        self._last_commit = monotonic()
+        if not self._buffer:
+            return
+
+        self._file.write(self._buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._buffer.clear()
+        self._pending = 0
+        self.committed_position = self.position
+
+    def read(self, start: int | None = None) -> Iterator[Event]:
+        """Yield the committed commands from position `start` (the first) on."""
+        for _, event in self.read_positions(start):
+            yield event
+
+    def read_positions(self, start: int | None = None) -> Iterator[tuple[int, Event]]:
+        """Like `read`, also yielding the position after each command."""
+        start = self.start if start is None else start
+        if start >= self.committed_position:
+            return
+
+        with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from decode(data, start, self.committed_position)
+
+    def close(self) -> None:
+        self.commit()
+        self._file.close()
+
+    def _append(self, record: bytes) -> int:
+        self._buffer += record
+        self._pending += 1
+        self.position += len(record)
+
+        if (
+            self._pending >= self.commit_size
+            or monotonic() - self._last_commit >= self.commit_interval
+        ):
+            self.commit()
+
+        return self.position
+
+    def _recover(self) -> int:
+        """Return the end of the last intact command, truncating anything after."""
+        size = os.fstat(self._file.fileno()).st_size
+        end = FILE_HEADER.size
+        with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for end, _ in frames(data, end, size):
+                pass
+
+        if end < size:
+            logger.warning(
+                "Truncating {} bytes of torn records at the end of journal {}",
+                size - end,
+                self.path,
+            )
+            self._file.truncate(end)
+            os.fsync(self._file.fileno())
+
+        return end
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from uuid import UUID
+
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.order_book.order.model import Order
+
+
+class ClosedOrders:
+    """
+    Orders of an engine that left its books for good (filled, cancelled or
+    expired), for them to still be found by ID with their final status.
+
+    Orders are kept as they were when closed: the record of a resting order
+    filled in its book, the model of any other (an incoming order that never
+    rested, or one cancelled or expired, whose model was built to return it),
+    so closing an order costs a dict insertion. Only the `max_orders` most
+    recently closed are kept (all of them if None), the oldest being evicted
+    first.
+    """
+
+    def __init__(self, max_orders: int | None = None):
+        if max_orders is not None and max_orders < 0:
+            raise ValueError("The number of closed orders kept cannot be negative")
+
+        self.max_orders = max_orders
+        # In order of closing, for the oldest to be evicted in O(1)
+        self._orders: OrderedDict[UUID, Order | OrderRecord] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def add(self, order: Order | OrderRecord) -> None:
+        orders = self._orders
+        orders[order.id] = order
+        if self.max_orders is not None and len(orders) > self.max_orders:
+            orders.popitem(last=False)
+
+    def get(self, order_id: UUID) -> Order | OrderRecord | None:
+        return self._orders.get(order_id)
+
+    def clear(self) -> None:
+        self._orders.clear()
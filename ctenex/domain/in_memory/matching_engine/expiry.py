@@ -0,0 +1,52 @@
+from datetime import datetime
+from heapq import heappop, heappush
+from uuid import UUID
+
+
+class ExpiryQueue:
+    """
+    Expiry times of the orders of an engine, for them to be expired in bulk.
+
+    Orders are bucketed by expiry time, and only the distinct times are kept
+    in a heap: scheduling an order is an append (plus a heap push for a new
+    time), and a sweep pops whole buckets. Day orders all expire at the end
+    of the session, in a single bucket, so expiring them at once costs O(1)
+    per order, whatever the number of other orders waiting.
+
+    Entries are never removed before their time: orders filled or cancelled
+    in the meantime are skipped when their bucket is swept (the engine looks
+    them up as it would to cancel them), and an order scheduled again (e.g.
+    once re-queued by an amendment) is only expired once.
+    """
+
+    def __init__(self):
+        self._times: list[datetime] = []
+        self._buckets: dict[datetime, list[tuple[str, UUID]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, expires_at: datetime, contract_id: str, order_id: UUID) -> None:
+        bucket = self._buckets.get(expires_at)
+        if bucket is None:
+            bucket = self._buckets[expires_at] = []
+            heappush(self._times, expires_at)
+        bucket.append((contract_id, order_id))
+        self._size += 1
+
+    def next_expiry(self) -> datetime | None:
+        """Return the earliest expiry time scheduled, if any."""
+        return self._times[0] if self._times else None
+
+    def pop_expired(self, now: datetime) -> list[tuple[str, UUID]]:
+        """
+        Remove and return the contract and order IDs scheduled to expire at
+        or before `now`, earliest first (and in scheduling order at a time).
+        """
+        expired: list[tuple[str, UUID]] = []
+        times = self._times
+        while times and times[0] <= now:
+            expired.extend(self._buckets.pop(heappop(times)))
+        self._size -= len(expired)
+        return expired
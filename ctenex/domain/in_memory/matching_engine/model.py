@@ -1,4 +1,9 @@
-from typing import Type
+import gc
+from collections import defaultdict
+from datetime import UTC, datetime, time, timedelta
+from decimal import Decimal
+from time import perf_counter_ns
+from typing import Iterable, Mapping, Type
 from uuid import UUID
 
 from loguru import logger
@@ -9,81 +14,886 @@ from ctenex.domain.entities import (
     OrderSide,
     OrderType,
     ProcessedOrderStatus,
+    TimeInForce,
 )
+from ctenex.domain.exceptions import RiskLimitError, SnapshotFormatError
+from ctenex.domain.in_memory.journal.codec import (
+    AmendEvent,
+    CancelAllEvent,
+    CancelEvent,
+    ExpireEvent,
+)
+from ctenex.domain.in_memory.journal.model import Journal
+from ctenex.domain.in_memory.matching_engine.closed import ClosedOrders
+from ctenex.domain.in_memory.matching_engine.expiry import ExpiryQueue
+from ctenex.domain.in_memory.matching_engine.record import OrderResult, TradeRecord
+from ctenex.domain.in_memory.matching_engine.risk import RiskCheck, RiskLimits
+from ctenex.domain.in_memory.matching_engine.trade_log import TradeLog
 from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.stops import (
+    STOP_TYPES,
+    TRIGGERED_TYPES,
+    StopBook,
+)
+from ctenex.domain.in_memory.snapshot.codec import BookCopy, record_state
+from ctenex.domain.in_memory.snapshot.codec import encode as encode_snapshot
+from ctenex.domain.in_memory.snapshot.model import SnapshotStore
+from ctenex.domain.latency.model import LatencyRecorder
+from ctenex.domain.latency.schemas import LatencyGetResponse
+from ctenex.domain.order_book.contract.model import Contract
+from ctenex.domain.order_book.depth.schemas import (
+    DepthGetResponse,
+    TopOfBookGetResponse,
+)
 from ctenex.domain.order_book.order.model import Order
 from ctenex.domain.order_book.trade.model import Trade
 
+# Stages of adding an order whose latencies are recorded, alone or in a batch
+ORDER_STAGES = ("log", "match", "rest", "stops", "journal", "trades", "total")
+BATCH_ORDER_STAGES = ("match", "rest", "stops", "journal", "total")
+
+# Times in force of the orders whose remainder rests until an expiry time
+EXPIRING = (TimeInForce.GTD, TimeInForce.DAY)
 
-class MatchingEngine:
-    def __init__(self):
-        self.order_books: dict[ContractCode, OrderBook] = {}
-        self.trades: list[Trade] = []
 
-    def start(self, contract_codes: Type[ContractCode] = ContractCode):
-        """Start the matching engine and create order books for all contract codes."""
+class MatchingEngine:
+    def __init__(
+        self,
+        max_trades: int | None = None,
+        max_trade_age: float | None = None,
+        journal: Journal | None = None,
+        latency: LatencyRecorder | None = None,
+        session_close: time = time(0),
+        risk_limits: RiskLimits | None = None,
+        max_closed_orders: int | None = 10_000,
+    ):
+        """
+        Trades are kept per contract, up to `max_trades` of them and for up to
+        `max_trade_age` seconds (unbounded by default, see `TradeLog`).
+
+        If a `journal` is given, every command the engine accepts (orders
+        added, orders cancelled) is appended to it, so that the state of the
+        books can be rebuilt with `replay`.
+
+        The latency of each stage of the processing of every order added is
+        recorded in `latency` (see `get_latency`).
+
+        Day orders expire at the first `session_close` (a UTC time of day)
+        after they are placed, good-till-date orders at their own expiry time,
+        once `expire_orders` is called past it.
+
+        If `risk_limits` are given, orders added (or amended) are checked
+        against them before they are matched, and rejected with a
+        `RiskLimitError` if they would breach one. The exposure they are
+        checked against is kept up to date by the books on every fill and
+        cancellation, so the checks cost O(1) per order.
+
+        Orders that leave the books for good (filled, cancelled or expired)
+        can still be found with `get_order`, the `max_closed_orders` most
+        recently closed of them (see `ClosedOrders`).
+        """
+        self.order_books: dict[str, OrderBook] = {}
+        self.stop_books: dict[str, StopBook] = {}
+        self.trade_logs: dict[str, TradeLog] = {}
+        self.max_trades = max_trades
+        self.max_trade_age = max_trade_age
+        self.journal = journal
+        self.latency = latency if latency is not None else LatencyRecorder()
+        self.session_close = session_close
+        self.expiries = ExpiryQueue()
+        self.risk_limits = risk_limits
+        self.risk_checks: dict[str, RiskCheck] = {}
+        self.closed_orders = ClosedOrders(max_closed_orders)
+
+        # Contract of every resting order and waiting stop order, kept by the
+        # books on every add and removal (see `get_order`)
+        self.contract_index: dict[UUID, str] = {}
+
+    def start(
+        self,
+        contract_codes: Iterable[str] = ContractCode,
+        contracts: Iterable[Contract] = (),
+        order_book_types: Mapping[str, Type[OrderBook]] | None = None,
+        tick_sizes: Mapping[str, Decimal] | None = None,
+    ):
+        """
+        Start the matching engine and create order books for all contract codes.
+
+        Books for the contracts whose metadata is given, or whose tick size is
+        given in `tick_sizes` (by contract code, taking precedence over the
+        metadata), match on integer ticks and lots derived from the tick size.
+        The others match on Decimals.
+
+        Each book is an `OrderBook` unless another implementation is selected
+        for its contract in `order_book_types` (e.g. a `LadderOrderBook`).
+        """
+        tick_sizes = {
+            **{contract.external_id: contract.tick_size for contract in contracts},
+            **(tick_sizes or {}),
+        }
+        order_book_types = order_book_types or {}
         for contract_code in contract_codes:
-            self.order_books[contract_code] = OrderBook(contract_code)
+            order_book_type = order_book_types.get(contract_code, OrderBook)
+            self.order_books[contract_code] = order_book_type(
+                contract_code,
+                tick_size=tick_sizes.get(contract_code),
+            )
+            self.stop_books[contract_code] = StopBook(
+                contract_code, self.order_books[contract_code].scale
+            )
+            self.order_books[contract_code].share_index(self.contract_index)
+            self.stop_books[contract_code].share_index(self.contract_index)
+            if self.risk_limits is not None:
+                self.order_books[contract_code].track_exposure()
+                self.risk_checks[contract_code] = RiskCheck(
+                    self.risk_limits, self.order_books[contract_code].scale
+                )
+            if contract_code not in self.trade_logs:
+                self.trade_logs[contract_code] = TradeLog(
+                    max_trades=self.max_trades,
+                    max_age=self.max_trade_age,
+                )
 
     def stop(self):
         """Stop the matching engine and clear all order books."""
         self.order_books.clear()
+        self.stop_books.clear()
+        self.risk_checks.clear()
+        self.closed_orders.clear()
+        self.contract_index.clear()
+        self.expiries = ExpiryQueue()
 
     def add_order(self, order: Order) -> UUID:
         """Add an order to the book and return any trades that result."""
-        logger.debug(f"Adding order: {order}")
+        start = perf_counter_ns()
+        logger.debug("Adding order: {}", order)
+        logged = perf_counter_ns()
+
+        order_book = self.order_books[order.contract_id]
+        trades = self._match(
+            order,
+            order_book,
+            self.risk_checks.get(order.contract_id) if self.risk_checks else None,
+        )
+        matched = perf_counter_ns()
+        self._rest(order, order_book)
+        rested = perf_counter_ns()
+        if trades:
+            trades.extend(self._trigger(order_book, trades))
+        triggered = perf_counter_ns()
+
+        if self.journal is not None:
+            self.journal.append_add(order)
+        journaled = perf_counter_ns()
 
-        if order.remaining_quantity is None:
-            order.remaining_quantity = order.quantity
+        if len(trades) > 0:
+            logger.debug("Matched order with ID {}", order.id)
+            logger.debug("Generated {} trades:", len(trades))
+            for trade in trades:
+                logger.debug("{}", trade)
+
+            self.trade_logs[order.contract_id].append(trades)
+        end = perf_counter_ns()
+
+        self.latency.record(
+            order.contract_id,
+            ORDER_STAGES,
+            logged - start,
+            matched - logged,
+            rested - matched,
+            triggered - rested,
+            journaled - triggered,
+            end - journaled,
+            end - start,
+        )
 
-        # Try to match the order first
-        if order.side == OrderSide.BUY:
-            trades = self._match_buy_order(order)
-        else:
-            trades = self._match_sell_order(order)
+        return order.id
 
-        # If order still has quantity remaining, add to book
-        # (only for limit orders) <- TODO: review this
-        if order.remaining_quantity > 0 and order.type == OrderType.LIMIT:
-            self.order_books[order.contract_id].add_order(order)
+    def add_orders(self, orders: Iterable[Order]) -> list[OrderResult]:
+        """
+        Validate and match a batch of orders, in arrival order.
+
+        Each order is processed exactly as by `add_order`, but an order that is
+        rejected does not stop the batch: its result carries the error instead.
+        The trades of the whole batch are recorded at once and the batch is
+        logged as a single summary (so neither is part of the latencies
+        recorded for each order).
+        """
+        results = []
+        batch_trades: defaultdict[str, list[TradeRecord]] = defaultdict(list)
+        order_books = self.order_books
+
+        for order in orders:
+            order_book = order_books.get(order.contract_id)
+            if order_book is None:
+                results.append(
+                    OrderResult(
+                        order, [], error=f"Unknown contract: {order.contract_id}"
+                    )
+                )
+                continue
+
+            start = perf_counter_ns()
+            try:
+                trades = self._match(
+                    order,
+                    order_book,
+                    self.risk_checks.get(order.contract_id)
+                    if self.risk_checks
+                    else None,
+                )
+            except (ValueError, RiskLimitError) as e:
+                results.append(OrderResult(order, [], order_book.scale, str(e), e))
+                continue
+            matched = perf_counter_ns()
+            self._rest(order, order_book)
+            rested = perf_counter_ns()
+            # The trades of the stops triggered by an order are recorded, but
+            # not part of its result
+            batch_trades[order.contract_id].extend(trades)
+            if trades:
+                batch_trades[order.contract_id].extend(
+                    self._trigger(order_book, trades)
+                )
+            triggered = perf_counter_ns()
+
+            if self.journal is not None:
+                self.journal.append_add(order)
+            end = perf_counter_ns()
+
+            results.append(OrderResult(order, trades, order_book.scale))
+            self.latency.record(
+                order.contract_id,
+                BATCH_ORDER_STAGES,
+                matched - start,
+                rested - matched,
+                triggered - rested,
+                end - triggered,
+                end - start,
+            )
+
+        for contract_id, trades in batch_trades.items():
+            self.trade_logs[contract_id].append(trades)
+
+        logger.debug(
+            "Added batch of {} orders ({} rejected), generated {} trades",
+            len(results),
+            sum(1 for result in results if result.error is not None),
+            sum(len(trades) for trades in batch_trades.values()),
+        )
+
+        return results
+
+    def cancel_order(self, contract_id: str, order_id: UUID) -> Order | None:
+        """
+        Cancel a resting order (or a stop order waiting for its trigger) and
+        return it, if it was in the book.
+        """
+        order = self._cancel(contract_id, order_id)
+
+        if order is not None and self.journal is not None:
+            self.journal.append_cancel(contract_id, order_id)
+
+        return order
+
+    def cancel_all(
+        self, trader_id: UUID, contract_id: str | None = None
+    ) -> list[Order]:
+        """
+        Cancel all the resting orders (and stop orders waiting for their
+        trigger) of a trader, for one contract or for all of them, and return
+        them.
+
+        The orders are found through the per-trader index of each book, so
+        this costs O(1) per order cancelled, whatever the size of the books.
+        The cancellation is journaled as a single command per contract.
+        """
+        contract_ids = (
+            [contract_id] if contract_id is not None else list(self.order_books)
+        )
+
+        orders = []
+        for contract_id in contract_ids:
+            cancelled = self._cancel_all(contract_id, trader_id)
+            if cancelled and self.journal is not None:
+                self.journal.append_cancel_all(contract_id, trader_id)
+            orders.extend(cancelled)
+
+        logger.info("Cancelled {} orders of trader {}", len(orders), trader_id)
+        return orders
+
+    def amend_order(
+        self,
+        contract_id: str,
+        order_id: UUID,
+        new_quantity: Decimal | None = None,
+        new_price: Decimal | None = None,
+    ) -> Order | None:
+        """
+        Amend the quantity and/or price of a resting order and return it, if
+        it was in the book.
+
+        A decrease in quantity is applied in place, in O(1): the order keeps
+        its priority. A new price (or a larger quantity) re-queues the order
+        behind those already resting at its price, as a new order would be,
+        matching it first if it now crosses the book. The quantity is the
+        order's total quantity, filled part included, so it must exceed the
+        quantity already filled.
+        """
+        order_book = self.order_books[contract_id]
+        order = self._amend(order_book, order_id, new_quantity, new_price)
+
+        if order is not None and self.journal is not None:
+            self.journal.append_amend(contract_id, order_id, new_quantity, new_price)
+
+        return order
+
+    def expire_orders(self, now: datetime | None = None) -> list[Order]:
+        """
+        Expire the good-till-date and day orders whose expiry time is at or
+        before `now` (the current time by default) and return them.
+
+        Expired orders leave their book exactly as cancelled ones do, with
+        the status expired. A sweep is journaled as a single command, the
+        orders it expires following from the commands before it.
+        """
+        now = _as_utc(now if now is not None else datetime.now(UTC))
+        if (expiry := self.expiries.next_expiry()) is None or expiry > now:
+            return []
+
+        # The orders expired all survive the sweep (they are returned): keep
+        # the cyclic garbage collector from scanning them over and over
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            orders = self._expire(now)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if self.journal is not None:
+            self.journal.append_expire(now)
+
+        logger.info("Expired {} orders", len(orders))
+        return orders
+
+    def replay(self, start: int | None = None) -> int:
+        """
+        Apply the commands of the journal from position `start` (the first by
+        default) on, without journaling them again, and return their number.
+        Matching is deterministic, so this rebuilds the books and trades as
+        they were (trade IDs and timestamps excepted, which are drawn anew).
+        """
+        if self.journal is None:
+            return 0
+
+        count = 0
+        for event in self.journal.read(start):
+            count += 1
+
+            if isinstance(event, ExpireEvent):
+                self._expire(event.timestamp)
+                continue
+
+            order_book = self.order_books.get(event.contract_id)
+            if order_book is None:
+                logger.warning("Skipping journaled command for {}", event)
+                continue
+
+            if isinstance(event, CancelEvent):
+                self._cancel(event.contract_id, event.order_id)
+                continue
+
+            if isinstance(event, CancelAllEvent):
+                self._cancel_all(event.contract_id, event.trader_id)
+                continue
+
+            if isinstance(event, AmendEvent):
+                self._amend(order_book, event.order_id, event.quantity, event.price)
+                continue
+
+            trades = self._execute(event, order_book)
+            if trades:
+                trades.extend(self._trigger(order_book, trades))
+                self.trade_logs[event.contract_id].append(trades)
+
+        logger.info("Replayed {} journaled commands", count)
+        return count
+
+    def copy_state(self) -> tuple[int, list[BookCopy]]:
+        """
+        Copy the state of the books (and the trade sequence numbers) as of
+        the current journal position, to be encoded with `encode_snapshot`
+        off the matching thread, while matching continues.
+
+        The state must not change while it is copied: run this on the
+        matching thread (e.g. through the `Sequencer`), which then only pauses
+        for the copy. That copies the list of resting orders and what changes
+        in them (see `record_state`), not the orders themselves, so it costs a
+        fraction of encoding them. The journal is committed first, so that a
+        snapshot never covers commands that could still be lost.
+        """
+        position = 0
+        if self.journal is not None:
+            self.journal.commit()
+            position = self.journal.position
+
+        # Every tuple copied survives: keep the cyclic garbage collector from
+        # scanning them over and over meanwhile
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            books = []
+            for contract_id, order_book in self.order_books.items():
+                records = list(order_book.orders_by_id.values())
+                stop_book = self.stop_books[contract_id]
+                books.append(
+                    BookCopy(
+                        contract_id=contract_id,
+                        tick_size=order_book.scale.tick_size,
+                        last_sequence=self.trade_logs[contract_id].last_sequence,
+                        records=records,
+                        states=list(map(record_state, records)),
+                        stops=list(stop_book.stops_by_id.values()),
+                        last_price=stop_book.last_price,
+                        positions=[
+                            (key, exposure.position)
+                            for key, exposure in (order_book.exposures or {}).items()
+                            if exposure.position
+                        ],
+                    )
+                )
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return position, books
+
+    def snapshot(self) -> bytes:
+        """
+        Encode the state of the books as of the current journal position, to
+        be written to a `SnapshotStore`: `copy_state` and encode the copy at
+        once, when the matching thread is stopped (or does not matter).
+        """
+        return encode_snapshot(*self.copy_state())
+
+    def restore(self, store: SnapshotStore) -> int | None:
+        """
+        Load the books from the latest snapshot of `store` into the (freshly
+        started) engine and return the journal position to replay from, or
+        None if there is no snapshot.
+
+        Raises `SnapshotFormatError` if the snapshot is unreadable or does not
+        fit the books (e.g. the tick size of a contract changed since), in
+        which case no book is modified.
+        """
+        # Restoring allocates millions of objects which all survive: keep the
+        # cyclic garbage collector from scanning them over and over meanwhile
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            snapshot = store.read()
+            if snapshot is None:
+                return None
+
+            position, books = snapshot
+            for book in books:
+                order_book = self.order_books.get(book.contract_id)
+                if order_book is None:
+                    raise SnapshotFormatError(f"Unknown contract: {book.contract_id}")
+                if order_book.scale.tick_size != book.tick_size:
+                    raise SnapshotFormatError(
+                        f"Snapshot of {book.contract_id} does not match its tick size"
+                    )
+
+            for book in books:
+                self.order_books[book.contract_id].load(book.records)
+                self.stop_books[book.contract_id].load(book.stops)
+                self.stop_books[book.contract_id].last_price = book.last_price
+                # The expiry times of the orders travel with them
+                for record in (*book.records, *book.stops):
+                    if record.expires_at is not None:
+                        self.expiries.add(
+                            record.expires_at, book.contract_id, record.id
+                        )
+                self.trade_logs[book.contract_id].last_sequence = book.last_sequence
+                # Positions are only kept (and restored) for the risk checks
+                order_book = self.order_books[book.contract_id]
+                if order_book.exposures is not None:
+                    for trader_id, net in book.positions:
+                        order_book.get_exposure(trader_id).position = net
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        logger.info(
+            "Restored {} resting orders from the snapshot at position {}",
+            sum(len(book.records) for book in books),
+            position,
+        )
+        return position
+
+    def get_latency(self) -> LatencyGetResponse:
+        """
+        Return the p50, p99 and p99.9 latencies of each stage of adding an
+        order, per contract, since the engine started (or was last reset):
+        logging, matching (including building trades), resting the remainder
+        in the book, executing the stop orders it triggered, journaling and
+        recording trades.
+        """
+        return self.latency.summarize()
+
+    def reset_latency(self) -> None:
+        self.latency.reset()
+
+    def get_orders(self, contract_id: str) -> list[Order]:
+        return self.order_books[contract_id].get_orders()
 
-        self.trades.extend(trades)
+    def find_contract(self, order_id: UUID) -> str | None:
+        """
+        Return the contract of a resting order (or of a stop order waiting
+        for its trigger), if it is in a book.
+        """
+        return self.contract_index.get(order_id)
+
+    def get_order(self, order_id: UUID) -> Order | None:
+        """
+        Return a resting order (or a stop order waiting for its trigger), if
+        it is in a book, or else an order closed recently enough to be kept
+        (see `ClosedOrders`), with its final status. The book of an order is
+        found through the engine's index of the contract of every order, in
+        O(1), rather than by probing every book.
+        """
+        contract_id = self.find_contract(order_id)
+        if contract_id is None:
+            closed = self.closed_orders.get(order_id)
+            if isinstance(closed, OrderRecord):
+                return closed.to_order(self.order_books[closed.contract_id].scale)
+            return closed
+
+        order = self.order_books[contract_id].get_order(order_id)
+        if order is None:
+            order = self.stop_books[contract_id].get_order(order_id)
+        return order
+
+    def get_stop_orders(self, contract_id: str) -> list[Order]:
+        """Return the stop orders of a contract waiting for their trigger."""
+        return self.stop_books[contract_id].get_orders()
+
+    def get_depth(self, contract_id: str, levels: int = 10) -> DepthGetResponse:
+        return self.order_books[contract_id].depth(levels)
+
+    def get_top_of_book(self, contract_id: str) -> TopOfBookGetResponse:
+        return self.order_books[contract_id].top_of_book()
+
+    def get_trades(self, contract_id: str, since: int = 0) -> list[Trade]:
+        """
+        Return the retained trades of a contract numbered after sequence
+        `since` (all of them by default), oldest first (see `TradeLog.since`).
+        """
+        scale = self.order_books[contract_id].scale
+        return [
+            trade.to_trade(scale) for trade in self.trade_logs[contract_id].since(since)
+        ]
+
+    def _amend(
+        self,
+        order_book: OrderBook,
+        order_id: UUID,
+        new_quantity: Decimal | None,
+        new_price: Decimal | None,
+    ) -> Order | None:
+        record = order_book.orders_by_id.get(order_id)
+        if record is None:
+            return None
+
+        scale = order_book.scale
+        quantity = (
+            scale.to_lots(new_quantity) if new_quantity is not None else record.quantity
+        )
+        price = scale.to_ticks(new_price) if new_price is not None else record.price
+        filled = record.quantity - record.remaining
+        if quantity <= filled:
+            raise ValueError("New quantity must exceed the quantity already filled")
+
+        if price == record.price and quantity <= record.quantity:
+            if quantity < record.quantity:
+                order_book.reduce_order(record, record.quantity - quantity)
+            return record.to_order(scale)
+
+        # Checked as a new order would be, in place of the resting one
+        order_book.check_price(price)
+        risk_check = self.risk_checks.get(order_book.contract_id)
+        if risk_check is not None:
+            risk_check.check(
+                record.exposure,
+                record.side,
+                price,
+                quantity - filled,
+                replacing=record,
+                waiting=self.stop_books[order_book.contract_id].waiting(
+                    record.trader_id, record.side
+                ),
+            )
+
+        # Re-queued at the back of its (new) price level, as a new order
+        # would be: withdrawing it and adding it again also moves it to the
+        # end of `orders_by_id`, which has to follow the order of arrival
+        order = order_book.withdraw_order(order_id)
+        assert order is not None
+        order.price = scale.to_price(price)
+        order.quantity = scale.to_quantity(quantity)
+        order.remaining_quantity = scale.to_quantity(quantity - filled)
+
+        trades = self._execute(order, order_book)
+        if trades:
+            trades.extend(self._trigger(order_book, trades))
+            self.trade_logs[order.contract_id].append(trades)
+
+        return order
+
+    def _expire(self, now: datetime) -> list[Order]:
+        orders = []
+        for contract_id, order_id in self.expiries.pop_expired(now):
+            # Gone already if filled or cancelled since it was scheduled
+            order = self._cancel(
+                contract_id,
+                order_id,
+                ProcessedOrderStatus.EXPIRED,
+            )
+            if order is not None:
+                orders.append(order)
+        return orders
+
+    def _schedule(self, order: Order) -> None:
+        """Schedule the expiry of a resting order, if it has one."""
+        if order.expires_at is not None:
+            self.expiries.add(order.expires_at, order.contract_id, order.id)
+
+    def _cancel(
+        self,
+        contract_id: str,
+        order_id: UUID,
+        status: ProcessedOrderStatus = ProcessedOrderStatus.CANCELLED,
+    ) -> Order | None:
+        order = self.order_books[contract_id].cancel_order(order_id, status)
+        if order is None:
+            order = self.stop_books[contract_id].cancel_order(order_id, status)
+        if order is not None:
+            self.closed_orders.add(order)
+        return order
+
+    def _cancel_all(self, contract_id: str, trader_id: UUID) -> list[Order]:
+        orders = self.order_books[contract_id].cancel_all(trader_id)
+        orders.extend(self.stop_books[contract_id].cancel_all(trader_id))
+        for order in orders:
+            self.closed_orders.add(order)
+        return orders
+
+    def _execute(self, order: Order, order_book: OrderBook) -> list[TradeRecord]:
+        """Match an order against its book and rest what remains of it."""
+        trades = self._match(order, order_book)
+        self._rest(order, order_book)
+        return trades
 
-        return order.id
+    def _trigger(
+        self, order_book: OrderBook, trades: list[TradeRecord]
+    ) -> list[TradeRecord]:
+        """
+        Execute the stop orders triggered by `trades`, and in turn those
+        triggered by the trades of these, and return all their trades.
+        """
+        stop_book = self.stop_books[order_book.contract_id]
+        stop_book.last_price = trades[-1].price
+        if not stop_book:
+            return []
+
+        triggered_trades = []
+        # Each round only takes the stops in the range of prices newly traded
+        # through, so a cascade costs a range query per round, not a scan
+        while orders := stop_book.pop_triggered():
+            for order in orders:
+                logger.debug("Triggered stop order with ID {}", order.id)
+                trades = self._execute(order, order_book)
+                if trades:
+                    stop_book.last_price = trades[-1].price
+                    triggered_trades.extend(trades)
+
+        return triggered_trades
+
+    def _match(
+        self,
+        order: Order,
+        order_book: OrderBook,
+        risk_check: RiskCheck | None = None,
+    ) -> list[TradeRecord]:
+        """
+        Match an order against its book. A stop order whose stop price has
+        not been traded through yet is put in the stop book instead. With a
+        `risk_check`, the order is checked against the risk limits first (a
+        stop order when it is placed, not when triggered, the stops waiting
+        counting towards the position of every order checked). An order with
+        the ID of one resting (or waiting) in any book is rejected.
+        """
+        # Orders are found by ID alone (see `get_order`), across contracts
+        if order.id in self.contract_index:
+            raise ValueError(f"Order {order.id} is already in a book")
 
-    def get_orders(self, contract_id: ContractCode) -> list[Order]:
-        return self.order_books[contract_id].get_orders()
+        if order.remaining_quantity is None:
+            order.remaining_quantity = order.quantity
 
-    def get_trades(self, contract_id: ContractCode) -> list[Trade]:
-        return [trade for trade in self.trades if trade.contract_id == contract_id]
+        if order.time_in_force in EXPIRING:
+            self._set_expiry(order)
+        elif order.expires_at is not None:
+            raise ValueError("Only good-till-date and day orders expire")
+
+        # Checked before any resting order is touched, the remainder of the
+        # order being rested only after matching
+        if order.price is not None and order.type in (
+            OrderType.LIMIT,
+            OrderType.STOP_LIMIT,
+        ):
+            order_book.check_price(order_book.scale.to_ticks(order.price))
+
+        if order.type in STOP_TYPES:
+            if order.stop_price is None:
+                raise ValueError("Stop orders must have a stop price")
+            if order.type == OrderType.STOP_LIMIT and order.price is None:
+                raise ValueError("Order must have a price")
+
+            stop_book = self.stop_books[order_book.contract_id]
+            if not stop_book.triggers(
+                order.side, order_book.scale.to_ticks(order.stop_price)
+            ):
+                price = None
+                if order.type == OrderType.STOP_LIMIT:
+                    assert order.price is not None
+                    price = order_book.scale.to_ticks(order.price)
+                if risk_check is not None:
+                    risk_check.check(
+                        order_book.get_exposure(order.trader_id),
+                        order.side,
+                        price,
+                        order_book.scale.to_lots(order.remaining_quantity),
+                        waiting=stop_book.waiting(order.trader_id, order.side),
+                    )
+                stop_book.add_order(order)
+                self._schedule(order)
+                return []
+            order.type = TRIGGERED_TYPES[order.type]
+
+        if order.type == OrderType.LIMIT and order.price is None:
+            raise ValueError("Order must have a price")
+
+        # A fill-or-kill order that cannot be filled in full is cancelled
+        # before any resting order is touched, rather than rolled back
+        if order.time_in_force == TimeInForce.FOK and not order_book.can_fill(
+            order.side,
+            (
+                order_book.scale.to_ticks(order.price)
+                if order.type == OrderType.LIMIT and order.price is not None
+                else None
+            ),
+            order_book.scale.to_lots(order.remaining_quantity),
+        ):
+            order.status = ProcessedOrderStatus.CANCELLED
+            return []
 
-    def _match_buy_order(self, buy_order: Order) -> list[Trade]:
+        # Try to match the order first
+        if order.side == OrderSide.BUY:
+            return self._match_buy_order(order, order_book, risk_check)
+        return self._match_sell_order(order, order_book, risk_check)
+
+    def _rest(self, order: Order, order_book: OrderBook) -> None:
+        """
+        Add what remains of a matched limit order to its book. What remains of
+        a market order, or of an immediate-or-cancel or fill-or-kill order,
+        never rests: it is cancelled.
+        """
+        assert order.remaining_quantity is not None
+        # Stop orders waiting for their trigger are in the stop book already
+        if order.type in STOP_TYPES:
+            return
+        if order.remaining_quantity > 0:
+            if order.type == OrderType.LIMIT and order.time_in_force not in (
+                TimeInForce.IOC,
+                TimeInForce.FOK,
+            ):
+                order_book.add_order(order)
+                self._schedule(order)
+            else:
+                order.status = ProcessedOrderStatus.CANCELLED
+        if isinstance(order.status, ProcessedOrderStatus):
+            self.closed_orders.add(order)
+
+    def _set_expiry(self, order: Order) -> None:
+        """Check the expiry time of an order, or set that of a day order."""
+        placed_at = _as_utc(order.placed_at)
+        if order.time_in_force == TimeInForce.DAY:
+            close = datetime.combine(placed_at.date(), self.session_close, UTC)
+            if close <= placed_at:
+                close += timedelta(days=1)
+            order.expires_at = close
+        elif order.expires_at is None:
+            raise ValueError("Good-till-date orders must have an expiry time")
+        else:
+            order.expires_at = _as_utc(order.expires_at)
+            if order.expires_at <= placed_at:
+                raise ValueError("Order expires before it is placed")
+
+    def _match_buy_order(
+        self,
+        buy_order: Order,
+        order_book: OrderBook,
+        risk_check: RiskCheck | None = None,
+    ) -> list[TradeRecord]:
         trades = []
-        order_book = self.order_books[buy_order.contract_id]
-
-        while buy_order.remaining_quantity and buy_order.remaining_quantity > 0:
+        scale = order_book.scale
+
+        # Match in the book's units, converting back only for the incoming order
+        assert buy_order.remaining_quantity is not None
+        remaining = quantity = scale.to_lots(buy_order.remaining_quantity)
+        limit_price = (
+            scale.to_ticks(buy_order.price)
+            if buy_order.type == OrderType.LIMIT and buy_order.price is not None
+            else None
+        )
+        exposure = (
+            order_book.get_exposure(buy_order.trader_id)
+            if order_book.exposures is not None
+            else None
+        )
+        if risk_check is not None:
+            risk_check.check(
+                exposure,
+                buy_order.side,
+                limit_price,
+                quantity,
+                waiting=self.stop_books[order_book.contract_id].waiting(
+                    buy_order.trader_id, buy_order.side
+                ),
+            )
+
+        while remaining > 0:
             # Check if there are any asks to match against
-            if not order_book.asks or not order_book.ask_queues:
+            best_ask_price = order_book.best_ask()
+            if best_ask_price is None:
                 break
 
-            best_ask_price = order_book.asks.keys()[0]
-
             # For limit orders, check if the price is acceptable
-            if buy_order.type == OrderType.LIMIT and best_ask_price > buy_order.price:
+            if limit_price is not None and best_ask_price > limit_price:
                 break
 
             # Match against the best ask price
-            ask_queue = order_book.ask_queues[best_ask_price]
-            while ask_queue and buy_order.remaining_quantity > 0:
-                sell_order = ask_queue[0]
+            ask_queue = order_book.get_level(OrderSide.SELL, best_ask_price)
+            while ask_queue and remaining > 0:
+                sell_order = ask_queue.peek()
 
                 # Calculate trade quantity
-                trade_quantity = min(
-                    buy_order.remaining_quantity, sell_order.remaining_quantity
-                )
+                trade_quantity = min(remaining, sell_order.remaining)
 
                 # Create and record the trade
-                trade = Trade(
+                trade = TradeRecord(
                     contract_id=order_book.contract_id,
                     buy_order_id=buy_order.id,
                     sell_order_id=sell_order.id,
@@ -92,63 +902,77 @@ class MatchingEngine:
                 )
                 trades.append(trade)
 
-                # Update order quantities
-                buy_order.remaining_quantity -= trade_quantity
-                sell_order.remaining_quantity -= trade_quantity
-
-                # Update order statuses
-                if sell_order.remaining_quantity == 0:
-                    sell_order.status = ProcessedOrderStatus.FILLED
-                    ask_queue.pop(0)
-                    order_book.orders_by_id.pop(sell_order.id)
-                else:
-                    sell_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-                if buy_order.remaining_quantity == 0:
-                    buy_order.status = ProcessedOrderStatus.FILLED
-                else:
-                    buy_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-            # If ask queue is empty, remove the price level
-            if not ask_queue:
-                order_book.ask_queues.pop(best_ask_price)
-                order_book.asks.pop(best_ask_price)
+                # Update order quantities and statuses (the book drops the
+                # resting order, and its price level, once filled)
+                remaining -= trade_quantity
+                order_book.fill(sell_order, trade_quantity)
+                if sell_order.remaining == 0:
+                    self.closed_orders.add(sell_order)
 
         if len(trades) > 0:
-            logger.debug(f"Matched order with ID {buy_order.id}")
-            logger.debug(f"Generated {len(trades)} trades:")
-            for trade in trades:
-                logger.debug(trade)
+            if exposure is not None:
+                exposure.position += quantity - remaining
+            buy_order.remaining_quantity = scale.to_quantity(remaining)
+            if remaining == 0:
+                buy_order.status = ProcessedOrderStatus.FILLED
+            else:
+                buy_order.status = OpenOrderStatus.PARTIALLY_FILLED
 
         return trades
 
-    def _match_sell_order(self, sell_order: Order) -> list[Trade]:
+    def _match_sell_order(
+        self,
+        sell_order: Order,
+        order_book: OrderBook,
+        risk_check: RiskCheck | None = None,
+    ) -> list[TradeRecord]:
         trades = []
-        order_book = self.order_books[sell_order.contract_id]
-
-        while sell_order.remaining_quantity and sell_order.remaining_quantity > 0:
+        scale = order_book.scale
+
+        # Match in the book's units, converting back only for the incoming order
+        assert sell_order.remaining_quantity is not None
+        remaining = quantity = scale.to_lots(sell_order.remaining_quantity)
+        limit_price = (
+            scale.to_ticks(sell_order.price)
+            if sell_order.type == OrderType.LIMIT and sell_order.price is not None
+            else None
+        )
+        exposure = (
+            order_book.get_exposure(sell_order.trader_id)
+            if order_book.exposures is not None
+            else None
+        )
+        if risk_check is not None:
+            risk_check.check(
+                exposure,
+                sell_order.side,
+                limit_price,
+                quantity,
+                waiting=self.stop_books[order_book.contract_id].waiting(
+                    sell_order.trader_id, sell_order.side
+                ),
+            )
+
+        while remaining > 0:
             # Check if there are any bids to match against
-            if not order_book.bids or not order_book.bid_queues:
+            best_bid_price = order_book.best_bid()
+            if best_bid_price is None:
                 break
 
-            best_bid_price = -order_book.bids.keys()[0]  # Convert back from negative
-
             # For limit orders, check if the price is acceptable
-            if sell_order.type == OrderType.LIMIT and best_bid_price < sell_order.price:
+            if limit_price is not None and best_bid_price < limit_price:
                 break
 
             # Match against the best bid price
-            bid_queue = order_book.bid_queues[best_bid_price]
-            while bid_queue and sell_order.remaining_quantity > 0:
-                buy_order = bid_queue[0]
+            bid_queue = order_book.get_level(OrderSide.BUY, best_bid_price)
+            while bid_queue and remaining > 0:
+                buy_order = bid_queue.peek()
 
                 # Calculate trade quantity
-                trade_quantity = min(
-                    sell_order.remaining_quantity, buy_order.remaining_quantity
-                )
+                trade_quantity = min(remaining, buy_order.remaining)
 
                 # Create and record the trade
-                trade = Trade(
+                trade = TradeRecord(
                     contract_id=sell_order.contract_id,
                     buy_order_id=buy_order.id,
                     sell_order_id=sell_order.id,
@@ -157,33 +981,25 @@ class MatchingEngine:
                 )
                 trades.append(trade)
 
-                # Update order quantities
-                sell_order.remaining_quantity -= trade_quantity
-                buy_order.remaining_quantity -= trade_quantity
-
-                # Update order statuses
-                if buy_order.remaining_quantity == 0:
-                    buy_order.status = ProcessedOrderStatus.FILLED
-                    bid_queue.pop(0)
-                    order_book.orders_by_id.pop(buy_order.id)
-                else:
-                    buy_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-                if sell_order.remaining_quantity == 0:
-                    sell_order.status = ProcessedOrderStatus.FILLED
-                else:
-                    sell_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-            # If bid queue is empty, remove the price level
-            if not bid_queue:
-                order_book.bid_queues.pop(best_bid_price)
-                order_book.bids.pop(-best_bid_price)
-
-        # Temp
+                # Update order quantities and statuses (the book drops the
+                # resting order, and its price level, once filled)
+                remaining -= trade_quantity
+                order_book.fill(buy_order, trade_quantity)
+                if buy_order.remaining == 0:
+                    self.closed_orders.add(buy_order)
+
         if len(trades) > 0:
-            logger.debug(f"Matched order with ID {sell_order.id}")
-            logger.debug(f"Generated {len(trades)} trades:")
-            for trade in trades:
-                logger.debug(trade)
+            if exposure is not None:
+                exposure.position -= quantity - remaining
+            sell_order.remaining_quantity = scale.to_quantity(remaining)
+            if remaining == 0:
+                sell_order.status = ProcessedOrderStatus.FILLED
+            else:
+                sell_order.status = OpenOrderStatus.PARTIALLY_FILLED
 
         return trades
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Naive times are taken to be in UTC, as in the journal
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
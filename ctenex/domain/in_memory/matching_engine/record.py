@@ -0,0 +1,104 @@
+from datetime import UTC, datetime
+from time import time
+from uuid import UUID, uuid4
+
+from ctenex.domain.in_memory.order_book.scale import Scale, Units
+from ctenex.domain.order_book.order.model import Order
+from ctenex.domain.order_book.trade.model import Trade
+
+
+class TradeRecord:
+    """
+    Compact record of a trade generated by the in-memory engine.
+
+    Price and quantity are kept in the units of the book that generated the
+    trade. The trade ID is only drawn the first time the record is converted
+    with `to_trade`, so trades that are never read cost no UUID generation.
+    The sequence number is assigned by the `TradeLog` the trade is appended to.
+    """
+
+    __slots__ = (
+        "id",
+        "sequence",
+        "contract_id",
+        "buy_order_id",
+        "sell_order_id",
+        "price",
+        "quantity",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        contract_id: str,
+        buy_order_id: UUID,
+        sell_order_id: UUID,
+        price: Units,
+        quantity: Units,
+    ):
+        self.id: UUID | None = None
+        self.sequence = 0
+        self.contract_id = contract_id
+        self.buy_order_id = buy_order_id
+        self.sell_order_id = sell_order_id
+        self.price = price
+        self.quantity = quantity
+        self.timestamp = time()
+
+    def __repr__(self) -> str:
+        return (
+            "TradeRecord("
+            f"contract_id={self.contract_id}, "
+            f"buy_order_id={self.buy_order_id}, "
+            f"sell_order_id={self.sell_order_id}, "
+            f"price={self.price}, "
+            f"quantity={self.quantity}"
+            ")"
+        )
+
+    def to_trade(self, scale: Scale) -> Trade:
+        if self.id is None:
+            self.id = uuid4()
+
+        return Trade(
+            id=self.id,
+            contract_id=self.contract_id,
+            buy_order_id=self.buy_order_id,
+            sell_order_id=self.sell_order_id,
+            price=scale.to_price(self.price),
+            quantity=scale.to_quantity(self.quantity),
+            generated_at=datetime.fromtimestamp(self.timestamp, UTC),
+        )
+
+
+class OrderResult:
+    """
+    Outcome of one order of a batch submitted to the in-memory engine.
+
+    Holds the order (its status and remaining quantity updated by matching),
+    the records of the trades it generated, in the units of its book, and the
+    reason it was rejected, if it was (with the error itself, if raised by the
+    engine, e.g. a `RiskLimitError`).
+    """
+
+    __slots__ = ("order", "trades", "scale", "error", "exception")
+
+    def __init__(
+        self,
+        order: Order,
+        trades: list[TradeRecord],
+        scale: Scale | None = None,
+        error: str | None = None,
+        exception: Exception | None = None,
+    ):
+        self.order = order
+        self.trades = trades
+        self.scale = scale
+        self.error = error
+        self.exception = exception
+
+    def get_trades(self) -> list[Trade]:
+        if self.scale is None:
+            return []
+
+        return [trade.to_trade(self.scale) for trade in self.trades]
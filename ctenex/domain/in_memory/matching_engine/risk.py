@@ -0,0 +1,111 @@
+from decimal import Decimal
+from typing import NamedTuple
+
+from ctenex.domain.entities import OrderSide
+from ctenex.domain.exceptions import (
+    OpenNotionalLimitError,
+    OrderSizeLimitError,
+    PositionLimitError,
+)
+from ctenex.domain.in_memory.order_book.exposure import Exposure
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import Scale, Units
+
+# The exposure of a trader without any, never updated
+NO_EXPOSURE = Exposure()
+
+
+class RiskLimits(NamedTuple):
+    """
+    Pre-trade limits applied to every trader, per contract (None for none):
+
+    - max_order_quantity: quantity of a single order
+    - max_open_notional: price times remaining quantity of the trader's
+      resting orders, the new order included
+    - max_position: net position the trader would reach if all of their
+      resting orders and waiting stop orders on one side, and the new order,
+      were filled
+    """
+
+    max_order_quantity: Decimal | None = None
+    max_open_notional: Decimal | None = None
+    max_position: Decimal | None = None
+
+
+class RiskCheck:
+    """
+    `RiskLimits` converted to the units of one book, checked against the
+    exposures the book keeps (see `OrderBook.track_exposure`): a check is a
+    handful of comparisons, whatever the number of orders of the trader.
+    """
+
+    __slots__ = ("limits", "max_quantity", "max_notional", "max_position")
+
+    def __init__(self, limits: RiskLimits, scale: Scale):
+        self.limits = limits
+
+        # Limits are rounded down to whole units, so never loosened
+        ticked = scale.tick_size is not None
+        lot = scale.to_quantity(1)
+        notional = scale.to_price(1) * lot
+
+        def to_units(limit: Decimal | None, unit: Decimal) -> Units | None:
+            if limit is None:
+                return None
+            return int(limit / unit) if ticked else limit
+
+        self.max_quantity = to_units(limits.max_order_quantity, lot)
+        self.max_notional = to_units(limits.max_open_notional, notional)
+        self.max_position = to_units(limits.max_position, lot)
+
+    def check(
+        self,
+        exposure: Exposure | None,
+        side: OrderSide,
+        price: Units | None,
+        quantity: Units,
+        replacing: OrderRecord | None = None,
+        waiting: Units = 0,
+    ) -> None:
+        """
+        Raise a `RiskLimitError` if an order of `quantity` at `price` (None
+        for a market order, which never rests) would breach a limit, given
+        the trader's `exposure` and the quantity of their stop orders
+        `waiting` on the side of the order. An amended order is checked in
+        place of the resting order it is `replacing`.
+        """
+        if self.max_quantity is not None and quantity > self.max_quantity:
+            raise OrderSizeLimitError(
+                f"Order quantity exceeds the limit of {self.limits.max_order_quantity}"
+            )
+
+        if exposure is None:
+            exposure = NO_EXPOSURE
+        freed_quantity: Units = 0
+        freed_notional: Units = 0
+        if replacing is not None:
+            freed_quantity = replacing.remaining
+            freed_notional = replacing.price * replacing.remaining
+
+        if self.max_position is not None:
+            # Only the worst case on the side of the order grows: a sell is
+            # never rejected for the long position, nor a buy for the short
+            if side == OrderSide.BUY:
+                position = exposure.position + exposure.bids - freed_quantity
+                position += waiting + quantity
+            else:
+                position = exposure.asks - exposure.position - freed_quantity
+                position += waiting + quantity
+            if position > self.max_position:
+                raise PositionLimitError(
+                    f"Order could take the position beyond the limit of "
+                    f"{self.limits.max_position}"
+                )
+
+        if self.max_notional is not None and price is not None:
+            notional = exposure.notional - freed_notional + price * quantity
+            if notional > self.max_notional:
+                raise OpenNotionalLimitError(
+                    f"Order takes the open notional beyond the limit of "
+                    f"{self.limits.max_open_notional}"
+                )
@@ -0,0 +1,174 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import SimpleQueue
+from threading import Thread
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# Command telling the matching thread to exit, once the commands before it ran
+_STOP = object()
+
+
+class Sequencer:
+    """
+    Single-threaded sequencer in front of an in-memory matching engine.
+
+    Commands (any callable touching the engine, e.g. `engine.add_order`) are
+    queued, in arrival order, to one dedicated matching thread which runs them
+    one at a time. The engine and its books are thus only ever accessed from
+    that thread: there is no lock to contend on, and orders are matched in the
+    order in which they were submitted, whatever the number of callers.
+
+    Callers either block on the future returned by `submit` or, from async
+    code, await `execute`.
+
+    Commands run in batches: whatever is queued, up to `batch_size` commands,
+    runs before `on_batch` is called once (e.g. to commit the engine's
+    journal) and only then are the results of the batch handed to their
+    callers. No caller thus sees the result of a command before its batch is
+    committed, and a burst of commands costs a single commit.
+    """
+
+    def __init__(
+        self,
+        name: str = "matching-engine",
+        on_batch: Callable[[], None] | None = None,
+        batch_size: int = 1_000,
+    ):
+        self.name = name
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self._commands: SimpleQueue = SimpleQueue()
+        self._thread: Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the matching thread."""
+        if self.running:
+            raise RuntimeError(f"Sequencer {self.name} is already running")
+
+        self._thread = Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Run the commands already queued, then stop the matching thread."""
+        if self._thread is None:
+            return
+
+        self._commands.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, command: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+        """Queue a command and return the future of its result."""
+        if not self.running:
+            raise RuntimeError(f"Sequencer {self.name} is not running")
+
+        future: Future = Future()
+        self._commands.put((future, command, args, kwargs))
+        return future
+
+    async def execute(self, command: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Queue a command and wait, without blocking the event loop, for its result."""
+        return await asyncio.wrap_future(self.submit(command, *args, **kwargs))
+
+    def _run(self) -> None:
+        logger.debug("Sequencer {} started", self.name)
+
+        commands = self._commands
+        stopping = False
+        while not stopping:
+            batch: list[tuple[Future, Any, BaseException | None]] = []
+
+            # Block for the first command, then take whatever else is queued
+            item = commands.get()
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+
+                future, command, args, kwargs = item
+                if future.set_running_or_notify_cancel():
+                    try:
+                        batch.append((future, command(*args, **kwargs), None))
+                    except BaseException as e:
+                        batch.append((future, None, e))
+
+                if len(batch) >= self.batch_size or commands.empty():
+                    break
+                item = commands.get()
+
+            self._complete(batch)
+
+        logger.debug("Sequencer {} stopped", self.name)
+
+    def _complete(self, batch: list[tuple[Future, Any, BaseException | None]]) -> None:
+        if self.on_batch is not None:
+            try:
+                self.on_batch()
+            except BaseException as e:
+                logger.exception("Sequencer {} failed to complete a batch", self.name)
+                for future, _, _ in batch:
+                    future.set_exception(e)
+                return
+
+        for future, result, error in batch:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+class Dispatcher:
+    """
+    Sequencer-like front for an engine that takes calls from many threads at
+    once, such as a `ShardedMatchingEngine`: each of its shards runs its own
+    calls in the order they reach it.
+
+    Commands run on a pool of up to `workers` threads instead of a single
+    matching thread, each waiting only on the shards it calls, so that the
+    calls to one shard do not queue behind those to the others. Commands
+    submitted concurrently may reach a shard in either order; those a caller
+    awaits one after the other run in that order.
+    """
+
+    def __init__(self, name: str = "matching-engine", workers: int = 32):
+        self.name = name
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Start the pool of threads."""
+        if self.running:
+            raise RuntimeError(f"Dispatcher {self.name} is already running")
+
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix=self.name)
+
+    def stop(self) -> None:
+        """Run the commands already submitted, then stop the pool of threads."""
+        if self._executor is None:
+            return
+
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def submit(self, command: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+        """Submit a command and return the future of its result."""
+        if self._executor is None:
+            raise RuntimeError(f"Dispatcher {self.name} is not running")
+
+        return self._executor.submit(command, *args, **kwargs)
+
+    async def execute(self, command: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Submit a command and wait, without blocking the event loop, for its result."""
+        return await asyncio.wrap_future(self.submit(command, *args, **kwargs))
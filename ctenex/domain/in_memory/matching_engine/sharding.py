@@ -0,0 +1,498 @@
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import Future
+from datetime import UTC, datetime, time
+from decimal import Decimal
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from threading import Lock, Thread
+from typing import Any, Callable, Iterable, Mapping, Type
+from uuid import UUID, uuid4
+
+from loguru import logger
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import (
+    OpenOrderStatus,
+    OrderStatus,
+    OrderType,
+    ProcessedOrderStatus,
+)
+from ctenex.domain.in_memory.journal.codec import decode, encode_add
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.record import OrderResult, TradeRecord
+from ctenex.domain.in_memory.matching_engine.risk import RiskLimits
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.in_memory.order_book.scale import DecimalScale, Scale, TickScale
+from ctenex.domain.latency.model import LatencyRecorder
+from ctenex.domain.latency.schemas import LatencyGetResponse
+from ctenex.domain.order_book.contract.model import Contract
+from ctenex.domain.order_book.depth.schemas import (
+    DepthGetResponse,
+    TopOfBookGetResponse,
+)
+from ctenex.domain.order_book.order.model import Order
+from ctenex.domain.order_book.trade.model import Trade
+
+STATUSES: tuple[OrderStatus, ...] = (*OpenOrderStatus, *ProcessedOrderStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+TYPES: tuple[OrderType, ...] = tuple(OrderType)
+TYPE_CODES = {type: code for code, type in enumerate(TYPES)}
+
+
+class Shard:
+    """Worker process running the books of some contracts, and its channel."""
+
+    __slots__ = ("index", "process", "connection", "lock", "pending", "reader")
+
+    def __init__(self, index: int, process: BaseProcess, connection: Connection):
+        self.index = index
+        self.process = process
+        self.connection = connection
+        # Requests are pipelined: sent as they come, without waiting for the
+        # answers to those before, which come back in the same order and are
+        # handed to the futures queued along with the requests
+        self.lock = Lock()
+        self.pending: deque[Future] = deque()
+        self.reader = Thread(
+            target=self._read, name=f"matching-shard-{index}", daemon=True
+        )
+        self.reader.start()
+
+    def request(self, method: str, *args: Any) -> Future:
+        """Send a call to the shard and return the future of its result."""
+        future: Future = Future()
+        with self.lock:
+            self.pending.append(future)
+            self.connection.send((method, args))
+        return future
+
+    def call(self, method: str, *args: Any) -> Any:
+        return self.request(method, *args).result()
+
+    def stop(self, timeout: float | None) -> None:
+        with self.lock:
+            self.connection.send(None)
+        self.process.join(timeout)
+        self.reader.join(timeout)
+        self.connection.close()
+
+    def _read(self) -> None:
+        while True:
+            try:
+                result, error = self.connection.recv()
+            except (EOFError, OSError):
+                break
+
+            future = self.pending.popleft()
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+        # The shard stopped: fail the calls it will not answer
+        while self.pending:
+            self.pending.popleft().set_exception(
+                RuntimeError(f"Matching shard {self.index} stopped")
+            )
+
+
+class ShardedMatchingEngine:
+    """
+    In-memory matching engine spread over a pool of worker processes.
+
+    Contracts are assigned round-robin to `shards` processes, each running a
+    `MatchingEngine` for its own contracts only, so that contracts match in
+    parallel rather than sharing a single core (and GIL). Every call is routed,
+    over a pipe, to the shard owning its contract, where calls run one at a
+    time in arrival order. Calls from several threads are pipelined, several
+    at a time in flight to a shard, rather than waiting on each other. A batch
+    (see `add_orders`) is split per shard and all of its parts are matched at
+    once.
+
+    Orders are copied to their shard: unlike with a `MatchingEngine`, the
+    models passed in are updated with the outcome of matching them, but not
+    with that of later orders (query the engine instead). The shards do not
+    journal their commands.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        max_trades: int | None = None,
+        max_trade_age: float | None = None,
+        log_level: str | None = "DEBUG",
+        latency_histograms: bool = True,
+        session_close: time = time(0),
+        risk_limits: RiskLimits | None = None,
+        max_closed_orders: int | None = 10_000,
+    ):
+        """
+        The shard processes log to stderr from `log_level` on (not at all if
+        None), loguru's configuration not being inherited by them, and record
+        latency histograms if `latency_histograms`. Their day orders expire at
+        `session_close`, their orders are checked against `risk_limits`, if
+        any, and each keeps up to `max_closed_orders` closed orders (see
+        `MatchingEngine`).
+        """
+        if shards < 1:
+            raise ValueError("The engine needs at least one shard")
+
+        self.shards = shards
+        self.max_trades = max_trades
+        self.max_trade_age = max_trade_age
+        self.log_level = log_level
+        self.latency_histograms = latency_histograms
+        self.session_close = session_close
+        self.risk_limits = risk_limits
+        self.max_closed_orders = max_closed_orders
+        self.shard_of: dict[str, Shard] = {}
+        self.scales: dict[str, Scale] = {}
+        self._shards: list[Shard] = []
+
+    def start(
+        self,
+        contract_codes: Iterable[str] = ContractCode,
+        contracts: Iterable[Contract] = (),
+        order_book_types: Mapping[str, Type[OrderBook]] | None = None,
+        tick_sizes: Mapping[str, Decimal] | None = None,
+    ):
+        """
+        Start the shard processes and create the order books of all contract
+        codes in them (see `MatchingEngine.start`).
+        """
+        codes = list(contract_codes)
+        contracts = list(contracts)
+        tick_sizes = {
+            **{contract.external_id: contract.tick_size for contract in contracts},
+            **(tick_sizes or {}),
+        }
+        # The units the books of the shards match on, as chosen by their engine
+        for code in codes:
+            tick_size = tick_sizes.get(code)
+            self.scales[code] = (
+                DecimalScale() if tick_size is None else TickScale(tick_size)
+            )
+        # Processes are spawned rather than forked: the parent may be running
+        # threads (e.g. a server's), which a fork would not carry over safely
+        context = multiprocessing.get_context("spawn")
+
+        for index in range(self.shards):
+            shard_codes = codes[index :: self.shards]
+            connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=serve,
+                args=(
+                    child_connection,
+                    shard_codes,
+                    dict(order_book_types or {}),
+                    {c: tick_sizes[c] for c in shard_codes if c in tick_sizes},
+                    self.max_trades,
+                    self.max_trade_age,
+                    self.log_level,
+                    self.latency_histograms,
+                    self.session_close,
+                    self.risk_limits,
+                    self.max_closed_orders,
+                ),
+                name=f"matching-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+
+            shard = Shard(index, process, connection)
+            self._shards.append(shard)
+            for code in shard_codes:
+                self.shard_of[code] = shard
+
+        logger.info(
+            "Started {} matching shards for {} contracts", self.shards, len(codes)
+        )
+
+    def stop(self, timeout: float | None = 5):
+        """Stop the shard processes, dropping their books."""
+        for shard in self._shards:
+            shard.stop(timeout)
+
+        self._shards.clear()
+        self.shard_of.clear()
+        self.scales.clear()
+
+    def add_order(self, order: Order) -> UUID:
+        """Add an order to its book, raising if it is rejected."""
+        (result,) = self.add_orders([order])
+        if result.exception is not None:
+            raise result.exception
+        if result.error is not None:
+            raise ValueError(result.error)
+        return order.id
+
+    def add_orders(self, orders: Iterable[Order]) -> list[OrderResult]:
+        """
+        Validate and match a batch of orders (see `MatchingEngine.add_orders`).
+        The orders of each shard are sent at once, and matched in parallel
+        with those of the other shards.
+        """
+        results: list[OrderResult | None] = []
+        batches: dict[Shard, tuple[list[int], list[Order]]] = {}
+        for order in orders:
+            shard = self.shard_of.get(order.contract_id)
+            if shard is None:
+                results.append(
+                    OrderResult(
+                        order, [], error=f"Unknown contract: {order.contract_id}"
+                    )
+                )
+                continue
+
+            positions, batch = batches.setdefault(shard, ([], []))
+            positions.append(len(results))
+            batch.append(order)
+            results.append(None)
+
+        # Orders travel in the journal's compact encoding rather than pickled,
+        # which would cost more than matching them
+        data = {
+            shard: b"".join(encode_add(order) for order in batch)
+            for shard, (_, batch) in batches.items()
+        }
+
+        # Sent to every shard before waiting on any of them
+        futures = {shard: shard.request("add_orders", data[shard]) for shard in batches}
+        for shard, future in futures.items():
+            positions, batch = batches[shard]
+            for position, order, outcome in zip(positions, batch, future.result()):
+                results[position] = self._result(order, *outcome)
+
+        return results  # type: ignore[return-value]
+
+    def cancel_order(self, contract_id: str, order_id: UUID) -> Order | None:
+        return self._call(contract_id, "cancel_order", contract_id, order_id)
+
+    def cancel_all(
+        self, trader_id: UUID, contract_id: str | None = None
+    ) -> list[Order]:
+        """
+        Cancel all the orders of a trader (see `MatchingEngine.cancel_all`),
+        in the shard of `contract_id` or, without one, in every shard.
+        """
+        if contract_id is not None:
+            return self._call(contract_id, "cancel_all", trader_id, contract_id)
+        return [
+            order
+            for shard in self._shards
+            for order in self._call_shard(shard, "cancel_all", trader_id)
+        ]
+
+    def amend_order(
+        self,
+        contract_id: str,
+        order_id: UUID,
+        new_quantity: Decimal | None = None,
+        new_price: Decimal | None = None,
+    ) -> Order | None:
+        return self._call(
+            contract_id, "amend_order", contract_id, order_id, new_quantity, new_price
+        )
+
+    def expire_orders(self, now: datetime | None = None) -> list[Order]:
+        """
+        Expire the orders of all shards past their expiry time (see
+        `MatchingEngine.expire_orders`), at the same time in every shard.
+        """
+        now = now if now is not None else datetime.now(UTC)
+        return [
+            order
+            for shard in self._shards
+            for order in self._call_shard(shard, "expire_orders", now)
+        ]
+
+    def get_orders(self, contract_id: str) -> list[Order]:
+        return self._call(contract_id, "get_orders", contract_id)
+
+    def find_contract(self, order_id: UUID) -> str | None:
+        """
+        Return the contract of an order in a book (see
+        `MatchingEngine.find_contract`): each shard only indexes its own
+        orders, so they are asked in turn, each lookup being O(1).
+        """
+        for shard in self._shards:
+            contract_id = self._call_shard(shard, "find_contract", order_id)
+            if contract_id is not None:
+                return contract_id
+        return None
+
+    def get_order(self, order_id: UUID) -> Order | None:
+        """
+        Return an order in a book, or closed recently enough to be kept (see
+        `MatchingEngine.get_order`): the shards are asked in turn, as only
+        the shard of an order keeps it once closed.
+        """
+        for shard in self._shards:
+            order = self._call_shard(shard, "get_order", order_id)
+            if order is not None:
+                return order
+        return None
+
+    def get_stop_orders(self, contract_id: str) -> list[Order]:
+        return self._call(contract_id, "get_stop_orders", contract_id)
+
+    def get_depth(self, contract_id: str, levels: int = 10) -> DepthGetResponse:
+        return self._call(contract_id, "get_depth", contract_id, levels)
+
+    def get_top_of_book(self, contract_id: str) -> TopOfBookGetResponse:
+        return self._call(contract_id, "get_top_of_book", contract_id)
+
+    def get_trades(self, contract_id: str, since: int = 0) -> list[Trade]:
+        return self._call(contract_id, "get_trades", contract_id, since)
+
+    def get_latency(self) -> LatencyGetResponse:
+        """Latency histograms of all shards (see `MatchingEngine.get_latency`)."""
+        return LatencyGetResponse(
+            contracts=[
+                contract
+                for shard in self._shards
+                for contract in self._call_shard(shard, "get_latency").contracts
+            ]
+        )
+
+    def reset_latency(self) -> None:
+        for shard in self._shards:
+            self._call_shard(shard, "reset_latency")
+
+    def _result(
+        self,
+        order: Order,
+        status: int,
+        remaining_quantity: Decimal | None,
+        type: int,
+        expires_at: datetime | None,
+        error: str | None,
+        exception: Exception | None,
+        trades: list[tuple],
+    ) -> OrderResult:
+        """Apply the outcome of matching an order to it, as in its shard."""
+        order.status = STATUSES[status]
+        order.remaining_quantity = remaining_quantity
+        # A triggered stop order changes type, a day order gets its expiry
+        order.type = TYPES[type]
+        order.expires_at = expires_at
+
+        records = []
+        for trade_id, buy_order_id, sell_order_id, *fields in trades:
+            record = TradeRecord(
+                order.contract_id,
+                UUID(bytes=buy_order_id),
+                UUID(bytes=sell_order_id),
+                *fields[:2],
+            )
+            record.id = UUID(bytes=trade_id)
+            record.timestamp, record.sequence = fields[2:]
+            records.append(record)
+
+        scale = self.scales[order.contract_id]
+        return OrderResult(order, records, scale, error, exception)
+
+    def _call(self, contract_id: str, method: str, *args: Any) -> Any:
+        return self._call_shard(self.shard_of[contract_id], method, *args)
+
+    def _call_shard(self, shard: Shard, method: str, *args: Any) -> Any:
+        return shard.call(method, *args)
+
+
+def serve(
+    connection: Connection,
+    contract_codes: list[str],
+    order_book_types: dict[str, Type[OrderBook]],
+    tick_sizes: dict[str, Decimal],
+    max_trades: int | None,
+    max_trade_age: float | None,
+    log_level: str | None,
+    latency_histograms: bool,
+    session_close: time,
+    risk_limits: RiskLimits | None,
+    max_closed_orders: int | None,
+) -> None:
+    """Run the engine of a shard, answering calls until told to stop."""
+    logger.remove()
+    if log_level is not None:
+        logger.add(sys.stderr, level=log_level)
+
+    engine = MatchingEngine(
+        max_trades=max_trades,
+        max_trade_age=max_trade_age,
+        latency=LatencyRecorder(enabled=latency_histograms),
+        session_close=session_close,
+        risk_limits=risk_limits,
+        max_closed_orders=max_closed_orders,
+    )
+    engine.start(
+        contract_codes, order_book_types=order_book_types, tick_sizes=tick_sizes
+    )
+
+    while (request := connection.recv()) is not None:
+        method, args = request
+        try:
+            command = COMMANDS.get(method)
+            result = (
+                command(engine, *args)
+                if command is not None
+                else getattr(engine, method)(*args)
+            )
+        except Exception as e:
+            connection.send((None, e))
+        else:
+            connection.send((result, None))
+
+    engine.stop()
+    connection.close()
+
+
+def add_orders(engine: MatchingEngine, data: bytes) -> list[tuple]:
+    """
+    Match a batch of encoded orders and return the outcome of each: its
+    status, remaining quantity, type, expiry, error and trades, as plain
+    values.
+    """
+    orders = [order for _, order in decode(data, 0, len(data))]
+
+    outcomes = []
+    for result in engine.add_orders(orders):  # type: ignore[arg-type]
+        trades = []
+        for trade in result.trades:
+            # Trade IDs are drawn lazily: draw them here, so that the trades
+            # sent back and those kept in the shard agree
+            if trade.id is None:
+                trade.id = uuid4()
+            trades.append(
+                (
+                    trade.id.bytes,
+                    trade.buy_order_id.bytes,
+                    trade.sell_order_id.bytes,
+                    trade.price,
+                    trade.quantity,
+                    trade.timestamp,
+                    trade.sequence,
+                )
+            )
+
+        order = result.order
+        outcomes.append(
+            (
+                STATUS_CODES[order.status],
+                order.remaining_quantity,
+                TYPE_CODES[order.type],
+                order.expires_at,
+                result.error,
+                result.exception,
+                trades,
+            )
+        )
+
+    return outcomes
+
+
+# Commands run in the shards in place of the engine's method of the same name
+COMMANDS: dict[str, Callable[..., Any]] = {"add_orders": add_orders}
@@ -0,0 +1,106 @@
+from itertools import islice
+from time import time
+from typing import Callable, Iterable, Iterator
+
+from ctenex.domain.in_memory.matching_engine.record import TradeRecord
+
+# Evicted records are only released in bulk, once at least this many of them
+# (and at least as many as are retained) have piled up at the head of the log
+COMPACTION_THRESHOLD = 1_024
+
+
+class TradeLog:
+    """
+    Append-only log of the trades of a single contract, with bounded retention.
+
+    Every trade appended is numbered with the next sequence number of the log
+    (starting from 1), so the position of a trade in the log follows from its
+    sequence number: reading the trades since sequence N costs O(1) plus the
+    trades returned, whatever the history.
+
+    Trades are retained up to `max_trades` of them and for up to `max_age`
+    seconds (either or both may be left unbounded). Older trades are evicted,
+    oldest first, as new trades are appended or the log is read, and handed to
+    `spill`, if given, on their way out. Evicted records are released in bulk,
+    so the log never holds more than about twice its retention.
+    """
+
+    def __init__(
+        self,
+        max_trades: int | None = None,
+        max_age: float | None = None,
+        spill: Callable[[list[TradeRecord]], None] | None = None,
+    ):
+        if max_trades is not None and max_trades < 0:
+            raise ValueError("The number of trades retained cannot be negative")
+        if max_age is not None and max_age < 0:
+            raise ValueError("The age of the trades retained cannot be negative")
+
+        self.max_trades = max_trades
+        self.max_age = max_age
+        self.spill = spill
+
+        self._records: list[TradeRecord] = []
+        # Index of the oldest retained record in `_records`
+        self._start = 0
+
+        self.last_sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._records) - self._start
+
+    def __iter__(self) -> Iterator[TradeRecord]:
+        return islice(self._records, self._start, None)
+
+    @property
+    def first_sequence(self) -> int:
+        """Sequence number of the oldest retained trade (the next one if none)."""
+        return self.last_sequence - len(self) + 1
+
+    def append(self, trades: Iterable[TradeRecord]) -> None:
+        """Number and append trades, in order, then evict what is out of retention."""
+        sequence = self.last_sequence
+        records = self._records
+        for trade in trades:
+            sequence += 1
+            trade.sequence = sequence
+            records.append(trade)
+        self.last_sequence = sequence
+
+        self._evict()
+
+    def since(self, sequence: int) -> list[TradeRecord]:
+        """
+        Return the retained trades numbered after `sequence`, oldest first.
+
+        Trades already evicted are not returned: a caller that is behind can
+        tell it missed some when `first_sequence` is past `sequence + 1`.
+        """
+        self._evict()
+
+        offset = max(sequence + 1 - self.first_sequence, 0)
+        return self._records[self._start + offset :]
+
+    def _evict(self) -> None:
+        records = self._records
+        end = self._start
+
+        if self.max_trades is not None:
+            end = max(end, len(records) - self.max_trades)
+
+        if self.max_age is not None:
+            cutoff = time() - self.max_age
+            while end < len(records) and records[end].timestamp < cutoff:
+                end += 1
+
+        if end == self._start:
+            return
+
+        if self.spill is not None:
+            self.spill(records[self._start : end])
+        self._start = end
+
+        # Release the evicted records once they outnumber the retained ones
+        if end >= COMPACTION_THRESHOLD and 2 * end >= len(records):
+            del records[:end]
+            self._start = 0
@@ -0,0 +1,29 @@
+from ctenex.domain.in_memory.order_book.scale import Units
+
+
+class Exposure:
+    """
+    Exposure of a trader to a single contract, in the units of its book.
+
+    Kept up to date by the book as orders rest, fill and leave it (see
+    `OrderBook.track_exposure`), so that reading it is O(1) whatever the
+    number of orders of the trader:
+
+    - position: quantity bought less quantity sold, over all fills
+    - bids, asks: remaining quantity of the trader's resting orders, per side
+    - notional: sum of price times remaining quantity of the resting orders
+    """
+
+    __slots__ = ("position", "bids", "asks", "notional")
+
+    def __init__(self):
+        self.position: Units = 0
+        self.bids: Units = 0
+        self.asks: Units = 0
+        self.notional: Units = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"Exposure(position={self.position}, bids={self.bids}, "
+            f"asks={self.asks}, notional={self.notional})"
+        )
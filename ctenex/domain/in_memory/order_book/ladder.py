@@ -0,0 +1,253 @@
+from decimal import Decimal
+from typing import Iterator, Mapping
+
+from ctenex.domain.entities import OrderSide
+from ctenex.domain.in_memory.order_book.model import OrderBook, PriceKey
+from ctenex.domain.in_memory.order_book.price_level import PriceLevel
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import TickScale, Units
+
+# Prices are stored as DECIMAL(5, 2) (see `BaseOrder.price`), and market buy
+# orders are booked at this sentinel, so no price can exceed it
+MAX_PRICE = Decimal("999.99")
+
+# Spacing of the ladder for contracts without a tick size: the resolution of
+# a DECIMAL(5, 2) price
+PRICE_TICK = Decimal("0.01")
+
+# Number of ladder slots summarized by one occupancy counter
+BLOCK_SIZE = 64
+
+
+class LadderOrderBook(OrderBook):
+    """
+    In-memory order book indexing its price levels in a preallocated array.
+
+    Prices are bounded (from 0 to `MAX_PRICE`), so each side keeps one slot per
+    possible tick, from which a level is found by index instead of through a
+    `SortedDict`. The best bid and best ask are tracked with a pointer that
+    only moves, away from the spread, when the level it points to empties; so
+    looking up the best price and inserting a level are O(1), and removing the
+    best level is amortized over the gap to the next one.
+
+    Each side also counts the occupied levels in every block of `BLOCK_SIZE`
+    slots, so that moving a pointer across a wide, empty spread skips the
+    empty blocks instead of visiting every tick.
+
+    The ladder costs one slot per tick and side (about 800KB per side with a
+    0.01 tick) whatever the number of resting orders. Prices and quantities
+    are kept in the same units as in `OrderBook`.
+    """
+
+    def __init__(self, contract_id: str, tick_size: Decimal | None = None):
+        super().__init__(contract_id, tick_size=tick_size)
+
+        # Up to the last tick at or below `MAX_PRICE`, which need not be a
+        # multiple of the tick size
+        self._grid = TickScale(tick_size or PRICE_TICK)
+        size = int(MAX_PRICE // self._grid.tick_size) + 1
+
+        self._bid_levels: list[PriceLevel | None] = [None] * size
+        self._ask_levels: list[PriceLevel | None] = [None] * size
+        self._bid_blocks = [0] * (size // BLOCK_SIZE + 1)
+        self._ask_blocks = [0] * (size // BLOCK_SIZE + 1)
+        self._bid_level_count = 0
+        self._ask_level_count = 0
+
+        # Index of the best level of each side (past the ends when empty)
+        self._best_bid = -1
+        self._best_ask = size
+
+        # Read-only views keyed like the `SortedDict` book's, for inspection
+        self.bids = LadderPrices(self, OrderSide.BUY)
+        self.asks = LadderPrices(self, OrderSide.SELL)
+
+    @property
+    def bid_queues(self) -> "LadderQueues":
+        return LadderQueues(self, OrderSide.BUY)
+
+    @property
+    def ask_queues(self) -> "LadderQueues":
+        return LadderQueues(self, OrderSide.SELL)
+
+    def best_bid(self) -> Units | None:
+        """Return the highest bid price (in book units), if any."""
+        if self._best_bid < 0:
+            return None
+
+        level = self._bid_levels[self._best_bid]
+        assert level is not None
+        return level.peek().price
+
+    def best_ask(self) -> Units | None:
+        """Return the lowest ask price (in book units), if any."""
+        if self._best_ask == len(self._ask_levels):
+            return None
+
+        level = self._ask_levels[self._best_ask]
+        assert level is not None
+        return level.peek().price
+
+    def get_level(self, side: OrderSide, price: Units) -> PriceLevel:
+        """Return the queue of `side` orders resting at `price` (in book units)."""
+        levels = self._bid_levels if side == OrderSide.BUY else self._ask_levels
+        return levels[self._index(price)] or PriceLevel()
+
+    def check_price(self, price: Units) -> None:
+        """Raise a `ValueError` if a price (in book units) is off the ladder."""
+        self._index(price)
+
+    def _index(self, price: Units) -> int:
+        """Return the ladder slot of a price given in book units."""
+        index = price if isinstance(price, int) else self._grid.to_ticks(price)
+        if not 0 <= index < len(self._bid_levels):
+            raise ValueError(f"Price {price} is outside the price ladder")
+
+        return index
+
+    def _insert(self, record: OrderRecord) -> None:
+        index = self._index(record.price)
+
+        if record.side == OrderSide.BUY:
+            level = self._bid_levels[index]
+            if level is None:
+                level = self._bid_levels[index] = PriceLevel()
+                self._bid_blocks[index // BLOCK_SIZE] += 1
+                self._bid_level_count += 1
+                if index > self._best_bid:
+                    self._best_bid = index
+        else:
+            level = self._ask_levels[index]
+            if level is None:
+                level = self._ask_levels[index] = PriceLevel()
+                self._ask_blocks[index // BLOCK_SIZE] += 1
+                self._ask_level_count += 1
+                if index < self._best_ask:
+                    self._best_ask = index
+
+        level.append(record)
+
+    def _unlink(self, record: OrderRecord) -> None:
+        index = self._index(record.price)
+
+        if record.side == OrderSide.BUY:
+            level = self._bid_levels[index]
+            assert level is not None
+            level.remove(record)
+            if level:
+                return
+
+            self._bid_levels[index] = None
+            self._bid_blocks[index // BLOCK_SIZE] -= 1
+            self._bid_level_count -= 1
+            if index == self._best_bid:
+                self._best_bid = (
+                    _seek(self._bid_levels, self._bid_blocks, index - 1, -1)
+                    if self._bid_level_count
+                    else -1
+                )
+        else:
+            level = self._ask_levels[index]
+            assert level is not None
+            level.remove(record)
+            if level:
+                return
+
+            self._ask_levels[index] = None
+            self._ask_blocks[index // BLOCK_SIZE] -= 1
+            self._ask_level_count -= 1
+            if index == self._best_ask:
+                self._best_ask = (
+                    _seek(self._ask_levels, self._ask_blocks, index + 1, 1)
+                    if self._ask_level_count
+                    else len(self._ask_levels)
+                )
+
+    def _levels(self, side: OrderSide) -> Iterator[tuple[Units, PriceLevel]]:
+        if side == OrderSide.BUY:
+            remaining, index = self._bid_level_count, self._best_bid
+            levels, step = self._bid_levels, -1
+        else:
+            remaining, index = self._ask_level_count, self._best_ask
+            levels, step = self._ask_levels, 1
+
+        while remaining:
+            level = levels[index]
+            if level is not None:
+                yield level.peek().price, level
+                remaining -= 1
+            index += step
+
+
+def _seek(
+    levels: list[PriceLevel | None], blocks: list[int], index: int, step: int
+) -> int:
+    """
+    Return the first occupied slot from `index` on, moving by `step` (1 or
+    -1), skipping the blocks without any level. One must exist that way.
+    """
+    while True:
+        block = index // BLOCK_SIZE
+        end = block * BLOCK_SIZE + (BLOCK_SIZE if step > 0 else -1)
+        if blocks[block]:
+            while index != end:
+                if levels[index] is not None:
+                    return index
+                index += step
+        else:
+            index = end
+
+
+class LadderPrices:
+    """
+    Sorted view of the prices of one side of a `LadderOrderBook`, keyed like
+    the `SortedDict`s of `OrderBook` (bid prices are negated).
+    """
+
+    def __init__(self, order_book: LadderOrderBook, side: OrderSide):
+        self._order_book = order_book
+        self._side = side
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return next(iter(self), None) is not None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[Units]:
+        sign = -1 if self._side == OrderSide.BUY else 1
+        for price, _ in self._order_book._levels(self._side):
+            yield sign * price
+
+    def keys(self) -> list[Units]:
+        return list(self)
+
+
+class LadderQueues(Mapping[PriceKey, PriceLevel]):
+    """
+    View of the price levels of one side of a `LadderOrderBook` by price, like
+    the `defaultdict`s of `OrderBook` (a missing level reads as empty).
+    """
+
+    def __init__(self, order_book: LadderOrderBook, side: OrderSide):
+        self._order_book = order_book
+        self._side = side
+
+    def __getitem__(self, price: object) -> PriceLevel:
+        for level_price, level in self._order_book._levels(self._side):
+            if level_price == price:
+                return level
+        return PriceLevel()
+
+    def __contains__(self, price: object) -> bool:
+        return any(level_price == price for level_price in self)
+
+    def __iter__(self) -> Iterator[Units]:
+        for price, _ in self._order_book._levels(self._side):
+            yield price
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -1,17 +1,58 @@
 from collections import defaultdict
 from decimal import Decimal
+from itertools import islice
+from typing import Iterable, Iterator, Mapping
 from uuid import UUID
+from weakref import WeakValueDictionary
 
 from sortedcontainers import SortedDict
 
-from ctenex.domain.entities import OrderSide, OrderType, ProcessedOrderStatus
+from ctenex.domain.entities import (
+    OpenOrderStatus,
+    OrderSide,
+    OrderType,
+    ProcessedOrderStatus,
+)
+from ctenex.domain.in_memory.order_book.exposure import Exposure
+from ctenex.domain.in_memory.order_book.price_level import PriceLevel
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import (
+    DecimalScale,
+    Scale,
+    TickScale,
+    Units,
+)
+from ctenex.domain.order_book.depth.schemas import (
+    DepthGetResponse,
+    PriceLevelGetResponse,
+    TopOfBookGetResponse,
+)
 from ctenex.domain.order_book.order.model import Order
 
+# Key of a price level: prices are kept in book units, but a level is found by
+# any number equal to its price, e.g. `bid_queues[100.0]` in Decimal mode
+PriceKey = Units | float
+
 
 class OrderBook:
-    def __init__(self, contract_id: str):
+    """
+    In-memory order book of a single contract.
+
+    Resting orders are kept as compact `OrderRecord`s. The pydantic `Order`
+    models handed to `add_order` are only weakly referenced: as long as a
+    caller holds on to one, its status and remaining quantity are kept in sync
+    with the book, but the book itself never keeps the models alive.
+    """
+
+    def __init__(self, contract_id: str, tick_size: Decimal | None = None):
         self.contract_id = contract_id
 
+        # Prices and quantities are kept as Decimals unless the contract's
+        # tick size is given, in which case they are kept as integer ticks/lots
+        self.scale: Scale = (
+            DecimalScale() if tick_size is None else TickScale(tick_size)
+        )
+
         # Buy orders sorted by price (descending) and then by time (ascending)
         # SortedDict with negative price as key for descending sort
         self.bids = SortedDict()
@@ -19,15 +60,171 @@ class OrderBook:
         # Sell orders sorted by price (ascending) and then by time (ascending)
         self.asks = SortedDict()
 
-        # Time-based queues at each price level
-        self.bid_queues = defaultdict(list)  # price -> list of orders
-        self.ask_queues = defaultdict(list)  # price -> list of orders
+        # Time-based queues at each price level (see `PriceKey`)
+        self._bid_queues: defaultdict[PriceKey, PriceLevel] = defaultdict(PriceLevel)
+        self._ask_queues: defaultdict[PriceKey, PriceLevel] = defaultdict(PriceLevel)
 
         # Fast lookup for orders by ID
-        self.orders_by_id: dict[UUID, Order] = {}
+        self.orders_by_id: dict[UUID, OrderRecord] = {}
+
+        # Resting orders of each trader, in arrival order (see `cancel_all`)
+        self.orders_by_trader: defaultdict[UUID, dict[UUID, OrderRecord]] = defaultdict(
+            dict
+        )
+
+        # Exposure of each trader to the contract, if tracked (see
+        # `track_exposure`), keyed by the integer of the trader's ID: unlike
+        # that of the UUID, its hash and comparison run in C
+        self.exposures: dict[int, Exposure] | None = None
+
+        # Contract of each resting order, in an index shared with the other
+        # books of an engine, if any (see `share_index`)
+        self.contract_index: dict[UUID, str] | None = None
+
+        # Caller-held models of the resting orders, kept in sync while alive
+        self._views: WeakValueDictionary[UUID, Order] = WeakValueDictionary()
+
+    @property
+    def bid_queues(self) -> Mapping[PriceKey, PriceLevel]:
+        """Queues of the bids by price (in book units), for inspection."""
+        return self._bid_queues
+
+    @property
+    def ask_queues(self) -> Mapping[PriceKey, PriceLevel]:
+        """Queues of the asks by price (in book units), for inspection."""
+        return self._ask_queues
+
+    def track_exposure(self) -> None:
+        """
+        Keep the exposure of each trader up to date from now on, as orders
+        rest, fill and leave the book (for pre-trade risk checks). Fills of
+        incoming orders are added by the engine matching them, to the
+        position of the exposure it gets from `get_exposure`.
+        """
+        self.exposures = {}
+        for record in self.orders_by_id.values():
+            record.exposure = None
+            self._expose(record, record.remaining)
+
+    def share_index(self, contract_index: dict[UUID, str]) -> None:
+        """
+        Record the contract of each resting order in `contract_index` from
+        now on, for the orders of all the books sharing it to be found by ID
+        alone.
+        """
+        self.contract_index = contract_index
+        for order_id in self.orders_by_id:
+            contract_index[order_id] = self.contract_id
+
+    def get_exposure(self, trader_id: UUID) -> Exposure:
+        """Return the exposure of a trader, creating it if needed."""
+        assert self.exposures is not None
+        exposure = self.exposures.get(trader_id.int)
+        if exposure is None:
+            exposure = self.exposures[trader_id.int] = Exposure()
+        return exposure
 
     def get_orders(self) -> list[Order]:
-        return list(self.orders_by_id.values())
+        return [record.to_order(self.scale) for record in self.orders_by_id.values()]
+
+    def get_order(self, order_id: UUID) -> Order | None:
+        record = self.orders_by_id.get(order_id)
+        if record is None:
+            return None
+
+        return record.to_order(self.scale)
+
+    def load(self, records: Iterable[OrderRecord]) -> None:
+        """
+        Rest records without matching them (e.g. to restore a book from a
+        snapshot). Records are queued in the order given, which must be the
+        order in which they were added, as in `orders_by_id`.
+        """
+        orders_by_id, orders_by_trader = self.orders_by_id, self.orders_by_trader
+        for record in records:
+            self._insert(record)
+            orders_by_id[record.id] = record
+            orders_by_trader[record.trader_id][record.id] = record
+            if self.contract_index is not None:
+                self.contract_index[record.id] = self.contract_id
+            if self.exposures is not None:
+                self._expose(record, record.remaining)
+
+    def best_bid(self) -> Units | None:
+        """Return the highest bid price (in book units), if any."""
+        return -self.bids.keys()[0] if self.bids else None
+
+    def best_ask(self) -> Units | None:
+        """Return the lowest ask price (in book units), if any."""
+        return self.asks.keys()[0] if self.asks else None
+
+    def get_level(self, side: OrderSide, price: Units) -> PriceLevel:
+        """Return the queue of `side` orders resting at `price` (in book units)."""
+        return (
+            self._bid_queues[price]
+            if side == OrderSide.BUY
+            else self._ask_queues[price]
+        )
+
+    def check_price(self, price: Units) -> None:
+        """
+        Raise a `ValueError` if a price (in book units) cannot rest in the
+        book. Any price can here, but not in every implementation (e.g. a
+        `LadderOrderBook`), so orders are checked before they are matched.
+        """
+
+    def can_fill(self, side: OrderSide, price: Units | None, quantity: Units) -> bool:
+        """
+        Whether an incoming `side` order could be filled in full right away,
+        up to `price` (at any price if None), from the aggregated quantities
+        of the opposite side's levels: O(levels crossed), no order touched.
+        """
+        opposite = OrderSide.SELL if side == OrderSide.BUY else OrderSide.BUY
+        for level_price, level in self._levels(opposite):
+            if price is not None and (
+                level_price > price if side == OrderSide.BUY else level_price < price
+            ):
+                return False
+            quantity -= level.quantity
+            if quantity <= 0:
+                return True
+        return False
+
+    def depth(self, levels: int = 10) -> DepthGetResponse:
+        """
+        Return the aggregated quantity and number of orders at the best
+        `levels` prices of each side, in O(levels).
+        """
+        return DepthGetResponse(
+            contract_id=self.contract_id,
+            bids=[
+                self._summarize(price, level)
+                for price, level in islice(self._levels(OrderSide.BUY), levels)
+            ],
+            asks=[
+                self._summarize(price, level)
+                for price, level in islice(self._levels(OrderSide.SELL), levels)
+            ],
+        )
+
+    def top_of_book(self) -> TopOfBookGetResponse:
+        """Return the aggregated best bid and best ask levels, if any."""
+        best_bid = self.best_bid()
+        best_ask = self.best_ask()
+
+        return TopOfBookGetResponse(
+            contract_id=self.contract_id,
+            best_bid=(
+                self._summarize(best_bid, self.get_level(OrderSide.BUY, best_bid))
+                if best_bid is not None
+                else None
+            ),
+            best_ask=(
+                self._summarize(best_ask, self.get_level(OrderSide.SELL, best_ask))
+                if best_ask is not None
+                else None
+            ),
+        )
 
     def add_order(self, order: Order) -> UUID:
         """Add an order to the appropriate side of the book."""
@@ -40,42 +237,192 @@ class OrderBook:
         elif order.price is None:
             raise ValueError("Order must have a price")
 
-        self.orders_by_id[order.id] = order
+        if order.remaining_quantity is None:
+            order.remaining_quantity = order.quantity
 
-        if order.side == OrderSide.BUY:
-            # Store negative price for descending sort
-            self.bids[-order.price] = True
-            self.bid_queues[order.price].append(order)
-        else:
-            self.asks[order.price] = True
-            self.ask_queues[order.price].append(order)
+        record = OrderRecord.from_order(order, self.scale)
+        self._insert(record)
+
+        self.orders_by_id[order.id] = record
+        self.orders_by_trader[order.trader_id][order.id] = record
+        self._views[order.id] = order
+        if self.contract_index is not None:
+            self.contract_index[order.id] = self.contract_id
+        if self.exposures is not None:
+            self._expose(record, record.remaining)
 
         return order.id
 
-    def cancel_order(self, order_id: UUID) -> Order | None:
-        """Cancel an order and remove it from the book."""
+    def fill(self, record: OrderRecord, quantity: Units) -> None:
+        """
+        Fill `quantity` (in book units) of a resting order, removing it from
+        the book once it is fully filled.
+        """
+        self.get_level(record.side, record.price).fill(record, quantity)
+        if self.exposures is not None:
+            # Inlined, as it runs on every fill: the quantity moves from the
+            # resting orders of the trader to their position
+            exposure = record.exposure
+            assert exposure is not None
+            if record.side == OrderSide.BUY:
+                exposure.bids -= quantity
+                exposure.position += quantity
+            else:
+                exposure.asks -= quantity
+                exposure.position -= quantity
+            exposure.notional -= record.price * quantity
+
+        if record.remaining == 0:
+            record.status = ProcessedOrderStatus.FILLED
+            self._sync_view(record)
+            self._remove(record)
+        else:
+            record.status = OpenOrderStatus.PARTIALLY_FILLED
+            self._sync_view(record)
+
+    def reduce_order(self, record: OrderRecord, quantity: Units) -> None:
+        """
+        Take `quantity` (in book units) off the quantity of a resting order,
+        in place: unlike a cancel and re-add, the order keeps its place in the
+        queue of its price level.
+        """
+        self.get_level(record.side, record.price).fill(record, quantity)
+        record.quantity -= quantity
+        if self.exposures is not None:
+            self._expose(record, -quantity)
+
+        order = self._views.get(record.id)
+        if order is not None:
+            order.quantity = self.scale.to_quantity(record.quantity)
+            order.remaining_quantity = self.scale.to_quantity(record.remaining)
+
+    def withdraw_order(self, order_id: UUID) -> Order | None:
+        """
+        Take an order off the book as it is (e.g. to re-queue it), and return
+        its model: the caller's, if still held, so that it stays in sync once
+        the order is added again.
+        """
+        record = self.orders_by_id.get(order_id)
+        if record is None:
+            return None
+
+        order = self._views.get(order_id)
+        if order is None:
+            order = record.to_order(self.scale)
+        self._remove(record)
+
+        return order
+
+    def cancel_order(
+        self,
+        order_id: UUID,
+        status: ProcessedOrderStatus = ProcessedOrderStatus.CANCELLED,
+    ) -> Order | None:
+        """
+        Cancel an order and remove it from the book, with `status` (e.g.
+        expired rather than cancelled).
+        """
         if order_id not in self.orders_by_id:
             return None
 
-        order = self.orders_by_id[order_id]
+        record = self.orders_by_id[order_id]
+        record.status = status
+        self._sync_view(record)
+        # The caller's model, if still held, is up to date: hand it back
+        # rather than building another one
+        order = self._views.get(order_id)
+        self._remove(record)
 
-        if order.price is None:
-            raise ValueError("Order cannot be cancelled as it has no price")
+        return order if order is not None else record.to_order(self.scale)
 
-        # Remove from price queue
-        if order.side == OrderSide.BUY:
-            self.bid_queues[order.price].remove(order)
-            if not self.bid_queues[order.price]:
-                del self.bid_queues[order.price]
-                del self.bids[-order.price]
+    def cancel_all(self, trader_id: UUID) -> list[Order]:
+        """
+        Cancel all the resting orders of a trader, in arrival order, found
+        through the per-trader index (no scan of the book).
+        """
+        orders = self.orders_by_trader.get(trader_id)
+        if not orders:
+            return []
+
+        return [
+            order
+            for order_id in list(orders)
+            if (order := self.cancel_order(order_id)) is not None
+        ]
+
+    def _insert(self, record: OrderRecord) -> None:
+        """Queue a record at its price level, creating the level if needed."""
+        if record.side == OrderSide.BUY:
+            # Store negative price for descending sort
+            self.bids[-record.price] = True
+            self._bid_queues[record.price].append(record)
+        else:
+            self.asks[record.price] = True
+            self._ask_queues[record.price].append(record)
+
+    def _unlink(self, record: OrderRecord) -> None:
+        """Take a record off its price level, dropping the level once empty."""
+        if record.side == OrderSide.BUY:
+            queue = self._bid_queues[record.price]
+            queue.remove(record)
+            if not queue:
+                del self._bid_queues[record.price]
+                del self.bids[-record.price]
+        else:
+            queue = self._ask_queues[record.price]
+            queue.remove(record)
+            if not queue:
+                del self._ask_queues[record.price]
+                del self.asks[record.price]
+
+    def _levels(self, side: OrderSide) -> Iterator[tuple[Units, PriceLevel]]:
+        """Yield the price levels of one side, best price first."""
+        if side == OrderSide.BUY:
+            for price in self.bids:
+                yield -price, self._bid_queues[-price]
+        else:
+            for price in self.asks:
+                yield price, self._ask_queues[price]
+
+    def _expose(self, record: OrderRecord, quantity: Units) -> None:
+        """
+        Add `quantity` of a resting order to its trader's exposure, which the
+        record keeps from then on (hashing the trader's ID once per order).
+        """
+        exposure = record.exposure
+        if exposure is None:
+            exposure = record.exposure = self.get_exposure(record.trader_id)
+        if record.side == OrderSide.BUY:
+            exposure.bids += quantity
         else:
-            self.ask_queues[order.price].remove(order)
-            if not self.ask_queues[order.price]:
-                del self.ask_queues[order.price]
-                del self.asks[order.price]
+            exposure.asks += quantity
+        exposure.notional += record.price * quantity
+
+    def _remove(self, record: OrderRecord) -> None:
+        self._unlink(record)
+        # What was left of the order (nothing, if it was filled)
+        if self.exposures is not None and record.remaining:
+            self._expose(record, -record.remaining)
 
         # Remove from ID lookup
-        del self.orders_by_id[order_id]
+        del self.orders_by_id[record.id]
+        if self.contract_index is not None:
+            del self.contract_index[record.id]
+        orders = self.orders_by_trader[record.trader_id]
+        del orders[record.id]
+        if not orders:
+            del self.orders_by_trader[record.trader_id]
+        self._views.pop(record.id, None)
 
-        order.status = ProcessedOrderStatus.CANCELLED
-        return order
+    def _summarize(self, price: Units, level: PriceLevel) -> PriceLevelGetResponse:
+        return PriceLevelGetResponse(
+            price=self.scale.to_price(price),
+            quantity=self.scale.to_quantity(level.quantity),
+            orders=len(level),
+        )
+
+    def _sync_view(self, record: OrderRecord) -> None:
+        order = self._views.get(record.id)
+        if order is not None:
+            order.status = record.status
+            order.remaining_quantity = self.scale.to_quantity(record.remaining)
@@ -0,0 +1,92 @@
+from typing import Iterator
+
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import Units
+
+
+class PriceLevel:
+    """
+    FIFO queue of the orders resting at a single price.
+
+    The queue is a doubly linked list threaded through the order records
+    themselves (intrusive), so appending at the tail, popping the head and
+    unlinking any record are all O(1) and allocate nothing, whatever the depth
+    of the level. Finding a record by order ID is the book's job (see
+    `OrderBook.orders_by_id`). Iteration follows time priority (earliest first).
+
+    The level also keeps its total remaining quantity up to date on every
+    append, removal and fill, so that depth queries never walk the queue.
+    """
+
+    __slots__ = ("_head", "_tail", "_count", "quantity")
+
+    def __init__(self):
+        self._head: OrderRecord | None = None
+        self._tail: OrderRecord | None = None
+        self._count = 0
+        self.quantity: Units = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._head is not None
+
+    def __contains__(self, order: object) -> bool:
+        # Linear scan: membership by order ID is meant for inspection only
+        order_id = getattr(order, "id", None)
+        return any(record.id == order_id for record in self)
+
+    def __iter__(self) -> Iterator[OrderRecord]:
+        record = self._head
+        while record is not None:
+            yield record
+            record = record.next
+
+    def peek(self) -> OrderRecord:
+        """Return, without removing it, the record at the front of the queue."""
+        if self._head is None:
+            raise IndexError("peek at an empty price level")
+
+        return self._head
+
+    def append(self, record: OrderRecord) -> None:
+        """Add a record at the back of the queue."""
+        if self._tail is None:
+            self._head = record
+        else:
+            record.prev = self._tail
+            self._tail.next = record
+        self._tail = record
+        self._count += 1
+        self.quantity += record.remaining
+
+    def popleft(self) -> OrderRecord:
+        """Remove and return the record at the front of the queue."""
+        record = self._head
+        if record is None:
+            raise IndexError("pop from an empty price level")
+
+        self.remove(record)
+        return record
+
+    def remove(self, record: OrderRecord) -> None:
+        """Unlink a record resting in this level from anywhere in the queue."""
+        if record.prev is None:
+            self._head = record.next
+        else:
+            record.prev.next = record.next
+
+        if record.next is None:
+            self._tail = record.prev
+        else:
+            record.next.prev = record.prev
+
+        record.prev = record.next = None
+        self._count -= 1
+        self.quantity -= record.remaining
+
+    def fill(self, record: OrderRecord, quantity: Units) -> None:
+        """Take `quantity` off a record resting in this level."""
+        record.remaining -= quantity
+        self.quantity -= quantity
@@ -0,0 +1,110 @@
+from datetime import datetime
+from uuid import UUID
+
+from ctenex.domain.entities import OrderSide, OrderStatus, OrderType, TimeInForce
+from ctenex.domain.in_memory.order_book.exposure import Exposure
+from ctenex.domain.in_memory.order_book.scale import Scale, Units
+from ctenex.domain.order_book.order.model import Order
+
+
+class OrderRecord:
+    """
+    Compact, book-side state of a resting order.
+
+    The book stores these instead of pydantic `Order` models: a record only
+    holds the fields needed for matching (no audit fields, no validation),
+    with the price and quantities in the book's units (see
+    `ctenex.domain.in_memory.order_book.scale`). It also carries the links of
+    the price-level queue it rests in, and the exposure of its trader when
+    the book tracks exposures. Use `to_order` to build the pydantic
+    model when the order has to leave the engine.
+    """
+
+    __slots__ = (
+        "id",
+        "contract_id",
+        "trader_id",
+        "side",
+        "type",
+        "price",
+        "quantity",
+        "remaining",
+        "status",
+        "placed_at",
+        "time_in_force",
+        "expires_at",
+        "exposure",
+        "prev",
+        "next",
+    )
+
+    def __init__(
+        self,
+        id: UUID,
+        contract_id: str,
+        trader_id: UUID,
+        side: OrderSide,
+        type: OrderType,
+        price: Units,
+        quantity: Units,
+        remaining: Units,
+        status: OrderStatus,
+        placed_at: datetime,
+        time_in_force: TimeInForce = TimeInForce.GTC,
+        expires_at: datetime | None = None,
+    ):
+        self.id = id
+        self.contract_id = contract_id
+        self.trader_id = trader_id
+        self.side = side
+        self.type = type
+        self.price = price
+        self.quantity = quantity
+        self.remaining = remaining
+        self.status = status
+        self.placed_at = placed_at
+        self.time_in_force = time_in_force
+        self.expires_at = expires_at
+        self.exposure: Exposure | None = None
+        self.prev: OrderRecord | None = None
+        self.next: OrderRecord | None = None
+
+    @classmethod
+    def from_order(cls, order: Order, scale: Scale) -> "OrderRecord":
+        if order.price is None:
+            raise ValueError("Order must have a price")
+
+        return cls(
+            id=order.id,
+            contract_id=order.contract_id,
+            trader_id=order.trader_id,
+            side=order.side,
+            type=order.type,
+            price=scale.to_ticks(order.price),
+            quantity=scale.to_lots(order.quantity),
+            remaining=scale.to_lots(
+                order.remaining_quantity
+                if order.remaining_quantity is not None
+                else order.quantity
+            ),
+            status=order.status,
+            placed_at=order.placed_at,
+            time_in_force=order.time_in_force,
+            expires_at=order.expires_at,
+        )
+
+    def to_order(self, scale: Scale) -> Order:
+        return Order(
+            id=self.id,
+            contract_id=self.contract_id,
+            trader_id=self.trader_id,
+            side=self.side,
+            type=self.type,
+            price=scale.to_price(self.price),
+            quantity=scale.to_quantity(self.quantity),
+            status=self.status,
+            remaining_quantity=scale.to_quantity(self.remaining),
+            time_in_force=self.time_in_force,
+            placed_at=self.placed_at,
+            expires_at=self.expires_at,
+        )
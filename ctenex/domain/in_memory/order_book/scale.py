@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+# Quantities are stored with two decimal places (see `BaseOrder.quantity`)
+LOT_SIZE = Decimal("0.01")
+
+# Book units: a Decimal in Decimal mode, an integer number of ticks/lots otherwise
+Units = Decimal | int
+
+
+class DecimalScale:
+    """
+    Identity scale: the book keeps prices and quantities as Decimals,
+    exactly as they were submitted.
+    """
+
+    # No tick: prices are matched as they are
+    tick_size: Decimal | None = None
+
+    def to_ticks(self, price: Decimal) -> Units:
+        return price
+
+    def to_price(self, ticks: Units) -> Decimal:
+        return Decimal(ticks)
+
+    def to_lots(self, quantity: Decimal) -> Units:
+        return quantity
+
+    def to_quantity(self, lots: Units) -> Decimal:
+        return Decimal(lots)
+
+
+class TickScale:
+    """
+    Fixed-point scale: prices are kept as an integer number of ticks and
+    quantities as an integer number of lots, so matching runs on integer
+    arithmetic. Values are converted back to Decimals (quantized to the tick
+    and lot sizes) only when they leave the book.
+
+    The exponent of a submitted value is not kept: with a tick size of 0.01,
+    a price of `Decimal("100")` or `Decimal("100.000")` leaves the book as
+    `Decimal("100.00")`, equal in value, as the database stores it.
+    """
+
+    def __init__(self, tick_size: Decimal, lot_size: Decimal = LOT_SIZE):
+        if tick_size <= 0 or lot_size <= 0:
+            raise ValueError("Tick and lot sizes must be positive")
+
+        self.tick_size = tick_size
+        self.lot_size = lot_size
+
+    def to_ticks(self, price: Decimal) -> int:
+        ticks, remainder = divmod(price, self.tick_size)
+        if remainder:
+            raise ValueError(
+                f"Price {price} is not a multiple of the tick size {self.tick_size}"
+            )
+        return int(ticks)
+
+    def to_price(self, ticks: Units) -> Decimal:
+        return ticks * self.tick_size
+
+    def to_lots(self, quantity: Decimal) -> int:
+        lots, remainder = divmod(quantity, self.lot_size)
+        if remainder:
+            raise ValueError(
+                f"Quantity {quantity} is not a multiple of the lot size {self.lot_size}"
+            )
+        return int(lots)
+
+    def to_quantity(self, lots: Units) -> Decimal:
+        return lots * self.lot_size
+
+
+Scale = DecimalScale | TickScale
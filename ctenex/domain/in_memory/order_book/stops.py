@@ -0,0 +1,306 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+from weakref import WeakValueDictionary
+
+from sortedcontainers import SortedDict
+
+from ctenex.domain.entities import (
+    OpenOrderStatus,
+    OrderSide,
+    OrderType,
+    ProcessedOrderStatus,
+    TimeInForce,
+)
+from ctenex.domain.in_memory.order_book.scale import Scale, Units
+from ctenex.domain.order_book.order.model import Order
+
+STOP_TYPES = (OrderType.STOP, OrderType.STOP_LIMIT)
+
+# What a stop order becomes once triggered
+TRIGGERED_TYPES = {
+    OrderType.STOP: OrderType.MARKET,
+    OrderType.STOP_LIMIT: OrderType.LIMIT,
+}
+
+
+class StopRecord:
+    """
+    Compact state of a stop order waiting for its trigger (see `StopBook`).
+
+    Unlike an `OrderRecord`, nothing of a stop order is matched before it is
+    triggered, so its price, stop price and quantity are kept as submitted.
+    """
+
+    __slots__ = (
+        "id",
+        "contract_id",
+        "trader_id",
+        "side",
+        "type",
+        "time_in_force",
+        "price",
+        "stop_price",
+        "quantity",
+        "placed_at",
+        "expires_at",
+    )
+
+    def __init__(
+        self,
+        id: UUID,
+        contract_id: str,
+        trader_id: UUID,
+        side: OrderSide,
+        type: OrderType,
+        time_in_force: TimeInForce,
+        price: Decimal | None,
+        stop_price: Decimal,
+        quantity: Decimal,
+        placed_at: datetime,
+        expires_at: datetime | None = None,
+    ):
+        self.id = id
+        self.contract_id = contract_id
+        self.trader_id = trader_id
+        self.side = side
+        self.type = type
+        self.time_in_force = time_in_force
+        self.price = price
+        self.stop_price = stop_price
+        self.quantity = quantity
+        self.placed_at = placed_at
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_order(cls, order: Order) -> "StopRecord":
+        if order.stop_price is None:
+            raise ValueError("Stop orders must have a stop price")
+
+        return cls(
+            id=order.id,
+            contract_id=order.contract_id,
+            trader_id=order.trader_id,
+            side=order.side,
+            type=order.type,
+            time_in_force=order.time_in_force,
+            price=order.price,
+            stop_price=order.stop_price,
+            quantity=order.quantity,
+            placed_at=order.placed_at,
+            expires_at=order.expires_at,
+        )
+
+    def to_order(self) -> Order:
+        return Order(
+            id=self.id,
+            contract_id=self.contract_id,
+            trader_id=self.trader_id,
+            side=self.side,
+            type=self.type,
+            time_in_force=self.time_in_force,
+            price=self.price,
+            stop_price=self.stop_price,
+            quantity=self.quantity,
+            placed_at=self.placed_at,
+            expires_at=self.expires_at,
+        )
+
+
+class StopBook:
+    """
+    Stop and stop-limit orders of a single contract, waiting for their trigger.
+
+    A buy stop triggers once a trade prints at or above its stop price, a sell
+    stop once a trade prints at or below it. Stops are indexed by stop price
+    (in book units) in a `SortedDict` per side, each price holding its stops
+    in arrival order, so the stops triggered by a trade are found with a range
+    query on the prices it crossed, whatever the number of stops left waiting.
+
+    Triggered stops come out in a deterministic order: buy stops by ascending
+    stop price, then sell stops by descending stop price (the order in which
+    a moving price reaches them), and by arrival at each price.
+
+    As in `OrderBook`, the pydantic models of the stops are only weakly
+    referenced: a caller still holding one gets that same model back once it
+    is triggered.
+    """
+
+    def __init__(self, contract_id: str, scale: Scale):
+        self.contract_id = contract_id
+        self.scale = scale
+
+        # Stops by stop price (in book units), each price in arrival order
+        self.buys: SortedDict = SortedDict()
+        self.sells: SortedDict = SortedDict()
+
+        # Fast lookup for stops by ID, in arrival order
+        self.stops_by_id: dict[UUID, StopRecord] = {}
+
+        # Stops of each trader, in arrival order
+        self.stops_by_trader: dict[UUID, dict[UUID, StopRecord]] = {}
+
+        # Quantity (in book units) of the stops of each trader, per side, for
+        # the risk checks (see `waiting`)
+        self.bids_by_trader: dict[UUID, Units] = {}
+        self.asks_by_trader: dict[UUID, Units] = {}
+
+        # Contract of each stop, in an index shared with the other books of an
+        # engine, if any (see `OrderBook.share_index`)
+        self.contract_index: dict[UUID, str] | None = None
+
+        # Price of the last trade of the contract (in book units), if any
+        self.last_price: Units | None = None
+
+        # Caller-held models of the stops, handed back once triggered
+        self._views: WeakValueDictionary[UUID, Order] = WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self.stops_by_id)
+
+    def get_orders(self) -> list[Order]:
+        return [record.to_order() for record in self.stops_by_id.values()]
+
+    def share_index(self, contract_index: dict[UUID, str]) -> None:
+        """Record the contract of each stop in `contract_index` from now on."""
+        self.contract_index = contract_index
+        for order_id in self.stops_by_id:
+            contract_index[order_id] = self.contract_id
+
+    def get_order(self, order_id: UUID) -> Order | None:
+        record = self.stops_by_id.get(order_id)
+        if record is None:
+            return None
+
+        return record.to_order()
+
+    def waiting(self, trader_id: UUID, side: OrderSide) -> Units:
+        """Return the quantity of the `side` stops of a trader (in book units)."""
+        return self._waiting_by_trader(side).get(trader_id, 0)
+
+    def triggers(self, side: OrderSide, stop_price: Units) -> bool:
+        """Whether a `side` stop at `stop_price` is triggered at the last price."""
+        if self.last_price is None:
+            return False
+        if side == OrderSide.BUY:
+            return self.last_price >= stop_price
+        return self.last_price <= stop_price
+
+    def add_order(self, order: Order) -> UUID:
+        """Add a stop order to wait for its trigger."""
+        record = StopRecord.from_order(order)
+        self._insert(record)
+        self._views[order.id] = order
+        return order.id
+
+    def load(self, records: Iterable[StopRecord]) -> None:
+        """Add stop records (e.g. from a snapshot), in arrival order."""
+        for record in records:
+            self._insert(record)
+
+    def cancel_order(
+        self,
+        order_id: UUID,
+        status: ProcessedOrderStatus = ProcessedOrderStatus.CANCELLED,
+    ) -> Order | None:
+        """Cancel a stop order waiting for its trigger, with `status`."""
+        record = self.stops_by_id.pop(order_id, None)
+        if record is None:
+            return None
+        self._unindex(record)
+
+        stops = self.buys if record.side == OrderSide.BUY else self.sells
+        stop_price = self.scale.to_ticks(record.stop_price)
+        level = stops[stop_price]
+        del level[order_id]
+        if not level:
+            del stops[stop_price]
+
+        order = self._views.pop(order_id, None)
+        if order is None:
+            order = record.to_order()
+        order.status = status
+        return order
+
+    def cancel_all(self, trader_id: UUID) -> list[Order]:
+        """Cancel all the stops of a trader, in arrival order."""
+        stops = self.stops_by_trader.get(trader_id)
+        if not stops:
+            return []
+
+        return [
+            order
+            for order_id in list(stops)
+            if (order := self.cancel_order(order_id)) is not None
+        ]
+
+    def pop_triggered(self) -> list[Order]:
+        """
+        Remove and return the stops triggered at the last price, as the
+        orders they become (see `TRIGGERED_TYPES`), in trigger order.
+        """
+        last_price = self.last_price
+        if last_price is None or not self.stops_by_id:
+            return []
+
+        # Most trades trigger nothing: check the nearest stop price of each
+        # side before building any range
+        buys, sells = self.buys, self.sells
+        records: list[StopRecord] = []
+        if buys and buys.keys()[0] <= last_price:
+            # Materialize the range before deleting from the dict it iterates
+            for stop_price in list(buys.irange(maximum=last_price)):
+                records.extend(buys[stop_price].values())
+                del buys[stop_price]
+        if sells and sells.keys()[-1] >= last_price:
+            for stop_price in list(sells.irange(minimum=last_price, reverse=True)):
+                records.extend(sells[stop_price].values())
+                del sells[stop_price]
+        if not records:
+            return []
+
+        orders = []
+        for record in records:
+            del self.stops_by_id[record.id]
+            self._unindex(record)
+            order = self._views.pop(record.id, None)
+            if order is None:
+                order = record.to_order()
+            order.type = TRIGGERED_TYPES[record.type]
+            order.status = OpenOrderStatus.OPEN
+            orders.append(order)
+
+        return orders
+
+    def _waiting_by_trader(self, side: OrderSide) -> dict[UUID, Units]:
+        return self.bids_by_trader if side == OrderSide.BUY else self.asks_by_trader
+
+    def _insert(self, record: StopRecord) -> None:
+        stops = self.buys if record.side == OrderSide.BUY else self.sells
+        stop_price = self.scale.to_ticks(record.stop_price)
+        level = stops.get(stop_price)
+        if level is None:
+            level = stops[stop_price] = {}
+        level[record.id] = record
+        self.stops_by_id[record.id] = record
+        self.stops_by_trader.setdefault(record.trader_id, {})[record.id] = record
+        waiting = self._waiting_by_trader(record.side)
+        quantity = self.scale.to_lots(record.quantity)
+        waiting[record.trader_id] = waiting.get(record.trader_id, 0) + quantity
+        if self.contract_index is not None:
+            self.contract_index[record.id] = self.contract_id
+
+    def _unindex(self, record: StopRecord) -> None:
+        stops = self.stops_by_trader[record.trader_id]
+        del stops[record.id]
+        if not stops:
+            del self.stops_by_trader[record.trader_id]
+        waiting = self._waiting_by_trader(record.side)
+        quantity = waiting[record.trader_id] - self.scale.to_lots(record.quantity)
+        if quantity:
+            waiting[record.trader_id] = quantity
+        else:
+            del waiting[record.trader_id]
+        if self.contract_index is not None:
+            del self.contract_index[record.id]
@@ -0,0 +1,377 @@
+"""
+Binary encoding of the snapshots of the in-memory engine.
+
+A snapshot file starts with `FILE_HEADER` (magic, format version, journal
+position the snapshot was taken at and number of books), followed by the
+books, and ends with the CRC32 of everything before it (`TRAILER`).
+
+Each book is a `BOOK` header (length of the contract ID, whether the book
+matches on ticks and, if so, its tick size as an exponent and an integer
+mantissa, last trade sequence number, number of resting orders, number of
+stop orders, number of positions and price of the last trade, if any), the
+contract ID, one fixed-size `ORDER` record per resting order (IDs, side, type
+and time in force, status, price, quantity and remaining quantity, placement
+time and expiry time, if any, in microseconds) and one fixed-size `STOP`
+record per stop order waiting for its trigger (the same fields, as
+submitted, with the stop price in place of the remaining quantity) and one
+fixed-size `POSITION` record per trader with a position in the contract
+(trader ID and net quantity filled, kept for the engine's risk checks).
+The prices and quantities of resting orders, and positions, are in the
+book's units: integer ticks and lots (with a zero exponent) for a book
+matching on ticks, exact exponents and mantissas of Decimals otherwise.
+Orders are stored in the order in which they were added to the book, so
+loading them in file order rebuilds every price level queue as it was, and
+likewise for stop orders.
+
+All integers are little-endian. Contract IDs are UTF-8.
+"""
+
+import struct
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from mmap import mmap
+from operator import attrgetter
+from typing import Iterable, NamedTuple
+from uuid import UUID
+
+from ctenex.domain.entities import OpenOrderStatus, OrderStatus
+from ctenex.domain.exceptions import SnapshotFormatError
+from ctenex.domain.in_memory.journal.codec import (
+    EPOCH,
+    MICROSECOND,
+    SIDE_CODES,
+    SIDES,
+    TIME_IN_FORCE_CODES,
+    TIME_IN_FORCE_SHIFT,
+    TIMES_IN_FORCE,
+    TYPE_CODES,
+    TYPE_MASK,
+    TYPES,
+    join_decimal,
+    split_decimal,
+    to_microseconds,
+)
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import Units
+from ctenex.domain.in_memory.order_book.stops import StopRecord
+
+MAGIC = b"CTXS"
+VERSION = 4
+
+FILE_HEADER = struct.Struct("<4sHQI")
+BOOK = struct.Struct("<B?bqQIII?bq")
+ORDER = struct.Struct("<16s16sBBBbqbqbqq?q")
+STOP = struct.Struct("<16s16sBB?bqbqbqq?q")
+POSITION = struct.Struct("<16sbq")
+TRAILER = struct.Struct("<I")
+
+STATUSES = (OpenOrderStatus.OPEN, OpenOrderStatus.PARTIALLY_FILLED)
+STATUS_CODES: dict[OrderStatus, int] = {
+    status: code for code, status in enumerate(STATUSES)
+}
+
+# The only fields of a resting order changed in place (by fills and
+# reductions): a price change re-queues the order as a new record
+record_state = attrgetter("quantity", "remaining", "status")
+
+
+class BookState(NamedTuple):
+    """State of one book, as stored in a snapshot."""
+
+    contract_id: str
+    tick_size: Decimal | None
+    last_sequence: int
+    records: list[OrderRecord]
+    stops: list[StopRecord] = []
+    last_price: Units | None = None
+    positions: list[tuple[UUID, Units]] = []
+
+
+class BookCopy(NamedTuple):
+    """
+    Point-in-time copy of the state of one book, to be encoded while the book
+    keeps changing. The records (and stop records) are shared with the book,
+    but `states` holds a copy of what changes in them (see `record_state`),
+    taken along with the list, and positions are keyed by the integer of the
+    trader's ID.
+    """
+
+    contract_id: str
+    tick_size: Decimal | None
+    last_sequence: int
+    records: list[OrderRecord]
+    states: list[tuple[Units, Units, OrderStatus]]
+    stops: list[StopRecord]
+    last_price: Units | None
+    positions: list[tuple[int, Units]]
+
+
+def encode(position: int, books: Iterable[BookCopy]) -> bytes:
+    """Encode the state of `books`, copied at journal `position`."""
+    books = list(books)
+    size = FILE_HEADER.size + TRAILER.size
+    contracts = []
+    for book in books:
+        contract_id = book.contract_id.encode()
+        contracts.append(contract_id)
+        size += (
+            BOOK.size
+            + len(contract_id)
+            + ORDER.size * len(book.records)
+            + STOP.size * len(book.stops)
+            + POSITION.size * len(book.positions)
+        )
+
+    data = bytearray(size)
+    FILE_HEADER.pack_into(data, 0, MAGIC, VERSION, position, len(books))
+    offset = FILE_HEADER.size
+
+    pack_order = ORDER.pack_into
+    split = _split_units
+    for book, contract_id in zip(books, contracts):
+        tick_exponent, tick_size = (
+            split_decimal(book.tick_size) if book.tick_size is not None else (0, 0)
+        )
+        BOOK.pack_into(
+            data,
+            offset,
+            len(contract_id),
+            book.tick_size is not None,
+            tick_exponent,
+            tick_size,
+            book.last_sequence,
+            len(book.records),
+            len(book.stops),
+            len(book.positions),
+            book.last_price is not None,
+            *(split(book.last_price) if book.last_price is not None else (0, 0)),
+        )
+        offset += BOOK.size
+        data[offset : offset + len(contract_id)] = contract_id
+        offset += len(contract_id)
+
+        for record, (quantity, remaining, status) in zip(book.records, book.states):
+            pack_order(
+                data,
+                offset,
+                record.id.bytes,
+                record.trader_id.bytes,
+                SIDE_CODES[record.side],
+                TYPE_CODES[record.type]
+                | TIME_IN_FORCE_CODES[record.time_in_force] << TIME_IN_FORCE_SHIFT,
+                STATUS_CODES[status],
+                *split(record.price),
+                *split(quantity),
+                *split(remaining),
+                to_microseconds(record.placed_at),
+                *_split_expiry(record.expires_at),
+            )
+            offset += ORDER.size
+
+        for stop in book.stops:
+            STOP.pack_into(
+                data,
+                offset,
+                stop.id.bytes,
+                stop.trader_id.bytes,
+                SIDE_CODES[stop.side],
+                TYPE_CODES[stop.type]
+                | TIME_IN_FORCE_CODES[stop.time_in_force] << TIME_IN_FORCE_SHIFT,
+                stop.price is not None,
+                *(split_decimal(stop.price) if stop.price is not None else (0, 0)),
+                *split_decimal(stop.stop_price),
+                *split_decimal(stop.quantity),
+                to_microseconds(stop.placed_at),
+                *_split_expiry(stop.expires_at),
+            )
+            offset += STOP.size
+
+        for trader_id, net in book.positions:
+            POSITION.pack_into(data, offset, trader_id.to_bytes(16, "big"), *split(net))
+            offset += POSITION.size
+
+    TRAILER.pack_into(data, offset, zlib.crc32(memoryview(data)[:offset]))
+    return bytes(data)
+
+
+def decode(data: bytes | mmap) -> tuple[int, list[BookState]]:
+    """Return the journal position of a snapshot and the state of its books."""
+    if len(data) < FILE_HEADER.size + TRAILER.size:
+        raise SnapshotFormatError("Snapshot file is too short")
+
+    magic, version, position, book_count = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotFormatError("Not a snapshot file")
+    if version != VERSION:
+        raise SnapshotFormatError(f"Unsupported snapshot version {version}")
+
+    end = len(data) - TRAILER.size
+    (checksum,) = TRAILER.unpack_from(data, end)
+    if zlib.crc32(data[:end]) != checksum:
+        raise SnapshotFormatError("Snapshot file is corrupted")
+
+    books = []
+    offset = FILE_HEADER.size
+    for _ in range(book_count):
+        (
+            contract_length,
+            ticked,
+            tick_exponent,
+            tick_size,
+            last_sequence,
+            count,
+            stop_count,
+            position_count,
+            has_last_price,
+            last_price_exponent,
+            last_price,
+        ) = BOOK.unpack_from(data, offset)
+        offset += BOOK.size
+        contract_id = bytes(data[offset : offset + contract_length]).decode()
+        offset += contract_length
+
+        records_end = offset + ORDER.size * count
+        stops_end = records_end + STOP.size * stop_count
+        positions_end = stops_end + POSITION.size * position_count
+        if positions_end > end:
+            raise SnapshotFormatError(f"Snapshot of {contract_id} is truncated")
+
+        books.append(
+            BookState(
+                contract_id=contract_id,
+                tick_size=join_decimal(tick_exponent, tick_size) if ticked else None,
+                last_sequence=last_sequence,
+                records=_decode_records(data[offset:records_end], contract_id, ticked),
+                stops=_decode_stops(data[records_end:stops_end], contract_id),
+                last_price=(
+                    (
+                        last_price
+                        if ticked
+                        else join_decimal(last_price_exponent, last_price)
+                    )
+                    if has_last_price
+                    else None
+                ),
+                positions=[
+                    (
+                        UUID(bytes=trader_id),
+                        position if ticked else join_decimal(exponent, position),
+                    )
+                    for trader_id, exponent, position in POSITION.iter_unpack(
+                        data[stops_end:positions_end]
+                    )
+                ],
+            )
+        )
+        offset = positions_end
+
+    return position, books
+
+
+def _split_expiry(expires_at: datetime | None) -> tuple[bool, int]:
+    if expires_at is None:
+        return False, 0
+    return True, to_microseconds(expires_at)
+
+
+def _split_units(units: Units) -> tuple[int, int]:
+    # Ticks and lots are stored with a zero exponent
+    return (0, units) if isinstance(units, int) else split_decimal(units)
+
+
+def _decode_records(data: bytes, contract_id: str, ticked: bool) -> list[OrderRecord]:
+    # Restoring is dominated by object creation: build the records directly
+    # (no pydantic), and share the UUIDs of traders and the values of prices
+    # and quantities, which repeat across orders
+    traders: dict[bytes, UUID] = {}
+    units: dict[tuple[int, int], Units] = {}
+    sides, types, statuses, times_in_force = SIDES, TYPES, STATUSES, TIMES_IN_FORCE
+    epoch, microsecond = EPOCH, MICROSECOND
+
+    records = []
+    append = records.append
+    for (
+        order_id,
+        trader_id,
+        side,
+        type,
+        status,
+        price_exponent,
+        price,
+        quantity_exponent,
+        quantity,
+        remaining_exponent,
+        remaining,
+        placed_at,
+        expires,
+        expires_at,
+    ) in ORDER.iter_unpack(data):
+        trader = traders.get(trader_id)
+        if trader is None:
+            trader = traders[trader_id] = UUID(bytes=trader_id)
+
+        if not ticked:
+            price = _join(units, price_exponent, price)
+            quantity = _join(units, quantity_exponent, quantity)
+            remaining = _join(units, remaining_exponent, remaining)
+
+        append(
+            OrderRecord(
+                UUID(bytes=order_id),
+                contract_id,
+                trader,
+                sides[side],
+                types[type & TYPE_MASK],
+                price,
+                quantity,
+                remaining,
+                statuses[status],
+                epoch + placed_at * microsecond,
+                times_in_force[type >> TIME_IN_FORCE_SHIFT],
+                epoch + expires_at * microsecond if expires else None,
+            )
+        )
+
+    return records
+
+
+def _decode_stops(data: bytes, contract_id: str) -> list[StopRecord]:
+    return [
+        StopRecord(
+            UUID(bytes=order_id),
+            contract_id,
+            UUID(bytes=trader_id),
+            SIDES[side],
+            TYPES[type & TYPE_MASK],
+            TIMES_IN_FORCE[type >> TIME_IN_FORCE_SHIFT],
+            join_decimal(price_exponent, price) if has_price else None,
+            join_decimal(stop_exponent, stop_price),
+            join_decimal(quantity_exponent, quantity),
+            EPOCH + placed_at * MICROSECOND,
+            EPOCH + expires_at * MICROSECOND if expires else None,
+        )
+        for (
+            order_id,
+            trader_id,
+            side,
+            type,
+            has_price,
+            price_exponent,
+            price,
+            stop_exponent,
+            stop_price,
+            quantity_exponent,
+            quantity,
+            placed_at,
+            expires,
+            expires_at,
+        ) in STOP.iter_unpack(data)
+    ]
+
+
+def _join(cache: dict[tuple[int, int], Units], exponent: int, mantissa: int) -> Units:
+    value = cache.get((exponent, mantissa))
+    if value is None:
+        value = cache[exponent, mantissa] = join_decimal(exponent, mantissa)
+    return value
@@ -0,0 +1,80 @@
+import mmap
+import os
+from pathlib import Path
+
+from loguru import logger
+
+from ctenex.domain.in_memory.snapshot.codec import FILE_HEADER, BookState, decode
+
+PREFIX = "snapshot-"
+SUFFIX = ".bin"
+
+
+class SnapshotStore:
+    """
+    Directory of the snapshots of an in-memory engine.
+
+    Each snapshot (encoded by `ctenex.domain.in_memory.snapshot.codec`) is
+    named after the journal position it was taken at, so the latest one is the
+    one to restore from, before replaying the journal from that position on.
+    Snapshots are written atomically (to a temporary file, fsynced, then
+    renamed), so a crash mid-write never leaves a partial snapshot behind, and
+    only the `keep` latest ones are kept.
+    """
+
+    def __init__(self, directory: Path | str, keep: int = 2):
+        if keep < 1:
+            raise ValueError("At least one snapshot must be kept")
+
+        self.directory = Path(directory)
+        self.keep = keep
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def paths(self) -> list[Path]:
+        """Return the paths of the snapshots, oldest first."""
+        return sorted(self.directory.glob(f"{PREFIX}*{SUFFIX}"))
+
+    def latest(self) -> Path | None:
+        paths = self.paths()
+        return paths[-1] if paths else None
+
+    def write(self, data: bytes) -> Path:
+        """Durably write a snapshot, as encoded by `MatchingEngine.snapshot`."""
+        _, _, position, _ = FILE_HEADER.unpack_from(data)
+        path = self.directory / f"{PREFIX}{position:020d}{SUFFIX}"
+        temporary = path.with_suffix(".tmp")
+
+        with open(temporary, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        self._sync_directory()
+
+        for stale in self.paths()[: -self.keep]:
+            stale.unlink()
+
+        logger.info("Wrote snapshot {} ({} bytes)", path, len(data))
+        return path
+
+    def read(self, path: Path | None = None) -> tuple[int, list[BookState]] | None:
+        """
+        Return the journal position and state of the books of the snapshot at
+        `path` (the latest by default), or None if there is no snapshot.
+        """
+        path = path or self.latest()
+        if path is None:
+            return None
+
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return decode(b"")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return decode(data)
+
+    def _sync_directory(self) -> None:
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
@@ -0,0 +1,171 @@
+from array import array
+from collections import defaultdict
+from typing import Mapping
+
+from ctenex.domain.latency.schemas import (
+    ContractLatencyGetResponse,
+    LatencyGetResponse,
+    StageLatencyGetResponse,
+)
+
+# Each power of two is split into 2**SUB_BUCKET_BITS buckets, so that a
+# latency is known to within 1 / 2**SUB_BUCKET_BITS (3%) of its value
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Enough buckets for any latency below 2**63 ns
+BUCKETS = (63 - SUB_BUCKET_BITS) * SUB_BUCKETS + 2 * SUB_BUCKETS
+
+PERCENTILES = (50.0, 99.0, 99.9)
+
+
+def bucket_of(nanoseconds: int) -> int:
+    """Index of the bucket of a latency, log-linear in its value."""
+    shift = nanoseconds.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return nanoseconds
+    return (shift << SUB_BUCKET_BITS) + (nanoseconds >> shift)
+
+
+def bucket_value(index: int) -> int:
+    """Midpoint, in nanoseconds, of the latencies falling in a bucket."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = (index - (shift << SUB_BUCKET_BITS)) << shift
+    return low + (1 << shift) // 2
+
+
+class LatencyHistogram:
+    """
+    Fixed-size, log-linear histogram of latencies in nanoseconds.
+
+    Recording a latency is a bit length and an increment (no allocation, no
+    sorting), whatever the number of latencies recorded, so histograms can be
+    left on in production. Percentiles are read off the bucket counts, to
+    within the width of a bucket (see `SUB_BUCKET_BITS`).
+    """
+
+    __slots__ = ("counts", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.max = 0
+
+    def record(self, nanoseconds: int) -> None:
+        self.counts[bucket_of(nanoseconds)] += 1
+        self.count += 1
+        if nanoseconds > self.max:
+            self.max = nanoseconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the latencies recorded by another histogram to this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> int:
+        """Return the latency, in nanoseconds, below which `percentile`% fall."""
+        if self.count == 0:
+            return 0
+
+        rank = max(1, round(self.count * percentile / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_value(index), self.max)
+        return self.max
+
+    def summarize(self) -> StageLatencyGetResponse:
+        p50, p99, p999 = (self.percentile(p) / 1_000 for p in PERCENTILES)
+        return StageLatencyGetResponse(
+            count=self.count,
+            p50=p50,
+            p99=p99,
+            p999=p999,
+            max=self.max / 1_000,
+        )
+
+
+class LatencyRecorder:
+    """
+    Latency histograms of an engine, per contract and per stage of the
+    processing of an order (e.g. matching, resting, journaling).
+
+    The latencies of an order are only buffered when recorded (a single array
+    extension), and added to the histograms in bulk once `FLUSH_SIZE` of them
+    are pending or when the histograms are read, which keeps the cost of
+    recording on the hot path to a fraction of a microsecond.
+    """
+
+    FLUSH_SIZE: int = 4_096
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms: defaultdict[str, defaultdict[str, LatencyHistogram]] = (
+            defaultdict(lambda: defaultdict(LatencyHistogram))
+        )
+        self._pending: dict[tuple[str, tuple[str, ...]], array] = {}
+
+    def record(
+        self, contract_id: str, stages: tuple[str, ...], *nanoseconds: int
+    ) -> None:
+        """Record the latency, in nanoseconds, of each of the `stages` of one order."""
+        if not self.enabled:
+            return
+
+        key = (contract_id, stages)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = array("q")
+        pending.extend(nanoseconds)
+
+        if len(pending) >= self.FLUSH_SIZE:
+            self._flush(key, pending)
+
+    @property
+    def histograms(self) -> Mapping[str, Mapping[str, LatencyHistogram]]:
+        """Histograms of each stage, per contract, including pending latencies."""
+        for key, pending in self._pending.items():
+            self._flush(key, pending)
+        return self._histograms
+
+    def merge(self, other: "LatencyRecorder") -> None:
+        for contract_id, histograms in other.histograms.items():
+            for stage, histogram in histograms.items():
+                self._histograms[contract_id][stage].merge(histogram)
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._pending.clear()
+
+    def summarize(self) -> LatencyGetResponse:
+        return LatencyGetResponse(
+            contracts=[
+                ContractLatencyGetResponse(
+                    contract_id=contract_id,
+                    stages={
+                        stage: histogram.summarize()
+                        for stage, histogram in histograms.items()
+                    },
+                )
+                for contract_id, histograms in self.histograms.items()
+            ]
+        )
+
+    def _flush(self, key: tuple[str, tuple[str, ...]], pending: array) -> None:
+        contract_id, stages = key
+        histograms = self._histograms[contract_id]
+        for offset, stage in enumerate(stages):
+            histogram = histograms[stage]
+            counts = histogram.counts
+            samples = pending[offset :: len(stages)]
+            for nanoseconds in samples:
+                counts[bucket_of(nanoseconds)] += 1
+            if samples:
+                histogram.count += len(samples)
+                histogram.max = max(histogram.max, max(samples))
+        del pending[:]
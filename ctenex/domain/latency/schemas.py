@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class StageLatencyGetResponse(BaseModel):
+    """Latencies of one stage of order processing, in microseconds."""
+
+    count: int
+    p50: float
+    p99: float
+    p999: float
+    max: float
+
+
+class ContractLatencyGetResponse(BaseModel):
+    contract_id: str
+    stages: dict[str, StageLatencyGetResponse]
+
+
+class LatencyGetResponse(BaseModel):
+    contracts: list[ContractLatencyGetResponse]
@@ -1,8 +1,8 @@
-from decimal import Decimal
+from time import perf_counter_ns
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
 from ctenex.core.db.async_session import AsyncSessionStream, get_async_session
 from ctenex.core.db.utils import get_entity_values
@@ -13,8 +13,11 @@ from ctenex.domain.entities import (
     OrderSide,
     OrderType,
     ProcessedOrderStatus,
+    TimeInForce,
     Trade,
 )
+from ctenex.domain.latency.model import LatencyRecorder
+from ctenex.domain.latency.schemas import LatencyGetResponse
 from ctenex.domain.order_book.model import order_book
 from ctenex.domain.order_book.order.model import Order as OrderSchema
 from ctenex.domain.order_book.order.reader import OrderFilter
@@ -23,6 +26,9 @@ from ctenex.domain.order_book.trade.model import Trade as TradeSchema
 from ctenex.domain.order_book.trade.reader import trades_reader
 from ctenex.domain.order_book.trade.writer import trades_writer
 
+# Stages of adding an order whose latencies are recorded
+ORDER_STAGES = ("log", "match", "rest", "trades", "total")
+
 
 class MatchingEngine:
     trades_writer = trades_writer
@@ -32,34 +38,84 @@ class MatchingEngine:
     def __init__(
         self,
         db: AsyncSessionStream = get_async_session,
+        latency: LatencyRecorder | None = None,
     ):
         self.db: AsyncSessionStream = db
+        self.latency = latency if latency is not None else LatencyRecorder()
 
     async def add_order(self, order: OrderSchema) -> UUID:
         """Add an order to the book and return any trades that result."""
+        start = perf_counter_ns()
         logger.debug(f"Adding order: {order}")
+        logged = perf_counter_ns()
+
+        if order.type in (OrderType.STOP, OrderType.STOP_LIMIT):
+            raise ValueError("Stop orders are only supported by the in-memory engine")
+        if order.time_in_force in (TimeInForce.GTD, TimeInForce.DAY):
+            raise ValueError(
+                "Expiring orders are only supported by the in-memory engine"
+            )
 
         if order.remaining_quantity is None:
             order.remaining_quantity = order.quantity
 
-        # Try to match the order first
-        if order.side == OrderSide.BUY:
-            trades = await self._match_buy_order(order)
-        else:
-            trades = await self._match_sell_order(order)
-
-        # Persist order in book (whatever the status)
-        await self.order_book.add_order(order)
-
-        # Persist trades
+        # Every effect of the order (the order itself, the resting orders it
+        # fills and its trades) is committed in a single transaction: it is
+        # rolled back as a whole if any statement fails. The contract is
+        # locked for the transaction, for workers never to match against the
+        # same resting orders at once
         async with self.db() as session:
-            for trade in trades:
-                trade_entity = Trade(**trade.model_dump())
-                await self.trades_writer.create(session, trade_entity)
+            await self.order_book.lock_contract(session, order.contract_id)
+
+            # Try to match the order first
+            trades, filled = await self._match(session, order)
+
+            # Immediate-or-cancel and fill-or-kill orders never rest: what
+            # remains of them is persisted as cancelled
+            if order.remaining_quantity > 0 and order.time_in_force != TimeInForce.GTC:
+                order.status = ProcessedOrderStatus.CANCELLED
+            matched = perf_counter_ns()
+
+            # Persist order in book (whatever the status), before the trades
+            # referencing it
+            await self.order_book.insert_order(session, order)
+            rested = perf_counter_ns()
+
+            # Persist the resting orders filled and the trades, one statement
+            # each
+            if trades:
+                await self.order_book.fill_orders(session, filled)
+                await self.trades_writer.create_many(
+                    session, [Trade(**trade.model_dump()) for trade in trades]
+                )
             await session.commit()
+        end = perf_counter_ns()
+
+        self.latency.record(
+            order.contract_id,
+            ORDER_STAGES,
+            logged - start,
+            matched - logged,
+            rested - matched,
+            end - rested,
+            end - start,
+        )
 
         return order.id
 
+    def get_latency(self) -> LatencyGetResponse:
+        """
+        Return the p50, p99 and p99.9 latencies of each stage of adding an
+        order, per contract, since the engine started (or was last reset):
+        logging, matching (waiting for the contract's lock, then reading the
+        resting orders crossed), persisting the order, and persisting its
+        trades with the resting orders filled then committing all of it.
+        """
+        return self.latency.summarize()
+
+    def reset_latency(self) -> None:
+        self.latency.reset()
+
     async def get_orders(
         self,
         filter: OrderFilter,
@@ -79,6 +135,13 @@ class MatchingEngine:
     ) -> OrderSchema | None:
         return await self.order_book.get_order(order_id)
 
+    async def cancel_all(
+        self,
+        trader_id: UUID,
+        contract_id: ContractCode | None = None,
+    ) -> list[OrderSchema]:
+        return await self.order_book.cancel_all(trader_id, contract_id)
+
     async def get_trades_by_order(
         self,
         contract_id: ContractCode,  # noqa F811
@@ -101,184 +164,66 @@ class MatchingEngine:
         )
         return [TradeSchema(**get_entity_values(trade)) for trade in trades]
 
-    async def _match_buy_order(self, buy_order: OrderSchema) -> list[TradeSchema]:
-        trades = []
-
-        # Match against the best ask price
-        while (
-            OpenOrderStatus.OPEN == buy_order.status
-            or OpenOrderStatus.PARTIALLY_FILLED == buy_order.status
+    async def _match(
+        self,
+        session: async_scoped_session[AsyncSession],
+        order: OrderSchema,
+    ) -> tuple[list[TradeSchema], list[Order]]:
+        """
+        Match an order against the resting orders it crosses, fetched at once
+        (see `OrderBook.get_crossing_orders`), and return its trades and the
+        resting orders they fill, updated but not persisted. A fill-or-kill
+        order that cannot be filled in full is cancelled without any trade.
+        """
+        resting_orders = await self.order_book.get_crossing_orders(session, order)
+
+        assert order.remaining_quantity is not None
+        if order.time_in_force == TimeInForce.FOK and (
+            sum(resting.remaining_quantity for resting in resting_orders)
+            < order.remaining_quantity
         ):
-            # Check if there are any asks to match against
-            best_ask_price = await self.order_book.get_best_ask_price(
-                contract_id=buy_order.contract_id,
-            )
-
-            if best_ask_price is None:
-                break
+            order.status = ProcessedOrderStatus.CANCELLED
+            return [], []
 
-            # For limit orders, check if the price is acceptable
-            if (
-                buy_order.price is not None  # Market orders have no price
-                and buy_order.type == OrderType.LIMIT
-                and best_ask_price > buy_order.price
-            ):
-                break
-
-            async with self.db() as session:
-                next_sell_order_cursor = await session.execute(
-                    select(Order)
-                    .where(
-                        Order.contract_id == buy_order.contract_id,
-                        Order.side == OrderSide.SELL,
-                        Order.status.in_(
-                            [OpenOrderStatus.OPEN, OpenOrderStatus.PARTIALLY_FILLED]
-                        ),
-                        Order.price
-                        <= (
-                            Decimal("999.99")
-                            if buy_order.type == OrderType.MARKET
-                            else buy_order.price
-                        ),
-                    )
-                    .order_by(
-                        Order.price.asc(),  # Best (lowest) price first
-                        Order.created_at.asc(),  # First in time at each price level
-                    )
-                )
-                next_sell_order = next_sell_order_cursor.scalars().first()
-
-            if next_sell_order is None:
+        trades = []
+        filled = []
+        for resting in resting_orders:
+            if order.remaining_quantity == 0:
                 break
 
             # Calculate trade quantity
-            assert buy_order.remaining_quantity is not None
-            trade_quantity = min(
-                buy_order.remaining_quantity, next_sell_order.remaining_quantity
-            )
+            trade_quantity = min(order.remaining_quantity, resting.remaining_quantity)
 
-            # Update order quantities
-            buy_order.remaining_quantity -= trade_quantity
-            next_sell_order.remaining_quantity -= trade_quantity
-
-            # Update order statuses
-            if next_sell_order.remaining_quantity == 0:
-                next_sell_order.status = ProcessedOrderStatus.FILLED
-            else:
-                next_sell_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-            if buy_order.remaining_quantity == 0:
-                buy_order.status = ProcessedOrderStatus.FILLED
+            # Update order quantities and statuses
+            order.remaining_quantity -= trade_quantity
+            resting.remaining_quantity -= trade_quantity
+            if resting.remaining_quantity == 0:
+                resting.status = ProcessedOrderStatus.FILLED
             else:
-                buy_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-            # TODO: Update order book and trade in a transaction
+                resting.status = OpenOrderStatus.PARTIALLY_FILLED
+            filled.append(resting)
 
-            # Update order book
-            updated_sell_order = OrderSchema(**get_entity_values(next_sell_order))
-            await self.order_book.update_order(updated_sell_order)
-
-            # Create and record the trade
-            trade = TradeSchema(
-                contract_id=buy_order.contract_id,
-                buy_order_id=buy_order.id,
-                sell_order_id=next_sell_order.id,
-                price=best_ask_price,
-                quantity=trade_quantity,
+            # Create and record the trade, at the resting order's price
+            buy_order, sell_order = (
+                (order, resting) if order.side == OrderSide.BUY else (resting, order)
             )
-            trades.append(trade)
-
-        return trades
-
-    async def _match_sell_order(self, sell_order: OrderSchema) -> list[TradeSchema]:
-        trades = []
-
-        # Match against the best bid price
-        while (
-            OpenOrderStatus.OPEN == sell_order.status
-            or OpenOrderStatus.PARTIALLY_FILLED == sell_order.status
-        ):
-            # Check if there are any bids to match against
-            best_bid_price = await self.order_book.get_best_bid_price(
-                contract_id=sell_order.contract_id,
-            )
-
-            if best_bid_price is None:
-                break
-
-            # For limit orders, check if the price is acceptable
-            if (
-                sell_order.price is not None  # Market orders have no price
-                and sell_order.type == OrderType.LIMIT
-                and best_bid_price < sell_order.price
-            ):
-                break
-
-            async with self.db() as session:
-                next_buy_order_cursor = await session.execute(
-                    select(Order)
-                    .where(
-                        Order.contract_id == sell_order.contract_id,
-                        Order.side == OrderSide.BUY,
-                        Order.status.in_(
-                            [OpenOrderStatus.OPEN, OpenOrderStatus.PARTIALLY_FILLED]
-                        ),
-                        Order.price
-                        <= (
-                            Decimal("999.99")
-                            if sell_order.type == OrderType.MARKET
-                            else sell_order.price
-                        ),
-                    )
-                    .order_by(
-                        Order.price.asc(),  # Best (lowest) price first
-                        Order.created_at.asc(),  # First in time at each price level
-                    )
+            trades.append(
+                TradeSchema(
+                    contract_id=order.contract_id,
+                    buy_order_id=buy_order.id,
+                    sell_order_id=sell_order.id,
+                    price=resting.price,
+                    quantity=trade_quantity,
                 )
-                next_buy_order = next_buy_order_cursor.scalars().first()
-
-            if next_buy_order is None:
-                break
-
-            # Calculate trade quantity
-            assert sell_order.remaining_quantity is not None
-            trade_quantity = min(
-                sell_order.remaining_quantity,
-                next_buy_order.remaining_quantity,
             )
 
-            # TODO: Update order book and trade in a transaction
-
-            # Update order quantities
-            sell_order.remaining_quantity -= trade_quantity
-            next_buy_order.remaining_quantity -= trade_quantity
-
-            # Update order statuses
-            if next_buy_order.remaining_quantity == 0:
-                next_buy_order.status = ProcessedOrderStatus.FILLED
+        if trades:
+            if order.remaining_quantity == 0:
+                order.status = ProcessedOrderStatus.FILLED
             else:
-                next_buy_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-            if sell_order.remaining_quantity == 0:
-                sell_order.status = ProcessedOrderStatus.FILLED
-            else:
-                sell_order.status = OpenOrderStatus.PARTIALLY_FILLED
-
-            # Update order book
-            updated_buy_order = OrderSchema(**get_entity_values(next_buy_order))
-            await self.order_book.update_order(updated_buy_order)
-
-            # Create and record the trade
-            trade = TradeSchema(
-                contract_id=sell_order.contract_id,
-                buy_order_id=next_buy_order.id,
-                sell_order_id=sell_order.id,
-                price=best_bid_price,
-                quantity=trade_quantity,
-            )
-            trades.append(trade)
+                order.status = OpenOrderStatus.PARTIALLY_FILLED
 
-        return trades
+        return trades, filled
 
 
 matching_engine = MatchingEngine()
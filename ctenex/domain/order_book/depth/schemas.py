@@ -0,0 +1,21 @@
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class PriceLevelGetResponse(BaseModel):
+    price: Decimal
+    quantity: Decimal
+    orders: int
+
+
+class DepthGetResponse(BaseModel):
+    contract_id: str
+    bids: list[PriceLevelGetResponse]
+    asks: list[PriceLevelGetResponse]
+
+
+class TopOfBookGetResponse(BaseModel):
+    contract_id: str
+    best_bid: PriceLevelGetResponse | None = None
+    best_ask: PriceLevelGetResponse | None = None
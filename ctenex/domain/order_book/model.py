@@ -1,17 +1,41 @@
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, column, func, literal, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+from sqlalchemy.orm import aliased
 
 from ctenex.core.db.async_session import AsyncSessionStream, get_async_session
 from ctenex.core.db.utils import get_entity_values
 from ctenex.domain.contracts import ContractCode
-from ctenex.domain.entities import Order, OrderSide, OrderType, ProcessedOrderStatus
+from ctenex.domain.entities import (
+    OPEN_STATUSES,
+    OpenOrderStatus,
+    Order,
+    OrderSide,
+    OrderType,
+    ProcessedOrderStatus,
+)
 from ctenex.domain.order_book.order.model import Order as OrderSchema
 from ctenex.domain.order_book.order.reader import OrderFilter, orders_reader
 from ctenex.domain.order_book.order.writer import orders_writer
 
 
+def open_orders(side: OrderSide) -> list[ColumnElement[bool]]:
+    """
+    Conditions selecting the open orders of a side, with the side and the
+    statuses rendered inline: bound as parameters of a prepared statement,
+    they could not be matched with the predicates of the partial indexes of
+    the open orders (see `ix_book_orders_open_asks`) by a generic plan.
+    """
+    return [
+        Order.side == literal(side.value, literal_execute=True),
+        Order.status.in_(
+            [literal(status, literal_execute=True) for status in OPEN_STATUSES]
+        ),
+    ]
+
+
 class OrderBook:
     orders_writer = orders_writer
     orders_reader = orders_reader
@@ -48,6 +72,21 @@ class OrderBook:
 
     async def add_order(self, order: OrderSchema) -> UUID:
         """Add an order to the appropriate side of the book."""
+        async with self.db() as session:
+            order_id = await self.insert_order(session, order)
+            await session.commit()
+
+        return order_id
+
+    async def insert_order(
+        self,
+        session: async_scoped_session[AsyncSession],
+        order: OrderSchema,
+    ) -> UUID:
+        """
+        Write an order to the book within the transaction of `session` (not
+        committed), for it to be committed together with its trades.
+        """
 
         # For market orders, set price to MAX (buy) or 0 (sell) to ensure matching
         if order.type == OrderType.MARKET:
@@ -57,10 +96,9 @@ class OrderBook:
         elif order.price is None:
             raise ValueError("Order must have a price")
 
-        async with self.db() as session:
-            entity = Order(**order.model_dump())
-            await self.orders_writer.create(session, entity)
-            await session.commit()
+        entity = Order(**order.model_dump())
+        await self.orders_writer.create(session, entity)
+        await session.flush()
 
         return entity.id
 
@@ -74,13 +112,177 @@ class OrderBook:
         if entity.price is None:
             raise ValueError("Order cannot be cancelled as it has no price")
 
-        entity.status = ProcessedOrderStatus.CANCELLED
+        # Only the status is written, once no order of the contract is being
+        # matched, for a fill in flight not to be overwritten; an order filled
+        # (or cancelled) meanwhile is left as it is
         async with self.db() as session:
-            await self.orders_writer.update(session, entity)
+            await self.lock_contract(session, entity.contract_id)
+            entity = (
+                await session.scalars(
+                    update(Order)
+                    .where(
+                        Order.id == order_id,
+                        Order.status.in_(list(OpenOrderStatus)),
+                    )
+                    .values(status=ProcessedOrderStatus.CANCELLED)
+                    .returning(Order)
+                )
+            ).one_or_none()
             await session.commit()
 
+        if entity is None:
+            return None
+
         return OrderSchema(**get_entity_values(entity))
 
+    async def cancel_all(
+        self,
+        trader_id: UUID,
+        contract_id: ContractCode | None = None,
+    ) -> list[OrderSchema]:
+        """
+        Cancel all the open orders of a trader, for one contract or for all
+        of them, in a single set-based UPDATE, and return them.
+        """
+        async with self.db() as session:
+            # Lock the contracts of the orders first (always in the same order,
+            # not to deadlock with another cancellation)
+            if contract_id is not None:
+                contract_ids = [contract_id]
+            else:
+                contract_ids = (
+                    await session.scalars(
+                        select(Order.contract_id)
+                        .distinct()
+                        .where(
+                            Order.trader_id == trader_id,
+                            Order.status.in_(list(OpenOrderStatus)),
+                        )
+                    )
+                ).all()
+            for locked_id in sorted(contract_ids):
+                await self.lock_contract(session, locked_id)
+
+            # Only the orders of the contracts locked: an order placed on
+            # another one meanwhile is left open, as if placed after this
+            entities = (
+                await session.scalars(
+                    update(Order)
+                    .where(
+                        Order.trader_id == trader_id,
+                        Order.status.in_(list(OpenOrderStatus)),
+                        Order.contract_id.in_(contract_ids),
+                    )
+                    .values(status=ProcessedOrderStatus.CANCELLED)
+                    .returning(Order)
+                )
+            ).all()
+            await session.commit()
+
+        orders = [OrderSchema(**get_entity_values(entity)) for entity in entities]
+        return sorted(orders, key=lambda order: order.placed_at)
+
+    async def lock_contract(
+        self,
+        session: async_scoped_session[AsyncSession],
+        contract_id: str,
+    ) -> None:
+        """
+        Take the transaction-level advisory lock of a contract, waiting for
+        any other transaction holding it to end: orders of the same contract
+        are then matched one at a time, whatever the number of workers, and
+        orders of different contracts concurrently. The lock is released on
+        commit or rollback.
+        """
+        # Hashed by the database, as Python salts the hashes of strings per
+        # process and the workers must all agree on the key
+        await session.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(contract_id)))
+        )
+
+    async def get_crossing_orders(
+        self,
+        session: async_scoped_session[AsyncSession],
+        order: OrderSchema,
+    ) -> list[Order]:
+        """
+        Return the open orders on the opposite side that `order` crosses, in
+        priority order (best price first, then first in), and only as many as
+        it takes to cover its remaining quantity: a single query, however
+        many orders it fills. They are returned detached from the session,
+        for their fills to be written by `fill_orders` in one statement rather
+        than flushed one UPDATE each.
+        """
+        assert order.remaining_quantity is not None
+        side = OrderSide.SELL if order.side == OrderSide.BUY else OrderSide.BUY
+        conditions = [Order.contract_id == order.contract_id, *open_orders(side)]
+        # Market orders take any price
+        if order.type == OrderType.LIMIT and order.price is not None:
+            conditions.append(
+                Order.price <= order.price
+                if order.side == OrderSide.BUY
+                else Order.price >= order.price
+            )
+
+        # Best price first: the lowest asks for a buy, the highest bids for a
+        # sell, then first in at each price level
+        def priority(orders) -> tuple:
+            return (
+                orders.price.asc()
+                if order.side == OrderSide.BUY
+                else orders.price.desc(),
+                orders.created_at.asc(),
+            )
+
+        # Quantity of the crossing orders ahead of each one: an order is only
+        # needed if those ahead of it leave some of the quantity unfilled
+        ahead = func.coalesce(
+            func.sum(Order.remaining_quantity).over(
+                order_by=priority(Order), rows=(None, -1)
+            ),
+            0,
+        )
+        candidates = select(Order, ahead.label("ahead")).where(*conditions).subquery()
+        crossing = aliased(Order, candidates)
+        statement = (
+            select(crossing)
+            .where(candidates.c.ahead < order.remaining_quantity)
+            .order_by(*priority(candidates.c))
+        )
+        orders = list((await session.scalars(statement)).all())
+        for resting in orders:
+            session.expunge(resting)
+        return orders
+
+    async def fill_orders(
+        self,
+        session: async_scoped_session[AsyncSession],
+        orders: list[Order],
+    ) -> None:
+        """
+        Write the remaining quantity and status of resting orders filled by
+        a match, in a single `UPDATE ... FROM (VALUES ...)` (not committed).
+        """
+        if not orders:
+            return
+
+        table = Order.__table__.c
+        fills = values(
+            column("id", table.id.type),
+            column("remaining_quantity", table.remaining_quantity.type),
+            column("status", table.status.type),
+            name="fills",
+        ).data([(order.id, order.remaining_quantity, order.status) for order in orders])
+        await session.execute(
+            update(Order)
+            .where(Order.id == fills.c.id)
+            .values(
+                remaining_quantity=fills.c.remaining_quantity,
+                status=fills.c.status,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def update_order(self, order: OrderSchema) -> OrderSchema:
         """Update an order in the order book."""
         async with self.db() as session:
@@ -94,12 +296,12 @@ class OrderBook:
         self,
         contract_id: ContractCode,
     ) -> Decimal | None:
-        """Get the best ask price from the order book."""
+        """Get the best (lowest) price of the open asks of the order book."""
         async with self.db() as session:
             best_ask = await session.execute(
-                select(func.max(Order.price)).where(
+                select(func.min(Order.price)).where(
                     Order.contract_id == contract_id,
-                    Order.side == OrderSide.SELL,
+                    *open_orders(OrderSide.SELL),
                 )
             )
             return best_ask.scalar_one_or_none()
@@ -108,12 +310,12 @@ class OrderBook:
         self,
         contract_id: ContractCode,
     ) -> Decimal | None:
-        """Get the best bid price from the order book."""
+        """Get the best (highest) price of the open bids of the order book."""
         async with self.db() as session:
             best_bid = await session.execute(
-                select(func.min(Order.price)).where(
+                select(func.max(Order.price)).where(
                     Order.contract_id == contract_id,
-                    Order.side == OrderSide.BUY,
+                    *open_orders(OrderSide.BUY),
                 )
             )
             return best_bid.scalar_one_or_none()
@@ -5,24 +5,32 @@ from uuid import UUID
 from pydantic import Field
 
 from ctenex.domain.base_model import BaseDomainModel
-from ctenex.domain.contracts import ContractCode
 from ctenex.domain.entities import (
     OpenOrderStatus,
     OrderSide,
     OrderStatus,
     OrderType,
+    TimeInForce,
 )
 
 
 class Order(BaseDomainModel):
-    contract_id: ContractCode
+    contract_id: str
     trader_id: UUID
     side: OrderSide
     type: OrderType
     price: Decimal | None = Field(
         default=None, description="Required for limit orders, ignored for market orders"
     )
+    stop_price: Decimal | None = Field(
+        default=None, description="Required for stop and stop-limit orders"
+    )
     quantity: Decimal
+    time_in_force: TimeInForce = Field(default=TimeInForce.GTC)
     status: OrderStatus = Field(default=OpenOrderStatus.OPEN)
     remaining_quantity: Decimal | None = Field(default=None)
-    placed_at: datetime = Field(default=datetime.now(UTC))
+    placed_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    expires_at: datetime | None = Field(
+        default=None,
+        description="Required for good-till-date orders, set for day orders",
+    )
@@ -2,9 +2,14 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from ctenex.domain.entities import OrderSide, OrderStatus, OrderType
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderStatus, OrderType, TimeInForce
+from ctenex.domain.order_book.trade.model import Trade
+
+# Largest number of orders accepted in a single batch
+MAX_BATCH_SIZE = 1_000
 
 
 class OrderAddRequest(BaseModel):
@@ -13,7 +18,18 @@ class OrderAddRequest(BaseModel):
     side: OrderSide
     type: OrderType
     price: Decimal | None = None
+    stop_price: Decimal | None = None
     quantity: Decimal
+    time_in_force: TimeInForce = TimeInForce.GTC
+    expires_at: datetime | None = None
+
+
+class OrderAmendRequest(BaseModel):
+    contract_id: ContractCode
+    quantity: Decimal | None = Field(
+        default=None, gt=0, description="New total quantity, filled part included"
+    )
+    price: Decimal | None = Field(default=None, gt=0)
 
 
 class OrderAddResponse(BaseModel):
@@ -23,7 +39,10 @@ class OrderAddResponse(BaseModel):
     side: OrderSide
     type: OrderType
     price: Decimal | None = None
+    stop_price: Decimal | None = None
     quantity: Decimal
+    time_in_force: TimeInForce = TimeInForce.GTC
+    expires_at: datetime | None = None
     status: OrderStatus
 
 
@@ -34,7 +53,21 @@ class OrderGetResponse(BaseModel):
     side: OrderSide
     type: OrderType
     price: Decimal | None = None
+    stop_price: Decimal | None = None
     quantity: Decimal
+    time_in_force: TimeInForce = TimeInForce.GTC
+    expires_at: datetime | None = None
     status: OrderStatus
     remaining_quantity: Decimal | None = None
     placed_at: datetime
+
+
+class OrderBatchAddRequest(BaseModel):
+    orders: list[OrderAddRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class OrderBatchAddResponse(OrderGetResponse):
+    trades: list[Trade] = Field(default_factory=list)
+    error: str | None = None
+    # Type of the risk limit breached, if rejected by the risk checks
+    error_code: str | None = None
@@ -0,0 +1,17 @@
+import asyncio
+
+from ctenex.core.db.async_session import DatabaseManager, create_custom_engine
+from ctenex.domain import entities  # noqa F401 (declares the tables of the schema)
+from ctenex.settings.application import get_app_settings
+
+
+async def migrate_db():
+    db_settings = get_app_settings().db
+    engine = create_custom_engine(str(db_settings.uri))
+
+    await DatabaseManager.migrate_db(engine=engine)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_db())
@@ -4,12 +4,14 @@ from pydantic import Field
 
 from ctenex.settings.api import APISettings
 from ctenex.settings.base import CommonSettings
+from ctenex.settings.engine import EngineSettings
 from ctenex.settings.postgres import PostgresSettings
 
 
 class AppSettings(CommonSettings):
     api: APISettings = APISettings()
     db: PostgresSettings = PostgresSettings()
+    engine: EngineSettings = EngineSettings()
 
     environment: str = Field(validation_alias="ENVIRONMENT", default="dev")
     project_name: str = "CTENEX (Commodity Trading Exchange)"
@@ -0,0 +1,79 @@
+from datetime import time
+from decimal import Decimal
+from pathlib import Path
+
+from pydantic import Field
+
+from ctenex.settings.base import CommonSettings
+
+
+class EngineSettings(CommonSettings):
+    # Retention of the trades of each contract in the in-memory engine
+    trade_retention_count: int | None = Field(
+        validation_alias="TRADE_RETENTION_COUNT", default=1_000_000
+    )
+    trade_retention_seconds: float | None = Field(
+        validation_alias="TRADE_RETENTION_SECONDS", default=None
+    )
+    # Orders closed (filled, cancelled or expired) still found by ID in the
+    # in-memory engine, the most recently closed (per shard if sharded): a
+    # closed order takes up to about 2KB
+    closed_order_retention_count: int | None = Field(
+        validation_alias="CLOSED_ORDER_RETENTION_COUNT", default=10_000
+    )
+
+    # Journal of the commands accepted by the in-memory engine (off if unset)
+    journal_path: Path | None = Field(validation_alias="JOURNAL_PATH", default=None)
+    journal_commit_size: int = Field(
+        validation_alias="JOURNAL_COMMIT_SIZE", default=1_000
+    )
+    journal_commit_interval: float = Field(
+        validation_alias="JOURNAL_COMMIT_INTERVAL", default=0.01
+    )
+
+    # Snapshots of the books of the in-memory engine (off if unset), taken
+    # every `snapshot_interval` seconds so that a restart only replays the
+    # journal from the latest snapshot on
+    snapshot_dir: Path | None = Field(validation_alias="SNAPSHOT_DIR", default=None)
+    snapshot_interval: float = Field(validation_alias="SNAPSHOT_INTERVAL", default=60)
+    snapshot_keep: int = Field(validation_alias="SNAPSHOT_KEEP", default=2)
+
+    # Worker processes the contracts of the in-memory engine are spread over
+    # (0: contracts are matched in the API process itself)
+    shards: int = Field(validation_alias="ENGINE_SHARDS", default=0)
+    # Commands in flight at once to the shards, over all of them
+    dispatch_workers: int = Field(validation_alias="DISPATCH_WORKERS", default=32)
+
+    # Units and structure of the books of the in-memory engine: the books of
+    # the contracts given a tick size (e.g. '{"UK-BL-MAR-25": "0.01"}') match
+    # on integer ticks and lots rather than Decimals, and all books are price
+    # ladders rather than sorted price levels if `ladder_order_books` is set
+    tick_sizes: dict[str, Decimal] = Field(
+        validation_alias="ENGINE_TICK_SIZES", default_factory=dict
+    )
+    ladder_order_books: bool = Field(
+        validation_alias="ENGINE_LADDER_ORDER_BOOKS", default=False
+    )
+
+    # Per-stage latency histograms of the engines, readable on /status/latency
+    latency_histograms: bool = Field(
+        validation_alias="LATENCY_HISTOGRAMS", default=True
+    )
+
+    # Expiry of the good-till-date and day orders of the in-memory engine:
+    # day orders expire at `session_close` (UTC), and expired orders are
+    # swept every `expiry_interval` seconds
+    session_close: time = Field(validation_alias="SESSION_CLOSE", default=time(0))
+    expiry_interval: float = Field(validation_alias="EXPIRY_INTERVAL", default=1.0)
+
+    # Pre-trade risk limits of the in-memory engine, applied to every trader
+    # per contract (no checks at all if none is set)
+    risk_max_order_quantity: Decimal | None = Field(
+        validation_alias="RISK_MAX_ORDER_QUANTITY", default=None
+    )
+    risk_max_open_notional: Decimal | None = Field(
+        validation_alias="RISK_MAX_OPEN_NOTIONAL", default=None
+    )
+    risk_max_position: Decimal | None = Field(
+        validation_alias="RISK_MAX_POSITION", default=None
+    )
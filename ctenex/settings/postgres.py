@@ -10,6 +10,15 @@ class PostgresSettings(CommonSettings):
     host: str | None = Field(validation_alias="DB_HOST", default="")
     uri: PostgresDsn | str | None = Field(validation_alias="DB_URI", default=None)
 
+    # Pool of connections of the engine, kept open for the life of the app:
+    # `pool_size` connections, and up to `max_overflow` more under load,
+    # waited for up to `pool_timeout` seconds and reopened once older than
+    # `pool_recycle` seconds
+    pool_size: int = Field(validation_alias="DB_POOL_SIZE", default=10)
+    max_overflow: int = Field(validation_alias="DB_MAX_OVERFLOW", default=0)
+    pool_timeout: float = Field(validation_alias="DB_POOL_TIMEOUT", default=30)
+    pool_recycle: int = Field(validation_alias="DB_POOL_RECYCLE", default=1800)
+
     @field_validator("uri")
     def assemble_db_uri(cls, v, values: ValidationInfo):
         if not v:
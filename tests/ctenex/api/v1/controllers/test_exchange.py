@@ -225,28 +225,74 @@ class TestOrdersController:
 
         assert response.status_code == 200
         assert len(payload) == 3
-        assert payload[0]["trader_id"] == str(order_request_1.trader_id)
-        assert payload[0]["contract_id"] == order_request_1.contract_id
-        assert payload[0]["side"] == order_request_1.side
-        assert payload[0]["type"] == order_request_1.type
-        assert payload[0]["price"] == str(order_request_1.price)
-        assert payload[0]["quantity"] == str(order_request_1.quantity)
-        assert payload[0]["status"] == ProcessedOrderStatus.FILLED
-
-        assert payload[1]["trader_id"] == str(order_request_2.trader_id)
-        assert payload[1]["contract_id"] == order_request_2.contract_id
-        assert payload[1]["side"] == order_request_2.side
-        assert payload[1]["type"] == order_request_2.type
-        assert payload[1]["price"] == str(order_request_2.price)
-        assert payload[1]["quantity"] == str(order_request_2.quantity)
-        assert payload[1]["status"] == OpenOrderStatus.PARTIALLY_FILLED
-
-        assert payload[2]["trader_id"] == str(order_request_3.trader_id)
-        assert payload[2]["contract_id"] == order_request_3.contract_id
-        assert payload[2]["side"] == order_request_3.side
-        assert payload[2]["type"] == order_request_3.type
-        assert payload[2]["quantity"] == str(order_request_3.quantity)
-        assert payload[2]["status"] == ProcessedOrderStatus.FILLED
+        # Rows come back in no particular order
+        orders = {(order["side"], order["price"]): order for order in payload}
+
+        second_best_bid = orders[(OrderSide.BUY, str(order_request_1.price))]
+        assert second_best_bid["trader_id"] == str(order_request_1.trader_id)
+        assert second_best_bid["contract_id"] == order_request_1.contract_id
+        assert second_best_bid["type"] == order_request_1.type
+        assert second_best_bid["quantity"] == str(order_request_1.quantity)
+        assert second_best_bid["remaining_quantity"] == "8.00"
+        assert second_best_bid["status"] == OpenOrderStatus.PARTIALLY_FILLED
+
+        best_bid = orders[(OrderSide.BUY, str(order_request_2.price))]
+        assert best_bid["trader_id"] == str(order_request_2.trader_id)
+        assert best_bid["contract_id"] == order_request_2.contract_id
+        assert best_bid["type"] == order_request_2.type
+        assert best_bid["quantity"] == str(order_request_2.quantity)
+        assert best_bid["remaining_quantity"] == "0.00"
+        assert best_bid["status"] == ProcessedOrderStatus.FILLED
+
+        (sell_order,) = [
+            order for order in payload if order["side"] == order_request_3.side
+        ]
+        assert sell_order["trader_id"] == str(order_request_3.trader_id)
+        assert sell_order["contract_id"] == order_request_3.contract_id
+        assert sell_order["type"] == order_request_3.type
+        assert sell_order["quantity"] == str(order_request_3.quantity)
+        assert sell_order["status"] == ProcessedOrderStatus.FILLED
+
+    # DELETE /orders
+
+    def test_cancel_orders(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        trader_id = UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213")
+        order_ids = []
+        for price in ("100.00", "99.00"):
+            response = client.post(
+                url=self.url,
+                json=jsonable_encoder(
+                    OrderAddRequest(
+                        contract_id=ContractCode.UK_BL_MAR_25,
+                        trader_id=trader_id,
+                        side=OrderSide.BUY,
+                        type=OrderType.LIMIT,
+                        price=Decimal(price),
+                        quantity=Decimal("10.00"),
+                    )
+                ),
+            )
+            order_ids.append(response.json()["id"])
+
+        # test
+        response = client.delete(
+            url=self.url,
+            params={"trader_id": str(trader_id), "contract_id": "UK-BL-MAR-25"},
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert [order["id"] for order in payload] == order_ids
+        assert payload[0]["status"] == ProcessedOrderStatus.CANCELLED
+
+        response = client.delete(url=self.url, params={"trader_id": str(trader_id)})
+        assert response.json() == []
 
 
 class TestContractsController:
@@ -5,8 +5,14 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.testclient import TestClient
 
 from ctenex.domain.contracts import ContractCode
-from ctenex.domain.entities import OpenOrderStatus, OrderSide, OrderType
-from ctenex.domain.order_book.order.schemas import OrderAddRequest
+from ctenex.domain.entities import (
+    OpenOrderStatus,
+    OrderSide,
+    OrderType,
+    ProcessedOrderStatus,
+    TimeInForce,
+)
+from ctenex.domain.order_book.order.schemas import OrderAddRequest, OrderAmendRequest
 from tests.fixtures.db import async_session, engine, setup_and_teardown_db  # noqa F401
 from tests.fixtures.domain import client_for_stateful_app as client  # noqa F401
 from tests.fixtures.domain import (
@@ -121,7 +127,7 @@ class TestOrdersController:
         assert payload["type"] == order_request.type
         assert payload["price"] == order_request.price
         assert payload["quantity"] == str(order_request.quantity)
-        assert payload["status"] == OpenOrderStatus.OPEN
+        assert payload["status"] == ProcessedOrderStatus.CANCELLED
 
     def test_add_market_sell_order(
         self,
@@ -154,8 +160,131 @@ class TestOrdersController:
         assert payload["type"] == order_request.type
         assert payload["price"] == order_request.price
         assert payload["quantity"] == str(order_request.quantity)
+        assert payload["status"] == ProcessedOrderStatus.CANCELLED
+
+    def test_add_ioc_order_without_match(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            time_in_force=TimeInForce.IOC,
+            price=Decimal("100.00"),
+            quantity=Decimal("10.00"),
+        )
+
+        # test
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(order_request),
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+
+        assert payload["time_in_force"] == TimeInForce.IOC
+        assert payload["status"] == ProcessedOrderStatus.CANCELLED
+
+        response = client.get(
+            url=self.url,
+            params={"contract_id": "UK-BL-MAR-25"},
+        )
+        assert response.json() == []
+
+    def test_add_stop_order(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.STOP_LIMIT,
+            price=Decimal("101.00"),
+            stop_price=Decimal("100.50"),
+            quantity=Decimal("10.00"),
+        )
+
+        # test
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(order_request),
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+
+        assert payload["type"] == OrderType.STOP_LIMIT
+        assert payload["stop_price"] == "100.50"
+        assert payload["status"] == OpenOrderStatus.OPEN
+
+        response = client.get(
+            url=f"{self.url}/stops",
+            params={"contract_id": "UK-BL-MAR-25"},
+        )
+        assert [order["id"] for order in response.json()] == [payload["id"]]
+
+    def test_add_day_order(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            time_in_force=TimeInForce.DAY,
+            price=Decimal("100.00"),
+            quantity=Decimal("10.00"),
+        )
+
+        # test
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(order_request),
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+
+        assert payload["time_in_force"] == TimeInForce.DAY
+        assert payload["expires_at"] is not None
         assert payload["status"] == OpenOrderStatus.OPEN
 
+    def test_add_stop_order_without_stop_price(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.STOP,
+            quantity=Decimal("10.00"),
+        )
+
+        # test
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(order_request),
+        )
+
+        # validation
+        assert response.status_code == 400
+
     # GET /orders
 
     def test_get_orders(
@@ -224,3 +353,302 @@ class TestOrdersController:
         assert payload[0]["price"] == str(order_request_1.price)
         assert payload[0]["quantity"] == str(order_request_1.quantity)
         assert payload[0]["status"] == OpenOrderStatus.PARTIALLY_FILLED
+
+    # PATCH /orders/{id}
+
+    def test_amend_order(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.0"),
+            quantity=Decimal("10.0"),
+        )
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(order_request),
+        )
+        order_id = response.json()["id"]
+
+        # test
+        response = client.patch(
+            url=f"{self.url}/{order_id}",
+            json=jsonable_encoder(
+                OrderAmendRequest(
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    quantity=Decimal("4.0"),
+                    price=Decimal("99.5"),
+                )
+            ),
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert payload["id"] == order_id
+        assert payload["price"] == "99.5"
+        assert payload["quantity"] == "4.0"
+        assert payload["remaining_quantity"] == "4.0"
+        assert payload["status"] == OpenOrderStatus.OPEN
+
+    def test_amend_unknown_order(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        amend_request = OrderAmendRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            quantity=Decimal("4.0"),
+        )
+
+        # test
+        response = client.patch(
+            url=f"{self.url}/391d8651-5ef8-4d17-9a0c-43c96c29b213",
+            json=jsonable_encoder(amend_request),
+        )
+
+        # validation
+        assert response.status_code == 404
+
+    # DELETE /orders
+
+    def test_cancel_orders(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        trader_id = UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213")
+        order_ids = []
+        for price in ("100.00", "99.00"):
+            response = client.post(
+                url=self.url,
+                json=jsonable_encoder(
+                    OrderAddRequest(
+                        contract_id=ContractCode.UK_BL_MAR_25,
+                        trader_id=trader_id,
+                        side=OrderSide.BUY,
+                        type=OrderType.LIMIT,
+                        price=Decimal(price),
+                        quantity=Decimal("10.00"),
+                    )
+                ),
+            )
+            order_ids.append(response.json()["id"])
+
+        # test
+        response = client.delete(
+            url=self.url,
+            params={"trader_id": str(trader_id), "contract_id": "UK-BL-MAR-25"},
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert [order["id"] for order in payload] == order_ids
+        assert payload[0]["status"] == ProcessedOrderStatus.CANCELLED
+
+        response = client.delete(url=self.url, params={"trader_id": str(trader_id)})
+        assert response.json() == []
+
+    # GET /orders/{order_id}
+
+    def test_get_order_by_id(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(
+                OrderAddRequest(
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+                    side=OrderSide.BUY,
+                    type=OrderType.LIMIT,
+                    price=Decimal("100.00"),
+                    quantity=Decimal("10.00"),
+                )
+            ),
+        )
+        order_id = response.json()["id"]
+
+        # test
+        response = client.get(url=f"{self.url}/{order_id}")
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert payload["id"] == order_id
+        assert payload["contract_id"] == ContractCode.UK_BL_MAR_25
+        assert payload["status"] == OpenOrderStatus.OPEN
+
+    def test_get_unknown_order(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # test
+        response = client.get(url=f"{self.url}/391d8651-5ef8-4d17-9a0c-43c96c29b213")
+
+        # validation
+        assert response.status_code == 404
+
+    # DELETE /orders/{order_id}
+
+    def test_cancel_order(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        response = client.post(
+            url=self.url,
+            json=jsonable_encoder(
+                OrderAddRequest(
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+                    side=OrderSide.SELL,
+                    type=OrderType.LIMIT,
+                    price=Decimal("100.00"),
+                    quantity=Decimal("10.00"),
+                )
+            ),
+        )
+        order_id = response.json()["id"]
+
+        # test
+        response = client.delete(url=f"{self.url}/{order_id}")
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert payload["id"] == order_id
+        assert payload["status"] == ProcessedOrderStatus.CANCELLED
+
+        assert client.delete(url=f"{self.url}/{order_id}").status_code == 404
+        # Still found, with its final status
+        response = client.get(url=f"{self.url}/{order_id}")
+        assert response.status_code == 200
+        assert response.json()["status"] == ProcessedOrderStatus.CANCELLED
+
+    # GET /orders/depth
+
+    def test_get_depth(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        for side, price in [
+            (OrderSide.BUY, Decimal("99.0")),
+            (OrderSide.BUY, Decimal("99.0")),
+            (OrderSide.BUY, Decimal("98.0")),
+            (OrderSide.SELL, Decimal("101.0")),
+        ]:
+            client.post(
+                url=self.url,
+                json=jsonable_encoder(
+                    OrderAddRequest(
+                        contract_id=ContractCode.UK_BL_MAR_25,
+                        trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+                        side=side,
+                        type=OrderType.LIMIT,
+                        price=price,
+                        quantity=Decimal("10.0"),
+                    )
+                ),
+            )
+
+        # test
+        response = client.get(
+            url=f"{self.url}/depth",
+            params={"contract_id": "UK-BL-MAR-25", "levels": 1},
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert payload["contract_id"] == ContractCode.UK_BL_MAR_25
+        assert payload["bids"] == [{"price": "99.0", "quantity": "20.0", "orders": 2}]
+        assert payload["asks"] == [{"price": "101.0", "quantity": "10.0", "orders": 1}]
+
+    # POST /orders/batch
+
+    def test_add_orders_batch(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        trader_id = UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213")
+        body = {
+            "orders": [
+                OrderAddRequest(
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=trader_id,
+                    side=OrderSide.SELL,
+                    type=OrderType.LIMIT,
+                    price=Decimal("100.00"),
+                    quantity=Decimal("10.00"),
+                ),
+                OrderAddRequest(
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=trader_id,
+                    side=OrderSide.BUY,
+                    type=OrderType.LIMIT,
+                    quantity=Decimal("5.00"),
+                ),
+                OrderAddRequest(
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=trader_id,
+                    side=OrderSide.BUY,
+                    type=OrderType.MARKET,
+                    quantity=Decimal("4.00"),
+                ),
+            ]
+        }
+
+        # test
+        response = client.post(
+            url=f"{self.url}/batch",
+            json=jsonable_encoder(body),
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+        assert len(payload) == 3
+
+        assert payload[0]["status"] == OpenOrderStatus.PARTIALLY_FILLED
+        assert payload[0]["trades"] == []
+        assert payload[0]["error"] is None
+
+        assert payload[1]["error"] == "Order must have a price"
+
+        assert payload[2]["status"] == ProcessedOrderStatus.FILLED
+        assert payload[2]["remaining_quantity"] == "0.00"
+        [trade] = payload[2]["trades"]
+        assert trade["buy_order_id"] == payload[2]["id"]
+        assert trade["sell_order_id"] == payload[0]["id"]
+        assert trade["price"] == "100.00"
+        assert trade["quantity"] == "4.00"
+
+    def test_add_orders_batch_rejects_empty_batch(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        ...
+
+        # test
+        response = client.post(url=f"{self.url}/batch", json={"orders": []})
+
+        # validation
+        assert response.status_code == 422
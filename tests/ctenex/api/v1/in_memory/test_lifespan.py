@@ -0,0 +1,197 @@
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from ctenex.api.app_factory import create_app
+from ctenex.api.controllers.status import router as status_router
+from ctenex.api.v1.in_memory.controllers.exchange import (
+    router as stateful_exchange_router,
+)
+from ctenex.api.v1.in_memory.lifespan import lifespan
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.order_book.ladder import LadderOrderBook
+from ctenex.domain.order_book.order.schemas import OrderAddRequest
+from ctenex.settings.application import get_app_settings
+
+
+@pytest.fixture
+def journal_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "journal"
+    monkeypatch.setattr(get_app_settings().engine, "journal_path", path)
+    return path
+
+
+def make_client() -> TestClient:
+    return TestClient(
+        app=create_app(
+            lifespan=lifespan,
+            routers=[status_router, stateful_exchange_router],
+        )
+    )
+
+
+class TestJournaledLifespan:
+    def test_resting_orders_survive_a_restart(self, journal_path: Path):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.00"),
+            quantity=Decimal("10.00"),
+        )
+        with make_client() as client:
+            order_id = client.post(
+                url="/orders", json=jsonable_encoder(order_request)
+            ).json()["id"]
+
+        # test
+        with make_client() as client:
+            response = client.get(url="/orders", params={"contract_id": "UK-BL-MAR-25"})
+
+        # validation
+        payload = response.json()
+
+        assert journal_path.exists()
+        assert response.status_code == 200
+        assert [order["id"] for order in payload] == [order_id]
+        assert payload[0]["price"] == "100.00"
+        assert payload[0]["remaining_quantity"] == "10.00"
+
+    def test_resting_orders_are_restored_from_a_snapshot(
+        self, journal_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # setup
+        snapshot_dir = tmp_path / "snapshots"
+        monkeypatch.setattr(get_app_settings().engine, "snapshot_dir", snapshot_dir)
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.SELL,
+            type=OrderType.LIMIT,
+            price=Decimal("101.00"),
+            quantity=Decimal("5.00"),
+        )
+        with make_client() as client:
+            order_id = client.post(
+                url="/orders", json=jsonable_encoder(order_request)
+            ).json()["id"]
+
+        # test
+        with make_client() as client:
+            response = client.get(url="/orders", params={"contract_id": "UK-BL-MAR-25"})
+
+        # validation
+        # Shutting down snapshots the books as of the end of the journal
+        assert [path.name for path in snapshot_dir.iterdir()] == [
+            f"snapshot-{journal_path.stat().st_size:020d}.bin"
+        ]
+        assert response.status_code == 200
+        assert [order["id"] for order in response.json()] == [order_id]
+
+
+class TestShardedLifespan:
+    def test_orders_are_matched_in_shards(self, monkeypatch: pytest.MonkeyPatch):
+        # setup
+        monkeypatch.setattr(get_app_settings().engine, "shards", 2)
+        order_requests = [
+            OrderAddRequest(
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+                side=side,
+                type=OrderType.LIMIT,
+                price=Decimal("100.00"),
+                quantity=Decimal("10.00"),
+            )
+            for side in (OrderSide.BUY, OrderSide.SELL)
+        ]
+
+        # test
+        with make_client() as client:
+            response = client.post(
+                url="/orders/batch",
+                json=jsonable_encoder({"orders": order_requests}),
+            )
+            resting = client.get(url="/orders", params={"contract_id": "UK-BL-MAR-25"})
+
+        # validation
+        assert response.status_code == 200
+        assert [len(order["trades"]) for order in response.json()] == [0, 1]
+        assert resting.json() == []
+
+
+class TestRiskLimitedLifespan:
+    def test_orders_breaching_a_limit_are_rejected(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        # setup
+        monkeypatch.setattr(
+            get_app_settings().engine, "risk_max_order_quantity", Decimal("5.00")
+        )
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.00"),
+            quantity=Decimal("10.00"),
+        )
+
+        # test
+        with make_client() as client:
+            response = client.post(url="/orders", json=jsonable_encoder(order_request))
+            batch = client.post(
+                url="/orders/batch",
+                json={"orders": [jsonable_encoder(order_request)]},
+            )
+
+        # validation
+        assert response.status_code == 422
+        assert response.json()["detail"]["code"] == "order_size_limit"
+        assert batch.status_code == 200
+        assert batch.json()[0]["error_code"] == "order_size_limit"
+
+
+class TestTickLifespan:
+    @pytest.mark.parametrize("shards", [0, 2], ids=["in-process", "sharded"])
+    def test_orders_are_matched_on_ladders_of_ticks(
+        self, shards: int, monkeypatch: pytest.MonkeyPatch
+    ):
+        # setup
+        settings = get_app_settings().engine
+        monkeypatch.setattr(settings, "shards", shards)
+        monkeypatch.setattr(
+            settings, "tick_sizes", {ContractCode.UK_BL_MAR_25: Decimal("0.05")}
+        )
+        monkeypatch.setattr(settings, "ladder_order_books", True)
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.02"),
+            quantity=Decimal("10.00"),
+        )
+
+        # test
+        with make_client() as client:
+            off_tick = client.post(url="/orders", json=jsonable_encoder(order_request))
+            order_request.price = Decimal("100.05")
+            on_tick = client.post(url="/orders", json=jsonable_encoder(order_request))
+            resting = client.get(url="/orders", params={"contract_id": "UK-BL-MAR-25"})
+            engine = client.app.state.matching_engine  # type: ignore[attr-defined]
+            if shards == 0:
+                assert isinstance(
+                    engine.order_books[ContractCode.UK_BL_MAR_25], LadderOrderBook
+                )
+
+        # validation
+        assert off_tick.status_code == 400
+        assert on_tick.status_code == 200
+        assert [order["price"] for order in resting.json()] == ["100.05"]
@@ -1,6 +1,20 @@
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
 from fastapi.testclient import TestClient
 
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.order_book.order.schemas import OrderAddRequest
+from tests.fixtures.db import (
+    engine,  # noqa F401
+    setup_and_teardown_db,  # noqa F401
+)
 from tests.fixtures.domain import client_for_stateful_app as client  # noqa F401
+from tests.fixtures.domain import (
+    client_for_stateless_app as stateless_client,  # noqa F401
+)
 
 
 class TestStatusController:
@@ -24,3 +38,68 @@ class TestStatusController:
         assert response.status_code == 200
 
         assert payload["status"] == "OK"
+
+    # GET /status/latency
+
+    def test_get_latency(
+        self,
+        client: TestClient,  # noqa F811
+    ):
+        # setup
+        order_request = OrderAddRequest(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID("391d8651-5ef8-4d17-9a0c-43c96c29b213"),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.00"),
+            quantity=Decimal("10.00"),
+        )
+        client.post(url="/orders", json=jsonable_encoder(order_request))
+
+        # test
+        response = client.get(
+            url=f"{self.url}/latency",
+        )
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+
+        (contract,) = payload["contracts"]
+        assert contract["contract_id"] == ContractCode.UK_BL_MAR_25
+        assert contract["stages"]["total"]["count"] == 1
+        assert set(contract["stages"]["total"]) == {
+            "count",
+            "p50",
+            "p99",
+            "p999",
+            "max",
+        }
+
+    # GET /status/pool
+
+    def test_get_pool(
+        self,
+        stateless_client: TestClient,  # noqa F811
+    ):
+        # setup
+        stateless_client.get(url="/supported-contracts")
+        before = stateless_client.get(url=f"{self.url}/pool").json()
+
+        # test
+        for _ in range(5):
+            stateless_client.get(url="/supported-contracts")
+        response = stateless_client.get(url=f"{self.url}/pool")
+
+        # validation
+        payload = response.json()
+
+        assert response.status_code == 200
+
+        # Connections are checked out of the pool, not opened anew
+        assert payload["connects"] == before["connects"]
+        assert payload["checkouts"] == before["checkouts"] + 5
+        assert payload["checked_out"] == 0
+        assert payload["checked_in"] >= 1
+        assert payload["max_wait_ms"] >= payload["mean_wait_ms"] > 0
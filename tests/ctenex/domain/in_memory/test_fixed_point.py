@@ -0,0 +1,196 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import (
+    Commodity,
+    DeliveryPeriod,
+    OrderSide,
+    OrderType,
+)
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.in_memory.order_book.scale import TickScale
+from ctenex.domain.order_book.contract.model import Contract
+from ctenex.domain.order_book.order.model import Order
+from tests.fixtures.flows import random_flow
+
+CONTRACT = Contract(
+    external_id=ContractCode.UK_BL_MAR_25,
+    commodity=Commodity.POWER,
+    delivery_period=DeliveryPeriod.MONTHLY,
+    start_date=datetime(2025, 3, 1),
+    end_date=datetime(2025, 3, 31),
+    location="GB",
+    tick_size=Decimal("0.01"),
+    contract_size=Decimal("1.0"),
+)
+
+
+def replay(engine: MatchingEngine, flow: list[tuple[str, dict]]) -> dict[UUID, Order]:
+    orders = {}
+    for action, payload in flow:
+        if action == "add":
+            order = Order(**payload)
+            orders[order.id] = order
+            engine.add_order(order)
+        else:
+            engine.order_books[ContractCode.UK_BL_MAR_25].cancel_order(payload["id"])
+    return orders
+
+
+class TestTickScale:
+    def setup_method(self):
+        self.scale = TickScale(tick_size=Decimal("0.05"))
+
+    def test_round_trip(self):
+        """Test prices and quantities convert to integers and back."""
+
+        # Setup
+        ...
+
+        # Test and validation
+        assert self.scale.to_ticks(Decimal("100.05")) == 2001
+        assert self.scale.to_price(2001) == Decimal("100.05")
+        assert self.scale.to_lots(Decimal("2.5")) == 250
+        assert self.scale.to_quantity(250) == Decimal("2.50")
+
+    def test_off_tick_price_raises_error(self):
+        """Test a price that is not a multiple of the tick size is rejected."""
+
+        # Setup
+        ...
+
+        # Test and validation
+        with pytest.raises(ValueError, match="not a multiple of the tick size"):
+            self.scale.to_ticks(Decimal("100.03"))
+
+    def test_off_lot_quantity_raises_error(self):
+        """Test a quantity that is not a multiple of the lot size is rejected."""
+
+        # Setup
+        ...
+
+        # Test and validation
+        with pytest.raises(ValueError, match="not a multiple of the lot size"):
+            self.scale.to_lots(Decimal("1.005"))
+
+
+class TestFixedPointMatching:
+    def setup_method(self):
+        self.decimal_engine = MatchingEngine()
+        self.decimal_engine.start()
+
+        self.tick_engine = MatchingEngine()
+        self.tick_engine.start(contracts=[CONTRACT])
+
+    def test_tick_engine_keys_book_on_integers(self):
+        """Test the book of a contract with metadata is keyed on integer ticks."""
+
+        # Setup
+        flow = random_flow(seed=1, size=50)
+
+        # Test
+        replay(self.tick_engine, flow)
+
+        # Validation
+        order_book: OrderBook = self.tick_engine.order_books[ContractCode.UK_BL_MAR_25]
+        assert isinstance(order_book.scale, TickScale)
+        assert all(isinstance(price, int) for price in order_book.asks.keys())
+        assert all(isinstance(price, int) for price in order_book.bids.keys())
+
+    @pytest.mark.parametrize("seed", [7, 42, 2025])
+    def test_matching_is_identical_to_decimal_path(self, seed: int):
+        """Test randomized flows produce the same trades and orders in both modes."""
+
+        # Setup
+        flow = random_flow(seed=seed, size=2_000)
+
+        # Test
+        decimal_orders = replay(self.decimal_engine, flow)
+        tick_orders = replay(self.tick_engine, flow)
+
+        # Validation
+        decimal_trades = self.decimal_engine.get_trades(ContractCode.UK_BL_MAR_25)
+        tick_trades = self.tick_engine.get_trades(ContractCode.UK_BL_MAR_25)
+
+        assert len(decimal_trades) > 0
+        assert [
+            (t.buy_order_id, t.sell_order_id, str(t.price), str(t.quantity))
+            for t in decimal_trades
+        ] == [
+            (t.buy_order_id, t.sell_order_id, str(t.price), str(t.quantity))
+            for t in tick_trades
+        ]
+
+        for order_id, decimal_order in decimal_orders.items():
+            tick_order = tick_orders[order_id]
+            assert tick_order.status == decimal_order.status
+            assert str(tick_order.remaining_quantity) == str(
+                decimal_order.remaining_quantity
+            )
+
+        assert {o.id for o in self.decimal_engine.get_orders(CONTRACT.external_id)} == {
+            o.id for o in self.tick_engine.get_orders(CONTRACT.external_id)
+        }
+
+    def test_submitted_exponents_are_normalised_to_the_tick_and_lot(self):
+        """Test values with other exponents match the same, leaving quantized."""
+
+        # Setup
+        flow = random_flow(seed=11, size=2_000)
+        for index, (action, payload) in enumerate(flow):
+            if action == "add":
+                # e.g. 100.00 as 1E+2, 100.0 or 100.0000 in turn
+                exponent = (None, Decimal("0.1"), Decimal("0.0001"))[index % 3]
+                for field in ("price", "quantity"):
+                    if payload[field] is not None:
+                        payload[field] = (
+                            payload[field].normalize()
+                            if exponent is None
+                            else payload[field].quantize(exponent)
+                        )
+
+        # Test
+        decimal_orders = replay(self.decimal_engine, flow)
+        tick_orders = replay(self.tick_engine, flow)
+
+        # Validation
+        decimal_trades = self.decimal_engine.get_trades(ContractCode.UK_BL_MAR_25)
+        tick_trades = self.tick_engine.get_trades(ContractCode.UK_BL_MAR_25)
+
+        assert len(decimal_trades) > 0
+        assert [(t.price, t.quantity) for t in decimal_trades] == [
+            (t.price, t.quantity) for t in tick_trades
+        ]
+        assert {
+            (t.price.as_tuple().exponent, t.quantity.as_tuple().exponent)
+            for t in tick_trades
+        } == {(-2, -2)}
+
+        for order_id, decimal_order in decimal_orders.items():
+            tick_order = tick_orders[order_id]
+            assert tick_order.remaining_quantity == decimal_order.remaining_quantity
+        resting = self.tick_engine.get_orders(CONTRACT.external_id)
+        assert {o.price.as_tuple().exponent for o in resting if o.price} == {-2}
+
+    def test_off_tick_order_is_rejected_before_matching(self):
+        """Test an order off the tick grid is rejected without touching the book."""
+
+        # Setup
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID(int=1),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.005"),
+            quantity=Decimal("1.00"),
+        )
+
+        # Test and validation
+        with pytest.raises(ValueError, match="not a multiple of the tick size"):
+            self.tick_engine.add_order(order)
+        assert self.tick_engine.get_orders(ContractCode.UK_BL_MAR_25) == []
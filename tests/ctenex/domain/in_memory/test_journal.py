@@ -0,0 +1,382 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType, TimeInForce
+from ctenex.domain.exceptions import JournalFormatError
+from ctenex.domain.in_memory.journal.codec import (
+    AmendEvent,
+    CancelAllEvent,
+    CancelEvent,
+    ExpireEvent,
+)
+from ctenex.domain.in_memory.journal.model import Journal
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.sequencer import Sequencer
+from ctenex.domain.order_book.order.model import Order
+from tests.fixtures.flows import random_flow
+
+SUBMITTED_FIELDS = {
+    "id",
+    "contract_id",
+    "trader_id",
+    "side",
+    "type",
+    "price",
+    "quantity",
+    "time_in_force",
+    "stop_price",
+    "placed_at",
+    "expires_at",
+}
+
+
+def make_order(price: str | None = "100.25") -> Order:
+    return Order(
+        id=UUID(int=1),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=UUID(int=2),
+        side=OrderSide.SELL,
+        type=OrderType.LIMIT if price is not None else OrderType.MARKET,
+        price=Decimal(price) if price is not None else None,
+        quantity=Decimal("10.50"),
+        placed_at=datetime(2025, 3, 1, 9, 30, 0, 123456, tzinfo=UTC),
+    )
+
+
+def snapshot(engine: MatchingEngine) -> tuple[list, list]:
+    trades = engine.get_trades(ContractCode.UK_BL_MAR_25)
+    orders = engine.get_orders(ContractCode.UK_BL_MAR_25)
+    return (
+        [(t.buy_order_id, t.sell_order_id, t.price, t.quantity) for t in trades],
+        [(o.id, o.status, o.remaining_quantity) for o in orders],
+    )
+
+
+class TestJournal:
+    def test_commands_round_trip(self, tmp_path: Path):
+        """Test journaled commands are read back exactly as appended."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal")
+        limit_order, market_order = make_order(), make_order(price=None)
+        market_order.time_in_force = TimeInForce.FOK
+        stop_order = make_order()
+        stop_order.type = OrderType.STOP_LIMIT
+        stop_order.stop_price = Decimal("99.75")
+
+        # Test
+        journal.append_add(limit_order)
+        journal.append_add(market_order)
+        journal.append_add(stop_order)
+        journal.append_cancel(ContractCode.UK_BL_MAR_25, limit_order.id)
+        journal.append_amend(
+            ContractCode.UK_BL_MAR_25, limit_order.id, Decimal("2.50"), None
+        )
+        journal.append_cancel_all(ContractCode.UK_BL_MAR_25, limit_order.trader_id)
+        journal.commit()
+
+        # Validation
+        events = list(journal.read())
+        added = [event for event in events[:3] if isinstance(event, Order)]
+        assert [event.model_dump(include=SUBMITTED_FIELDS) for event in added] == [
+            limit_order.model_dump(include=SUBMITTED_FIELDS),
+            market_order.model_dump(include=SUBMITTED_FIELDS),
+            stop_order.model_dump(include=SUBMITTED_FIELDS),
+        ]
+        assert isinstance(events[0], Order)
+        assert str(events[0].price) == "100.25"
+        assert events[3] == CancelEvent(ContractCode.UK_BL_MAR_25, limit_order.id)
+        assert events[4] == AmendEvent(
+            ContractCode.UK_BL_MAR_25, limit_order.id, Decimal("2.50"), None
+        )
+        assert events[5] == CancelAllEvent(
+            ContractCode.UK_BL_MAR_25, limit_order.trader_id
+        )
+
+    def test_expiring_commands_round_trip(self, tmp_path: Path):
+        """Test expiry times and expiry sweeps are read back as appended."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal")
+        order = make_order()
+        order.time_in_force = TimeInForce.GTD
+        order.expires_at = datetime(2025, 3, 1, 17, 30, tzinfo=UTC)
+        swept_at = datetime(2025, 3, 1, 17, 30, 0, 250, tzinfo=UTC)
+
+        # Test
+        journal.append_add(order)
+        journal.append_expire(swept_at)
+        journal.commit()
+
+        # Validation
+        added, expired = journal.read()
+        assert isinstance(added, Order)
+        assert added.model_dump(include=SUBMITTED_FIELDS) == order.model_dump(
+            include=SUBMITTED_FIELDS
+        )
+        assert expired == ExpireEvent(swept_at)
+
+    def test_only_committed_commands_are_read(self, tmp_path: Path):
+        """Test commands are buffered until they are committed."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal", commit_interval=60)
+
+        # Test
+        journal.append_add(make_order())
+
+        # Validation
+        assert list(journal.read()) == []
+        journal.commit()
+        assert len(list(journal.read())) == 1
+
+    def test_commands_are_committed_in_groups(self, tmp_path: Path):
+        """Test a commit happens once `commit_size` commands are buffered."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal", commit_size=3, commit_interval=60)
+
+        # Test
+        for _ in range(7):
+            journal.append_add(make_order())
+
+        # Validation
+        assert len(list(journal.read())) == 6
+        assert journal.committed_position < journal.position
+
+    def test_reopening_truncates_a_torn_record(self, tmp_path: Path):
+        """Test a record torn by a crash is dropped when the journal is reopened."""
+
+        # Setup
+        path = tmp_path / "journal"
+        journal = Journal(path)
+        journal.append_add(make_order())
+        end = journal.append_add(make_order())
+        journal.close()
+        with open(path, "ab") as file:
+            file.write(b"\x30\x00\x00\x00torn")
+
+        # Test
+        journal = Journal(path)
+
+        # Validation
+        assert journal.position == end
+        assert path.stat().st_size == end
+        assert len(list(journal.read())) == 2
+
+    def test_not_a_journal_raises_error(self, tmp_path: Path):
+        """Test opening a file that is not a journal fails."""
+
+        # Setup
+        path = tmp_path / "journal"
+        path.write_bytes(b"not a journal")
+
+        # Test and validation
+        with pytest.raises(JournalFormatError, match="Not a journal file"):
+            Journal(path)
+
+
+class TestJournalReplay:
+    def test_replay_rebuilds_books_and_trades(self, tmp_path: Path):
+        """Test replaying the journal rebuilds the engine as it was."""
+
+        # Setup
+        engine = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        engine.start()
+        for action, payload in random_flow(seed=3, size=1_000):
+            if action == "add":
+                engine.add_order(Order(**payload))
+            else:
+                engine.cancel_order(ContractCode.UK_BL_MAR_25, payload["id"])
+        assert engine.journal is not None
+        engine.journal.close()
+
+        # Test
+        restarted = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        restarted.start()
+        count = restarted.replay()
+
+        # Validation
+        assert count > 1_000 * 0.85
+        assert snapshot(restarted) == snapshot(engine)
+
+    def test_replay_applies_amendments(self, tmp_path: Path):
+        """Test replayed amendments rebuild the books, queue order included."""
+
+        # Setup
+        engine = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        engine.start()
+        for action, payload in random_flow(seed=4, size=1_000):
+            if action == "add":
+                engine.add_order(Order(**payload))
+                continue
+            # Alternately reduce and reprice, rather than cancel, resting orders
+            order = engine.order_books[ContractCode.UK_BL_MAR_25].get_order(
+                payload["id"]
+            )
+            if order is None:
+                continue
+            if order.remaining_quantity == order.quantity and order.quantity > 1:
+                engine.amend_order(
+                    order.contract_id, order.id, new_quantity=order.quantity - 1
+                )
+            elif order.price is not None:
+                engine.amend_order(
+                    order.contract_id, order.id, new_price=order.price + 1
+                )
+        assert engine.journal is not None
+        engine.journal.close()
+
+        # Test
+        restarted = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        restarted.start()
+        restarted.replay()
+
+        # Validation
+        assert snapshot(restarted) == snapshot(engine)
+
+    def test_replay_rebuilds_stop_orders(self, tmp_path: Path):
+        """Test replay triggers the journaled stop orders as they were."""
+
+        # Setup
+        engine = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        engine.start()
+        for action, payload in random_flow(seed=5, size=1_000, stops=0.2):
+            if action == "add":
+                engine.add_order(Order(**payload))
+            else:
+                engine.cancel_order(ContractCode.UK_BL_MAR_25, payload["id"])
+        assert engine.journal is not None
+        engine.journal.close()
+
+        # Test
+        restarted = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        restarted.start()
+        restarted.replay()
+
+        # Validation
+        assert snapshot(restarted) == snapshot(engine)
+        assert restarted.get_stop_orders(
+            ContractCode.UK_BL_MAR_25
+        ) == engine.get_stop_orders(ContractCode.UK_BL_MAR_25)
+        assert engine.get_stop_orders(ContractCode.UK_BL_MAR_25)
+
+    def test_replay_applies_expiry_sweeps(self, tmp_path: Path):
+        """Test replayed sweeps expire the orders they expired, and only them."""
+
+        # Setup
+        engine = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        engine.start()
+        placed_at = datetime(2025, 3, 3, 9, tzinfo=UTC)
+        for index, (action, payload) in enumerate(random_flow(seed=6, size=1_000)):
+            if action == "cancel":
+                engine.cancel_order(ContractCode.UK_BL_MAR_25, payload["id"])
+                continue
+            order = Order(**payload)
+            order.placed_at = placed_at + timedelta(seconds=index)
+            if index % 3 == 0:
+                order.time_in_force = TimeInForce.GTD
+                order.expires_at = order.placed_at + timedelta(minutes=5)
+            elif index % 3 == 1:
+                order.time_in_force = TimeInForce.DAY
+            engine.add_order(order)
+            if index % 100 == 0:
+                engine.expire_orders(order.placed_at)
+        # The day orders left expire at the end of the session
+        assert engine.expire_orders(datetime(2025, 3, 4, tzinfo=UTC))
+        assert engine.journal is not None
+        engine.journal.close()
+
+        # Test
+        restarted = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        restarted.start()
+        restarted.replay()
+
+        # Validation
+        assert snapshot(restarted) == snapshot(engine)
+        assert all(
+            order.time_in_force == TimeInForce.GTC
+            for order in restarted.get_orders(ContractCode.UK_BL_MAR_25)
+        )
+
+    def test_replay_applies_cancel_all(self, tmp_path: Path):
+        """Test replayed cancellations of all of a trader's orders."""
+
+        # Setup
+        engine = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        engine.start()
+        for index, (action, payload) in enumerate(
+            random_flow(seed=7, size=1_000, stops=0.1)
+        ):
+            if action == "cancel":
+                engine.cancel_order(ContractCode.UK_BL_MAR_25, payload["id"])
+                continue
+            order = Order(**payload)
+            order.trader_id = UUID(int=index % 5)
+            engine.add_order(order)
+            if index % 100 == 99:
+                assert engine.cancel_all(UUID(int=index % 5))
+        assert engine.journal is not None
+        engine.journal.close()
+
+        # Test
+        restarted = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        restarted.start()
+        restarted.replay()
+
+        # Validation
+        assert snapshot(restarted) == snapshot(engine)
+        assert restarted.get_stop_orders(
+            ContractCode.UK_BL_MAR_25
+        ) == engine.get_stop_orders(ContractCode.UK_BL_MAR_25)
+
+    def test_replay_does_not_journal_again(self, tmp_path: Path):
+        """Test replayed commands are not appended to the journal a second time."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal")
+        engine = MatchingEngine(journal=journal)
+        engine.start()
+        engine.add_order(make_order())
+        journal.commit()
+        position = journal.position
+
+        # Test
+        restarted = MatchingEngine(journal=journal)
+        restarted.start()
+        restarted.replay()
+
+        # Validation
+        assert journal.position == position
+
+    def test_sequencer_commits_before_answering(self, tmp_path: Path):
+        """Test callers only get their result once their batch is committed."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal", commit_interval=60)
+        engine = MatchingEngine(journal=journal)
+        engine.start()
+        sequencer = Sequencer(on_batch=journal.commit)
+        sequencer.start()
+
+        # Test
+        futures = [
+            sequencer.submit(engine.add_order, Order(**payload))
+            for action, payload in random_flow(seed=5, size=200)
+            if action == "add"
+        ]
+        first_result = futures[0].result()
+        committed = journal.committed_position
+        for future in futures:
+            future.result()
+        sequencer.stop()
+
+        # Validation
+        assert first_result is not None
+        assert committed > journal.start
+        assert journal.committed_position == journal.position
@@ -0,0 +1,171 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.order_book.ladder import LadderOrderBook
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.order_book.order.model import Order
+from tests.ctenex.domain.in_memory import (
+    test_fixed_point,
+    test_matching_engine,
+    test_order_book,
+)
+from tests.fixtures.domain import (
+    limit_buy_order,  # noqa F811
+    limit_sell_order,  # noqa F811
+    second_limit_sell_order,  # noqa F811
+)
+from tests.fixtures.flows import random_flow
+
+LADDER: dict[str, type[OrderBook]] = {ContractCode.UK_BL_MAR_25: LadderOrderBook}
+
+
+def make_order(side: OrderSide, price: str) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=uuid4(),
+        side=side,
+        type=OrderType.LIMIT,
+        price=Decimal(price),
+        quantity=Decimal("1.00"),
+        placed_at=datetime.now(UTC),
+    )
+
+
+class TestLadderOrderBookSuite(test_order_book.TestOrderBook):
+    """Run the `OrderBook` suite against the ladder book."""
+
+    def setup_method(self):
+        self.order_book = LadderOrderBook(contract_id=ContractCode.UK_BL_MAR_25)
+
+
+class TestLadderMatchingEngineSuite(test_matching_engine.TestMatchingEngine):
+    """Run the `MatchingEngine` suite on ladder books."""
+
+    def setup_method(self):
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start(order_book_types=LADDER)
+
+
+class TestLadderFixedPointSuite(test_fixed_point.TestFixedPointMatching):
+    """Run the fixed-point suite on ladder books, in both modes."""
+
+    def setup_method(self):
+        self.decimal_engine = MatchingEngine()
+        self.decimal_engine.start(order_book_types=LADDER)
+
+        self.tick_engine = MatchingEngine()
+        self.tick_engine.start(
+            contracts=[test_fixed_point.CONTRACT], order_book_types=LADDER
+        )
+
+
+class TestLadderOrderBook:
+    def setup_method(self):
+        self.order_book = LadderOrderBook(contract_id=ContractCode.UK_BL_MAR_25)
+
+    def test_best_prices_move_past_emptied_levels(self):
+        """Test the best bid and ask move to the next level once theirs empties."""
+
+        # Setup
+        bids = [make_order(OrderSide.BUY, price) for price in ("99.00", "97.50")]
+        asks = [make_order(OrderSide.SELL, price) for price in ("101.00", "102.25")]
+        for order in bids + asks:
+            self.order_book.add_order(order)
+
+        # Test
+        self.order_book.cancel_order(bids[0].id)
+        self.order_book.cancel_order(asks[0].id)
+
+        # Validation
+        assert self.order_book.best_bid() == Decimal("97.50")
+        assert self.order_book.best_ask() == Decimal("102.25")
+
+        self.order_book.cancel_order(bids[1].id)
+        self.order_book.cancel_order(asks[1].id)
+        assert self.order_book.best_bid() is None
+        assert self.order_book.best_ask() is None
+
+    def test_price_outside_the_ladder_is_rejected(self):
+        """Test an order priced beyond the ladder is not booked."""
+
+        # Setup
+        order = make_order(OrderSide.SELL, "1000.00")
+
+        # Test and validation
+        with pytest.raises(ValueError, match="outside the price ladder"):
+            self.order_book.add_order(order)
+        assert self.order_book.get_orders() == []
+
+    def test_ladder_ends_at_the_last_tick_below_the_max_price(self):
+        """Test a tick size that does not divide the max price sizes the ladder."""
+
+        # Setup
+        order_book = LadderOrderBook(
+            contract_id=ContractCode.UK_BL_MAR_25, tick_size=Decimal("0.05")
+        )
+        top = make_order(OrderSide.SELL, "999.95")
+        bottom = make_order(OrderSide.BUY, "0.05")
+
+        # Test
+        order_book.add_order(top)
+        order_book.add_order(bottom)
+
+        # Validation
+        assert order_book.best_ask() == order_book.scale.to_ticks(Decimal("999.95"))
+        assert order_book.best_bid() == order_book.scale.to_ticks(Decimal("0.05"))
+        with pytest.raises(ValueError, match="outside the price ladder"):
+            order_book.add_order(make_order(OrderSide.SELL, "1000.00"))
+
+    def test_price_outside_the_ladder_is_rejected_before_matching(self):
+        """Test an order priced beyond the ladder leaves the book untouched."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(order_book_types=LADDER)
+        sell_order = make_order(OrderSide.SELL, "100.00")
+        sell_order.quantity = Decimal("5.00")
+        engine.add_order(sell_order)
+        orders = engine.get_orders(ContractCode.UK_BL_MAR_25)
+        buy_order = make_order(OrderSide.BUY, "1000.00")
+        buy_order.quantity = Decimal("10.00")
+
+        # Test and validation
+        with pytest.raises(ValueError, match="outside the price ladder"):
+            engine.add_order(buy_order)
+        assert engine.get_orders(ContractCode.UK_BL_MAR_25) == orders
+        assert engine.get_trades(ContractCode.UK_BL_MAR_25) == []
+
+        with pytest.raises(ValueError, match="outside the price ladder"):
+            engine.amend_order(
+                ContractCode.UK_BL_MAR_25, sell_order.id, new_price=Decimal("1000.00")
+            )
+        assert engine.get_orders(ContractCode.UK_BL_MAR_25) == orders
+
+    def test_matches_sorted_book_on_random_flow(self):
+        """Test a random flow leaves the ladder and sorted books identical."""
+
+        # Setup
+        sorted_engine = MatchingEngine()
+        sorted_engine.start()
+        ladder_engine = MatchingEngine()
+        ladder_engine.start(order_book_types=LADDER)
+        flow = random_flow(seed=11, size=2_000)
+
+        # Test
+        test_fixed_point.replay(sorted_engine, flow)
+        test_fixed_point.replay(ladder_engine, flow)
+
+        # Validation
+        sorted_book: OrderBook = sorted_engine.order_books[ContractCode.UK_BL_MAR_25]
+        ladder_book = ladder_engine.order_books[ContractCode.UK_BL_MAR_25]
+        assert sorted_book.depth(levels=1_000) == ladder_book.depth(levels=1_000)
+        assert [
+            t.price for t in sorted_engine.get_trades(ContractCode.UK_BL_MAR_25)
+        ] == [t.price for t in ladder_engine.get_trades(ContractCode.UK_BL_MAR_25)]
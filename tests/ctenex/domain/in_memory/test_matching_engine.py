@@ -1,6 +1,8 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, time, timedelta
 from decimal import Decimal
-from uuid import uuid4
+from uuid import UUID, uuid4
+
+import pytest
 
 from ctenex.domain.contracts import ContractCode
 from ctenex.domain.entities import (
@@ -8,6 +10,7 @@ from ctenex.domain.entities import (
     OrderSide,
     OrderType,
     ProcessedOrderStatus,
+    TimeInForce,
 )
 from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
 from ctenex.domain.order_book.order.model import Order
@@ -16,6 +19,10 @@ from tests.fixtures.domain import (
     limit_sell_order,  # noqa F811
     second_limit_sell_order,  # noqa F811
 )
+from tests.fixtures.flows import random_flow
+
+# A contract of the tests' own, besides those of `ContractCode`
+OTHER_CONTRACT = "UK-BL-APR-25"
 
 
 class TestMatchingEngine:
@@ -315,6 +322,39 @@ class TestMatchingEngine:
         assert len(trades) == 1
         assert all(t.contract_id == ContractCode.UK_BL_MAR_25 for t in trades)
 
+    def test_get_trades_since_sequence(
+        self,
+        limit_buy_order,  # noqa F811
+        limit_sell_order,  # noqa F811
+        second_limit_sell_order,  # noqa F811
+    ):
+        """Test get_trades only returns the trades after the given sequence."""
+
+        # Setup
+        self.matching_engine.add_order(limit_sell_order)
+        self.matching_engine.add_order(limit_buy_order)
+        self.matching_engine.add_order(second_limit_sell_order)
+        buy_order = Order(
+            id=uuid4(),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.0"),
+            quantity=Decimal("5.0"),
+            placed_at=datetime.now(UTC),
+        )
+        self.matching_engine.add_order(buy_order)
+
+        # Test
+        trades = self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25, since=1)
+
+        # Validation
+        assert len(self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)) == 2
+        assert [(t.buy_order_id, t.sell_order_id) for t in trades] == [
+            (buy_order.id, second_limit_sell_order.id)
+        ]
+
     def test_limit_buy_order_respects_price_limit(self):
         """Test that a limit buy order does not match with asks above its limit price."""
 
@@ -400,3 +440,1006 @@ class TestMatchingEngine:
         assert len(orders) == 2
         assert buy_order in orders
         assert sell_order in orders
+
+    def test_add_orders_matches_in_arrival_order(self):
+        """Test a batch is matched in order and reports each order's trades."""
+
+        # Setup
+        orders = [
+            Order(
+                id=uuid4(),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=uuid4(),
+                side=side,
+                type=OrderType.LIMIT,
+                price=Decimal(price),
+                quantity=Decimal(quantity),
+                placed_at=datetime.now(UTC),
+            )
+            for side, price, quantity in [
+                (OrderSide.SELL, "100.0", "10.0"),
+                (OrderSide.BUY, "100.0", "4.0"),
+                (OrderSide.BUY, "101.0", "10.0"),
+            ]
+        ]
+
+        # Test
+        results = self.matching_engine.add_orders(orders)
+
+        # Validation
+        assert [result.order for result in results] == orders
+        assert [result.error for result in results] == [None, None, None]
+        assert results[0].get_trades() == []
+        assert [
+            (trade.buy_order_id, trade.quantity) for trade in results[1].get_trades()
+        ] == [(orders[1].id, Decimal("4.0"))]
+        assert [
+            (trade.buy_order_id, trade.quantity) for trade in results[2].get_trades()
+        ] == [(orders[2].id, Decimal("6.0"))]
+
+        assert orders[0].status == ProcessedOrderStatus.FILLED
+        assert orders[1].status == ProcessedOrderStatus.FILLED
+        assert orders[2].status == OpenOrderStatus.PARTIALLY_FILLED
+        assert orders[2].remaining_quantity == Decimal("4.0")
+        assert len(self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)) == 2
+
+    def test_add_orders_reports_rejected_orders(
+        self,
+        limit_buy_order,  # noqa F811
+        limit_sell_order,  # noqa F811
+    ):
+        """Test a rejected order does not stop the rest of its batch."""
+
+        # Setup
+        order_without_price = Order(
+            id=uuid4(),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            quantity=Decimal("1.0"),
+            placed_at=datetime.now(UTC),
+        )
+
+        # Test
+        results = self.matching_engine.add_orders(
+            [limit_sell_order, order_without_price, limit_buy_order]
+        )
+
+        # Validation
+        assert [result.error for result in results] == [
+            None,
+            "Order must have a price",
+            None,
+        ]
+        assert results[1].get_trades() == []
+        assert len(results[2].get_trades()) == 1
+        assert order_without_price not in self.matching_engine.get_orders(
+            ContractCode.UK_BL_MAR_25
+        )
+
+    def test_depth_is_updated_on_fill(
+        self,
+        limit_sell_order,  # noqa F811
+        second_limit_sell_order,  # noqa F811
+    ):
+        """Test fills take the traded quantity off the resting price level."""
+
+        # Setup
+        self.matching_engine.add_order(limit_sell_order)  # Quantity: 10.0
+        self.matching_engine.add_order(second_limit_sell_order)  # Quantity: 15.0
+        buy_order = Order(
+            id=uuid4(),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.MARKET,
+            quantity=Decimal("12.0"),
+            placed_at=datetime.now(UTC),
+        )
+
+        # Test
+        self.matching_engine.add_order(buy_order)
+
+        # Validation
+        depth = self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25)
+        assert depth.bids == []
+        assert [
+            (level.price, level.quantity, level.orders) for level in depth.asks
+        ] == [
+            (Decimal("100.0"), Decimal("13.0"), 1),
+        ]
+
+    def test_latency_is_recorded_per_stage(
+        self,
+        limit_buy_order,  # noqa F811
+        limit_sell_order,  # noqa F811
+    ):
+        """Test every order adds a latency to each stage of its contract."""
+
+        # Setup
+        self.matching_engine.add_order(limit_sell_order)
+
+        # Test
+        self.matching_engine.add_orders([limit_buy_order])
+        latency = self.matching_engine.get_latency()
+
+        # Validation
+        (contract,) = latency.contracts
+        assert contract.contract_id == ContractCode.UK_BL_MAR_25
+        assert contract.stages["total"].count == 2
+        assert contract.stages["log"].count == 1
+        assert all(
+            stage.p50 <= stage.p99 <= stage.p999 <= stage.max
+            for stage in contract.stages.values()
+        )
+
+        self.matching_engine.reset_latency()
+        assert self.matching_engine.get_latency().contracts == []
+
+
+def make_limit_order(side: OrderSide, price: str, quantity: str) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=uuid4(),
+        side=side,
+        type=OrderType.LIMIT,
+        price=Decimal(price),
+        quantity=Decimal(quantity),
+        placed_at=datetime.now(UTC),
+    )
+
+
+class TestAmendOrder:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start()
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def take(self, quantity: str) -> list[UUID]:
+        """Buy `quantity` at market and return the IDs of the orders hit."""
+        buy_order = Order(
+            id=uuid4(),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.MARKET,
+            quantity=Decimal(quantity),
+            placed_at=datetime.now(UTC),
+        )
+        self.matching_engine.add_order(buy_order)
+        return [
+            trade.sell_order_id
+            for trade in self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)
+            if trade.buy_order_id == buy_order.id
+        ]
+
+    def test_quantity_decrease_keeps_priority(self):
+        """Test reducing an order's quantity keeps its place in the queue."""
+
+        # Setup
+        first = make_limit_order(OrderSide.SELL, "100.0", "10.0")
+        second = make_limit_order(OrderSide.SELL, "100.0", "10.0")
+        self.matching_engine.add_order(first)
+        self.matching_engine.add_order(second)
+
+        # Test
+        amended = self.matching_engine.amend_order(
+            ContractCode.UK_BL_MAR_25, first.id, new_quantity=Decimal("4.0")
+        )
+
+        # Validation
+        assert amended is not None
+        assert amended.quantity == amended.remaining_quantity == Decimal("4.0")
+        assert first.quantity == first.remaining_quantity == Decimal("4.0")
+        depth = self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25)
+        assert (depth.asks[0].quantity, depth.asks[0].orders) == (Decimal("14.0"), 2)
+        assert self.take("5.0") == [first.id, second.id]
+
+    def test_price_change_requeues(self):
+        """Test repricing an order puts it behind the orders at its new price."""
+
+        # Setup
+        first = make_limit_order(OrderSide.SELL, "100.0", "10.0")
+        second = make_limit_order(OrderSide.SELL, "100.5", "10.0")
+        self.matching_engine.add_order(first)
+        self.matching_engine.add_order(second)
+
+        # Test
+        self.matching_engine.amend_order(
+            ContractCode.UK_BL_MAR_25, first.id, new_price=Decimal("100.5")
+        )
+
+        # Validation
+        assert first.price == Decimal("100.5")
+        assert [
+            order.id
+            for order in self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25)
+        ] == [second.id, first.id]
+        assert self.take("15.0") == [second.id, first.id]
+
+    def test_crossing_price_change_matches(self):
+        """Test an order repriced across the book is matched at once."""
+
+        # Setup
+        bid = make_limit_order(OrderSide.BUY, "99.0", "10.0")
+        ask = make_limit_order(OrderSide.SELL, "100.0", "4.0")
+        self.matching_engine.add_order(bid)
+        self.matching_engine.add_order(ask)
+
+        # Test
+        amended = self.matching_engine.amend_order(
+            ContractCode.UK_BL_MAR_25, bid.id, new_price=Decimal("100.0")
+        )
+
+        # Validation
+        assert amended is bid
+        assert bid.status == OpenOrderStatus.PARTIALLY_FILLED
+        assert bid.remaining_quantity == Decimal("6.0")
+        assert ask.status == ProcessedOrderStatus.FILLED
+        depth = self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25)
+        assert [(level.price, level.quantity) for level in depth.bids] == [
+            (Decimal("100.0"), Decimal("6.0"))
+        ]
+        assert depth.asks == []
+
+    def test_quantity_must_exceed_filled_quantity(self):
+        """Test an order cannot be amended down to what has been filled."""
+
+        # Setup
+        ask = make_limit_order(OrderSide.SELL, "100.0", "10.0")
+        self.matching_engine.add_order(ask)
+        self.take("6.0")
+
+        # Test and validation
+        with pytest.raises(ValueError, match="already filled"):
+            self.matching_engine.amend_order(
+                ContractCode.UK_BL_MAR_25, ask.id, new_quantity=Decimal("6.0")
+            )
+        amended = self.matching_engine.amend_order(
+            ContractCode.UK_BL_MAR_25, ask.id, new_quantity=Decimal("7.0")
+        )
+        assert amended is not None
+        assert amended.remaining_quantity == Decimal("1.0")
+
+    def test_amend_nonexistent_order(self):
+        """Test amending an order that is not in the book returns None."""
+
+        # Setup
+        ...
+
+        # Test
+        amended = self.matching_engine.amend_order(
+            ContractCode.UK_BL_MAR_25, uuid4(), new_quantity=Decimal("1.0")
+        )
+
+        # Validation
+        assert amended is None
+
+
+class TestTimeInForce:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start()
+        for price, quantity in [("100.0", "5.0"), ("101.0", "5.0")]:
+            self.matching_engine.add_order(
+                make_limit_order(OrderSide.SELL, price, quantity)
+            )
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def asks(self) -> list[tuple[Decimal, Decimal]]:
+        depth = self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25)
+        return [(level.price, level.quantity) for level in depth.asks]
+
+    def test_ioc_remainder_is_cancelled(self):
+        """Test what remains of an immediate-or-cancel order never rests."""
+
+        # Setup
+        order = make_limit_order(OrderSide.BUY, "100.0", "8.0")
+        order.time_in_force = TimeInForce.IOC
+
+        # Test
+        self.matching_engine.add_order(order)
+
+        # Validation
+        assert order.status == ProcessedOrderStatus.CANCELLED
+        assert order.remaining_quantity == Decimal("3.0")
+        assert self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25).bids == []
+        assert self.asks() == [(Decimal("101.0"), Decimal("5.0"))]
+
+    def test_market_order_remainder_is_cancelled(self):
+        """Test what remains of a market order beyond the book never rests."""
+
+        # Setup
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.MARKET,
+            quantity=Decimal("12.0"),
+        )
+
+        # Test
+        self.matching_engine.add_order(order)
+
+        # Validation
+        assert order.status == ProcessedOrderStatus.CANCELLED
+        assert order.remaining_quantity == Decimal("2.0")
+        assert self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25).bids == []
+        assert self.asks() == []
+
+    def test_fok_without_enough_liquidity_is_cancelled(self):
+        """Test a fill-or-kill order that cannot fill in full touches nothing."""
+
+        # Setup
+        order = make_limit_order(OrderSide.BUY, "100.0", "8.0")
+        order.time_in_force = TimeInForce.FOK
+
+        # Test
+        self.matching_engine.add_order(order)
+
+        # Validation
+        assert order.status == ProcessedOrderStatus.CANCELLED
+        assert order.remaining_quantity == Decimal("8.0")
+        assert self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25) == []
+        assert self.asks() == [
+            (Decimal("100.0"), Decimal("5.0")),
+            (Decimal("101.0"), Decimal("5.0")),
+        ]
+
+    def test_fok_with_enough_liquidity_is_filled(self):
+        """Test a fill-or-kill order fills in full across the levels it crosses."""
+
+        # Setup
+        order = make_limit_order(OrderSide.BUY, "101.0", "8.0")
+        order.time_in_force = TimeInForce.FOK
+
+        # Test
+        self.matching_engine.add_order(order)
+
+        # Validation
+        assert order.status == ProcessedOrderStatus.FILLED
+        assert len(self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)) == 2
+        assert self.asks() == [(Decimal("101.0"), Decimal("2.0"))]
+
+
+def make_stop_order(
+    side: OrderSide, stop_price: str, quantity: str, price: str | None = None
+) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=uuid4(),
+        side=side,
+        type=OrderType.STOP if price is None else OrderType.STOP_LIMIT,
+        price=Decimal(price) if price is not None else None,
+        stop_price=Decimal(stop_price),
+        quantity=Decimal(quantity),
+        placed_at=datetime.now(UTC),
+    )
+
+
+class TestStopOrders:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start()
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def add_asks(self, *prices: str) -> None:
+        for price in prices:
+            self.matching_engine.add_order(
+                make_limit_order(OrderSide.SELL, price, "1.0")
+            )
+
+    def add_bids(self, *prices: str) -> None:
+        for price in prices:
+            self.matching_engine.add_order(
+                make_limit_order(OrderSide.BUY, price, "1.0")
+            )
+
+    def test_stop_order_waits_for_its_trigger(self):
+        """Test a stop order rests in the stop book, not in the order book."""
+
+        # Setup
+        self.add_asks("100.0", "101.0")
+        stop = make_stop_order(OrderSide.BUY, "101.0", "1.0")
+
+        # Test
+        self.matching_engine.add_order(stop)
+        # Trades below the stop price do not trigger it
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "100.0", "1.0"))
+
+        # Validation
+        assert stop.status == OpenOrderStatus.OPEN
+        assert stop.type == OrderType.STOP
+        assert [
+            order.id
+            for order in self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25)
+        ] == [stop.id]
+        assert stop.id not in {
+            order.id
+            for order in self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25)
+        }
+
+    def test_trade_at_stop_price_triggers_stop(self):
+        """Test a stop order becomes a market order once its price trades."""
+
+        # Setup
+        self.add_asks("100.0", "101.0", "102.0")
+        stop = make_stop_order(OrderSide.BUY, "101.0", "1.0")
+        self.matching_engine.add_order(stop)
+
+        # Test
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "101.0", "2.0"))
+
+        # Validation
+        assert stop.type == OrderType.MARKET
+        assert stop.status == ProcessedOrderStatus.FILLED
+        trades = self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)
+        assert trades[-1].buy_order_id == stop.id
+        assert trades[-1].price == Decimal("102.0")
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+
+    def test_triggered_stops_cascade(self):
+        """Test the trades of a triggered stop trigger the stops above them."""
+
+        # Setup
+        self.add_asks("100.0", "101.0", "102.0", "103.0")
+        stops = [
+            make_stop_order(OrderSide.BUY, price, "1.0")
+            for price in ("102.0", "101.0", "103.0")
+        ]
+        for stop in stops:
+            self.matching_engine.add_order(stop)
+
+        # Test
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "100.0", "1.0"))
+
+        # Validation
+        assert all(stop.status == OpenOrderStatus.OPEN for stop in stops)
+
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "101.0", "1.0"))
+
+        trades = self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)
+        assert [trade.price for trade in trades] == [
+            Decimal("100.0"),
+            Decimal("101.0"),
+            Decimal("102.0"),
+            Decimal("103.0"),
+        ]
+        # The 103.0 stop triggers on an empty book: nothing is left to buy
+        assert [trade.buy_order_id for trade in trades[2:]] == [
+            stops[1].id,
+            stops[0].id,
+        ]
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+
+    def test_triggered_stops_are_executed_in_trigger_order(self):
+        """Test stops trigger in the order a falling price reaches them."""
+
+        # Setup
+        self.add_bids("100.0", "99.0", "98.0")
+        first = make_stop_order(OrderSide.SELL, "99.0", "1.0")
+        second = make_stop_order(OrderSide.SELL, "100.0", "1.0")
+        third = make_stop_order(OrderSide.SELL, "99.0", "1.0")
+        for stop in (first, second, third):
+            self.matching_engine.add_order(stop)
+
+        # Test
+        self.matching_engine.add_order(make_limit_order(OrderSide.SELL, "98.0", "1.0"))
+
+        # Validation
+        trades = self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)
+        assert [trade.sell_order_id for trade in trades[1:]] == [second.id, first.id]
+        assert [trade.price for trade in trades] == [
+            Decimal("100.0"),
+            Decimal("99.0"),
+            Decimal("98.0"),
+        ]
+        # Triggered last, on an empty book
+        assert third.type == OrderType.MARKET
+        assert third.remaining_quantity == Decimal("1.0")
+
+    def test_triggered_stop_limit_rests_at_its_price(self):
+        """Test a stop-limit order becomes a limit order once triggered."""
+
+        # Setup
+        self.add_asks("100.0", "102.0")
+        stop = make_stop_order(OrderSide.BUY, "100.0", "2.0", price="101.0")
+        self.matching_engine.add_order(stop)
+
+        # Test
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "100.0", "1.0"))
+
+        # Validation
+        assert stop.type == OrderType.LIMIT
+        assert stop.status == OpenOrderStatus.OPEN
+        depth = self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25)
+        assert [(level.price, level.quantity) for level in depth.bids] == [
+            (Decimal("101.0"), Decimal("2.0"))
+        ]
+
+    def test_stop_already_triggered_executes_at_once(self):
+        """Test a stop order past the last trade price is not held back."""
+
+        # Setup
+        self.add_asks("100.0", "101.0")
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "100.0", "1.0"))
+        stop = make_stop_order(OrderSide.BUY, "99.0", "1.0")
+
+        # Test
+        self.matching_engine.add_order(stop)
+
+        # Validation
+        assert stop.type == OrderType.MARKET
+        assert stop.status == ProcessedOrderStatus.FILLED
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+
+    def test_cancel_stop_order(self):
+        """Test cancelling a stop order waiting for its trigger."""
+
+        # Setup
+        self.add_asks("100.0")
+        stop = make_stop_order(OrderSide.BUY, "100.0", "1.0")
+        self.matching_engine.add_order(stop)
+
+        # Test
+        cancelled = self.matching_engine.cancel_order(
+            ContractCode.UK_BL_MAR_25, stop.id
+        )
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "100.0", "1.0"))
+
+        # Validation
+        assert cancelled is stop
+        assert stop.status == ProcessedOrderStatus.CANCELLED
+        assert len(self.matching_engine.get_trades(ContractCode.UK_BL_MAR_25)) == 1
+
+    def test_stop_order_without_stop_price_is_rejected(self):
+        """Test a stop order must have a stop price."""
+
+        # Setup
+        stop = make_stop_order(OrderSide.BUY, "100.0", "1.0")
+        stop.stop_price = None
+
+        # Test
+        with pytest.raises(ValueError, match="stop price"):
+            self.matching_engine.add_order(stop)
+
+        # Validation
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+
+
+class TestOrderExpiry:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine(session_close=time(17))
+        self.matching_engine.start()
+        self.placed_at = datetime(2025, 3, 3, 9, tzinfo=UTC)
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def make_order(
+        self,
+        time_in_force: TimeInForce,
+        expires_at: datetime | None = None,
+        side: OrderSide = OrderSide.BUY,
+    ) -> Order:
+        order = make_limit_order(side, "100.0", "1.0")
+        order.placed_at = self.placed_at
+        order.time_in_force = time_in_force
+        order.expires_at = expires_at
+        return order
+
+    def resting_ids(self) -> set[UUID]:
+        return {
+            order.id
+            for order in self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25)
+        }
+
+    def test_gtd_order_expires_at_its_time(self):
+        """Test a good-till-date order rests until its expiry time only."""
+
+        # Setup
+        order = self.make_order(TimeInForce.GTD, self.placed_at + timedelta(hours=1))
+        self.matching_engine.add_order(order)
+
+        # Test
+        early = self.matching_engine.expire_orders(
+            self.placed_at + timedelta(minutes=59)
+        )
+        expired = self.matching_engine.expire_orders(
+            self.placed_at + timedelta(hours=1)
+        )
+
+        # Validation
+        assert early == []
+        assert [o.id for o in expired] == [order.id]
+        assert order.status == ProcessedOrderStatus.EXPIRED
+        assert self.resting_ids() == set()
+        assert self.matching_engine.get_depth(ContractCode.UK_BL_MAR_25).bids == []
+
+    def test_day_orders_expire_at_session_close(self):
+        """Test day orders expire in one sweep at the close, others stay."""
+
+        # Setup
+        day_orders = [self.make_order(TimeInForce.DAY) for _ in range(3)]
+        gtc_order = self.make_order(TimeInForce.GTC)
+        for order in (*day_orders, gtc_order):
+            self.matching_engine.add_order(order)
+
+        # Test
+        expired = self.matching_engine.expire_orders(
+            datetime(2025, 3, 3, 17, tzinfo=UTC)
+        )
+
+        # Validation
+        assert day_orders[0].expires_at == datetime(2025, 3, 3, 17, tzinfo=UTC)
+        assert [o.id for o in expired] == [o.id for o in day_orders]
+        assert all(o.status == ProcessedOrderStatus.EXPIRED for o in expired)
+        assert self.resting_ids() == {gtc_order.id}
+
+    def test_day_order_after_close_expires_next_day(self):
+        """Test a day order placed after the close lasts until the next one."""
+
+        # Setup
+        self.placed_at = datetime(2025, 3, 3, 18, tzinfo=UTC)
+        order = self.make_order(TimeInForce.DAY)
+
+        # Test
+        self.matching_engine.add_order(order)
+
+        # Validation
+        assert order.expires_at == datetime(2025, 3, 4, 17, tzinfo=UTC)
+
+    def test_day_order_placed_after_a_close_is_not_born_expired(self):
+        """Test a day order stamped on creation outlives a close already past."""
+
+        # Setup
+        close = datetime.now(UTC)
+        matching_engine = MatchingEngine(session_close=close.time())
+        matching_engine.start()
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.0"),
+            quantity=Decimal("1.0"),
+            time_in_force=TimeInForce.DAY,
+        )
+
+        # Test
+        matching_engine.add_order(order)
+        expired = matching_engine.expire_orders(datetime.now(UTC))
+        matching_engine.stop()
+
+        # Validation
+        assert order.placed_at >= close
+        assert order.expires_at is not None and order.expires_at > close
+        assert expired == []
+        assert order.status == OpenOrderStatus.OPEN
+
+    def test_filled_and_cancelled_orders_are_not_expired(self):
+        """Test orders gone from the book before their expiry are skipped."""
+
+        # Setup
+        expires_at = self.placed_at + timedelta(hours=1)
+        filled = self.make_order(TimeInForce.GTD, expires_at)
+        cancelled = self.make_order(TimeInForce.GTD, expires_at)
+        for order in (filled, cancelled):
+            self.matching_engine.add_order(order)
+        self.matching_engine.add_order(make_limit_order(OrderSide.SELL, "100.0", "1.0"))
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, cancelled.id)
+
+        # Test
+        expired = self.matching_engine.expire_orders(expires_at)
+
+        # Validation
+        assert expired == []
+        assert filled.status == ProcessedOrderStatus.FILLED
+        assert cancelled.status == ProcessedOrderStatus.CANCELLED
+        assert len(self.matching_engine.expiries) == 0
+
+    def test_stop_orders_expire(self):
+        """Test a good-till-date stop order expires while waiting."""
+
+        # Setup
+        stop = make_stop_order(OrderSide.BUY, "101.0", "1.0")
+        stop.placed_at = self.placed_at
+        stop.time_in_force = TimeInForce.GTD
+        stop.expires_at = self.placed_at + timedelta(hours=1)
+        self.matching_engine.add_order(stop)
+
+        # Test
+        expired = self.matching_engine.expire_orders(stop.expires_at)
+
+        # Validation
+        assert [o.id for o in expired] == [stop.id]
+        assert stop.status == ProcessedOrderStatus.EXPIRED
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+
+    @pytest.mark.parametrize(
+        "time_in_force, expires_at, message",
+        [
+            (TimeInForce.GTD, None, "must have an expiry time"),
+            (TimeInForce.GTD, datetime(2025, 3, 3, 8, tzinfo=UTC), "before"),
+            (TimeInForce.GTC, datetime(2025, 3, 3, 10, tzinfo=UTC), "Only"),
+        ],
+    )
+    def test_invalid_expiry_is_rejected(self, time_in_force, expires_at, message):
+        """Test orders with a missing or inconsistent expiry time are rejected."""
+
+        # Setup
+        order = self.make_order(time_in_force, expires_at)
+
+        # Test
+        with pytest.raises(ValueError, match=message):
+            self.matching_engine.add_order(order)
+
+        # Validation
+        assert self.resting_ids() == set()
+
+
+class TestCancelAll:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start(
+            contract_codes=[ContractCode.UK_BL_MAR_25, OTHER_CONTRACT]
+        )
+        self.trader_id = uuid4()
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def add_order(
+        self,
+        side: OrderSide,
+        price: str,
+        quantity: str = "1.0",
+        contract_id: str = ContractCode.UK_BL_MAR_25,
+    ) -> Order:
+        order = make_limit_order(side, price, quantity)
+        order.contract_id = contract_id
+        order.trader_id = self.trader_id
+        self.matching_engine.add_order(order)
+        return order
+
+    def test_index_follows_adds_fills_and_cancels(self):
+        """Test the per-trader index holds exactly the trader's resting orders."""
+
+        # Setup
+        order_book = self.matching_engine.order_books[ContractCode.UK_BL_MAR_25]
+        filled = self.add_order(OrderSide.SELL, "100.0")
+        partial = self.add_order(OrderSide.SELL, "101.0", "2.0")
+        cancelled = self.add_order(OrderSide.SELL, "102.0")
+        resting = self.add_order(OrderSide.SELL, "103.0")
+
+        # Test
+        self.matching_engine.add_order(make_limit_order(OrderSide.BUY, "101.0", "2.0"))
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, cancelled.id)
+
+        # Validation
+        assert filled.status == ProcessedOrderStatus.FILLED
+        assert partial.status == OpenOrderStatus.PARTIALLY_FILLED
+        assert list(order_book.orders_by_trader[self.trader_id]) == [
+            partial.id,
+            resting.id,
+        ]
+
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, partial.id)
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, resting.id)
+        assert self.trader_id not in order_book.orders_by_trader
+
+    def test_cancel_all_for_a_contract(self):
+        """Test cancelling all of a trader's orders for one contract."""
+
+        # Setup
+        bid = self.add_order(OrderSide.BUY, "99.0")
+        ask = self.add_order(OrderSide.SELL, "101.0")
+        stop = make_stop_order(OrderSide.BUY, "105.0", "1.0")
+        stop.trader_id = self.trader_id
+        self.matching_engine.add_order(stop)
+        other_contract = self.add_order(
+            OrderSide.BUY, "99.0", contract_id=OTHER_CONTRACT
+        )
+        other_trader = make_limit_order(OrderSide.BUY, "98.0", "1.0")
+        self.matching_engine.add_order(other_trader)
+
+        # Test
+        cancelled = self.matching_engine.cancel_all(
+            self.trader_id, ContractCode.UK_BL_MAR_25
+        )
+
+        # Validation
+        assert [order.id for order in cancelled] == [bid.id, ask.id, stop.id]
+        assert all(
+            order.status == ProcessedOrderStatus.CANCELLED for order in cancelled
+        )
+        assert [
+            order.id
+            for order in self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25)
+        ] == [other_trader.id]
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+        assert [
+            order.id for order in self.matching_engine.get_orders(OTHER_CONTRACT)
+        ] == [other_contract.id]
+
+    def test_cancel_all_for_all_contracts(self):
+        """Test cancelling all of a trader's orders, whatever their contract."""
+
+        # Setup
+        march = self.add_order(OrderSide.BUY, "99.0")
+        april = self.add_order(OrderSide.BUY, "99.0", contract_id=OTHER_CONTRACT)
+
+        # Test
+        cancelled = self.matching_engine.cancel_all(self.trader_id)
+
+        # Validation
+        assert {order.id for order in cancelled} == {march.id, april.id}
+        assert self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25) == []
+        assert self.matching_engine.get_orders(OTHER_CONTRACT) == []
+
+    def test_cancel_all_without_orders(self):
+        """Test cancelling all the orders of a trader with none resting."""
+
+        # Test
+        cancelled = self.matching_engine.cancel_all(uuid4())
+
+        # Validation
+        assert cancelled == []
+
+
+class TestGetOrder:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start(
+            contract_codes=[ContractCode.UK_BL_MAR_25, OTHER_CONTRACT]
+        )
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def test_get_order_by_id(self):
+        """Test resting and stop orders are found by ID alone, in any contract."""
+
+        # Setup
+        bid = make_limit_order(OrderSide.BUY, "99.0", "1.0")
+        bid.contract_id = OTHER_CONTRACT
+        stop = make_stop_order(OrderSide.BUY, "105.0", "1.0")
+        self.matching_engine.add_order(bid)
+        self.matching_engine.add_order(stop)
+
+        # Test
+        found_bid = self.matching_engine.get_order(bid.id)
+        found_stop = self.matching_engine.get_order(stop.id)
+
+        # Validation
+        assert found_bid is not None
+        assert (found_bid.id, found_bid.contract_id) == (
+            bid.id,
+            OTHER_CONTRACT,
+        )
+        assert found_stop is not None
+        assert found_stop.stop_price == Decimal("105.0")
+        assert self.matching_engine.get_order(uuid4()) is None
+
+    def test_closed_orders_are_found_with_their_final_status(self):
+        """Test filled and cancelled orders are found by ID once out of the books."""
+
+        # Setup
+        ask = make_limit_order(OrderSide.SELL, "100.0", "1.0")
+        bid = make_limit_order(OrderSide.BUY, "100.0", "1.0")
+        stop = make_stop_order(OrderSide.BUY, "105.0", "1.0")
+        for order in (ask, bid, stop):
+            self.matching_engine.add_order(order)
+
+        # Test
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, stop.id)
+        found = {
+            order.id: self.matching_engine.get_order(order.id)
+            for order in (ask, bid, stop)
+        }
+
+        # Validation
+        assert {
+            order_id: (order.status, order.remaining_quantity)
+            for order_id, order in found.items()
+            if order is not None
+        } == {
+            ask.id: (ProcessedOrderStatus.FILLED, Decimal("0.0")),
+            bid.id: (ProcessedOrderStatus.FILLED, Decimal("0.0")),
+            stop.id: (ProcessedOrderStatus.CANCELLED, Decimal("1.0")),
+        }
+
+    def test_only_the_most_recently_closed_orders_are_kept(self):
+        """Test the oldest closed orders are evicted past the limit."""
+
+        # Setup
+        matching_engine = MatchingEngine(max_closed_orders=2)
+        matching_engine.start()
+        orders = [make_limit_order(OrderSide.BUY, "99.0", "1.0") for _ in range(3)]
+        for order in orders:
+            matching_engine.add_order(order)
+
+        # Test
+        for order in orders:
+            matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, order.id)
+
+        # Validation
+        assert matching_engine.get_order(orders[0].id) is None
+        assert all(matching_engine.get_order(order.id) for order in orders[1:])
+        matching_engine.stop()
+
+    def test_index_follows_the_books(self):
+        """Test the index holds the contract of exactly the orders in the books."""
+
+        # Setup
+        flow = random_flow(seed=11, size=2_000, stops=0.1)
+
+        # Test
+        for index, (action, payload) in enumerate(flow):
+            if action == "add":
+                self.matching_engine.add_order(Order(**payload))
+            elif index % 3 == 0:
+                self.matching_engine.amend_order(
+                    ContractCode.UK_BL_MAR_25, payload["id"], new_price=Decimal(100)
+                )
+            else:
+                self.matching_engine.cancel_order(
+                    ContractCode.UK_BL_MAR_25, payload["id"]
+                )
+
+        # Validation
+        order_book = self.matching_engine.order_books[ContractCode.UK_BL_MAR_25]
+        stop_book = self.matching_engine.stop_books[ContractCode.UK_BL_MAR_25]
+        assert self.matching_engine.contract_index == {
+            order_id: ContractCode.UK_BL_MAR_25
+            for order_id in [*order_book.orders_by_id, *stop_book.stops_by_id]
+        }
+
+    def test_duplicate_order_id_is_rejected(self):
+        """Test an order with the ID of one already in a book is rejected."""
+
+        # Setup
+        bid = make_limit_order(OrderSide.BUY, "99.0", "1.0")
+        self.matching_engine.add_order(bid)
+        stop = make_stop_order(OrderSide.BUY, "105.0", "1.0")
+        stop.id = bid.id
+        ask = make_limit_order(OrderSide.SELL, "101.0", "1.0")
+        ask.id = bid.id
+
+        # Test
+        with pytest.raises(ValueError, match="already in a book"):
+            self.matching_engine.add_order(stop)
+        [result] = self.matching_engine.add_orders([ask])
+
+        # Validation
+        assert result.error is not None
+        assert self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25) == [bid]
+        assert self.matching_engine.get_stop_orders(ContractCode.UK_BL_MAR_25) == []
+
+        # The index still follows the books once the order leaves them
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, bid.id)
+        assert self.matching_engine.contract_index == {}
+        closed = self.matching_engine.get_order(bid.id)
+        assert closed is not None
+        assert closed.status == ProcessedOrderStatus.CANCELLED
@@ -38,7 +38,7 @@ class TestOrderBook:
 
         # Validation
         assert isinstance(order_id, UUID)
-        assert self.order_book.orders_by_id[order_id] == limit_buy_order
+        assert self.order_book.get_order(order_id) == limit_buy_order
         assert limit_buy_order in self.order_book.bid_queues[100.0]
         assert -100.0 in self.order_book.bids
 
@@ -78,7 +78,7 @@ class TestOrderBook:
 
         # Validation
         assert market_order.price == Decimal("999.99")
-        assert self.order_book.orders_by_id[order_id] == market_order
+        assert self.order_book.get_order(order_id) == market_order
 
     def test_add_market_sell_order(self):
         """Test adding a market sell order sets price to zero."""
@@ -99,7 +99,7 @@ class TestOrderBook:
 
         # Validation
         assert market_order.price == 0.0
-        assert self.order_book.orders_by_id[order_id] == market_order
+        assert self.order_book.get_order(order_id) == market_order
 
     def test_add_limit_order_without_price_raises_error(self):
         """Test adding a limit order without price raises ValueError."""
@@ -171,27 +171,6 @@ class TestOrderBook:
         # Validation
         assert result is None
 
-    def test_cancel_order_without_price_raises_error(self):
-        """Test cancelling an order without price raises ValueError."""
-
-        # Setup
-        order = Order(
-            id=uuid4(),
-            contract_id=ContractCode.UK_BL_MAR_25,
-            trader_id=uuid4(),
-            side=OrderSide.BUY,
-            type=OrderType.LIMIT,
-            quantity=Decimal("10.0"),
-            placed_at=datetime.now(UTC),
-        )
-        self.order_book.orders_by_id[order.id] = order
-
-        # Test and validation
-        with pytest.raises(
-            ValueError, match="Order cannot be cancelled as it has no price"
-        ):
-            self.order_book.cancel_order(order.id)
-
     def test_get_orders_returns_all_orders(
         self,
         limit_buy_order,  # noqa F811
@@ -286,3 +265,81 @@ class TestOrderBook:
         # Validation
         # Lower price should be first in asks
         assert list(self.order_book.asks.keys())[0] == 100.0
+
+    def test_depth_aggregates_price_levels(self):
+        """Test depth returns the quantity and order count of each level."""
+
+        # Setup
+        for side, price, quantity in [
+            (OrderSide.BUY, "100.0", "10.0"),
+            (OrderSide.BUY, "100.0", "5.0"),
+            (OrderSide.BUY, "99.0", "1.0"),
+            (OrderSide.BUY, "98.0", "2.0"),
+            (OrderSide.SELL, "101.0", "3.0"),
+        ]:
+            self.order_book.add_order(
+                Order(
+                    id=uuid4(),
+                    contract_id=ContractCode.UK_BL_MAR_25,
+                    trader_id=uuid4(),
+                    side=side,
+                    type=OrderType.LIMIT,
+                    price=Decimal(price),
+                    quantity=Decimal(quantity),
+                    placed_at=datetime.now(UTC),
+                )
+            )
+
+        # Test
+        depth = self.order_book.depth(levels=2)
+
+        # Validation
+        assert [
+            (level.price, level.quantity, level.orders) for level in depth.bids
+        ] == [
+            (Decimal("100.0"), Decimal("15.0"), 2),
+            (Decimal("99.0"), Decimal("1.0"), 1),
+        ]
+        assert [
+            (level.price, level.quantity, level.orders) for level in depth.asks
+        ] == [
+            (Decimal("101.0"), Decimal("3.0"), 1),
+        ]
+
+    def test_depth_is_updated_on_cancel(
+        self,
+        limit_sell_order,  # noqa F811
+        second_limit_sell_order,  # noqa F811
+    ):
+        """Test cancelling an order takes its quantity off its price level."""
+
+        # Setup
+        self.order_book.add_order(limit_sell_order)  # Quantity: 10.0
+        self.order_book.add_order(second_limit_sell_order)  # Quantity: 15.0
+
+        # Test
+        self.order_book.cancel_order(limit_sell_order.id)
+
+        # Validation
+        [level] = self.order_book.depth().asks
+        assert level.quantity == Decimal("15.0")
+        assert level.orders == 1
+
+    def test_top_of_book(
+        self,
+        limit_buy_order,  # noqa F811
+    ):
+        """Test top of book returns the best level of each side, if any."""
+
+        # Setup
+        self.order_book.add_order(limit_buy_order)
+
+        # Test
+        top_of_book = self.order_book.top_of_book()
+
+        # Validation
+        assert top_of_book.best_bid is not None
+        assert top_of_book.best_bid.price == Decimal("100.0")
+        assert top_of_book.best_bid.quantity == Decimal("10.0")
+        assert top_of_book.best_bid.orders == 1
+        assert top_of_book.best_ask is None
@@ -0,0 +1,122 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.order_book.price_level import PriceLevel
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import DecimalScale
+from ctenex.domain.order_book.order.model import Order
+
+
+def make_record() -> OrderRecord:
+    order = Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=uuid4(),
+        side=OrderSide.SELL,
+        type=OrderType.LIMIT,
+        price=Decimal("100.0"),
+        quantity=Decimal("5.0"),
+        placed_at=datetime.now(UTC),
+    )
+    return OrderRecord.from_order(order, DecimalScale())
+
+
+class TestPriceLevel:
+    def setup_method(self):
+        self.level = PriceLevel()
+
+    def test_empty_level(self):
+        """Test a new price level is empty."""
+
+        # Setup
+        ...
+
+        # Test and validation
+        assert len(self.level) == 0
+        assert not self.level
+        assert list(self.level) == []
+
+    def test_append_keeps_time_priority(self):
+        """Test orders are iterated in the order they were appended."""
+
+        # Setup
+        records = [make_record() for _ in range(3)]
+
+        # Test
+        for record in records:
+            self.level.append(record)
+
+        # Validation
+        assert len(self.level) == 3
+        assert list(self.level) == records
+        assert self.level.peek() == records[0]
+        assert all(record in self.level for record in records)
+
+    def test_popleft_returns_orders_in_fifo_order(self):
+        """Test popping the head returns orders first in, first out."""
+
+        # Setup
+        records = [make_record() for _ in range(3)]
+        for record in records:
+            self.level.append(record)
+
+        # Test
+        popped = [self.level.popleft() for _ in range(3)]
+
+        # Validation
+        assert popped == records
+        assert not self.level
+
+    def test_remove_from_middle(self):
+        """Test unlinking a record from the middle of the queue."""
+
+        # Setup
+        first, middle, last = (make_record() for _ in range(3))
+        for record in (first, middle, last):
+            self.level.append(record)
+
+        # Test
+        self.level.remove(middle)
+
+        # Validation
+        assert middle not in self.level
+        assert middle.prev is None and middle.next is None
+        assert list(self.level) == [first, last]
+
+    def test_remove_head_and_tail(self):
+        """Test unlinking the head and the tail keeps the queue linked."""
+
+        # Setup
+        first, middle, last = (make_record() for _ in range(3))
+        for record in (first, middle, last):
+            self.level.append(record)
+
+        # Test
+        self.level.remove(first)
+        self.level.remove(last)
+
+        # Validation
+        assert list(self.level) == [middle]
+        assert self.level.peek() == middle
+
+        # Appending after removing the tail links to the remaining order
+        new_record = make_record()
+        self.level.append(new_record)
+        assert list(self.level) == [middle, new_record]
+
+    def test_pop_and_peek_on_empty_level_raise_error(self):
+        """Test popping or peeking an empty level raises IndexError."""
+
+        # Setup
+        ...
+
+        # Test and validation
+        with pytest.raises(IndexError):
+            self.level.popleft()
+        with pytest.raises(IndexError):
+            self.level.peek()
@@ -0,0 +1,109 @@
+import gc
+import weakref
+from decimal import Decimal
+from uuid import uuid4
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OpenOrderStatus, OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.record import TradeRecord
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.in_memory.order_book.record import OrderRecord
+from ctenex.domain.in_memory.order_book.scale import DecimalScale, TickScale
+from ctenex.domain.order_book.order.model import Order
+from ctenex.domain.order_book.trade.model import Trade
+from tests.fixtures.domain import (
+    limit_buy_order,  # noqa F811
+)
+
+
+class TestOrderRecord:
+    def test_round_trip_in_decimal_mode(
+        self,
+        limit_buy_order,  # noqa F811
+    ):
+        """Test a record converts back to an equal pydantic order."""
+
+        # Setup
+        limit_buy_order.remaining_quantity = limit_buy_order.quantity
+
+        # Test
+        record = OrderRecord.from_order(limit_buy_order, DecimalScale())
+
+        # Validation
+        assert record.to_order(DecimalScale()) == limit_buy_order
+
+    def test_round_trip_in_tick_mode(
+        self,
+        limit_buy_order,  # noqa F811
+    ):
+        """Test a record keeps integer ticks and lots and converts them back."""
+
+        # Setup
+        scale = TickScale(tick_size=Decimal("0.01"))
+
+        # Test
+        record = OrderRecord.from_order(limit_buy_order, scale)
+        order = record.to_order(scale)
+
+        # Validation
+        assert record.price == 10_000
+        assert record.remaining == record.quantity == 1_000
+        assert order.price == limit_buy_order.price
+        assert order.quantity == limit_buy_order.quantity
+        assert order.remaining_quantity == limit_buy_order.quantity
+
+
+class TestTradeRecord:
+    def test_to_trade_keeps_a_stable_id(self):
+        """Test a trade's ID is drawn once and reused on every conversion."""
+
+        # Setup
+        record = TradeRecord(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            buy_order_id=uuid4(),
+            sell_order_id=uuid4(),
+            price=10_025,
+            quantity=150,
+        )
+
+        # Test
+        first = record.to_trade(TickScale(tick_size=Decimal("0.01")))
+        second = record.to_trade(TickScale(tick_size=Decimal("0.01")))
+
+        # Validation
+        assert isinstance(first, Trade)
+        assert first.id == second.id
+        assert first.price == Decimal("100.25")
+        assert first.quantity == Decimal("1.50")
+
+
+class TestOrderBookRecords:
+    def setup_method(self):
+        self.order_book = OrderBook(contract_id=ContractCode.UK_BL_MAR_25)
+
+    def test_book_does_not_keep_submitted_orders_alive(self):
+        """Test the book only holds a record once the caller drops its order."""
+
+        # Setup
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.0"),
+            quantity=Decimal("10.0"),
+        )
+        order_id = self.order_book.add_order(order)
+        reference = weakref.ref(order)
+
+        # Test
+        del order
+        gc.collect()
+
+        # Validation
+        assert reference() is None
+        assert isinstance(self.order_book.orders_by_id[order_id], OrderRecord)
+        order = self.order_book.get_order(order_id)
+        assert order is not None
+        assert order.status == OpenOrderStatus.OPEN
+        assert order.remaining_quantity == Decimal("10.0")
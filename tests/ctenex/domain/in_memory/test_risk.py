@@ -0,0 +1,307 @@
+from collections import defaultdict
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.exceptions import (
+    OpenNotionalLimitError,
+    OrderSizeLimitError,
+    PositionLimitError,
+)
+from ctenex.domain.in_memory.journal.model import Journal
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.risk import RiskLimits
+from ctenex.domain.in_memory.snapshot.model import SnapshotStore
+from ctenex.domain.order_book.order.model import Order
+from tests.ctenex.domain.in_memory.test_fixed_point import CONTRACT
+from tests.fixtures.flows import random_flow
+
+TRADER = UUID(int=1)
+
+
+def make_order(
+    side: OrderSide,
+    quantity: str,
+    price: str | None = "100.00",
+    trader_id: UUID = TRADER,
+) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=trader_id,
+        side=side,
+        type=OrderType.LIMIT if price is not None else OrderType.MARKET,
+        price=Decimal(price) if price is not None else None,
+        quantity=Decimal(quantity),
+        placed_at=datetime.now(UTC),
+    )
+
+
+def recompute_exposures(
+    engine: MatchingEngine, traders: dict[UUID, UUID]
+) -> dict[UUID, tuple]:
+    """Exposures of the traders of a contract, computed from scratch."""
+    order_book = engine.order_books[ContractCode.UK_BL_MAR_25]
+    scale = order_book.scale
+    exposures: defaultdict[UUID, list] = defaultdict(lambda: [0, 0, 0, 0])
+    for trade in engine.get_trades(ContractCode.UK_BL_MAR_25):
+        quantity = scale.to_lots(trade.quantity)
+        exposures[traders[trade.buy_order_id]][0] += quantity
+        exposures[traders[trade.sell_order_id]][0] -= quantity
+    for record in order_book.orders_by_id.values():
+        exposure = exposures[record.trader_id]
+        exposure[1 if record.side == OrderSide.BUY else 2] += record.remaining
+        exposure[3] += record.price * record.remaining
+    return {
+        trader_id: tuple(exposure)
+        for trader_id, exposure in exposures.items()
+        if any(exposure)
+    }
+
+
+def tracked_exposures(engine: MatchingEngine) -> dict[UUID, tuple]:
+    exposures = engine.order_books[ContractCode.UK_BL_MAR_25].exposures
+    assert exposures is not None
+    return {
+        UUID(int=key): (e.position, e.bids, e.asks, e.notional)
+        for key, e in exposures.items()
+        if any((e.position, e.bids, e.asks, e.notional))
+    }
+
+
+class TestRiskLimits:
+    def setup_method(self):
+        """Create a fresh matching engine before each test."""
+        self.matching_engine = MatchingEngine(
+            risk_limits=RiskLimits(
+                max_order_quantity=Decimal("10.00"),
+                max_open_notional=Decimal("2000.00"),
+                max_position=Decimal("15.00"),
+            )
+        )
+        self.matching_engine.start(contracts=[CONTRACT])
+
+    def teardown_method(self):
+        """Stop the matching engine after each test."""
+        self.matching_engine.stop()
+
+    def resting_ids(self) -> list[UUID]:
+        return [
+            order.id
+            for order in self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25)
+        ]
+
+    def test_order_size_limit(self):
+        """Test an order larger than the maximum order quantity is rejected."""
+
+        # Setup
+        order = make_order(OrderSide.BUY, "10.01")
+
+        # Test
+        with pytest.raises(OrderSizeLimitError, match="10.00"):
+            self.matching_engine.add_order(order)
+
+        # Validation
+        assert self.resting_ids() == []
+
+    def test_open_notional_limit(self):
+        """Test resting orders count towards the open notional until cancelled."""
+
+        # Setup
+        first = make_order(OrderSide.BUY, "10.00")  # 1000.00
+        second = make_order(OrderSide.SELL, "10.00", price="100.01")  # 1000.10
+        self.matching_engine.add_order(first)
+
+        # Test
+        with pytest.raises(OpenNotionalLimitError):
+            self.matching_engine.add_order(second)
+        self.matching_engine.cancel_order(ContractCode.UK_BL_MAR_25, first.id)
+        self.matching_engine.add_order(second)
+
+        # Validation
+        assert self.resting_ids() == [second.id]
+
+    def test_market_orders_have_no_open_notional(self):
+        """Test market orders, which never rest, skip the open notional limit."""
+
+        # Setup
+        self.matching_engine.add_order(make_order(OrderSide.BUY, "10.00"))
+        self.matching_engine.add_order(
+            make_order(OrderSide.BUY, "10.00", trader_id=UUID(int=2))
+        )
+
+        # Test
+        self.matching_engine.add_order(make_order(OrderSide.SELL, "5.00", price=None))
+
+        # Validation
+        exposure = self.matching_engine.order_books[
+            ContractCode.UK_BL_MAR_25
+        ].get_exposure(TRADER)
+        # Its own bid was first in the queue: the trader traded with itself
+        assert exposure.position == 0
+        assert exposure.bids == 500
+
+    def test_position_limit_counts_fills_and_resting_orders(self):
+        """Test the position limit covers fills and the worst case of resting orders."""
+
+        # Setup
+        self.matching_engine.add_order(
+            make_order(OrderSide.SELL, "10.00", trader_id=UUID(int=2))
+        )
+        self.matching_engine.add_order(make_order(OrderSide.BUY, "10.00"))  # Filled
+        self.matching_engine.add_order(make_order(OrderSide.BUY, "4.00", "99.00"))
+
+        # Test
+        with pytest.raises(PositionLimitError):
+            self.matching_engine.add_order(make_order(OrderSide.BUY, "1.01", "98.00"))
+        self.matching_engine.add_order(make_order(OrderSide.BUY, "1.00", "98.00"))
+        # Selling reduces the long position, and is well within the short limit
+        self.matching_engine.add_order(make_order(OrderSide.SELL, "10.00", "101.00"))
+
+        # Validation
+        exposure = self.matching_engine.order_books[
+            ContractCode.UK_BL_MAR_25
+        ].get_exposure(TRADER)
+        assert (exposure.position, exposure.bids, exposure.asks) == (1000, 500, 1000)
+
+    def test_position_limit_counts_waiting_stop_orders(self):
+        """Test stop orders count towards the position limit while waiting."""
+
+        # Setup
+        stops = [make_order(OrderSide.BUY, "5.00", None) for _ in range(4)]
+        for stop in stops:
+            stop.type = OrderType.STOP
+            stop.stop_price = Decimal("100.00")
+        for stop in stops[:3]:
+            self.matching_engine.add_order(stop)
+
+        # Test
+        with pytest.raises(PositionLimitError):
+            self.matching_engine.add_order(stops[3])
+        with pytest.raises(PositionLimitError):
+            self.matching_engine.add_order(make_order(OrderSide.BUY, "0.01", "99.00"))
+        for seller in (2, 3):
+            self.matching_engine.add_order(
+                make_order(OrderSide.SELL, "10.00", trader_id=UUID(int=seller))
+            )
+        self.matching_engine.add_order(
+            make_order(OrderSide.BUY, "1.00", trader_id=UUID(int=4))
+        )  # Triggers the stops
+
+        # Validation
+        order_book = self.matching_engine.order_books[ContractCode.UK_BL_MAR_25]
+        assert order_book.get_exposure(TRADER).position == 1500
+        assert (
+            self.matching_engine.stop_books[ContractCode.UK_BL_MAR_25].bids_by_trader
+            == {}
+        )
+
+    def test_amendment_is_checked_in_place_of_the_order(self):
+        """Test an amendment is checked without counting the order it replaces."""
+
+        # Setup
+        order = make_order(OrderSide.BUY, "10.00")
+        self.matching_engine.add_order(order)
+
+        # Test
+        self.matching_engine.amend_order(
+            ContractCode.UK_BL_MAR_25, order.id, new_price=Decimal("199.00")
+        )
+        with pytest.raises(OpenNotionalLimitError):
+            self.matching_engine.amend_order(
+                ContractCode.UK_BL_MAR_25, order.id, new_price=Decimal("201.00")
+            )
+
+        # Validation
+        (resting,) = self.matching_engine.get_orders(ContractCode.UK_BL_MAR_25)
+        assert resting.price == Decimal("199.00")
+
+    def test_batch_reports_rejections(self):
+        """Test an order of a batch breaching a limit is rejected on its own."""
+
+        # Setup
+        orders = [
+            make_order(OrderSide.BUY, "11.00"),
+            make_order(OrderSide.BUY, "1.00"),
+        ]
+
+        # Test
+        results = self.matching_engine.add_orders(orders)
+
+        # Validation
+        assert isinstance(results[0].exception, OrderSizeLimitError)
+        assert results[0].error is not None
+        assert results[1].error is None
+        assert self.resting_ids() == [orders[1].id]
+
+    @pytest.mark.parametrize("contracts", [[], [CONTRACT]], ids=["decimal", "ticks"])
+    def test_exposure_is_kept_incrementally(self, contracts):
+        """Test the tracked exposures match exposures computed from scratch."""
+
+        # Setup
+        engine = MatchingEngine(risk_limits=RiskLimits())
+        engine.start(contracts=contracts)
+        traders = {}
+        flow = random_flow(seed=8, size=3_000, stops=0.1)
+
+        # Test
+        for index, (action, payload) in enumerate(flow):
+            if action == "add":
+                # A few traders, for their orders to trade with each other
+                order = Order(**{**payload, "trader_id": UUID(int=index % 7)})
+                traders[order.id] = order.trader_id
+                engine.add_order(order)
+            elif index % 3 == 0:
+                engine.amend_order(
+                    ContractCode.UK_BL_MAR_25, payload["id"], new_quantity=Decimal(25)
+                )
+            else:
+                engine.cancel_order(ContractCode.UK_BL_MAR_25, payload["id"])
+            if index % 1_000 == 999:
+                engine.cancel_all(UUID(int=index % 7))
+
+        # Validation
+        assert tracked_exposures(engine) == recompute_exposures(engine, traders)
+
+    def test_positions_are_restored_from_snapshots(self, tmp_path: Path):
+        """Test positions survive a snapshot, with the books' resting exposure."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal")
+        engine = MatchingEngine(journal=journal, risk_limits=RiskLimits())
+        engine.start(contracts=[CONTRACT])
+        for index, (action, payload) in enumerate(random_flow(seed=9, size=1_000)):
+            if action == "add":
+                trader_id = UUID(int=3 + index % 2)
+                engine.add_order(Order(**{**payload, "trader_id": trader_id}))
+        store = SnapshotStore(tmp_path / "snapshots")
+        store.write(engine.snapshot())
+        journal.close()
+
+        # Test
+        restarted = MatchingEngine(risk_limits=RiskLimits())
+        restarted.start(contracts=[CONTRACT])
+        position = restarted.restore(store)
+
+        # Validation
+        assert position == journal.position
+        assert tracked_exposures(restarted) == tracked_exposures(engine)
+
+    def test_no_limits_tracks_nothing(self):
+        """Test an engine without risk limits keeps no exposure."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start()
+
+        # Test
+        engine.add_order(make_order(OrderSide.BUY, "1000.00"))
+
+        # Validation
+        assert engine.order_books[ContractCode.UK_BL_MAR_25].exposures is None
+        assert len(engine.get_orders(ContractCode.UK_BL_MAR_25)) == 1
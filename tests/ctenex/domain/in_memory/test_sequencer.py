@@ -0,0 +1,154 @@
+import asyncio
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.sequencer import Sequencer
+from ctenex.domain.order_book.order.model import Order
+
+
+def make_orders(seed: int, size: int) -> list[Order]:
+    rng = random.Random(seed)
+    return [
+        Order(
+            id=UUID(int=rng.getrandbits(128)),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID(int=rng.getrandbits(128)),
+            side=rng.choice([OrderSide.BUY, OrderSide.SELL]),
+            type=OrderType.LIMIT,
+            price=Decimal(rng.randint(9_990, 10_010)).scaleb(-2),
+            quantity=Decimal(rng.randint(1, 1_000)).scaleb(-2),
+            placed_at=datetime(2025, 3, 1, tzinfo=UTC),
+        )
+        for _ in range(size)
+    ]
+
+
+def snapshot(engine: MatchingEngine) -> tuple[list, list]:
+    trades = engine.get_trades(ContractCode.UK_BL_MAR_25)
+    orders = engine.get_orders(ContractCode.UK_BL_MAR_25)
+    return (
+        [(t.buy_order_id, t.sell_order_id, t.price, t.quantity) for t in trades],
+        sorted((o.id, o.status, o.remaining_quantity) for o in orders),
+    )
+
+
+class TestSequencer:
+    def setup_method(self):
+        self.matching_engine = MatchingEngine()
+        self.matching_engine.start()
+        self.sequencer = Sequencer()
+        self.sequencer.start()
+
+    def teardown_method(self):
+        self.sequencer.stop()
+        self.matching_engine.stop()
+
+    def test_commands_run_on_the_matching_thread_in_order(self):
+        """Test commands run one at a time, in submission order, on one thread."""
+
+        # Setup
+        executed: list[tuple[int, str]] = []
+
+        def command(index: int) -> int:
+            executed.append((index, threading.current_thread().name))
+            return index
+
+        # Test
+        futures = [self.sequencer.submit(command, index) for index in range(100)]
+
+        # Validation
+        assert [future.result() for future in futures] == list(range(100))
+        assert executed == [(index, self.sequencer.name) for index in range(100)]
+
+    def test_exceptions_are_raised_to_the_caller(self):
+        """Test a failing command raises in its caller, not in the sequencer."""
+
+        # Setup
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID(int=1),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            quantity=Decimal("1.00"),
+        )
+
+        # Test and validation
+        with pytest.raises(ValueError, match="Order must have a price"):
+            self.sequencer.submit(self.matching_engine.add_order, order).result()
+        assert self.sequencer.running
+
+    def test_stop_runs_queued_commands_first(self):
+        """Test stopping the sequencer runs the commands already queued."""
+
+        # Setup
+        futures = [
+            self.sequencer.submit(self.matching_engine.add_order, order)
+            for order in make_orders(seed=1, size=50)
+        ]
+
+        # Test
+        self.sequencer.stop()
+
+        # Validation
+        assert all(future.done() for future in futures)
+        with pytest.raises(RuntimeError, match="is not running"):
+            self.sequencer.submit(self.matching_engine.get_orders, "UK-BL-MAR-25")
+
+    def test_concurrent_threads_match_as_a_sequential_replay(self):
+        """Test concurrent submissions leave the engine as if replayed in order."""
+
+        # Setup
+        executed: list[Order] = []
+
+        def add_order(order: Order) -> UUID:
+            executed.append(order)
+            return self.matching_engine.add_order(order)
+
+        clients = [make_orders(seed=seed, size=200) for seed in range(16)]
+
+        def client(orders: list[Order]) -> list[UUID]:
+            return [self.sequencer.submit(add_order, o).result() for o in orders]
+
+        # Test
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            results = list(pool.map(client, clients))
+
+        # Validation
+        assert results == [[order.id for order in orders] for orders in clients]
+        assert len(executed) == sum(len(orders) for orders in clients)
+
+        replayed = MatchingEngine()
+        replayed.start()
+        for order in executed:
+            # As submitted, before matching updated its status and quantity
+            replayed.add_order(
+                Order(**order.model_dump(exclude={"status", "remaining_quantity"}))
+            )
+        assert snapshot(replayed) == snapshot(self.matching_engine)
+
+    async def test_concurrent_coroutines_await_their_own_results(self):
+        """Test 64 concurrent async clients each get the results of their orders."""
+
+        # Setup
+        clients = [make_orders(seed=seed, size=20) for seed in range(64)]
+
+        async def client(orders: list[Order]) -> list[UUID]:
+            return [
+                await self.sequencer.execute(self.matching_engine.add_order, order)
+                for order in orders
+            ]
+
+        # Test
+        results = await asyncio.gather(*(client(orders) for orders in clients))
+
+        # Validation
+        assert results == [[order.id for order in orders] for orders in clients]
@@ -0,0 +1,326 @@
+import asyncio
+from decimal import Decimal
+from typing import Iterator
+from uuid import UUID
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import (
+    OrderSide,
+    OrderType,
+    ProcessedOrderStatus,
+    TimeInForce,
+)
+from ctenex.domain.exceptions import OrderSizeLimitError
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.matching_engine.risk import RiskLimits
+from ctenex.domain.in_memory.matching_engine.sequencer import Dispatcher
+from ctenex.domain.in_memory.matching_engine.sharding import ShardedMatchingEngine
+from ctenex.domain.order_book.order.model import Order
+from tests.fixtures.flows import random_flow
+
+# A contract of the tests' own, besides those of `ContractCode`
+APRIL = "UK-BL-APR-25"
+CONTRACTS = [ContractCode.UK_BL_MAR_25, APRIL]
+
+
+@pytest.fixture
+def sharded_engine() -> Iterator[ShardedMatchingEngine]:
+    engine = ShardedMatchingEngine(shards=2)
+    engine.start(contract_codes=CONTRACTS)
+    yield engine
+    engine.stop()
+
+
+def make_orders(seed: int) -> list[Order]:
+    """Interleave the same kind of flow on every contract, with unique IDs."""
+    return [
+        Order(
+            **{
+                **payload,
+                "id": UUID(int=payload["id"].int ^ index),
+                "contract_id": contract_id,
+            }
+        )
+        for index, contract_id in enumerate(CONTRACTS)
+        for action, payload in random_flow(seed=seed, size=300)
+        if action == "add"
+    ]
+
+
+def state(engine: MatchingEngine | ShardedMatchingEngine) -> dict:
+    return {
+        contract_id: (
+            [(t.buy_order_id, t.sell_order_id, t.price, t.quantity) for t in trades],
+            [(o.id, o.status, o.remaining_quantity) for o in orders],
+        )
+        for contract_id in CONTRACTS
+        for trades, orders in [
+            (engine.get_trades(contract_id), engine.get_orders(contract_id))
+        ]
+    }
+
+
+class TestShardedMatchingEngine:
+    def test_contracts_are_spread_over_the_shards(
+        self, sharded_engine: ShardedMatchingEngine
+    ):
+        """Test each contract is owned by exactly one shard, round-robin."""
+
+        # Setup
+        ...
+
+        # Test
+        shards = [sharded_engine.shard_of[contract_id] for contract_id in CONTRACTS]
+
+        # Validation
+        assert [shard.index for shard in shards] == [0, 1]
+        assert all(shard.process.is_alive() for shard in shards)
+
+    def test_batches_match_as_in_a_single_process(
+        self, sharded_engine: ShardedMatchingEngine
+    ):
+        """Test a sharded batch gives the same results as an in-process engine."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(contract_codes=CONTRACTS)
+
+        # Test
+        results = sharded_engine.add_orders(make_orders(seed=1))
+        expected_results = engine.add_orders(make_orders(seed=1))
+
+        # Validation
+        assert [
+            (r.order.id, r.order.status, r.order.remaining_quantity, len(r.trades))
+            for r in results
+        ] == [
+            (r.order.id, r.order.status, r.order.remaining_quantity, len(r.trades))
+            for r in expected_results
+        ]
+        assert state(sharded_engine) == state(engine)
+
+    def test_batch_results_carry_type_and_expiry(
+        self, sharded_engine: ShardedMatchingEngine
+    ):
+        """Test triggered stops and day orders come back as from one process."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(contract_codes=CONTRACTS)
+
+        def make_day_orders() -> list[Order]:
+            orders = [
+                Order(**payload)
+                for action, payload in random_flow(seed=3, size=300, stops=0.2)
+                if action == "add"
+            ]
+            for order in orders[::3]:
+                order.time_in_force = TimeInForce.DAY
+            return orders
+
+        # Test
+        results = sharded_engine.add_orders(make_day_orders())
+        expected_results = engine.add_orders(make_day_orders())
+
+        # Validation
+        outcomes = [(r.order.id, r.order.type, r.order.expires_at) for r in results]
+        assert outcomes == [
+            (r.order.id, r.order.type, r.order.expires_at) for r in expected_results
+        ]
+        assert any(r.order.expires_at is not None for r in results)
+        assert any(
+            r.order.stop_price is not None and r.order.type == OrderType.MARKET
+            for r in results
+        )
+
+    def test_concurrent_calls_are_pipelined(self):
+        """Test calls in flight at once to a shard match as if made in turn."""
+
+        # Setup
+        sharded_engine = ShardedMatchingEngine(shards=1, log_level=None)
+        sharded_engine.start(contract_codes=CONTRACTS)
+        engine = MatchingEngine()
+        engine.start(contract_codes=CONTRACTS)
+        dispatcher = Dispatcher(workers=4)
+        dispatcher.start()
+        orders = make_orders(seed=3)
+
+        async def client(contract_id: str) -> None:
+            for order in orders:
+                if order.contract_id == contract_id:
+                    await dispatcher.execute(sharded_engine.add_orders, [order])
+
+        async def clients() -> None:
+            await asyncio.gather(*(client(contract_id) for contract_id in CONTRACTS))
+
+        # Test
+        try:
+            asyncio.run(clients())
+            engine.add_orders(make_orders(seed=3))
+
+            # Validation
+            assert state(sharded_engine) == state(engine)
+        finally:
+            dispatcher.stop()
+            sharded_engine.stop()
+
+    def test_trades_keep_their_ids(self, sharded_engine: ShardedMatchingEngine):
+        """Test the trades returned for a batch are the ones the shard keeps."""
+
+        # Setup
+        ...
+
+        # Test
+        results = sharded_engine.add_orders(make_orders(seed=2))
+
+        # Validation
+        trade_ids = [trade.id for result in results for trade in result.get_trades()]
+        assert trade_ids
+        assert trade_ids == [
+            trade.id
+            for contract_id in CONTRACTS
+            for trade in sharded_engine.get_trades(contract_id)
+        ]
+
+    def test_single_commands_are_routed(self, sharded_engine: ShardedMatchingEngine):
+        """Test orders are added to, and cancelled from, their contract's shard."""
+
+        # Setup
+        order = Order(
+            contract_id=APRIL,
+            trader_id=UUID(int=1),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.00"),
+            quantity=Decimal("5.00"),
+        )
+
+        # Test
+        order_id = sharded_engine.add_order(order)
+        cancelled = sharded_engine.cancel_order(APRIL, order_id)
+
+        # Validation
+        assert order_id == order.id
+        assert cancelled is not None
+        assert cancelled.status == ProcessedOrderStatus.CANCELLED
+        assert sharded_engine.get_orders(ContractCode.UK_BL_MAR_25) == []
+        assert sharded_engine.get_orders(APRIL) == []
+
+    def test_get_order_from_any_shard(self, sharded_engine: ShardedMatchingEngine):
+        """Test an order is found by ID alone, in the shard of its contract."""
+
+        # Setup
+        order = Order(
+            contract_id=APRIL,
+            trader_id=UUID(int=1),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.00"),
+            quantity=Decimal("5.00"),
+        )
+        sharded_engine.add_order(order)
+
+        # Test
+        found = sharded_engine.get_order(order.id)
+
+        # Validation
+        assert found is not None
+        assert found.id == order.id
+        assert sharded_engine.find_contract(order.id) == APRIL
+        assert sharded_engine.get_order(UUID(int=2)) is None
+
+        # Still found once closed, with its final status
+        sharded_engine.cancel_order(APRIL, order.id)
+        closed = sharded_engine.get_order(order.id)
+        assert closed is not None
+        assert closed.status == ProcessedOrderStatus.CANCELLED
+
+    def test_cancel_all_in_every_shard(self, sharded_engine: ShardedMatchingEngine):
+        """Test a trader's orders are cancelled in the shard of each contract."""
+
+        # Setup
+        orders = [
+            Order(
+                contract_id=contract_id,
+                trader_id=UUID(int=1),
+                side=OrderSide.BUY,
+                type=OrderType.LIMIT,
+                price=Decimal("100.00"),
+                quantity=Decimal("5.00"),
+            )
+            for contract_id in CONTRACTS
+        ]
+        for order in orders:
+            sharded_engine.add_order(order)
+
+        # Test
+        first = sharded_engine.cancel_all(UUID(int=1), ContractCode.UK_BL_MAR_25)
+        rest = sharded_engine.cancel_all(UUID(int=1))
+
+        # Validation
+        assert [order.id for order in first] == [orders[0].id]
+        assert [order.id for order in rest] == [orders[1].id]
+        assert sharded_engine.get_orders(APRIL) == []
+
+    def test_errors_are_raised_to_the_caller(
+        self, sharded_engine: ShardedMatchingEngine
+    ):
+        """Test an error raised in a shard is raised again by the call."""
+
+        # Setup
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID(int=1),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            quantity=Decimal("5.00"),
+        )
+
+        # Test and validation
+        with pytest.raises(ValueError, match="Order must have a price"):
+            sharded_engine.add_order(order)
+        with pytest.raises(KeyError):
+            sharded_engine.get_orders("UK-BL-MAY-25")
+
+    def test_risk_limit_errors_keep_their_type(self):
+        """Test an order rejected by the risk checks of a shard raises their error."""
+
+        # Setup
+        engine = ShardedMatchingEngine(
+            shards=1,
+            log_level=None,
+            risk_limits=RiskLimits(max_order_quantity=Decimal("1.00")),
+        )
+        engine.start(contract_codes=CONTRACTS)
+        order = Order(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=UUID(int=1),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            price=Decimal("100.00"),
+            quantity=Decimal("5.00"),
+        )
+
+        # Test and validation
+        try:
+            with pytest.raises(OrderSizeLimitError):
+                engine.add_order(order)
+        finally:
+            engine.stop()
+
+    def test_latency_of_all_shards(self, sharded_engine: ShardedMatchingEngine):
+        """Test the latency histograms of every shard's contracts are read."""
+
+        # Setup
+        sharded_engine.add_orders(make_orders(seed=3))
+
+        # Test
+        latency = sharded_engine.get_latency()
+
+        # Validation
+        assert sorted(contract.contract_id for contract in latency.contracts) == sorted(
+            CONTRACTS
+        )
+        assert all(contract.stages["total"].count for contract in latency.contracts)
@@ -0,0 +1,281 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, TimeInForce
+from ctenex.domain.exceptions import SnapshotFormatError
+from ctenex.domain.in_memory.journal.model import Journal
+from ctenex.domain.in_memory.matching_engine.model import MatchingEngine
+from ctenex.domain.in_memory.order_book.ladder import LadderOrderBook
+from ctenex.domain.in_memory.order_book.model import OrderBook
+from ctenex.domain.in_memory.snapshot.codec import encode as encode_snapshot
+from ctenex.domain.in_memory.snapshot.model import SnapshotStore
+from ctenex.domain.order_book.order.model import Order
+from tests.ctenex.domain.in_memory.test_fixed_point import CONTRACT
+from tests.fixtures.flows import random_flow
+
+
+def run_flow(engine: MatchingEngine, seed: int, size: int, stops: float = 0.0) -> None:
+    for action, payload in random_flow(seed=seed, size=size, stops=stops):
+        if action == "add":
+            engine.add_order(Order(**payload))
+        else:
+            engine.cancel_order(ContractCode.UK_BL_MAR_25, payload["id"])
+
+
+def book_state(engine: MatchingEngine) -> tuple[list, list]:
+    order_book = engine.order_books[ContractCode.UK_BL_MAR_25]
+    return (
+        [
+            (o.id, o.trader_id, o.side, o.price, o.remaining_quantity, o.placed_at)
+            for o in order_book.get_orders()
+        ],
+        [
+            [record.id for record in order_book.get_level(side, price)]
+            for side in (OrderSide.BUY, OrderSide.SELL)
+            for price, _ in order_book._levels(side)
+        ],
+    )
+
+
+class TestSnapshot:
+    def test_snapshot_round_trip(self, tmp_path: Path):
+        """Test restoring a snapshot rebuilds the books in priority order."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start()
+        run_flow(engine, seed=7, size=1_000)
+        store = SnapshotStore(tmp_path)
+
+        # Test
+        store.write(engine.snapshot())
+        restored = MatchingEngine()
+        restored.start()
+        position = restored.restore(store)
+
+        # Validation
+        assert position == 0
+        assert book_state(restored) == book_state(engine)
+        assert (
+            restored.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence
+            == engine.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence
+        )
+
+    def test_copy_is_consistent_while_matching_continues(self, tmp_path: Path):
+        """Test a snapshot encoded after its copy holds the books as copied."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(contracts=[CONTRACT])
+        run_flow(engine, seed=9, size=1_000, stops=0.1)
+        expected = book_state(engine)
+        expected_stops = engine.get_stop_orders(ContractCode.UK_BL_MAR_25)
+        store = SnapshotStore(tmp_path)
+
+        # Test
+        position, books = engine.copy_state()
+        # Fills, cancellations and triggers, before the copy is encoded
+        run_flow(engine, seed=10, size=1_000, stops=0.1)
+        store.write(encode_snapshot(position, books))
+        restored = MatchingEngine()
+        restored.start(contracts=[CONTRACT])
+        restored.restore(store)
+
+        # Validation
+        assert book_state(engine) != expected
+        assert book_state(restored) == expected
+        assert restored.get_stop_orders(ContractCode.UK_BL_MAR_25) == expected_stops
+
+    @pytest.mark.parametrize("order_book_type", [None, LadderOrderBook])
+    def test_restore_and_replay_the_journal_tail(self, tmp_path: Path, order_book_type):
+        """Test a snapshot and the journal after it rebuild the engine as it was."""
+
+        # Setup
+        order_book_types: dict[str, type[OrderBook]] | None = (
+            {ContractCode.UK_BL_MAR_25: order_book_type} if order_book_type else None
+        )
+        journal = Journal(tmp_path / "journal")
+        engine = MatchingEngine(journal=journal)
+        engine.start(contracts=[CONTRACT], order_book_types=order_book_types)
+        store = SnapshotStore(tmp_path / "snapshots")
+        run_flow(engine, seed=3, size=1_000)
+        store.write(engine.snapshot())
+        run_flow(engine, seed=4, size=500)
+        journal.close()
+
+        # Test
+        restarted = MatchingEngine(journal=Journal(tmp_path / "journal"))
+        restarted.start(contracts=[CONTRACT], order_book_types=order_book_types)
+        position = restarted.restore(store)
+        count = restarted.replay(start=position)
+
+        # Validation
+        assert 0 < count < 600
+        assert book_state(restarted) == book_state(engine)
+
+    def test_restored_books_keep_matching(self, tmp_path: Path):
+        """Test orders restored from a snapshot match like the original ones."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(contracts=[CONTRACT])
+        run_flow(engine, seed=11, size=500)
+        store = SnapshotStore(tmp_path)
+        store.write(engine.snapshot())
+        restored = MatchingEngine()
+        restored.start(contracts=[CONTRACT])
+        restored.restore(store)
+        sequence = engine.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence
+
+        # Test
+        run_flow(engine, seed=12, size=500)
+        run_flow(restored, seed=12, size=500)
+
+        # Validation
+        assert book_state(restored) == book_state(engine)
+        assert [
+            (trade.buy_order_id, trade.sell_order_id, trade.price, trade.quantity)
+            for trade in restored.get_trades(ContractCode.UK_BL_MAR_25, since=sequence)
+        ] == [
+            (trade.buy_order_id, trade.sell_order_id, trade.price, trade.quantity)
+            for trade in engine.get_trades(ContractCode.UK_BL_MAR_25, since=sequence)
+        ]
+
+    def test_restored_stop_orders_keep_triggering(self, tmp_path: Path):
+        """Test stop orders and the last trade price survive a snapshot."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(contracts=[CONTRACT])
+        run_flow(engine, seed=13, size=500, stops=0.2)
+        store = SnapshotStore(tmp_path)
+        store.write(engine.snapshot())
+        restored = MatchingEngine()
+        restored.start(contracts=[CONTRACT])
+        restored.restore(store)
+        sequence = engine.trade_logs[ContractCode.UK_BL_MAR_25].last_sequence
+
+        # Test
+        stops = restored.get_stop_orders(ContractCode.UK_BL_MAR_25)
+        run_flow(engine, seed=14, size=500, stops=0.2)
+        run_flow(restored, seed=14, size=500, stops=0.2)
+
+        # Validation
+        assert stops
+        assert book_state(restored) == book_state(engine)
+        assert restored.get_stop_orders(
+            ContractCode.UK_BL_MAR_25
+        ) == engine.get_stop_orders(ContractCode.UK_BL_MAR_25)
+        assert [
+            (trade.buy_order_id, trade.sell_order_id, trade.price, trade.quantity)
+            for trade in restored.get_trades(ContractCode.UK_BL_MAR_25, since=sequence)
+        ] == [
+            (trade.buy_order_id, trade.sell_order_id, trade.price, trade.quantity)
+            for trade in engine.get_trades(ContractCode.UK_BL_MAR_25, since=sequence)
+        ]
+
+    def test_restored_orders_keep_their_expiry(self, tmp_path: Path):
+        """Test orders restored from a snapshot still expire when due."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start(contracts=[CONTRACT])
+        placed_at = datetime(2025, 3, 3, 9, tzinfo=UTC)
+        for index, (action, payload) in enumerate(random_flow(seed=15, size=500)):
+            if action == "add":
+                order = Order(**payload)
+                order.placed_at = placed_at
+                order.time_in_force = (TimeInForce.GTC, TimeInForce.DAY)[index % 2]
+                engine.add_order(order)
+        store = SnapshotStore(tmp_path)
+        store.write(engine.snapshot())
+        restored = MatchingEngine()
+        restored.start(contracts=[CONTRACT])
+        restored.restore(store)
+
+        # Test
+        close = datetime(2025, 3, 4, tzinfo=UTC)
+        expired = restored.expire_orders(close)
+
+        # Validation
+        assert expired
+        assert [order.id for order in expired] == [
+            order.id for order in engine.expire_orders(close)
+        ]
+        assert book_state(restored) == book_state(engine)
+
+    def test_latest_snapshots_are_kept(self, tmp_path: Path):
+        """Test the store restores from the latest snapshot and drops older ones."""
+
+        # Setup
+        journal = Journal(tmp_path / "journal")
+        engine = MatchingEngine(journal=journal)
+        engine.start()
+        store = SnapshotStore(tmp_path / "snapshots", keep=2)
+
+        # Test
+        for seed in range(3):
+            run_flow(engine, seed=seed, size=100)
+            store.write(engine.snapshot())
+
+        # Validation
+        paths = store.paths()
+        assert len(paths) == 2
+        assert store.latest() == paths[-1]
+        read = store.read()
+        assert read is not None
+        assert read[0] == journal.position
+
+    def test_no_snapshot_restores_nothing(self, tmp_path: Path):
+        """Test restoring from an empty store leaves the engine as it is."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start()
+
+        # Test
+        position = engine.restore(SnapshotStore(tmp_path))
+
+        # Validation
+        assert position is None
+        assert engine.get_orders(ContractCode.UK_BL_MAR_25) == []
+
+    def test_corrupted_snapshot_raises_error(self, tmp_path: Path):
+        """Test a corrupted snapshot is rejected without touching the books."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start()
+        run_flow(engine, seed=5, size=100)
+        store = SnapshotStore(tmp_path)
+        path = store.write(engine.snapshot())
+        data = bytearray(path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        path.write_bytes(data)
+        restored = MatchingEngine()
+        restored.start()
+
+        # Test and validation
+        with pytest.raises(SnapshotFormatError, match="corrupted"):
+            restored.restore(store)
+        assert restored.get_orders(ContractCode.UK_BL_MAR_25) == []
+
+    def test_tick_size_mismatch_raises_error(self, tmp_path: Path):
+        """Test a snapshot of Decimal books does not load into tick books."""
+
+        # Setup
+        engine = MatchingEngine()
+        engine.start()
+        run_flow(engine, seed=5, size=100)
+        store = SnapshotStore(tmp_path)
+        store.write(engine.snapshot())
+        restored = MatchingEngine()
+        restored.start(contracts=[CONTRACT])
+
+        # Test and validation
+        with pytest.raises(SnapshotFormatError, match="tick size"):
+            restored.restore(store)
+        assert restored.get_orders(ContractCode.UK_BL_MAR_25) == []
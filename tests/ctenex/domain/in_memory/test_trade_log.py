@@ -0,0 +1,124 @@
+from time import time
+from uuid import uuid4
+
+import pytest
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.in_memory.matching_engine.record import TradeRecord
+from ctenex.domain.in_memory.matching_engine.trade_log import (
+    COMPACTION_THRESHOLD,
+    TradeLog,
+)
+
+
+def make_trades(count: int) -> list[TradeRecord]:
+    return [
+        TradeRecord(
+            contract_id=ContractCode.UK_BL_MAR_25,
+            buy_order_id=uuid4(),
+            sell_order_id=uuid4(),
+            price=10_000,
+            quantity=100,
+        )
+        for _ in range(count)
+    ]
+
+
+class TestTradeLog:
+    def test_append_numbers_trades_in_order(self):
+        """Test appended trades are numbered from 1, in order."""
+
+        # Setup
+        trade_log = TradeLog()
+
+        # Test
+        trade_log.append(make_trades(2))
+        trade_log.append(make_trades(3))
+
+        # Validation
+        assert [trade.sequence for trade in trade_log] == [1, 2, 3, 4, 5]
+        assert trade_log.first_sequence == 1
+        assert trade_log.last_sequence == 5
+
+    def test_since_returns_trades_after_sequence(self):
+        """Test since returns the trades numbered after the given sequence."""
+
+        # Setup
+        trade_log = TradeLog()
+        trade_log.append(make_trades(5))
+
+        # Test and validation
+        assert [trade.sequence for trade in trade_log.since(3)] == [4, 5]
+        assert [trade.sequence for trade in trade_log.since(0)] == [1, 2, 3, 4, 5]
+        assert trade_log.since(5) == []
+
+    def test_retention_by_count_evicts_oldest_trades(self):
+        """Test only the latest `max_trades` trades are retained."""
+
+        # Setup
+        trade_log = TradeLog(max_trades=3)
+
+        # Test
+        trade_log.append(make_trades(5))
+
+        # Validation
+        assert len(trade_log) == 3
+        assert trade_log.first_sequence == 3
+        assert [trade.sequence for trade in trade_log.since(0)] == [3, 4, 5]
+        assert [trade.sequence for trade in trade_log.since(3)] == [4, 5]
+
+    def test_retention_by_age_evicts_old_trades(self):
+        """Test trades older than `max_age` seconds are evicted."""
+
+        # Setup
+        trade_log = TradeLog(max_age=60)
+        old_trades = make_trades(2)
+        for trade in old_trades:
+            trade.timestamp = time() - 120
+        trade_log.append(old_trades)
+
+        # Test
+        trade_log.append(make_trades(1))
+
+        # Validation
+        assert [trade.sequence for trade in trade_log.since(0)] == [3]
+
+    def test_evicted_trades_are_spilled(self):
+        """Test evicted trades are handed to the spill callback, oldest first."""
+
+        # Setup
+        spilled: list[TradeRecord] = []
+        trade_log = TradeLog(max_trades=2, spill=spilled.extend)
+
+        # Test
+        trade_log.append(make_trades(3))
+        trade_log.append(make_trades(2))
+
+        # Validation
+        assert [trade.sequence for trade in spilled] == [1, 2, 3]
+        assert [trade.sequence for trade in trade_log] == [4, 5]
+
+    def test_evicted_trades_are_released(self):
+        """Test the log holds at most about twice its retention."""
+
+        # Setup
+        trade_log = TradeLog(max_trades=COMPACTION_THRESHOLD)
+
+        # Test
+        for _ in range(10):
+            trade_log.append(make_trades(COMPACTION_THRESHOLD))
+
+        # Validation
+        assert len(trade_log) == COMPACTION_THRESHOLD
+        assert len(trade_log._records) <= 2 * COMPACTION_THRESHOLD
+        assert trade_log.first_sequence == 9 * COMPACTION_THRESHOLD + 1
+
+    def test_negative_retention_raises_error(self):
+        """Test a negative retention is rejected."""
+
+        # Setup
+        ...
+
+        # Test and validation
+        with pytest.raises(ValueError, match="cannot be negative"):
+            TradeLog(max_trades=-1)
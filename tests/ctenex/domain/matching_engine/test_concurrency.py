@@ -0,0 +1,162 @@
+import asyncio
+import multiprocessing
+import random
+from collections import defaultdict
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from loguru import logger
+from sqlalchemy import func, select
+
+from ctenex.core.db.async_session import db_connection, get_async_session
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import (
+    OpenOrderStatus,
+    OrderSide,
+    OrderType,
+    ProcessedOrderStatus,
+    Trade,
+)
+from ctenex.domain.entities import Order as OrderEntity
+from ctenex.domain.matching_engine.model import MatchingEngine
+from ctenex.domain.order_book.model import OrderBook
+from ctenex.domain.order_book.order.model import Order
+from tests.fixtures.db import (
+    engine,  # noqa F811
+    setup_and_teardown_db,  # noqa F811
+)
+
+# A second contract of the tests' own, besides those of `ContractCode`
+CONTRACTS = [ContractCode.UK_BL_MAR_25, "UK-BL-APR-25"]
+WORKERS = 4
+ORDERS_PER_WORKER = 60
+
+
+async def add_orders(seed: int, size: int) -> None:
+    matching_engine = MatchingEngine()
+    rng = random.Random(seed)
+    for _ in range(size):
+        # A narrow range of prices, for most orders to cross the same ones
+        await matching_engine.add_order(
+            Order(
+                id=uuid4(),
+                contract_id=rng.choice(CONTRACTS),
+                trader_id=uuid4(),
+                side=rng.choice([OrderSide.BUY, OrderSide.SELL]),
+                type=OrderType.LIMIT,
+                price=Decimal(rng.randint(99, 101)),
+                quantity=Decimal(rng.randint(1, 5)),
+                placed_at=datetime.now(UTC),
+            )
+        )
+
+
+def worker(seed: int, size: int) -> None:
+    """Add a seeded flow of orders with an engine of its own, as a worker would."""
+    logger.remove()
+    asyncio.run(add_orders(seed, size))
+
+
+class TestConcurrentWorkers:
+    async def test_no_order_is_overfilled(self):
+        """Test workers matching the same contracts at once never overfill an order."""
+
+        # Setup
+        context = multiprocessing.get_context("spawn")
+
+        # Test
+        with context.Pool(WORKERS) as pool:
+            pool.starmap(worker, [(seed, ORDERS_PER_WORKER) for seed in range(WORKERS)])
+
+        # Validation
+        async with get_async_session() as session:
+            orders = (await session.scalars(select(OrderEntity))).all()
+            trades = (await session.scalars(select(Trade))).all()
+
+        traded: defaultdict = defaultdict(Decimal)
+        for trade in trades:
+            traded[trade.buy_order_id] += trade.quantity
+            traded[trade.sell_order_id] += trade.quantity
+
+        assert len(orders) == WORKERS * ORDERS_PER_WORKER
+        assert trades
+        for order in orders:
+            assert order.remaining_quantity >= 0
+            assert traded[order.id] == order.quantity - order.remaining_quantity
+
+
+class TestConcurrentCancellation:
+    async def test_cancel_all_leaves_contracts_it_did_not_lock(self):
+        """Test cancelling all orders skips those placed on a contract meanwhile."""
+
+        # Setup
+        matching_engine = MatchingEngine()
+        trader_id = uuid4()
+        orders = [
+            Order(
+                id=uuid4(),
+                contract_id=contract_id,
+                trader_id=trader_id,
+                side=OrderSide.BUY,
+                type=OrderType.LIMIT,
+                price=Decimal("90.0"),
+                quantity=Decimal("1.0"),
+                placed_at=datetime.now(UTC),
+            )
+            for contract_id in CONTRACTS
+        ]
+        await matching_engine.add_order(orders[0])
+
+        # Test
+        async with db_connection.get_engine().begin() as conn:
+            # Held by another transaction: the cancellation picks the
+            # contracts of the trader's orders, then waits for their locks
+            await conn.execute(
+                select(func.pg_advisory_xact_lock(func.hashtext(CONTRACTS[0])))
+            )
+            cancellation = asyncio.create_task(matching_engine.cancel_all(trader_id))
+            await asyncio.sleep(0.5)
+            await matching_engine.add_order(orders[1])
+        cancelled = await cancellation
+
+        # Validation
+        assert [order.id for order in cancelled] == [orders[0].id]
+        placed = await matching_engine.get_order(CONTRACTS[1], orders[1].id)
+        assert placed is not None
+        assert placed.status == OpenOrderStatus.OPEN
+        cancelled_order = await matching_engine.get_order(CONTRACTS[0], orders[0].id)
+        assert cancelled_order is not None
+        assert cancelled_order.status == ProcessedOrderStatus.CANCELLED
+
+    async def test_cancel_order_leaves_a_filled_order_filled(self):
+        """Test cancelling an order filled before the lock was taken is a no-op."""
+
+        # Setup
+        matching_engine = MatchingEngine()
+        orders = [
+            Order(
+                id=uuid4(),
+                contract_id=ContractCode.UK_BL_MAR_25,
+                trader_id=uuid4(),
+                side=side,
+                type=OrderType.LIMIT,
+                price=Decimal("90.0"),
+                quantity=Decimal("1.0"),
+                placed_at=datetime.now(UTC),
+            )
+            for side in (OrderSide.BUY, OrderSide.SELL)
+        ]
+        for order in orders:
+            await matching_engine.add_order(order)
+
+        # Test
+        cancelled = await OrderBook().cancel_order(orders[0].id)
+
+        # Validation
+        assert cancelled is None
+        filled = await matching_engine.get_order(
+            ContractCode.UK_BL_MAR_25, orders[0].id
+        )
+        assert filled is not None
+        assert filled.status == ProcessedOrderStatus.FILLED
@@ -0,0 +1,240 @@
+import json
+from decimal import Decimal
+from typing import Awaitable, Callable
+
+from sqlalchemy import event, inspect, text
+
+from ctenex.core.db.async_session import (
+    DatabaseManager,
+    db_connection,
+    get_async_session,
+)
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import Order as OrderEntity
+from ctenex.domain.entities import OrderSide, ProcessedOrderStatus
+from ctenex.domain.order_book.model import order_book
+from ctenex.domain.order_book.order.writer import orders_writer
+from tests.ctenex.domain.matching_engine.test_matching_engine import make_limit_order
+from tests.fixtures.db import (
+    engine,  # noqa F811
+    setup_and_teardown_db,  # noqa F811
+)
+
+OPEN_ORDERS = 10
+FILLED_ORDERS = 2_000
+
+
+async def add_orders(open_orders: int, filled_orders: int) -> None:
+    """Rest open orders on both sides, over a history of filled ones."""
+    entities = []
+    for index in range(open_orders + filled_orders):
+        for side, price in ((OrderSide.SELL, 101 + index % 5), (OrderSide.BUY, 99)):
+            order = make_limit_order(side, str(price), "1.0")
+            order.remaining_quantity = order.quantity
+            if index >= open_orders:
+                order.remaining_quantity = Decimal(0)
+                order.status = ProcessedOrderStatus.FILLED
+            entities.append(OrderEntity(**order.model_dump()))
+
+    async with get_async_session() as session:
+        # In chunks, within the number of parameters of a statement
+        for start in range(0, len(entities), 1_000):
+            await orders_writer.create_many(session, entities[start : start + 1_000])
+        await session.commit()
+        await session.execute(text("ANALYZE book.orders"))
+
+
+async def explain(query: Callable[[], Awaitable]) -> dict:
+    """Run a query of the order book, and return the plan of its last statement."""
+    statements = []
+
+    def capture(_conn, _cursor, statement, parameters, *_) -> None:
+        statements.append((statement, parameters))
+
+    sync_engine = db_connection.get_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await query()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    async with get_async_session() as session:
+        connection = await session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar_one()
+    # Decoded by the driver, unless it leaves JSON as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def nodes(plan: dict) -> list[dict]:
+    return [plan] + [node for child in plan.get("Plans", []) for node in nodes(child)]
+
+
+def scans(plan: dict) -> list[dict]:
+    """Nodes of a plan reading the orders table (or its indexes)."""
+    return [node for node in nodes(plan) if node.get("Relation Name") == "orders"]
+
+
+def scan_types(plan: dict) -> list[tuple[str, str | None]]:
+    return [(node["Node Type"], node.get("Index Name")) for node in scans(plan)]
+
+
+class TestOpenOrderIndexes:
+    async def test_best_prices_are_index_only_lookups(self):
+        """Test the best prices are read off the open orders' indexes alone."""
+
+        # Setup
+        await add_orders(OPEN_ORDERS, FILLED_ORDERS)
+
+        # Test
+        best_ask = await explain(
+            lambda: order_book.get_best_ask_price(ContractCode.UK_BL_MAR_25)
+        )
+        best_bid = await explain(
+            lambda: order_book.get_best_bid_price(ContractCode.UK_BL_MAR_25)
+        )
+
+        # Validation
+        assert scan_types(best_ask) == [("Index Only Scan", "ix_book_orders_open_asks")]
+        assert scan_types(best_bid) == [("Index Only Scan", "ix_book_orders_open_bids")]
+
+    async def test_crossing_orders_are_read_in_priority_order(self):
+        """Test the crossing orders are read off the index, open orders only."""
+
+        # Setup
+        await add_orders(OPEN_ORDERS, FILLED_ORDERS)
+        buy_order = make_limit_order(OrderSide.BUY, "110.0", "3.0")
+        buy_order.remaining_quantity = buy_order.quantity
+        sell_order = make_limit_order(OrderSide.SELL, "90.0", "3.0")
+        sell_order.remaining_quantity = sell_order.quantity
+
+        # Test
+        plans = {}
+        for order in (buy_order, sell_order):
+            async with get_async_session() as session:
+                plans[order.side] = await explain(
+                    lambda: order_book.get_crossing_orders(session, order)
+                )
+
+        # Validation
+        for side, index_name in (
+            (OrderSide.BUY, "ix_book_orders_open_asks"),
+            (OrderSide.SELL, "ix_book_orders_open_bids"),
+        ):
+            plan = plans[side]
+            assert scan_types(plan) == [("Index Scan", index_name)]
+            # No sorting, and none of the filled orders read
+            assert "Sort" not in [node["Node Type"] for node in nodes(plan)]
+            assert [node["Actual Rows"] for node in scans(plan)] == [OPEN_ORDERS]
+
+    async def test_cost_does_not_grow_with_filled_history(self):
+        """Test the matching reads the same orders over ten times the history."""
+
+        # Setup
+        buy_order = make_limit_order(OrderSide.BUY, "110.0", "3.0")
+        buy_order.remaining_quantity = buy_order.quantity
+
+        async def crossing_plan() -> dict:
+            async with get_async_session() as session:
+                return await explain(
+                    lambda: order_book.get_crossing_orders(session, buy_order)
+                )
+
+        await add_orders(OPEN_ORDERS, FILLED_ORDERS // 10)
+        short_history = await crossing_plan()
+
+        # Test
+        await add_orders(0, FILLED_ORDERS - FILLED_ORDERS // 10)
+        long_history = await crossing_plan()
+
+        # Validation
+        assert scan_types(long_history) == scan_types(short_history)
+        assert [node["Actual Rows"] for node in scans(long_history)] == [
+            node["Actual Rows"] for node in scans(short_history)
+        ]
+
+    async def test_migration_creates_missing_indexes(self):
+        """Test migrating a database created before the indexes adds them."""
+
+        # Setup
+        db_engine = db_connection.get_engine()
+        async with db_engine.begin() as conn:
+            await conn.execute(text("DROP INDEX book.ix_book_orders_open_asks"))
+            await conn.execute(text("DROP INDEX book.ix_book_orders_open_bids"))
+        await add_orders(OPEN_ORDERS, 0)
+
+        # Test
+        await DatabaseManager.migrate_db(engine=db_engine)
+
+        # Validation
+        async with db_engine.connect() as conn:
+            indexes = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).get_indexes(
+                    "orders", schema="book"
+                )
+            )
+        assert {"ix_book_orders_open_asks", "ix_book_orders_open_bids"} <= {
+            index["name"] for index in indexes
+        }
+        assert await order_book.get_best_bid_price(
+            ContractCode.UK_BL_MAR_25
+        ) == Decimal("99.00")
+
+    async def test_migration_brings_the_baseline_schema_up_to_date(self):
+        """Test migrating orders tables of the first schema adds what they lack."""
+
+        # Setup
+        db_engine = db_connection.get_engine()
+        async with db_engine.begin() as conn:
+            # Back to the tables of the first schema, with an order in it
+            for table in ("book.orders", "history.historic_orders"):
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {table} DROP COLUMN stop_price, "
+                        "DROP COLUMN time_in_force, DROP COLUMN expires_at"
+                    )
+                )
+            await conn.execute(text("DROP INDEX book.ix_book_orders_trader_id"))
+            await conn.execute(text("DROP INDEX book.ix_book_orders_open_asks"))
+            await conn.execute(text("DROP INDEX book.ix_book_orders_open_bids"))
+            await conn.execute(
+                text(
+                    "INSERT INTO book.orders (id, created_at, updated_at, "
+                    "is_deleted, is_active, contract_id, trader_id, side, type, "
+                    "price, quantity, placed_at, remaining_quantity, status) "
+                    "VALUES (gen_random_uuid(), now(), now(), false, true, "
+                    "'UK-BL-MAR-25', gen_random_uuid(), 'buy', 'limit', 99, 1, "
+                    "now(), 1, 'open')"
+                )
+            )
+
+        # Test
+        await DatabaseManager.migrate_db(engine=db_engine)
+
+        # Validation
+        async with db_engine.connect() as conn:
+            columns = await conn.run_sync(
+                lambda sync_conn: {
+                    column["name"]: column
+                    for column in inspect(sync_conn).get_columns(
+                        "orders", schema="book"
+                    )
+                }
+            )
+            time_in_force = (
+                await conn.execute(text("SELECT time_in_force FROM book.orders"))
+            ).scalar_one()
+        assert {"stop_price", "time_in_force", "expires_at"} <= set(columns)
+        assert not columns["time_in_force"]["nullable"]
+        assert columns["time_in_force"]["default"] is None
+        assert time_in_force == "gtc"
+        # Orders are added and matched against the order already there
+        await add_orders(OPEN_ORDERS, 0)
+        assert await order_book.get_best_bid_price(
+            ContractCode.UK_BL_MAR_25
+        ) == Decimal("99.00")
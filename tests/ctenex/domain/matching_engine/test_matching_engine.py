@@ -2,12 +2,16 @@ from datetime import UTC, datetime
 from decimal import Decimal
 from uuid import uuid4
 
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
 from ctenex.domain.contracts import ContractCode
 from ctenex.domain.entities import (
     OpenOrderStatus,
     OrderSide,
     OrderType,
     ProcessedOrderStatus,
+    TimeInForce,
 )
 from ctenex.domain.matching_engine.model import matching_engine
 from ctenex.domain.order_book.order.model import Order
@@ -27,6 +31,19 @@ from tests.fixtures.domain import (
 )
 
 
+def make_limit_order(side: OrderSide, price: str, quantity: str) -> Order:
+    return Order(
+        id=uuid4(),
+        contract_id=ContractCode.UK_BL_MAR_25,
+        trader_id=uuid4(),
+        side=side,
+        type=OrderType.LIMIT,
+        price=Decimal(price),
+        quantity=Decimal(quantity),
+        placed_at=datetime.now(UTC),
+    )
+
+
 class TestMatchingEngine:
     def setup_method(self):
         """Create a fresh matching engine before each test."""
@@ -530,3 +547,244 @@ class TestMatchingEngine:
             )
         )
         assert len(orders) == 2
+
+    async def test_ioc_remainder_is_cancelled(
+        self,
+        limit_sell_order,  # noqa F811
+    ):
+        """Test what remains of an immediate-or-cancel order never rests."""
+
+        # Setup
+        await self.matching_engine.add_order(limit_sell_order)  # Quantity: 10.0
+        buy_order = Order(
+            id=uuid4(),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            time_in_force=TimeInForce.IOC,
+            price=Decimal("100.0"),
+            quantity=Decimal("12.0"),
+            placed_at=datetime.now(UTC),
+        )
+
+        # Test
+        await self.matching_engine.add_order(buy_order)
+
+        # Validation
+        assert buy_order.status == ProcessedOrderStatus.CANCELLED
+        assert buy_order.remaining_quantity == Decimal("2.0")
+        orders = await self.matching_engine.get_orders(
+            filter=OrderFilter(
+                contract_id=ContractCode.UK_BL_MAR_25,
+            )
+        )
+        assert {order.status for order in orders} == {
+            ProcessedOrderStatus.FILLED,
+            ProcessedOrderStatus.CANCELLED,
+        }
+
+    async def test_fok_without_enough_liquidity_is_cancelled(
+        self,
+        limit_sell_order,  # noqa F811
+    ):
+        """Test a fill-or-kill order that cannot fill in full touches nothing."""
+
+        # Setup
+        await self.matching_engine.add_order(limit_sell_order)  # Quantity: 10.0
+        buy_order = Order(
+            id=uuid4(),
+            contract_id=ContractCode.UK_BL_MAR_25,
+            trader_id=uuid4(),
+            side=OrderSide.BUY,
+            type=OrderType.LIMIT,
+            time_in_force=TimeInForce.FOK,
+            price=Decimal("100.0"),
+            quantity=Decimal("12.0"),
+            placed_at=datetime.now(UTC),
+        )
+
+        # Test
+        await self.matching_engine.add_order(buy_order)
+
+        # Validation
+        assert buy_order.status == ProcessedOrderStatus.CANCELLED
+        assert buy_order.remaining_quantity == Decimal("12.0")
+        sell_order = await self.matching_engine.get_order(
+            ContractCode.UK_BL_MAR_25, limit_sell_order.id
+        )
+        assert sell_order is not None
+        assert sell_order.status == OpenOrderStatus.OPEN
+        assert sell_order.remaining_quantity == Decimal("10.0")
+
+    async def test_cancel_all(
+        self,
+        limit_buy_order,  # noqa F811
+        limit_sell_order,  # noqa F811
+    ):
+        """Test cancelling all the open orders of a trader at once."""
+
+        # Setup
+        trader_id = uuid4()
+        orders = []
+        for contract_id, price in (
+            (ContractCode.UK_BL_MAR_25, "90.0"),
+            (ContractCode.UK_BL_MAR_25, "91.0"),
+            ("UK-BL-APR-25", "90.0"),
+        ):
+            order = Order(
+                id=uuid4(),
+                contract_id=contract_id,
+                trader_id=trader_id,
+                side=OrderSide.BUY,
+                type=OrderType.LIMIT,
+                price=Decimal(price),
+                quantity=Decimal("1.0"),
+                placed_at=datetime.now(UTC),
+            )
+            await self.matching_engine.add_order(order)
+            orders.append(order)
+        limit_buy_order.trader_id = trader_id
+        await self.matching_engine.add_order(limit_sell_order)  # Quantity: 10.0
+        await self.matching_engine.add_order(limit_buy_order)  # Filled
+
+        # Test
+        cancelled = await self.matching_engine.cancel_all(
+            trader_id, ContractCode.UK_BL_MAR_25
+        )
+
+        # Validation
+        assert [order.id for order in cancelled] == [orders[0].id, orders[1].id]
+        assert all(
+            order.status == ProcessedOrderStatus.CANCELLED for order in cancelled
+        )
+        filled = await self.matching_engine.get_order(
+            ContractCode.UK_BL_MAR_25, limit_buy_order.id
+        )
+        assert filled is not None
+        assert filled.status == ProcessedOrderStatus.FILLED
+
+        cancelled = await self.matching_engine.cancel_all(trader_id)
+        assert [order.id for order in cancelled] == [orders[2].id]
+        assert await self.matching_engine.cancel_all(trader_id) == []
+
+    async def test_sell_order_takes_the_best_bid_first(self):
+        """Test a sell order is matched with the highest bids first."""
+
+        # Setup
+        bids = [
+            make_limit_order(OrderSide.BUY, price, "5.0")
+            for price in ("99.0", "101.0", "100.0")
+        ]
+        for bid in bids:
+            await self.matching_engine.add_order(bid)
+        sell_order = make_limit_order(OrderSide.SELL, "100.0", "7.0")
+
+        # Test
+        await self.matching_engine.add_order(sell_order)
+
+        # Validation
+        assert sell_order.status == ProcessedOrderStatus.FILLED
+        trades = await self.matching_engine.get_trades_by_order(
+            ContractCode.UK_BL_MAR_25, sell_order.id
+        )
+        assert sorted((trade.price, trade.quantity) for trade in trades) == [
+            (Decimal("100.0"), Decimal("2.0")),
+            (Decimal("101.0"), Decimal("5.0")),
+        ]
+        statuses = [
+            (order.status, order.remaining_quantity)
+            for bid in bids
+            if (
+                order := await self.matching_engine.get_order(
+                    ContractCode.UK_BL_MAR_25, bid.id
+                )
+            )
+        ]
+        assert statuses == [
+            (OpenOrderStatus.OPEN, Decimal("5.0")),
+            (ProcessedOrderStatus.FILLED, Decimal("0.0")),
+            (OpenOrderStatus.PARTIALLY_FILLED, Decimal("3.0")),
+        ]
+
+    async def test_best_prices_are_those_of_open_orders(self):
+        """Test the best prices are the lowest open ask and the highest open bid."""
+
+        # Setup
+        for side, price in (
+            (OrderSide.SELL, "101.0"),
+            (OrderSide.SELL, "103.0"),
+            (OrderSide.BUY, "97.0"),
+            (OrderSide.BUY, "99.0"),
+        ):
+            await self.matching_engine.add_order(make_limit_order(side, price, "5.0"))
+        # Fills the best ask, which no longer counts
+        await self.matching_engine.add_order(
+            make_limit_order(OrderSide.BUY, "101.0", "5.0")
+        )
+
+        # Test
+        order_book = self.matching_engine.order_book
+        best_ask = await order_book.get_best_ask_price(ContractCode.UK_BL_MAR_25)
+        best_bid = await order_book.get_best_bid_price(ContractCode.UK_BL_MAR_25)
+
+        # Validation
+        assert best_ask == Decimal("103.0")
+        assert best_bid == Decimal("99.0")
+
+    async def test_crossing_orders_cover_the_quantity_needed(self):
+        """Test only the resting orders needed to fill an order are fetched."""
+
+        # Setup
+        for price in ("104.0", "100.0", "102.0", "101.0", "103.0"):
+            await self.matching_engine.add_order(
+                make_limit_order(OrderSide.SELL, price, "5.0")
+            )
+        buy_order = make_limit_order(OrderSide.BUY, "103.0", "12.0")
+        buy_order.remaining_quantity = buy_order.quantity
+
+        # Test
+        async with self.matching_engine.db() as session:
+            crossing = await self.matching_engine.order_book.get_crossing_orders(
+                session, buy_order
+            )
+
+        # Validation
+        assert [order.price for order in crossing] == [
+            Decimal("100.0"),
+            Decimal("101.0"),
+            Decimal("102.0"),
+        ]
+
+    async def test_order_is_committed_with_its_trades_or_not_at_all(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test a failure writing the trades rolls back the order and its fills."""
+
+        # Setup
+        sell_order = make_limit_order(OrderSide.SELL, "100.0", "5.0")
+        await self.matching_engine.add_order(sell_order)
+        buy_order = make_limit_order(OrderSide.BUY, "100.0", "3.0")
+
+        async def fail(*_):
+            raise SQLAlchemyError("Failed to write the trades")
+
+        monkeypatch.setattr(self.matching_engine.trades_writer, "create_many", fail)
+
+        # Test
+        with pytest.raises(SQLAlchemyError):
+            await self.matching_engine.add_order(buy_order)
+
+        # Validation
+        assert (
+            await self.matching_engine.get_order(
+                ContractCode.UK_BL_MAR_25, buy_order.id
+            )
+            is None
+        )
+        resting = await self.matching_engine.get_order(
+            ContractCode.UK_BL_MAR_25, sell_order.id
+        )
+        assert resting is not None
+        assert resting.status == OpenOrderStatus.OPEN
+        assert resting.remaining_quantity == Decimal("5.0")
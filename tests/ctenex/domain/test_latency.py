@@ -0,0 +1,104 @@
+from ctenex.domain.latency.model import (
+    BUCKETS,
+    LatencyHistogram,
+    LatencyRecorder,
+    bucket_of,
+    bucket_value,
+)
+
+
+class TestLatencyHistogram:
+    def test_buckets_are_within_a_few_percent(self):
+        """Test every latency falls in a bucket whose midpoint is within 3% of it."""
+
+        # Setup
+        latencies = [0, 1, 63, 64, 65, 1_000, 12_345, 999_999, 2**40 + 7, 2**62]
+
+        # Test
+        buckets = [bucket_of(latency) for latency in latencies]
+
+        # Validation
+        assert all(0 <= bucket < BUCKETS for bucket in buckets)
+        assert buckets == sorted(buckets)
+        for latency, bucket in zip(latencies, buckets):
+            assert abs(bucket_value(bucket) - latency) <= latency * 0.03
+
+    def test_percentiles(self):
+        """Test percentiles are read off the recorded latencies."""
+
+        # Setup
+        histogram = LatencyHistogram()
+
+        # Test
+        for latency in range(1, 10_001):
+            histogram.record(latency * 1_000)
+
+        # Validation
+        assert histogram.count == 10_000
+        assert histogram.max == 10_000_000
+        for percentile, expected in [(50, 5_000_000), (99, 9_900_000)]:
+            assert abs(histogram.percentile(percentile) - expected) <= expected * 0.03
+        assert histogram.percentile(100) == 10_000_000
+
+    def test_empty_histogram(self):
+        """Test an empty histogram summarizes to zeros."""
+
+        # Setup
+        histogram = LatencyHistogram()
+
+        # Test
+        summary = histogram.summarize()
+
+        # Validation
+        assert (summary.count, summary.p50, summary.p999, summary.max) == (0, 0, 0, 0)
+
+
+class TestLatencyRecorder:
+    def test_pending_latencies_are_read(self):
+        """Test latencies are per contract and stage, flushed or not."""
+
+        # Setup
+        recorder = LatencyRecorder()
+        recorder.FLUSH_SIZE = 4
+
+        # Test
+        for _ in range(3):
+            recorder.record("A", ("match", "total"), 1_000, 3_000)
+        recorder.record("B", ("match", "total"), 2_000, 5_000)
+
+        # Validation
+        summary = {
+            contract.contract_id: contract.stages
+            for contract in recorder.summarize().contracts
+        }
+        assert summary["A"]["match"].count == 3
+        assert summary["A"]["total"].max == 3.0
+        assert summary["B"]["match"].p50 == 2.0
+        assert summary["B"]["total"].p999 == 5.0
+
+    def test_disabled_recorder(self):
+        """Test a disabled recorder records nothing."""
+
+        # Setup
+        recorder = LatencyRecorder(enabled=False)
+
+        # Test
+        recorder.record("A", ("total",), 1_000)
+
+        # Validation
+        assert recorder.summarize().contracts == []
+
+    def test_reset(self):
+        """Test resetting drops recorded and pending latencies."""
+
+        # Setup
+        recorder = LatencyRecorder()
+        recorder.record("A", ("total",), 1_000)
+        recorder.summarize()
+        recorder.record("A", ("total",), 1_000)
+
+        # Test
+        recorder.reset()
+
+        # Validation
+        assert recorder.summarize().contracts == []
@@ -3,6 +3,7 @@ import pytest_asyncio
 from ctenex.core.db.async_session import (
     DatabaseManager,
     create_custom_engine,
+    db_connection,
     get_async_session,
 )
 from ctenex.settings.application import get_app_settings
@@ -28,3 +29,6 @@ async def setup_and_teardown_db(engine):
     await DatabaseManager.setup_db(engine=engine)
     yield
     await DatabaseManager.drop_db(engine=engine)
+    # The connections of the app's engine are bound to the event loop of the
+    # test that opened them
+    await db_connection.close_engine()
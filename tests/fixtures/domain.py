@@ -14,7 +14,8 @@ from ctenex.api.v1.in_memory.controllers.exchange import (
     router as stateful_exchange_router,
 )
 from ctenex.api.v1.in_memory.lifespan import lifespan
-from ctenex.core.db.async_session import get_async_session
+from ctenex.api.v1.lifespan import lifespan as stateless_lifespan
+from ctenex.core.db.async_session import db_connection, get_async_session
 from ctenex.domain.contracts import ContractCode
 from ctenex.domain.entities import (
     Commodity,
@@ -135,6 +136,10 @@ async def supported_contract_gb():
         session.add(supported_contract)
         await session.commit()
         await session.refresh(supported_contract)
+
+    # Connections are bound to the event loop that opened them, and the test
+    # client serves requests on a loop of its own
+    await db_connection.close_engine()
     return supported_contract
 
 
@@ -156,6 +161,7 @@ def client_for_stateful_app() -> Iterator[TestClient]:
 def client_for_stateless_app() -> Iterator[TestClient]:
     with TestClient(
         app=create_app(
+            lifespan=stateless_lifespan,
             routers=[status_router, stateless_exchange_router],
         )
     ) as client:
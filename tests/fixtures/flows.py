@@ -0,0 +1,56 @@
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from ctenex.domain.contracts import ContractCode
+from ctenex.domain.entities import OrderSide, OrderType
+
+
+def random_flow(seed: int, size: int, stops: float = 0.0) -> list[tuple[str, dict]]:
+    """
+    Generate a reproducible flow of order submissions and cancellations,
+    a `stops` fraction of the orders being stop or stop-limit orders.
+    """
+    rng = random.Random(seed)
+    flow = []
+    order_ids = []
+
+    for _ in range(size):
+        if order_ids and rng.random() < 0.15:
+            flow.append(("cancel", {"id": rng.choice(order_ids)}))
+            continue
+
+        order_type = OrderType.MARKET if rng.random() < 0.1 else OrderType.LIMIT
+        stop_price = None
+        if stops and rng.random() < stops:
+            stop_price = Decimal(rng.randint(9_950, 10_050)).scaleb(-2)
+            order_type = (
+                OrderType.STOP
+                if order_type == OrderType.MARKET
+                else OrderType.STOP_LIMIT
+            )
+        order_id = UUID(int=rng.getrandbits(128))
+        order_ids.append(order_id)
+        flow.append(
+            (
+                "add",
+                {
+                    "id": order_id,
+                    "contract_id": ContractCode.UK_BL_MAR_25,
+                    "trader_id": UUID(int=rng.getrandbits(128)),
+                    "side": rng.choice([OrderSide.BUY, OrderSide.SELL]),
+                    "type": order_type,
+                    "price": (
+                        Decimal(rng.randint(9_950, 10_050)).scaleb(-2)
+                        if order_type in (OrderType.LIMIT, OrderType.STOP_LIMIT)
+                        else None
+                    ),
+                    "stop_price": stop_price,
+                    "quantity": Decimal(rng.randint(1, 2_000)).scaleb(-2),
+                    "placed_at": datetime(2025, 3, 1, tzinfo=UTC),
+                },
+            )
+        )
+
+    return flow